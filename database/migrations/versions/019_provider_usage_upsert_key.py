@@ -0,0 +1,60 @@
+"""
+Make the provider_usage unique index treat NULL workspaces as equal.
+
+Usage sync upserts records in bulk with INSERT ... ON CONFLICT, which
+needs a unique index that matches records without a workspace_id.
+PostgreSQL treats NULLs as distinct unless the index is NULLS NOT
+DISTINCT (PostgreSQL 15+), so duplicates of such records are removed
+first, keeping the most recently updated row.
+
+Revision ID: 019_provider_usage_upsert_key
+Revises: 018_project_quality_settings
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+
+# Revision identifiers
+revision = "019_provider_usage_upsert_key"
+down_revision = "018_project_quality_settings"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Recreate ix_provider_usage_unique as NULLS NOT DISTINCT."""
+    op.execute("""
+        DELETE FROM provider_usage
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY provider, report_date, model, workspace_id
+                    ORDER BY updated_at DESC, id
+                ) AS rank
+                FROM provider_usage
+                WHERE workspace_id IS NULL
+            ) ranked
+            WHERE rank > 1
+        );
+    """)
+
+    op.drop_index("ix_provider_usage_unique", table_name="provider_usage")
+    op.create_index(
+        "ix_provider_usage_unique",
+        "provider_usage",
+        ["provider", "report_date", "model", "workspace_id"],
+        unique=True,
+        postgresql_nulls_not_distinct=True,
+    )
+
+
+def downgrade() -> None:
+    """Restore the plain unique index."""
+    op.drop_index("ix_provider_usage_unique", table_name="provider_usage")
+    op.create_index(
+        "ix_provider_usage_unique",
+        "provider_usage",
+        ["provider", "report_date", "model", "workspace_id"],
+        unique=True,
+    )
@@ -0,0 +1,44 @@
+"""
+Widen messages.id to fit prefixed message IDs.
+
+Agent responses and command results are stored as "agent-<uuid>" and
+"cmd-<uuid>" (42 characters), which didn't fit the 36-character column,
+so they never reached PostgreSQL.
+
+Revision ID: 020_message_id_length
+Revises: 019_provider_usage_upsert_key
+Create Date: 2026-10-18
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# Revision identifiers
+revision = "020_message_id_length"
+down_revision = "019_provider_usage_upsert_key"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Widen messages.id to 64 characters."""
+    op.alter_column(
+        "messages",
+        "id",
+        existing_type=sa.String(36),
+        type_=sa.String(64),
+        existing_nullable=False,
+    )
+
+
+def downgrade() -> None:
+    """Narrow messages.id back to 36 characters, dropping rows that don't fit."""
+    op.execute("DELETE FROM messages WHERE length(id) > 36")
+    op.alter_column(
+        "messages",
+        "id",
+        existing_type=sa.String(64),
+        type_=sa.String(36),
+        existing_nullable=False,
+    )
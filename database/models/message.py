@@ -5,6 +5,8 @@ Provides a PostgreSQL fallback for messages stored in Redis,
 ensuring conversation history survives Redis restarts or key expiry.
 """
 
+from uuid import uuid4
+
 from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -16,6 +18,14 @@ class Message(Base, UUIDMixin, TimestampMixin):
 
     __tablename__ = "messages"
 
+    # Wider than a UUID: agent and command results are stored as
+    # "agent-<uuid>" and "cmd-<uuid>"
+    id: Mapped[str] = mapped_column(
+        String(64),
+        primary_key=True,
+        default=lambda: str(uuid4()),
+    )
+
     conversation_id: Mapped[str] = mapped_column(
         String(36),
         ForeignKey("conversations.id", ondelete="CASCADE"),
@@ -76,7 +76,8 @@ class ProviderUsage(Base, UUIDMixin, TimestampMixin):
         Index("ix_provider_usage_provider_date", "provider", "report_date"),
         # Model-specific queries
         Index("ix_provider_usage_model_date", "model", "report_date"),
-        # Unique constraint to prevent duplicates
+        # Unique constraint to prevent duplicates; also the upsert conflict
+        # target, so records without a workspace must collide too
         Index(
             "ix_provider_usage_unique",
             "provider",
@@ -84,6 +85,7 @@ class ProviderUsage(Base, UUIDMixin, TimestampMixin):
             "model",
             "workspace_id",
             unique=True,
+            postgresql_nulls_not_distinct=True,
         ),
     )
 
@@ -64,6 +64,7 @@ from ai_memory.phase_memory import PhaseMemoryManager, format_phase_context_for_
 from ai_messaging import (
     AgentHeartbeat,
     AgentStatusMessage,
+    ConversationHistory,
     MessageType,
     PubSubManager,
     RedisClient,
@@ -1250,57 +1251,14 @@ class BaseAgent(ABC):
             return
 
         try:
-            # Get message IDs from conversation (stored newest first via lpush)
-            messages_key = f"conversation:{conversation_id}:messages"
-            message_ids = await self._redis.lrange(messages_key, 0, 19)  # Last 20 messages
-
-            if message_ids:
-                # Reverse to get chronological order (oldest first)
-                message_ids = list(reversed(message_ids))
-
-                # Load each message
-                for msg_id in message_ids:
-                    msg_key = f"message:{msg_id}"
-                    msg_data = await self._redis.hgetall(msg_key)
-
-                    if msg_data:
-                        role = msg_data.get("role", "user")
-                        content = msg_data.get("content", "")
-
-                        if content:
-                            self._state.conversation_history.append(
-                                ConversationMessage(role=role, content=content)
-                            )
-            else:
-                # Fallback: load from PostgreSQL if Redis is empty
-                try:
-                    from api.database import db_session_context
-                    from database.models import Message
-                    from sqlalchemy import select
-
-                    async with db_session_context() as session:
-                        result = await session.execute(
-                            select(Message)
-                            .where(Message.conversation_id == conversation_id)
-                            .order_by(Message.created_at.desc())
-                            .limit(20)
-                        )
-                        db_messages = list(reversed(result.scalars().all()))
-
-                        for msg in db_messages:
-                            if msg.content:
-                                self._state.conversation_history.append(
-                                    ConversationMessage(role=msg.role, content=msg.content)
-                                )
-
-                    if self._state.conversation_history:
-                        logger.debug(
-                            "Loaded conversation context from DB fallback",
-                            conversation_id=conversation_id,
-                            message_count=len(self._state.conversation_history),
-                        )
-                except Exception as db_err:
-                    logger.debug("DB fallback for conversation context failed", error=str(db_err))
+            # Last 20 messages in one read; reloaded from PostgreSQL if Redis has none
+            history = ConversationHistory(self._redis, loader=self._load_messages_from_db)
+            for msg in await history.recent(conversation_id, limit=20):
+                content = msg.get("content")
+                if content:
+                    self._state.conversation_history.append(
+                        ConversationMessage(role=msg.get("role", "user"), content=content)
+                    )
 
             logger.debug(
                 "Loaded conversation context",
@@ -1312,6 +1270,15 @@ class BaseAgent(ABC):
             logger.warning("Failed to load conversation context", error=str(e))
             self._state.conversation_history = []
 
+    async def _load_messages_from_db(self, conversation_id: str, limit: int) -> list[dict[str, Any]]:
+        """Newest stored messages of a conversation from PostgreSQL, oldest first."""
+        try:
+            from api.services.conversation_history import load_messages
+        except ImportError as e:
+            logger.debug("DB fallback for conversation context unavailable", error=str(e))
+            return []
+        return await load_messages(conversation_id, limit)
+
     def _build_task_message(self, request: TaskRequest) -> str:
         """Build the initial user message for a task."""
         # For chat tasks, just return the user's message content
@@ -35,6 +35,18 @@ from .pricing import (
     get_model_pricing,
     get_model_provider,
 )
+from .docker_client import (
+    DockerAPIError,
+    DockerClient,
+    get_docker_client,
+)
+from .git_service import (
+    GitRepository,
+    GitService,
+    GitStatus,
+    GitStatusEntry,
+    get_git_service,
+)
 from .enums import (
     AgentStatus,
     AgentType,
@@ -137,6 +149,9 @@ from .llm_provider import (
     LLMToolResult,
 )
 from .content_router import ContentRouter, get_content_router, COST_PER_1K_TOKENS, RoutingResult
+from .router_inference import ExportedRouter, RoutingBatcher
+from .pattern_classifier import PatternClassifier, PatternMatches, get_pattern_classifier
+from .rule_matcher import RuleMatcher, clear_decision_cache
 from .prompt_tier import (
     PromptTierClassifier,
     PromptSection,
@@ -265,6 +280,10 @@ from .metrics import (
     routing_cost_efficiency_ratio,
     security_violations_total,
     system_uptime_seconds,
+    websocket_connections_active,
+    websocket_frames_dropped_total,
+    websocket_send_queue_depth,
+    websocket_slow_disconnects_total,
 )
 
 __version__ = "0.1.0"
@@ -334,6 +353,16 @@ __all__ = [
     "get_all_breaker_status",
     "get_circuit_breaker",
     "reset_circuit_breaker",
+    # Docker
+    "DockerClient",
+    "DockerAPIError",
+    "get_docker_client",
+    # Git
+    "GitRepository",
+    "GitService",
+    "GitStatus",
+    "GitStatusEntry",
+    "get_git_service",
     # Pricing & Cost Tracking
     "Provider",
     "UsageCost",
@@ -408,6 +437,10 @@ __all__ = [
     "routing_model_accuracy",
     "routing_cost_efficiency_ratio",
     "system_uptime_seconds",
+    "websocket_connections_active",
+    "websocket_send_queue_depth",
+    "websocket_frames_dropped_total",
+    "websocket_slow_disconnects_total",
     # Plugins
     "Plugin",
     "PluginTool",
@@ -432,8 +465,17 @@ __all__ = [
     # Content Router
     "ContentRouter",
     "get_content_router",
+    "ExportedRouter",
+    "RoutingBatcher",
     "COST_PER_1K_TOKENS",
     "RoutingResult",
+    # Pattern Classifier
+    "PatternClassifier",
+    "PatternMatches",
+    "get_pattern_classifier",
+    # Rule Matcher
+    "RuleMatcher",
+    "clear_decision_cache",
     # Prompt Tier
     "PromptTierClassifier",
     "PromptSection",
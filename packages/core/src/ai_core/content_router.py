@@ -4,7 +4,10 @@ Content-based model routing using LLMRouter (MFRouter).
 Analyzes prompt content to refine tier selection beyond structural heuristics.
 Only invoked for BALANCED-tier requests (the uncertain middle ground).
 Uses MFRouter's matrix factorization model to predict the optimal tier
-based on learned query complexity patterns.
+based on learned query complexity patterns, served from an exported
+bundle (see router_inference) with concurrent requests scored in batches.
+Without a bundle, the trained MFRouter is served through llmrouter when
+it's installed.
 
 Also provides prompt tier classification for dynamic prompt sizing.
 """
@@ -13,25 +16,34 @@ import asyncio
 import hashlib
 import os
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Any
 
 from .circuit_breaker import CircuitBreaker, CircuitBreakerConfig, get_circuit_breaker
 from .logging import get_logger
 from .model_selector import ModelTier, PromptTier
+from .router_inference import ExportedRouter, RoutingBatcher
 
 logger = get_logger(__name__)
 
 # Configuration via environment variables with sensible defaults
 ROUTER_ENABLED_KEY = "llm:router_enabled"  # Redis key to enable/disable
-# Default 2000ms (2s) timeout - Longformer embedding takes ~1-2s on CPU
-# For production, consider pre-computing embeddings or using GPU
+# Default 2000ms (2s) timeout - covers a Longformer forward pass on CPU
+# plus waiting for the batch in flight
 LATENCY_BUDGET_MS = int(os.environ.get("CONTENT_ROUTER_LATENCY_BUDGET_MS", "2000"))
+# Bundle written by `scripts/train_content_router.py export`
+ROUTER_EXPORT_DIR = os.environ.get(
+    "CONTENT_ROUTER_EXPORT_DIR",
+    "/home/wyld-core/config/router/export"
+)
+# MFRouter config served through llmrouter when there is no bundle
 ROUTER_CONFIG_PATH = os.environ.get(
     "CONTENT_ROUTER_CONFIG_PATH",
     "/home/wyld-core/config/router/router_config.yaml"
 )
 CACHE_TTL = 300  # Cache routing decisions for 5 min (same prompt pattern)
+CACHE_MAX_ENTRIES = 1000  # Least recently used decisions are evicted past this
 
 
 @dataclass
@@ -55,6 +67,30 @@ COST_PER_1K_TOKENS = {
 }
 
 
+class _MFRouterFallback:
+    """
+    The trained MFRouter served through llmrouter (needs torch).
+
+    Routes one query at a time with llmrouter's own embedding; used until
+    a bundle is exported.
+    """
+
+    def __init__(self, config_path: str):
+        from llmrouter.models.mfrouter.router import MFRouter
+
+        self._router = MFRouter(yaml_path=config_path)
+
+    def route_batch(self, texts: list[str]) -> list[tuple[str, int]]:
+        """Model name and rough token estimate (words * 1.3) for each text."""
+        return [
+            (
+                self._router.route_single({"query": text}).get("model_name", "balanced"),
+                round(len(text.split()) * 1.3),
+            )
+            for text in texts
+        ]
+
+
 class ContentRouter:
     """
     Content-based LLM routing using MFRouter (LLMRouter library).
@@ -64,47 +100,98 @@ class ContentRouter:
     or downgraded to FAST. Includes cost tracking for analytics.
     """
 
-    def __init__(self, redis: Any = None):
-        self._router = None  # Lazy-loaded MFRouter instance
+    def __init__(
+        self,
+        redis: Any = None,
+        export_dir: str = ROUTER_EXPORT_DIR,
+        config_path: str = ROUTER_CONFIG_PATH,
+    ):
+        # Lazy-loaded exported MFRouter, or the llmrouter fallback
+        self._router: ExportedRouter | _MFRouterFallback | None = None
+        self._router_lock = asyncio.Lock()
+        self._batcher = RoutingBatcher(self._route_batch)
+        self._export_dir = export_dir
+        self._config_path = config_path
         self._redis = redis
         self._enabled = os.environ.get("CONTENT_ROUTER_ENABLED", "true").lower() == "true"
         self._latency_budget_ms = LATENCY_BUDGET_MS
-        self._cache: dict[str, tuple[ModelTier, float]] = {}  # hash -> (tier, timestamp)
+        # hash -> (tier, timestamp), least recently used first
+        self._cache: OrderedDict[str, tuple[ModelTier, float]] = OrderedDict()
         self._circuit_breaker = get_circuit_breaker(
             "content-router",
             CircuitBreakerConfig(failure_threshold=5, timeout=30.0),
         )
         self._cost_tracking_enabled = True
 
-    def _get_router(self):
-        """Lazy-load the MFRouter model."""
+    def _get_router(self) -> ExportedRouter | _MFRouterFallback | None:
+        """Lazy-load the exported MFRouter (blocking; see _ensure_router)."""
         if self._router is None:
-            # Check if config path is set and exists
-            if not ROUTER_CONFIG_PATH:
-                logger.info("CONTENT_ROUTER_CONFIG_PATH not set, disabling content routing")
-                self._enabled = False
-                return None
-
-            import os.path
-            if not os.path.exists(ROUTER_CONFIG_PATH):
-                logger.info(f"Router config not found at {ROUTER_CONFIG_PATH}, disabling content routing")
-                self._enabled = False
-                return None
+            if not self._export_dir:
+                logger.info("CONTENT_ROUTER_EXPORT_DIR not set, trying MFRouter")
+                self._router = self._get_fallback_router()
+                return self._router
 
             try:
-                from llmrouter.models.mfrouter.router import MFRouter
-                self._router = MFRouter(yaml_path=ROUTER_CONFIG_PATH)
-                logger.info(f"Loaded MFRouter from {ROUTER_CONFIG_PATH}")
-            except ImportError:
-                logger.warning("llmrouter package not installed, disabling content routing")
+                self._router = ExportedRouter.load(self._export_dir)
+            except FileNotFoundError as e:
+                logger.info(
+                    "Router bundle not found, trying MFRouter "
+                    "(run scripts/train_content_router.py export)",
+                    error=str(e),
+                )
+                self._router = self._get_fallback_router()
+                return self._router
+            except ImportError as e:
+                logger.warning(
+                    "numpy, onnxruntime or tokenizers not installed, disabling content routing",
+                    error=str(e),
+                )
                 self._enabled = False
                 return None
             except Exception as e:
-                logger.warning(f"Failed to load MFRouter, disabling content routing: {e}")
+                logger.warning(f"Failed to load router bundle, disabling content routing: {e}")
                 self._enabled = False
                 return None
         return self._router
 
+    def _get_fallback_router(self) -> _MFRouterFallback | None:
+        """MFRouter through llmrouter, or None (routing disabled) if unavailable."""
+        if not self._config_path or not os.path.exists(self._config_path):
+            logger.info(
+                f"Router config not found at {self._config_path}, disabling content routing"
+            )
+            self._enabled = False
+            return None
+
+        try:
+            router = _MFRouterFallback(self._config_path)
+        except ImportError:
+            logger.warning("llmrouter package not installed, disabling content routing")
+            self._enabled = False
+            return None
+        except Exception as e:
+            logger.warning(f"Failed to load MFRouter, disabling content routing: {e}")
+            self._enabled = False
+            return None
+
+        logger.info(f"Loaded MFRouter from {self._config_path}")
+        return router
+
+    async def _ensure_router(self) -> ExportedRouter | _MFRouterFallback | None:
+        """Load the router in a worker thread, once, without blocking the loop."""
+        if self._router is None:
+            async with self._router_lock:
+                if self._router is None and self._enabled:
+                    await asyncio.to_thread(self._get_router)
+        return self._router
+
+    def _route_batch(self, texts: list[str]) -> list[tuple[str, int]]:
+        """Route a batch with the currently loaded router (runs in a worker thread)."""
+        router = self._router
+        if router is None:
+            return [("balanced", 0) for _ in texts]
+        return router.route_batch(texts)
+
     async def route(
         self,
         messages: list[dict],
@@ -207,8 +294,7 @@ class ContentRouter:
         """Execute routing and track cost impact."""
         from .metrics import routing_latency_seconds
 
-        start = time.monotonic()
-        router = self._get_router()
+        router = await self._ensure_router()
 
         # If router failed to load, return BALANCED
         if router is None:
@@ -217,9 +303,10 @@ class ContentRouter:
         # Build the prompt text for the router
         prompt_text = self._extract_prompt_text(messages, system)
 
-        # Use MFRouter's route_single() method for tier prediction
-        result = await asyncio.wait_for(
-            asyncio.to_thread(router.route_single, {"query": prompt_text}),
+        # Scored together with concurrent requests in one forward pass
+        start = time.monotonic()
+        model_name, token_count = await asyncio.wait_for(
+            self._batcher.submit(prompt_text),
             timeout=self._latency_budget_ms / 1000,
         )
 
@@ -227,13 +314,12 @@ class ContentRouter:
         routing_latency_seconds.observe(elapsed_ms / 1000)
 
         # Map model_name to ModelTier
-        model_name = result.get("model_name", "balanced")
         selected_tier = self._tier_from_model_name(model_name)
 
         # Track cost analytics
         if self._cost_tracking_enabled:
-            # Rough token estimate: words * 1.3
-            estimated_tokens = len(prompt_text.split()) * 1.3
+            # Token count of the routed text from the router's tokenizer
+            estimated_tokens = float(token_count)
             self._record_routing_cost_impact(
                 from_tier=ModelTier.BALANCED,
                 to_tier=selected_tier,
@@ -312,26 +398,28 @@ class ContentRouter:
         return "\n".join(parts)
 
     def _compute_cache_key(self, messages: list[dict], system: str) -> str:
-        """Compute cache key from message content."""
-        text = self._extract_prompt_text(messages, system)
-        return hashlib.sha256(text.encode()).hexdigest()[:16]
+        """Compute cache key from message content, ignoring case and whitespace."""
+        text = " ".join(self._extract_prompt_text(messages, system).lower().split())
+        return hashlib.sha256(text.encode()).hexdigest()[:32]
 
     def _get_cached(self, key: str) -> ModelTier | None:
         """Get cached routing decision if still valid."""
-        if key in self._cache:
-            tier, ts = self._cache[key]
-            if time.time() - ts < CACHE_TTL:
-                return tier
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        tier, ts = entry
+        if time.time() - ts >= CACHE_TTL:
             del self._cache[key]
-        return None
+            return None
+        self._cache.move_to_end(key)
+        return tier
 
     def _cache_result(self, key: str, tier: ModelTier):
-        """Cache a routing decision."""
-        # Evict old entries if cache too large
-        if len(self._cache) > 1000:
-            cutoff = time.time() - CACHE_TTL
-            self._cache = {k: v for k, v in self._cache.items() if v[1] > cutoff}
+        """Cache a routing decision, evicting the least recently used past the limit."""
         self._cache[key] = (tier, time.time())
+        self._cache.move_to_end(key)
+        while len(self._cache) > CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
 
     async def set_enabled(self, enabled: bool):
         """Enable/disable the router (persists to Redis if available)."""
@@ -372,9 +460,9 @@ class ContentRouter:
             self._cost_tracking_enabled = cost_tracking_enabled
 
     def reload_router(self):
-        """Force reload of the MFRouter model."""
+        """Force reload of the exported router on the next request."""
         self._router = None
-        logger.info("MFRouter marked for reload on next request")
+        logger.info("Router bundle marked for reload on next request")
 
 
 # Global singleton
@@ -0,0 +1,706 @@
+"""
+Async Docker Engine API client.
+
+Talks HTTP/1.1 directly to the Docker daemon over its unix socket (or a
+plain TCP ``DOCKER_HOST``) instead of spawning a ``docker`` CLI process
+per call. Connections are kept alive and reused, log/stats/pull endpoints
+are consumed as chunked streams, and multi-container lookups are issued
+concurrently over the pool.
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+from urllib.parse import quote, urlencode, urlparse
+
+from .exceptions import APIError
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_SOCKET_PATH = "/var/run/docker.sock"
+
+# Reused stats samples older than this are resampled for CPU percentages
+STATS_SAMPLE_MAX_AGE = 60.0
+
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def _since_timestamp(since: str | int | None) -> int | None:
+    """Convert CLI-style ``since`` values (``10m``, ``1h``, ISO time) to unix seconds."""
+    if since is None or isinstance(since, int):
+        return since
+    value = since.strip()
+    if value.isdigit():
+        return int(value)
+    unit = _DURATION_UNITS.get(value[-1:])
+    if unit and value[:-1].replace(".", "", 1).isdigit():
+        return int(time.time() - float(value[:-1]) * unit)
+    return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp())
+
+
+class DockerAPIError(APIError):
+    """Error response from the Docker Engine API."""
+
+    error_code = "DOCKER_API_ERROR"
+
+    def __init__(self, message: str, *, docker_status: int = 500) -> None:
+        super().__init__(message, context={"docker_status": docker_status})
+        self.docker_status = docker_status
+
+
+@dataclass
+class DockerResponse:
+    """A fully read Docker API response."""
+
+    status: int
+    headers: dict[str, str]
+    body: bytes
+
+    def json(self) -> Any:
+        return json.loads(self.body) if self.body else None
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            try:
+                message = (self.json() or {}).get("message", "")
+            except (json.JSONDecodeError, AttributeError):
+                message = self.body.decode(errors="replace")
+            raise DockerAPIError(message or f"HTTP {self.status}", docker_status=self.status)
+
+
+@dataclass
+class _Connection:
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+@dataclass
+class _StatsSample:
+    taken_at: float
+    stats: dict[str, Any] = field(default_factory=dict)
+
+
+class DockerClient:
+    """
+    Minimal async Docker Engine API client with connection reuse.
+
+    Usage:
+        client = get_docker_client()
+        containers = await client.list_containers(all=True)
+        async for line in client.stream_logs("ai-api", tail=100, follow=True):
+            ...
+    """
+
+    def __init__(
+        self,
+        docker_host: str | None = None,
+        max_connections: int = 16,
+        timeout: float = 30.0,
+    ) -> None:
+        host = docker_host or os.environ.get("DOCKER_HOST") or f"unix://{DEFAULT_SOCKET_PATH}"
+        parsed = urlparse(host)
+        if parsed.scheme == "unix":
+            self._socket_path: str | None = parsed.path
+            self._tcp_address: tuple[str, int] | None = None
+        elif parsed.scheme in ("tcp", "http"):
+            self._socket_path = None
+            self._tcp_address = (parsed.hostname or "localhost", parsed.port or 2375)
+        else:
+            raise ValueError(f"Unsupported DOCKER_HOST: {host}")
+
+        self._timeout = timeout
+        self._idle: list[_Connection] = []
+        self._slots = asyncio.Semaphore(max_connections)
+        self._stats_samples: dict[str, _StatsSample] = {}
+
+    # ------------------------------------------------------------------
+    # Connection pool and HTTP/1.1 plumbing
+    # ------------------------------------------------------------------
+
+    async def _open(self) -> _Connection:
+        if self._socket_path is not None:
+            reader, writer = await asyncio.open_unix_connection(self._socket_path)
+        else:
+            assert self._tcp_address is not None
+            reader, writer = await asyncio.open_connection(*self._tcp_address)
+        return _Connection(reader, writer)
+
+    async def _acquire(self) -> _Connection:
+        await self._slots.acquire()
+        while self._idle:
+            conn = self._idle.pop()
+            if not conn.writer.is_closing() and not conn.reader.at_eof():
+                return conn
+            conn.close()
+        try:
+            return await self._open()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _release(self, conn: _Connection, reusable: bool) -> None:
+        if reusable and not conn.writer.is_closing():
+            self._idle.append(conn)
+        else:
+            conn.close()
+        self._slots.release()
+
+    async def close(self) -> None:
+        """Close all pooled connections."""
+        while self._idle:
+            self._idle.pop().close()
+
+    @staticmethod
+    def _build_path(path: str, params: dict[str, Any] | None) -> str:
+        if not params:
+            return path
+        clean: dict[str, str] = {}
+        for key, value in params.items():
+            if value is None:
+                continue
+            if isinstance(value, bool):
+                clean[key] = "1" if value else "0"
+            elif isinstance(value, (dict, list)):
+                clean[key] = json.dumps(value)
+            else:
+                clean[key] = str(value)
+        return f"{path}?{urlencode(clean)}" if clean else path
+
+    async def _send(
+        self,
+        conn: _Connection,
+        method: str,
+        path: str,
+        body: Any = None,
+    ) -> tuple[int, dict[str, str]]:
+        payload = b""
+        lines = [f"{method} {path} HTTP/1.1", "Host: docker", "User-Agent: ai-core-docker"]
+        if body is not None:
+            payload = json.dumps(body).encode()
+            lines.append("Content-Type: application/json")
+        lines.append(f"Content-Length: {len(payload)}")
+        conn.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + payload)
+        await conn.writer.drain()
+
+        status_line = await conn.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Docker daemon closed the connection")
+        parts = status_line.decode("latin-1").split(" ", 2)
+        status = int(parts[1])
+
+        headers: dict[str, str] = {}
+        while True:
+            line = await conn.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        return status, headers
+
+    @staticmethod
+    async def _iter_body(
+        conn: _Connection,
+        status: int,
+        headers: dict[str, str],
+    ) -> AsyncIterator[bytes]:
+        """Yield body chunks, honouring chunked and content-length framing."""
+        if status in (204, 304):
+            return
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size_line = await conn.reader.readline()
+                size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+                if size == 0:
+                    # Trailers end with an empty line
+                    while (await conn.reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    return
+                chunk = await conn.reader.readexactly(size)
+                await conn.reader.readexactly(2)
+                yield chunk
+        elif "content-length" in headers:
+            remaining = int(headers["content-length"])
+            while remaining > 0:
+                chunk = await conn.reader.read(min(remaining, 65536))
+                if not chunk:
+                    raise ConnectionResetError("Docker daemon closed the connection mid-body")
+                remaining -= len(chunk)
+                yield chunk
+        else:
+            # Hijacked/raw streams (e.g. exec start) run until the daemon closes
+            while chunk := await conn.reader.read(65536):
+                yield chunk
+
+    @staticmethod
+    def _reusable(status: int, headers: dict[str, str]) -> bool:
+        if headers.get("connection", "").lower() == "close":
+            return False
+        return status in (204, 304) or "content-length" in headers or (
+            headers.get("transfer-encoding", "").lower() == "chunked"
+        )
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None = None,
+        body: Any = None,
+        timeout: float | None = None,
+    ) -> DockerResponse:
+        """Issue a request and read the whole response body."""
+        full_path = self._build_path(path, params)
+        conn = await self._acquire()
+        reusable = False
+        try:
+            async def exchange() -> DockerResponse:
+                status, headers = await self._send(conn, method, full_path, body)
+                chunks = [chunk async for chunk in self._iter_body(conn, status, headers)]
+                return DockerResponse(status, headers, b"".join(chunks))
+
+            try:
+                response = await asyncio.wait_for(exchange(), timeout or self._timeout)
+            except (ConnectionResetError, asyncio.IncompleteReadError):
+                # A pooled keep-alive connection may have been closed by the daemon
+                conn.close()
+                conn = await self._open()
+                response = await asyncio.wait_for(exchange(), timeout or self._timeout)
+            reusable = self._reusable(response.status, response.headers)
+            return response
+        finally:
+            self._release(conn, reusable)
+
+    async def stream(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None = None,
+        body: Any = None,
+    ) -> AsyncIterator[bytes]:
+        """Issue a request and yield the response body as it arrives."""
+        full_path = self._build_path(path, params)
+        conn = await self._acquire()
+        finished = False
+        status = 0
+        headers: dict[str, str] = {}
+        try:
+            status, headers = await asyncio.wait_for(
+                self._send(conn, method, full_path, body), self._timeout
+            )
+            if status >= 400:
+                body_bytes = b"".join([c async for c in self._iter_body(conn, status, headers)])
+                finished = True
+                DockerResponse(status, headers, body_bytes).raise_for_status()
+            async for chunk in self._iter_body(conn, status, headers):
+                yield chunk
+            finished = True
+        finally:
+            # Abandoned streams leave unread data on the socket; don't reuse it
+            self._release(conn, finished and self._reusable(status, headers))
+
+    async def _json(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None = None,
+        body: Any = None,
+    ) -> Any:
+        response = await self.request(method, path, params, body)
+        response.raise_for_status()
+        return response.json()
+
+    # ------------------------------------------------------------------
+    # Containers
+    # ------------------------------------------------------------------
+
+    async def ping(self) -> bool:
+        try:
+            response = await self.request("GET", "/_ping", timeout=5)
+            return response.status == 200
+        except (OSError, asyncio.TimeoutError):
+            return False
+
+    async def list_containers(
+        self,
+        all: bool = False,
+        filters: dict[str, list[str]] | None = None,
+    ) -> list[dict[str, Any]]:
+        return await self._json(
+            "GET", "/containers/json", {"all": all, "filters": filters or None}
+        )
+
+    async def inspect_container(self, container: str) -> dict[str, Any]:
+        return await self._json("GET", f"/containers/{quote(container, safe='')}/json")
+
+    async def inspect_containers(self, containers: list[str]) -> dict[str, dict[str, Any] | None]:
+        """Inspect many containers concurrently; missing ones map to ``None``."""
+
+        async def one(name: str) -> dict[str, Any] | None:
+            try:
+                return await self.inspect_container(name)
+            except DockerAPIError as e:
+                if e.docker_status == 404:
+                    return None
+                raise
+
+        results = await asyncio.gather(*[one(c) for c in containers])
+        return dict(zip(containers, results, strict=True))
+
+    async def create_container(self, name: str, config: dict[str, Any]) -> dict[str, Any]:
+        return await self._json("POST", "/containers/create", {"name": name}, config)
+
+    async def start_container(self, container: str) -> None:
+        response = await self.request("POST", f"/containers/{quote(container, safe='')}/start")
+        # 304 means already started
+        if response.status != 304:
+            response.raise_for_status()
+
+    async def stop_container(self, container: str, timeout: int | None = None) -> None:
+        response = await self.request(
+            "POST",
+            f"/containers/{quote(container, safe='')}/stop",
+            {"t": timeout},
+            timeout=(timeout or 10) + self._timeout,
+        )
+        if response.status != 304:
+            response.raise_for_status()
+
+    async def restart_container(self, container: str, timeout: int | None = None) -> None:
+        response = await self.request(
+            "POST",
+            f"/containers/{quote(container, safe='')}/restart",
+            {"t": timeout},
+            timeout=(timeout or 10) + self._timeout,
+        )
+        response.raise_for_status()
+
+    async def remove_container(self, container: str, force: bool = False) -> None:
+        response = await self.request(
+            "DELETE", f"/containers/{quote(container, safe='')}", {"force": force}
+        )
+        response.raise_for_status()
+
+    # ------------------------------------------------------------------
+    # Logs
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _demux(buffer: bytearray) -> list[tuple[int, bytes]]:
+        """Pop complete ``(stream_type, payload)`` frames off a multiplexed buffer."""
+        frames: list[tuple[int, bytes]] = []
+        while len(buffer) >= 8:
+            size = int.from_bytes(buffer[4:8], "big")
+            if len(buffer) < 8 + size:
+                break
+            frames.append((buffer[0], bytes(buffer[8:8 + size])))
+            del buffer[:8 + size]
+        return frames
+
+    async def stream_logs(
+        self,
+        container: str,
+        tail: int | str = "all",
+        since: str | int | None = None,
+        follow: bool = False,
+        timestamps: bool = False,
+    ) -> AsyncIterator[tuple[str, str]]:
+        """Yield ``(stream, text)`` log chunks, where stream is stdout/stderr."""
+        names = {0: "stdin", 1: "stdout", 2: "stderr"}
+        buffer = bytearray()
+        # TTY containers send raw bytes instead of 8-byte framed chunks
+        multiplexed: bool | None = None
+        async for chunk in self.stream(
+            "GET",
+            f"/containers/{quote(container, safe='')}/logs",
+            {
+                "stdout": True,
+                "stderr": True,
+                "tail": tail,
+                "since": _since_timestamp(since),
+                "follow": follow,
+                "timestamps": timestamps,
+            },
+        ):
+            if multiplexed is False:
+                yield "stdout", chunk.decode(errors="replace")
+                continue
+            buffer.extend(chunk)
+            if multiplexed is None:
+                if len(buffer) < 8:
+                    continue
+                multiplexed = buffer[0] in names and buffer[1:4] == b"\x00\x00\x00"
+                if not multiplexed:
+                    yield "stdout", bytes(buffer).decode(errors="replace")
+                    buffer.clear()
+                    continue
+            for stream_type, data in self._demux(buffer):
+                yield names.get(stream_type, "stdout"), data.decode(errors="replace")
+        if buffer:
+            yield "stdout", bytes(buffer).decode(errors="replace")
+
+    async def logs(
+        self,
+        container: str,
+        tail: int | str = 100,
+        since: str | int | None = None,
+    ) -> tuple[str, str]:
+        """Return ``(stdout, stderr)`` for the last ``tail`` log lines."""
+        stdout: list[str] = []
+        stderr: list[str] = []
+        async for stream_name, text in self.stream_logs(container, tail=tail, since=since):
+            (stderr if stream_name == "stderr" else stdout).append(text)
+        return "".join(stdout), "".join(stderr)
+
+    # ------------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------------
+
+    async def stream_stats(self, container: str) -> AsyncIterator[dict[str, Any]]:
+        """Yield stats samples (roughly one per second) until the caller stops."""
+        buffer = b""
+        async for chunk in self.stream(
+            "GET", f"/containers/{quote(container, safe='')}/stats", {"stream": True}
+        ):
+            buffer += chunk
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                if line.strip():
+                    yield json.loads(line)
+
+    async def stats(self, container: str) -> dict[str, Any]:
+        """
+        Get one stats sample with a meaningful CPU delta.
+
+        Uses the fast ``one-shot`` endpoint and computes CPU usage against
+        this client's previous sample for the container. Only when no
+        recent sample exists does it read two frames from the streaming
+        endpoint (about one second).
+        """
+        previous = self._stats_samples.get(container)
+        now = time.monotonic()
+        if previous and now - previous.taken_at < STATS_SAMPLE_MAX_AGE:
+            sample = await self._json(
+                "GET",
+                f"/containers/{quote(container, safe='')}/stats",
+                {"stream": False, "one-shot": True},
+            )
+            sample["precpu_stats"] = previous.stats.get("cpu_stats", {})
+        else:
+            sample = {}
+            frames = 0
+            stream = self.stream_stats(container)
+            try:
+                async for frame in stream:
+                    sample = frame
+                    frames += 1
+                    if frames >= 2:
+                        break
+            finally:
+                await stream.aclose()  # type: ignore[attr-defined]
+        self._stats_samples[container] = _StatsSample(now, sample)
+        return sample
+
+    async def stats_many(self, containers: list[str]) -> dict[str, dict[str, Any] | None]:
+        """Sample stats for many containers concurrently."""
+
+        async def one(name: str) -> dict[str, Any] | None:
+            try:
+                return await self.stats(name)
+            except DockerAPIError:
+                return None
+
+        results = await asyncio.gather(*[one(c) for c in containers])
+        return dict(zip(containers, results, strict=True))
+
+    # ------------------------------------------------------------------
+    # Exec
+    # ------------------------------------------------------------------
+
+    async def exec(
+        self,
+        container: str,
+        cmd: list[str],
+        user: str | None = None,
+        workdir: str | None = None,
+        env: dict[str, str] | None = None,
+        timeout: float | None = None,
+    ) -> tuple[int, str, str]:
+        """Run a command in a container and return ``(exit_code, stdout, stderr)``."""
+        config: dict[str, Any] = {
+            "Cmd": cmd,
+            "AttachStdout": True,
+            "AttachStderr": True,
+            "Tty": False,
+        }
+        if user:
+            config["User"] = user
+        if workdir:
+            config["WorkingDir"] = workdir
+        if env:
+            config["Env"] = [f"{k}={v}" for k, v in env.items()]
+
+        created = await self._json(
+            "POST", f"/containers/{quote(container, safe='')}/exec", body=config
+        )
+        exec_id = created["Id"]
+
+        stdout: list[bytes] = []
+        stderr: list[bytes] = []
+        buffer = bytearray()
+
+        output = self.stream("POST", f"/exec/{exec_id}/start", body={"Detach": False, "Tty": False})
+
+        async def collect() -> None:
+            async for chunk in output:
+                buffer.extend(chunk)
+                for stream_type, data in self._demux(buffer):
+                    (stderr if stream_type == 2 else stdout).append(data)
+
+        try:
+            await asyncio.wait_for(collect(), timeout or self._timeout)
+        finally:
+            # Give the connection back now rather than when the generator is collected
+            await output.aclose()  # type: ignore[attr-defined]
+        info = await self._json("GET", f"/exec/{exec_id}/json")
+        return (
+            info.get("ExitCode") or 0,
+            b"".join(stdout).decode(errors="replace"),
+            b"".join(stderr).decode(errors="replace"),
+        )
+
+    # ------------------------------------------------------------------
+    # Images and networks
+    # ------------------------------------------------------------------
+
+    async def list_images(
+        self,
+        all: bool = False,
+        filters: dict[str, list[str]] | None = None,
+    ) -> list[dict[str, Any]]:
+        return await self._json("GET", "/images/json", {"all": all, "filters": filters or None})
+
+    async def image_exists(self, image: str) -> bool:
+        response = await self.request("GET", f"/images/{quote(image, safe='')}/json")
+        if response.status == 404:
+            return False
+        response.raise_for_status()
+        return True
+
+    async def pull_image(self, image: str) -> AsyncIterator[dict[str, Any]]:
+        """Pull an image, yielding progress events as they stream in."""
+        if "@" in image:
+            # Digest references (repo@sha256:...) pass the digest as the tag
+            name, _, tag = image.partition("@")
+        elif ":" in image.split("/")[-1]:
+            name, _, tag = image.rpartition(":")
+        else:
+            name, tag = image, ""
+        buffer = b""
+        async for chunk in self.stream(
+            "POST", "/images/create", {"fromImage": name, "tag": tag or "latest"}
+        ):
+            buffer += chunk
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                if line.strip():
+                    event = json.loads(line)
+                    if "error" in event:
+                        raise DockerAPIError(event["error"])
+                    yield event
+
+    async def network_exists(self, network: str) -> bool:
+        response = await self.request("GET", f"/networks/{quote(network, safe='')}")
+        if response.status == 404:
+            return False
+        response.raise_for_status()
+        return True
+
+    async def create_network(self, network: str) -> None:
+        await self._json("POST", "/networks/create", body={"Name": network, "CheckDuplicate": True})
+
+
+# ----------------------------------------------------------------------
+# Formatting helpers shared by CLI-compatible tool output
+# ----------------------------------------------------------------------
+
+
+def format_ports(ports: list[dict[str, Any]]) -> str:
+    """Format container port bindings the way ``docker ps`` does."""
+    formatted = []
+    for port in ports or []:
+        private = f"{port.get('PrivatePort')}/{port.get('Type', 'tcp')}"
+        if port.get("PublicPort"):
+            formatted.append(f"{port.get('IP', '0.0.0.0')}:{port['PublicPort']}->{private}")
+        else:
+            formatted.append(private)
+    return ", ".join(dict.fromkeys(formatted))
+
+
+def format_bytes(value: float, binary: bool = True) -> str:
+    """Human-readable byte count (``MiB`` style when ``binary``, ``MB`` otherwise)."""
+    base = 1024.0 if binary else 1000.0
+    units = ["B", "KiB", "MiB", "GiB", "TiB"] if binary else ["B", "kB", "MB", "GB", "TB"]
+    for unit in units:
+        if abs(value) < base or unit == units[-1]:
+            return f"{value:.2f}{unit}" if unit != "B" else f"{int(value)}{unit}"
+        value /= base
+    return f"{value:.2f}{units[-1]}"
+
+
+def summarize_stats(name: str, stats: dict[str, Any]) -> dict[str, Any]:
+    """Convert a raw stats sample into ``docker stats``-style fields."""
+    cpu = stats.get("cpu_stats", {})
+    precpu = stats.get("precpu_stats", {})
+    cpu_delta = cpu.get("cpu_usage", {}).get("total_usage", 0) - precpu.get(
+        "cpu_usage", {}
+    ).get("total_usage", 0)
+    system_delta = cpu.get("system_cpu_usage", 0) - precpu.get("system_cpu_usage", 0)
+    online = cpu.get("online_cpus") or len(cpu.get("cpu_usage", {}).get("percpu_usage") or []) or 1
+    cpu_percent = (cpu_delta / system_delta) * online * 100 if system_delta > 0 else 0.0
+
+    memory = stats.get("memory_stats", {})
+    mem_stats = memory.get("stats", {})
+    # Match the CLI: exclude page cache (cgroup v2 inactive_file, v1 cache)
+    used = memory.get("usage", 0) - mem_stats.get("inactive_file", mem_stats.get("cache", 0))
+    limit = memory.get("limit", 0)
+    mem_percent = (used / limit * 100) if limit else 0.0
+
+    rx = sum(n.get("rx_bytes", 0) for n in (stats.get("networks") or {}).values())
+    tx = sum(n.get("tx_bytes", 0) for n in (stats.get("networks") or {}).values())
+
+    read = write = 0
+    for entry in stats.get("blkio_stats", {}).get("io_service_bytes_recursive") or []:
+        op = entry.get("op", "").lower()
+        if op == "read":
+            read += entry.get("value", 0)
+        elif op == "write":
+            write += entry.get("value", 0)
+
+    return {
+        "name": name,
+        "cpu": f"{cpu_percent:.2f}%",
+        "memory": f"{format_bytes(used)} / {format_bytes(limit)}",
+        "mem_percent": f"{mem_percent:.2f}%",
+        "net_io": f"{format_bytes(rx, binary=False)} / {format_bytes(tx, binary=False)}",
+        "block_io": f"{format_bytes(read, binary=False)} / {format_bytes(write, binary=False)}",
+        "pids": str(stats.get("pids_stats", {}).get("current", 0)),
+    }
+
+
+_docker_client: DockerClient | None = None
+
+
+def get_docker_client() -> DockerClient:
+    """Get the process-wide Docker client."""
+    global _docker_client
+    if _docker_client is None:
+        _docker_client = DockerClient()
+    return _docker_client
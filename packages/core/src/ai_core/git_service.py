@@ -0,0 +1,505 @@
+"""
+Async git metadata service with per-repository caching.
+
+Workspace routes and agents ask the same few questions of a repository
+over and over (current branch, status, log, branch list, file at a ref),
+usually while the UI is polling. ``GitRepository`` answers them with:
+
+- results cached per command and keyed on a stamp of ``.git`` state
+  (HEAD, index, refs, packed-refs, FETCH_HEAD), so a commit, checkout or
+  fetch invalidates them without any explicit bookkeeping; commands run
+  through ``run()`` that may write drop the whole cache
+- working-tree dependent results (status, diff) additionally expired by
+  ``invalidate()`` (fed by file watcher events) or a short TTL when no
+  watcher is attached
+- concurrent callers asking the same question sharing one git invocation
+- a persistent ``git cat-file --batch`` process for reading blobs at refs
+- one ``git status --porcelain=v2 -z --branch`` call for branch, upstream,
+  ahead/behind and file status together
+- the current branch read straight from ``HEAD`` without a subprocess
+"""
+
+import asyncio
+import contextlib
+import os
+import subprocess
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+# Working-tree results are trusted this long without watcher events
+WORKTREE_TTL = 2.0
+# Upper bound when a watcher is attached (missed events, editor atomic saves)
+WATCHED_WORKTREE_TTL = 30.0
+# Upper bound for results keyed only on .git state (external ref changes)
+METADATA_TTL = 30.0
+
+# Outputs larger than this are returned but not cached
+MAX_CACHED_OUTPUT = 1024 * 1024
+# Distinct cached results kept per repository (least recently used dropped)
+MAX_CACHED_RESULTS = 256
+
+# Repositories kept open at once
+MAX_REPOSITORIES = 64
+
+CAT_FILE_TIMEOUT = 30.0
+
+# Subcommands that never change the repository or working tree
+READ_ONLY_COMMANDS = {
+    "status", "log", "diff", "show", "rev-parse", "rev-list", "cat-file",
+    "ls-files", "ls-tree", "merge-base", "for-each-ref", "describe",
+    "shortlog", "blame", "grep", "show-ref", "name-rev",
+}
+
+_Stamp = tuple[Any, ...]
+
+
+@dataclass
+class GitStatusEntry:
+    """A changed path from ``git status``."""
+
+    path: str
+    # Porcelain letters; " " for unmodified
+    index_status: str
+    worktree_status: str
+    orig_path: str | None = None
+    unmerged: bool = False
+
+
+@dataclass
+class GitStatus:
+    """Parsed ``git status --porcelain=v2 --branch`` output."""
+
+    branch: str | None = None
+    commit: str | None = None
+    upstream: str | None = None
+    ahead: int = 0
+    behind: int = 0
+    has_upstream: bool = False
+    entries: list[GitStatusEntry] = field(default_factory=list)
+    untracked: list[str] = field(default_factory=list)
+
+    @property
+    def is_clean(self) -> bool:
+        return not self.entries and not self.untracked
+
+
+def parse_status_v2(output: str) -> GitStatus:
+    """Parse NUL-separated ``git status --porcelain=v2 -z --branch`` output."""
+    status = GitStatus()
+    records = output.split("\0")
+    i = 0
+    while i < len(records):
+        record = records[i]
+        i += 1
+        if not record:
+            continue
+
+        if record.startswith("# "):
+            key, _, value = record[2:].partition(" ")
+            if key == "branch.oid":
+                status.commit = None if value == "(initial)" else value
+            elif key == "branch.head":
+                # Match `rev-parse --abbrev-ref HEAD` for detached heads
+                status.branch = "HEAD" if value == "(detached)" else value
+            elif key == "branch.upstream":
+                status.upstream = value
+            elif key == "branch.ab":
+                ahead, _, behind = value.partition(" ")
+                status.ahead = int(ahead.lstrip("+") or 0)
+                status.behind = int(behind.lstrip("-") or 0)
+                status.has_upstream = True
+            continue
+
+        kind = record[0]
+        if kind == "?":
+            status.untracked.append(record[2:])
+        elif kind == "1":
+            fields = record.split(" ", 8)
+            xy = fields[1].replace(".", " ")
+            status.entries.append(GitStatusEntry(fields[8], xy[0], xy[1]))
+        elif kind == "2":
+            fields = record.split(" ", 9)
+            xy = fields[1].replace(".", " ")
+            # With -z the original path follows as its own record
+            orig_path = records[i] if i < len(records) else None
+            i += 1
+            status.entries.append(GitStatusEntry(fields[9], xy[0], xy[1], orig_path=orig_path))
+        elif kind == "u":
+            fields = record.split(" ", 10)
+            xy = fields[1].replace(".", " ")
+            status.entries.append(GitStatusEntry(fields[10], xy[0], xy[1], unmerged=True))
+    return status
+
+
+def _stat_key(path: str) -> tuple[int, int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _tree_stat_key(path: str) -> tuple[Any, ...]:
+    """Stat keys of a directory and every directory below it.
+
+    Git updates loose refs by renaming a lock file into place, so any ref
+    created, moved or deleted touches the mtime of its parent directory.
+    """
+    keys = []
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        keys.append((current, _stat_key(current)))
+        try:
+            with os.scandir(current) as it:
+                stack.extend(entry.path for entry in it if entry.is_dir(follow_symlinks=False))
+        except OSError:
+            pass
+    return tuple(sorted(keys))
+
+
+@dataclass
+class _CacheEntry:
+    stamp: _Stamp
+    generation: int
+    created: float
+    value: Any
+
+
+class _CatFileWorker:
+    """A long-running ``git cat-file --batch`` process for one repository."""
+
+    def __init__(self, root_path: str):
+        self.root_path = root_path
+        self._proc: asyncio.subprocess.Process | None = None
+        self._lock = asyncio.Lock()
+
+    async def _ensure_started(self) -> asyncio.subprocess.Process:
+        if self._proc is None or self._proc.returncode is not None:
+            self._proc = await asyncio.create_subprocess_exec(
+                "git", "cat-file", "--batch",
+                cwd=self.root_path,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+        return self._proc
+
+    async def read(self, spec: str) -> tuple[str, bytes] | None:
+        """Return (object type, content) for a revision spec, or None if missing."""
+        if "\n" in spec or "\r" in spec:
+            raise ValueError("Object spec must be a single line")
+
+        async with self._lock:
+            try:
+                return await asyncio.wait_for(self._read(spec), CAT_FILE_TIMEOUT)
+            except (TimeoutError, OSError, ValueError, asyncio.IncompleteReadError) as e:
+                # The stream is out of sync now; start over next time
+                logger.warning("git cat-file worker failed", root_path=self.root_path, error=str(e))
+                await self.close()
+                raise
+
+    async def _read(self, spec: str) -> tuple[str, bytes] | None:
+        proc = await self._ensure_started()
+        assert proc.stdin is not None and proc.stdout is not None
+        proc.stdin.write(spec.encode("utf-8") + b"\n")
+        await proc.stdin.drain()
+
+        header = (await proc.stdout.readline()).decode("utf-8", errors="replace").rstrip("\n")
+        if not header:
+            raise ValueError("git cat-file exited")
+        parts = header.rsplit(" ", 2)
+        if len(parts) != 3 or not parts[2].isdigit():
+            # "<spec> missing" / "<spec> ambiguous"
+            return None
+
+        _, obj_type, size = parts
+        data = await proc.stdout.readexactly(int(size) + 1)
+        return obj_type, data[:-1]
+
+    async def close(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None or proc.returncode is not None:
+            return
+        try:
+            if proc.stdin is not None:
+                proc.stdin.close()
+            await asyncio.wait_for(proc.wait(), 2.0)
+        except (TimeoutError, OSError):
+            proc.kill()
+            await proc.wait()
+
+
+class GitRepository:
+    """Cached, coalescing git access for one working tree."""
+
+    def __init__(self, root_path: str):
+        self.root_path = os.path.realpath(root_path)
+        self.git_dir, self.common_dir = self._resolve_git_dirs()
+        # Set when a file watcher feeds invalidate(); allows longer status caching
+        self.watched = False
+        self._generation = 0
+        # Bumped when run() may have written; results computed across it are dropped
+        self._writes = 0
+        self._cache: OrderedDict[tuple[Any, ...], _CacheEntry] = OrderedDict()
+        self._inflight: dict[tuple[Any, ...], asyncio.Future] = {}
+        self._cat_file = _CatFileWorker(self.root_path)
+
+        self.invocations = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+
+    def _resolve_git_dirs(self) -> tuple[str, str]:
+        git_path = os.path.join(self.root_path, ".git")
+        git_dir = git_path
+        if os.path.isfile(git_path):
+            # Linked worktree or submodule: ".git" holds "gitdir: <path>"
+            try:
+                with open(git_path, encoding="utf-8") as f:
+                    line = f.readline().strip()
+                if line.startswith("gitdir:"):
+                    git_dir = os.path.normpath(os.path.join(self.root_path, line[7:].strip()))
+            except OSError:
+                pass
+
+        common_dir = git_dir
+        try:
+            with open(os.path.join(git_dir, "commondir"), encoding="utf-8") as f:
+                common_dir = os.path.normpath(os.path.join(git_dir, f.read().strip()))
+        except OSError:
+            pass
+        return git_dir, common_dir
+
+    @property
+    def is_repository(self) -> bool:
+        return os.path.isfile(os.path.join(self.git_dir, "HEAD"))
+
+    def _head_ref(self) -> str | None:
+        try:
+            with open(os.path.join(self.git_dir, "HEAD"), encoding="utf-8") as f:
+                head = f.read().strip()
+        except OSError:
+            return None
+        if head.startswith("ref:"):
+            return head[4:].strip()
+        return None
+
+    def stamp(self) -> _Stamp:
+        """Cheap fingerprint of .git state that changes on commit, checkout, fetch, etc."""
+        ref = self._head_ref()
+        return (
+            _stat_key(os.path.join(self.git_dir, "HEAD")),
+            _stat_key(os.path.join(self.git_dir, "index")),
+            _stat_key(os.path.join(self.git_dir, "MERGE_HEAD")),
+            _stat_key(os.path.join(self.common_dir, "packed-refs")),
+            _stat_key(os.path.join(self.common_dir, "FETCH_HEAD")),
+            _tree_stat_key(os.path.join(self.common_dir, "refs", "heads")),
+            _tree_stat_key(os.path.join(self.common_dir, "refs", "remotes")),
+            _tree_stat_key(os.path.join(self.common_dir, "refs", "tags")),
+            _stat_key(os.path.join(self.common_dir, ref)) if ref else None,
+        )
+
+    def invalidate(self) -> None:
+        """Drop working-tree dependent results (call on file changes)."""
+        self._generation += 1
+
+    def _is_fresh(self, entry: _CacheEntry, stamp: _Stamp, worktree: bool) -> bool:
+        if entry.stamp != stamp:
+            return False
+        age = time.monotonic() - entry.created
+        if not worktree:
+            return age < METADATA_TTL
+        if entry.generation != self._generation:
+            return False
+        return age < (WATCHED_WORKTREE_TTL if self.watched else WORKTREE_TTL)
+
+    async def _cached(self, key: tuple[Any, ...], worktree: bool, compute) -> Any:
+        stamp = self.stamp()
+        entry = self._cache.get(key)
+        if entry is not None and self._is_fresh(entry, stamp, worktree):
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return entry.value
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._compute(key, stamp, compute))
+            # Nobody may be left waiting if every caller was cancelled
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[key] = task
+        else:
+            self.coalesced += 1
+        # Shielded so one cancelled caller doesn't cancel the others' result
+        return await asyncio.shield(task)
+
+    async def _compute(self, key: tuple[Any, ...], stamp: _Stamp, compute) -> Any:
+        generation = self._generation
+        writes = self._writes
+        try:
+            value = await compute()
+        finally:
+            self._inflight.pop(key, None)
+
+        cacheable = writes == self._writes and (
+            not isinstance(value, subprocess.CompletedProcess)
+            or len(value.stdout) + len(value.stderr) <= MAX_CACHED_OUTPUT
+        )
+        if cacheable:
+            self._cache[key] = _CacheEntry(stamp, generation, time.monotonic(), value)
+            self._cache.move_to_end(key)
+            while len(self._cache) > MAX_CACHED_RESULTS:
+                self._cache.popitem(last=False)
+        return value
+
+    async def _exec(self, args: tuple[str, ...], read_only: bool) -> subprocess.CompletedProcess:
+        cmd = ["git", *args]
+        env = None
+        if read_only:
+            # Don't take index.lock just to refresh stat info while polling
+            env = {**os.environ, "GIT_OPTIONAL_LOCKS": "0"}
+        self.invocations += 1
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            cwd=self.root_path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=env,
+        )
+        stdout, stderr = await proc.communicate()
+        return subprocess.CompletedProcess(
+            args=cmd,
+            returncode=proc.returncode or 0,
+            stdout=stdout.decode("utf-8", errors="replace"),
+            stderr=stderr.decode("utf-8", errors="replace"),
+        )
+
+    @staticmethod
+    def _check(result: subprocess.CompletedProcess, check: bool) -> subprocess.CompletedProcess:
+        if check and result.returncode != 0:
+            raise subprocess.CalledProcessError(
+                result.returncode, result.args, result.stdout, result.stderr
+            )
+        return result
+
+    async def run(self, *args: str, check: bool = True) -> subprocess.CompletedProcess:
+        """Run any git command uncached; commands that may write drop the cache."""
+        read_only = bool(args) and args[0] in READ_ONLY_COMMANDS
+        try:
+            result = await self._exec(args, read_only)
+        finally:
+            if not read_only:
+                # The stamp misses some writes (config, upstream tracking, a
+                # ref rewritten within one mtime tick), so don't rely on it
+                self._writes += 1
+                self._cache.clear()
+                self.invalidate()
+        return self._check(result, check)
+
+    async def query(
+        self,
+        *args: str,
+        worktree: bool = False,
+        check: bool = True,
+    ) -> subprocess.CompletedProcess:
+        """
+        Run a read-only git command through the cache.
+
+        ``worktree`` marks results that depend on working-tree files (status,
+        diff against the worktree) rather than only on refs and the index.
+        """
+        result = await self._cached(
+            ("query", worktree, *args), worktree, lambda: self._exec(args, True)
+        )
+        return self._check(result, check)
+
+    async def status(self) -> GitStatus:
+        """Branch, upstream tracking and changed files in one git invocation."""
+        async def compute() -> GitStatus:
+            result = await self._exec(
+                ("status", "--porcelain=v2", "-z", "--branch", "--untracked-files=normal"),
+                read_only=True,
+            )
+            self._check(result, True)
+            return parse_status_v2(result.stdout)
+
+        return await self._cached(("status",), True, compute)
+
+    async def current_branch(self) -> str | None:
+        """Current branch name, "HEAD" when detached, None outside a repository."""
+        ref = self._head_ref()
+        if ref is not None:
+            return ref[len("refs/heads/"):] if ref.startswith("refs/heads/") else ref
+        if not self.is_repository:
+            return None
+        # Detached HEAD holds a commit id
+        return "HEAD"
+
+    async def read_object(self, spec: str) -> bytes | None:
+        """Content of an object such as ``HEAD:path/to/file``, or None if missing."""
+        result = await self._cat_file.read(spec)
+        if result is None:
+            return None
+        return result[1]
+
+    async def close(self) -> None:
+        await self._cat_file.close()
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "root_path": self.root_path,
+            "invocations": self.invocations,
+            "cache_hits": self.cache_hits,
+            "coalesced": self.coalesced,
+            "cached_results": len(self._cache),
+        }
+
+
+class GitService:
+    """Keeps a GitRepository per recently used working tree."""
+
+    def __init__(self, max_repositories: int = MAX_REPOSITORIES):
+        self.max_repositories = max_repositories
+        self._repos: OrderedDict[str, GitRepository] = OrderedDict()
+
+    def get(self, root_path: str) -> GitRepository:
+        key = os.path.realpath(root_path)
+        repo = self._repos.get(key)
+        if repo is None:
+            repo = GitRepository(key)
+            self._repos[key] = repo
+            while len(self._repos) > self.max_repositories:
+                _, evicted = self._repos.popitem(last=False)
+                with contextlib.suppress(RuntimeError):
+                    asyncio.get_running_loop().create_task(evicted.close())
+        else:
+            self._repos.move_to_end(key)
+        return repo
+
+    def invalidate(self, root_path: str) -> None:
+        """Mark a working tree as changed, if it is open."""
+        repo = self._repos.get(os.path.realpath(root_path))
+        if repo is not None:
+            repo.invalidate()
+
+    async def close_all(self) -> None:
+        for repo in list(self._repos.values()):
+            await repo.close()
+        self._repos.clear()
+
+
+# Global instance
+_git_service: GitService | None = None
+
+
+def get_git_service() -> GitService:
+    """Get or create the global git service."""
+    global _git_service
+    if _git_service is None:
+        _git_service = GitService()
+    return _git_service
@@ -7,6 +7,7 @@ Provides pre-defined metrics for monitoring:
 - Database connection metrics
 - External API call metrics
 - Memory system metrics
+- WebSocket delivery metrics
 """
 
 from prometheus_client import Counter, Gauge, Histogram, Info
@@ -202,6 +203,33 @@ message_queue_length = Gauge(
     ["channel"],
 )
 
+# =============================================================================
+# WebSocket Metrics
+# =============================================================================
+
+websocket_connections_active = Gauge(
+    "websocket_connections_active",
+    "Number of open chat WebSocket connections",
+)
+
+websocket_send_queue_depth = Histogram(
+    "websocket_send_queue_depth",
+    "Outbound queue depth of a connection when a frame is enqueued",
+    buckets=(0, 1, 2, 4, 8, 16, 32, 64, 128, 256, 512),
+)
+
+websocket_frames_dropped_total = Counter(
+    "websocket_frames_dropped_total",
+    "Outbound frames dropped or merged before delivery",
+    ["reason"],
+)
+
+websocket_slow_disconnects_total = Counter(
+    "websocket_slow_disconnects_total",
+    "Connections closed because the client could not keep up",
+    ["reason"],
+)
+
 # =============================================================================
 # PAI Algorithm Metrics
 # =============================================================================
@@ -0,0 +1,253 @@
+"""
+Single-pass keyword classification shared by the request classifiers.
+
+The supervisor's TaskRouter, the task complexity classifier and the prompt
+tier classifier each look for lists of keywords in incoming text. Their
+keyword sets are registered here as named categories and compiled into
+one Aho-Corasick automaton (pyahocorasick, from the ``speedups`` extra,
+when installed, otherwise a pure-Python one), so a text is scanned once
+however many keywords and consumers there are:
+
+    classifier = get_pattern_classifier()
+    classifier.register("task.direct", ["npm run", "git push", ...])
+    matches = classifier.scan("please git push the branch")
+    matches.counts["task.direct"]   # hits in the category
+    matches.first("task.direct")    # first matching keyword, in declaration order
+
+Text is lowercased before matching, so keywords and regexes are written in
+lowercase. Keywords match anywhere in the text, overlapping included, as
+``keyword in text`` would. Regexes are run one at a time after the
+automaton and count their matches as ``re.finditer`` would, whatever the
+other regexes match.
+
+Scans are memoized per text in a small LRU, so consumers classifying the
+same message share the result.
+"""
+
+import re
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+# Scans remembered per classifier
+MEMO_MAX_ENTRIES = 2048
+# Longer texts (e.g. serialized task payloads) are scanned but not memoized
+MEMO_MAX_TEXT_LENGTH = 8192
+
+
+class _Automaton:
+    """
+    Pure-Python Aho-Corasick automaton, used when pyahocorasick isn't
+    installed. Same interface: ``iter`` yields (end index, value) for
+    every occurrence of every keyword.
+    """
+
+    def __init__(self) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[Any]] = [[]]
+
+    def add_word(self, key: str, value: Any) -> None:
+        state = 0
+        for char in key:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                next_state = len(self._goto) - 1
+                self._goto[state][char] = next_state
+            state = next_state
+        self._out[state].append(value)
+
+    def make_automaton(self) -> None:
+        # Breadth first, so a state's failure link is complete before its children's
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def iter(self, text: str) -> Iterator[tuple[int, Any]]:
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for value in out[state]:
+                yield index, value
+
+
+def _new_automaton() -> Any:
+    try:
+        import ahocorasick
+    except ImportError:
+        return _Automaton()
+    return ahocorasick.Automaton()
+
+
+@dataclass
+class PatternMatches:
+    """Result of scanning one text against every registered category."""
+
+    counts: dict[str, int]
+    # pattern -> start of its first occurrence
+    positions: dict[str, int] = field(default_factory=dict)
+    # category -> its patterns in declaration order
+    patterns: dict[str, tuple[str, ...]] = field(default_factory=dict, repr=False)
+
+    def has(self, category: str) -> bool:
+        """Whether any pattern of the category occurs."""
+        return self.counts.get(category, 0) > 0
+
+    def matched(self, category: str) -> list[str]:
+        """The category's patterns that occur, in declaration order."""
+        return [p for p in self.patterns.get(category, ()) if p in self.positions]
+
+    def first(self, category: str) -> str | None:
+        """The first pattern of the category, in declaration order, that occurs."""
+        for pattern in self.patterns.get(category, ()):
+            if pattern in self.positions:
+                return pattern
+        return None
+
+    def position(self, pattern: str) -> int | None:
+        """Start of the pattern's first occurrence, or None."""
+        return self.positions.get(pattern)
+
+
+class PatternClassifier:
+    """
+    Keyword categories compiled into one automaton, plus regexes.
+
+    Registering a category (or replacing one) recompiles lazily on the next
+    scan and clears the memo.
+    """
+
+    def __init__(self, memo_size: int = MEMO_MAX_ENTRIES):
+        self._keywords: dict[str, tuple[str, ...]] = {}
+        self._regexes: dict[str, tuple[str, ...]] = {}
+        self._patterns: dict[str, tuple[str, ...]] = {}
+        self._automaton: Any = None
+        self._keyword_categories: dict[str, list[str]] = {}
+        # (source, compiled, categories) per distinct regex
+        self._compiled_regexes: list[tuple[str, re.Pattern[str], tuple[str, ...]]] = []
+        self._compiled = False
+        self._memo: OrderedDict[str, PatternMatches] = OrderedDict()
+        self._memo_size = memo_size
+
+    def register(
+        self,
+        category: str,
+        keywords: Iterable[str] = (),
+        regexes: Iterable[str] = (),
+    ) -> None:
+        """
+        Add a category, or replace an existing one.
+
+        Args:
+            category: Name consumers look the hits up by, e.g. "task.direct"
+            keywords: Substrings, matched case-insensitively
+            regexes: Regular expressions over the lowercased text
+        """
+        self._keywords[category] = tuple(dict.fromkeys(k.lower() for k in keywords if k))
+        self._regexes[category] = tuple(dict.fromkeys(regexes))
+        self._compiled = False
+        self._memo.clear()
+
+    def categories(self) -> list[str]:
+        return list(self._keywords)
+
+    def _compile(self) -> None:
+        self._keyword_categories = {}
+        for category, keywords in self._keywords.items():
+            for keyword in keywords:
+                self._keyword_categories.setdefault(keyword, []).append(category)
+
+        self._automaton = None
+        if self._keyword_categories:
+            self._automaton = _new_automaton()
+            for keyword, categories in self._keyword_categories.items():
+                # Everything a hit needs, so scans do no lookups per hit
+                self._automaton.add_word(keyword, (keyword, len(keyword) - 1, tuple(categories)))
+            self._automaton.make_automaton()
+
+        regex_categories: dict[str, list[str]] = {}
+        for category, regexes in self._regexes.items():
+            for regex in regexes:
+                regex_categories.setdefault(regex, []).append(category)
+        # Compiled separately: in one alternation, regexes matching at the
+        # same position would hide each other's hits
+        self._compiled_regexes = [
+            (regex, re.compile(regex), tuple(categories))
+            for regex, categories in regex_categories.items()
+        ]
+
+        # A new dict, so earlier results keep the patterns they were scanned with
+        self._patterns = {
+            category: self._keywords[category] + self._regexes[category]
+            for category in self._keywords
+        }
+        self._compiled = True
+        logger.debug(
+            "Compiled pattern classifier",
+            categories=len(self._keywords),
+            keywords=len(self._keyword_categories),
+            regexes=len(self._compiled_regexes),
+        )
+
+    def scan(self, text: str) -> PatternMatches:
+        """Count every category's hits in one pass over the text."""
+        memoize = self._memo_size > 0 and len(text) <= MEMO_MAX_TEXT_LENGTH
+        if memoize:
+            cached = self._memo.get(text)
+            if cached is not None:
+                self._memo.move_to_end(text)
+                return cached
+
+        if not self._compiled:
+            self._compile()
+
+        lowered = text.lower()
+        counts = dict.fromkeys(self._patterns, 0)
+        positions: dict[str, int] = {}
+        if self._automaton is not None:
+            for end, (keyword, offset, categories) in self._automaton.iter(lowered):
+                if keyword not in positions:
+                    positions[keyword] = end - offset
+                for category in categories:
+                    counts[category] += 1
+        for regex, compiled, categories in self._compiled_regexes:
+            for match in compiled.finditer(lowered):
+                positions.setdefault(regex, match.start())
+                for category in categories:
+                    counts[category] += 1
+
+        matches = PatternMatches(counts, positions, self._patterns)
+        if memoize:
+            self._memo[text] = matches
+            if len(self._memo) > self._memo_size:
+                self._memo.popitem(last=False)
+        return matches
+
+
+# Global singleton
+_pattern_classifier: PatternClassifier | None = None
+
+
+def get_pattern_classifier() -> PatternClassifier:
+    """Get the classifier shared by the request classifiers."""
+    global _pattern_classifier
+    if _pattern_classifier is None:
+        _pattern_classifier = PatternClassifier()
+    return _pattern_classifier
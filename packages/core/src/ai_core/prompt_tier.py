@@ -18,6 +18,7 @@ from typing import Any
 
 from .logging import get_logger
 from .model_selector import PromptTier
+from .pattern_classifier import get_pattern_classifier
 
 logger = get_logger(__name__)
 
@@ -200,26 +201,28 @@ class PromptTierClassifier:
         has_context: bool,
     ) -> tuple[PromptTier, TaskCategory]:
         """Perform the actual classification."""
-        msg_lower = message.lower()
         msg_len = len(message)
 
         # Very short messages are likely simple
         if msg_len < 50 and tools_count == 0:
             return PromptTier.MINIMAL, TaskCategory.CHAT
 
+        # One pass over the message for all keyword sets
+        matches = _patterns.scan(message)
+
         # Check for complex task indicators
-        if any(kw in msg_lower for kw in self.COMPLEX_KEYWORDS):
+        if matches.has("prompt.complex"):
             return PromptTier.FULL, TaskCategory.COMPLEX
 
         # Check for code writing tasks
-        if any(kw in msg_lower for kw in self.CODE_KEYWORDS):
+        if matches.has("prompt.code"):
             # Long code requests need more context
             if msg_len > 500 or tools_count > 5:
                 return PromptTier.FULL, TaskCategory.WRITE
             return PromptTier.STANDARD, TaskCategory.WRITE
 
         # Check for simple queries
-        if any(kw in msg_lower for kw in self.SIMPLE_KEYWORDS):
+        if matches.has("prompt.simple"):
             if tools_count == 0:
                 return PromptTier.MINIMAL, TaskCategory.CHAT
             return PromptTier.MINIMAL, TaskCategory.SEARCH
@@ -253,6 +256,13 @@ class PromptTierClassifier:
         return ""
 
 
+# Keyword sets are matched in one pass by the shared classifier
+_patterns = get_pattern_classifier()
+_patterns.register("prompt.simple", PromptTierClassifier.SIMPLE_KEYWORDS)
+_patterns.register("prompt.complex", PromptTierClassifier.COMPLEX_KEYWORDS)
+_patterns.register("prompt.code", PromptTierClassifier.CODE_KEYWORDS)
+
+
 # Token savings estimates per tier transition
 TIER_TOKEN_ESTIMATES = {
     PromptTier.MINIMAL: 500,
@@ -0,0 +1,275 @@
+"""
+Torch-free inference for the content router.
+
+``scripts/train_content_router.py export`` turns a trained MFRouter into a
+bundle directory served here with NumPy, ONNX Runtime and the
+``tokenizers`` library:
+
+    <export_dir>/encoder-<length>.onnx  Longformer encoder for inputs padded
+                                        to <length> tokens (input_ids,
+                                        attention_mask -> last_hidden_state)
+    <export_dir>/tokenizer.json         its tokenizer
+    <export_dir>/mf_head.npz            the routing head and model names
+
+Longformer pads its input to a multiple of the attention window and chunks
+it in Python, so a traced graph is only correct for the sequence length it
+was traced with. The export traces one encoder per length (doubling up to
+``MAX_INPUT_TOKENS``) with a dynamic batch axis, and each batch is padded
+to the shortest length that fits.
+
+MFRouter scores model m for a query embedding q as
+``w2 · (normalize(P[m]) ⊙ (W1 q))``, which is linear in q, so the export
+folds the head into one ``(text_dim, models)`` matrix and a whole batch of
+queries is scored with a single matrix product.
+
+``RoutingBatcher`` collects concurrent requests for a few milliseconds and
+routes them with one forward pass and one thread hop.
+"""
+
+import asyncio
+import bisect
+import contextlib
+import os
+import re
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Generic, TypeVar
+
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+ENCODER_FILE = "encoder-{length}.onnx"
+ENCODER_FILE_PATTERN = re.compile(r"encoder-(\d+)\.onnx")
+TOKENIZER_FILE = "tokenizer.json"
+HEAD_FILE = "mf_head.npz"
+
+# Longest input fed to the encoder; the router only looks at the system
+# prompt head and the last two user messages, well under this
+MAX_INPUT_TOKENS = 1024
+# How long the first request of a batch waits for others to join
+BATCH_WINDOW_MS = float(os.environ.get("CONTENT_ROUTER_BATCH_WINDOW_MS", "2"))
+# Most requests scored in one forward pass
+MAX_BATCH_SIZE = int(os.environ.get("CONTENT_ROUTER_MAX_BATCH_SIZE", "32"))
+
+
+class ExportedRouter:
+    """
+    MFRouter inference from an exported bundle, scored in batches.
+
+    Example:
+        router = ExportedRouter.load("/home/wyld-core/config/router/export")
+        [(model_name, tokens)] = router.route_batch(["Refactor the auth module"])
+    """
+
+    def __init__(
+        self,
+        sessions: dict[int, Any],
+        tokenizer: Any,
+        head: Any,
+        model_names: list[str],
+        pad_token_id: int,
+    ):
+        import numpy as np
+
+        self._np = np
+        # Encoder session per padded sequence length
+        self._sessions = sessions
+        self._lengths = sorted(sessions)
+        self._tokenizer = tokenizer
+        self._head = head
+        self.model_names = model_names
+        self._pad_token_id = pad_token_id
+        self._max_tokens = self._lengths[-1]
+
+    @classmethod
+    def load(cls, export_dir: str | Path) -> "ExportedRouter":
+        """
+        Load a bundle written by ``RouterTrainer.export``.
+
+        Raises:
+            FileNotFoundError: A bundle file is missing
+            ImportError: numpy, onnxruntime or tokenizers isn't installed
+        """
+        export_dir = Path(export_dir)
+        for name in (TOKENIZER_FILE, HEAD_FILE):
+            if not (export_dir / name).exists():
+                raise FileNotFoundError(f"Router bundle file not found: {export_dir / name}")
+        encoders = {
+            int(match.group(1)): path
+            for path in export_dir.glob("encoder-*.onnx")
+            if (match := ENCODER_FILE_PATTERN.fullmatch(path.name))
+        }
+        if not encoders:
+            raise FileNotFoundError(f"Router bundle has no encoder: {export_dir / ENCODER_FILE}")
+
+        import numpy as np
+        import onnxruntime
+        from tokenizers import Tokenizer
+
+        tokenizer = Tokenizer.from_file(str(export_dir / TOKENIZER_FILE))
+        # Inputs are padded and truncated here, and token counts taken first
+        tokenizer.no_padding()
+        tokenizer.no_truncation()
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        sessions = {
+            length: onnxruntime.InferenceSession(
+                str(path), sess_options=options, providers=["CPUExecutionProvider"]
+            )
+            for length, path in encoders.items()
+        }
+
+        with np.load(export_dir / HEAD_FILE) as bundle:
+            head = bundle["head"].astype(np.float32)
+            model_names = [str(name) for name in bundle["model_names"]]
+            pad_token_id = int(bundle["pad_token_id"])
+
+        logger.info(
+            "Loaded exported router",
+            path=str(export_dir),
+            models=model_names,
+            lengths=sorted(sessions),
+        )
+        return cls(sessions, tokenizer, head, model_names, pad_token_id)
+
+    def embed(self, texts: list[str]) -> tuple[Any, list[int]]:
+        """
+        Mean-pooled encoder embeddings for a batch, with each text's token
+        count before truncation.
+        """
+        np = self._np
+        encodings = self._tokenizer.encode_batch(texts)
+        token_counts = [len(e.ids) for e in encodings]
+
+        embeddings = None
+        for length, group in self._length_groups(token_counts).items():
+            pooled = self._encode([encodings[i].ids for i in group], length)
+            if embeddings is None:
+                embeddings = np.empty((len(texts), pooled.shape[1]), dtype=pooled.dtype)
+            embeddings[group] = pooled
+        return embeddings, token_counts
+
+    def _length_groups(self, token_counts: list[int]) -> dict[int, list[int]]:
+        """Indices of the texts run through each encoder length, shortest that fits."""
+        groups: dict[int, list[int]] = {}
+        for i, count in enumerate(token_counts):
+            length = self._lengths[bisect.bisect_left(self._lengths, min(count, self._max_tokens))]
+            groups.setdefault(length, []).append(i)
+        return groups
+
+    def _encode(self, batch_ids: list[list[int]], length: int) -> Any:
+        np = self._np
+        input_ids = np.full((len(batch_ids), length), self._pad_token_id, dtype=np.int64)
+        attention_mask = np.zeros((len(batch_ids), length), dtype=np.int64)
+        for row, ids in enumerate(batch_ids):
+            if len(ids) > length:
+                # Keep the closing special token, as truncation does
+                ids = ids[:length - 1] + ids[-1:]
+            input_ids[row, :len(ids)] = ids
+            attention_mask[row, :len(ids)] = 1
+
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        (hidden,) = self._sessions[length].run(["last_hidden_state"], feeds)
+
+        # Mean over real tokens only, so padding to the encoder's length
+        # doesn't change a text's embedding
+        mask = attention_mask[:, :, None].astype(hidden.dtype)
+        return (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1.0)
+
+    def score_batch(self, texts: list[str]) -> tuple[Any, list[int]]:
+        """
+        MFRouter scores, one row per text and one column per model name,
+        with each text's token count.
+        """
+        embeddings, token_counts = self.embed(texts)
+        return embeddings @ self._head, token_counts
+
+    def route_batch(self, texts: list[str]) -> list[tuple[str, int]]:
+        """Best model name and token count for each text."""
+        if not texts:
+            return []
+        scores, token_counts = self.score_batch(texts)
+        best = scores.argmax(axis=1)
+        return [(self.model_names[i], count) for i, count in zip(best, token_counts, strict=True)]
+
+
+class RoutingBatcher(Generic[T]):
+    """
+    Micro-batches concurrent routing requests.
+
+    The first request to arrive waits ``window_ms`` for others, then up to
+    ``max_batch_size`` queued requests are routed together in a worker
+    thread. Requests cancelled while waiting (e.g. by a latency budget) are
+    dropped from their batch; closing the batcher cancels every request
+    that hasn't been answered, including the batch being routed.
+    """
+
+    def __init__(
+        self,
+        route_batch: Callable[[list[str]], list[T]],
+        window_ms: float = BATCH_WINDOW_MS,
+        max_batch_size: int = MAX_BATCH_SIZE,
+    ):
+        self._route_batch = route_batch
+        self._window = window_ms / 1000
+        self._max_batch_size = max_batch_size
+        self._queue: asyncio.Queue[tuple[str, asyncio.Future[T]]] | None = None
+        self._worker: asyncio.Task[None] | None = None
+        self.batches = 0
+        self.routed = 0
+
+    async def submit(self, text: str) -> T:
+        """Route one text as part of the next batch."""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run(self._queue))
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        assert self._queue is not None
+        self._queue.put_nowait((text, future))
+        return await future
+
+    async def _run(self, queue: asyncio.Queue[tuple[str, asyncio.Future[T]]]) -> None:
+        batch: list[tuple[str, asyncio.Future[T]]] = []
+        while True:
+            try:
+                batch = [await queue.get()]
+                if self._window > 0:
+                    await asyncio.sleep(self._window)
+                while len(batch) < self._max_batch_size and not queue.empty():
+                    batch.append(queue.get_nowait())
+
+                batch = [(text, future) for text, future in batch if not future.done()]
+                if not batch:
+                    continue
+                results = await asyncio.to_thread(self._route_batch, [text for text, _ in batch])
+            except asyncio.CancelledError:
+                # Closed while collecting or routing: nobody will answer these
+                for _, future in batch:
+                    future.cancel()
+                raise
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.routed += len(batch)
+            for (_, future), result in zip(batch, results, strict=True):
+                if not future.done():
+                    future.set_result(result)
+
+    async def close(self) -> None:
+        """Stop the worker; requests still queued or being routed are cancelled."""
+        if self._worker is not None:
+            self._worker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._worker
+            self._worker = None
+        if self._queue is not None:
+            while not self._queue.empty():
+                self._queue.get_nowait()[1].cancel()
@@ -7,17 +7,22 @@ router model used for content-based model tier selection.
 
 import json
 import os
+import pickle
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import torch
 import yaml
 
 from ..logging import get_logger
 
+if TYPE_CHECKING:
+    import torch
+
 logger = get_logger(__name__)
 
+EMBEDDING_MODEL_NAME = "allenai/longformer-base-4096"
+
 
 @dataclass
 class TrainingConfig:
@@ -30,12 +35,16 @@ class TrainingConfig:
     epochs: int = 50
     batch_size: int = 32
 
+    # Query encoder; must be the one llmrouter embeds queries with
+    embedding_model: str = EMBEDDING_MODEL_NAME
+
     # Paths (relative to config directory)
     config_dir: str = "/home/wyld-core/config/router"
     training_data_file: str = "training_data.jsonl"
     embeddings_dir: str = "embeddings"
     model_dir: str = "model"
     model_file: str = "mfrouter.pt"
+    export_dir_name: str = "export"
 
     # Cost configuration for analytics
     cost_per_1k_tokens: dict[str, dict[str, float]] = field(
@@ -62,6 +71,10 @@ class TrainingConfig:
     def yaml_path(self) -> Path:
         return Path(self.config_dir) / "router_config.yaml"
 
+    @property
+    def export_dir(self) -> Path:
+        return Path(self.config_dir) / self.export_dir_name
+
     def to_yaml_config(self) -> dict:
         """Convert to YAML config format expected by MFRouter."""
         return {
@@ -105,12 +118,12 @@ class RouterTrainer:
         """Lazy-load the embedding model (Longformer)."""
         if self._embedding_model is None:
             try:
+                import torch
                 from transformers import AutoModel, AutoTokenizer
 
-                model_name = "allenai/longformer-base-4096"
-                logger.info(f"Loading embedding model: {model_name}")
-                self._tokenizer = AutoTokenizer.from_pretrained(model_name)
-                self._embedding_model = AutoModel.from_pretrained(model_name)
+                logger.info(f"Loading embedding model: {self.config.embedding_model}")
+                self._tokenizer = AutoTokenizer.from_pretrained(self.config.embedding_model)
+                self._embedding_model = AutoModel.from_pretrained(self.config.embedding_model)
                 self._embedding_model.eval()
 
                 # Move to GPU if available
@@ -120,12 +133,12 @@ class RouterTrainer:
             except ImportError:
                 logger.error("transformers package not installed")
                 raise RuntimeError(
-                    "transformers package required for embedding generation. "
-                    "Install with: pip install transformers"
+                    "torch and transformers packages required for embedding generation. "
+                    "Install with: pip install 'ai-core[training]'"
                 )
         return self._embedding_model, self._tokenizer
 
-    def generate_embeddings(self, force: bool = False) -> torch.Tensor:
+    def generate_embeddings(self, force: bool = False) -> "torch.Tensor":
         """
         Generate embeddings for training data.
 
@@ -135,6 +148,8 @@ class RouterTrainer:
         Returns:
             Tensor of embeddings [num_samples, text_dim]
         """
+        import torch
+
         self._ensure_directories()
 
         if self.config.embeddings_path.exists() and not force:
@@ -228,7 +243,7 @@ class RouterTrainer:
             logger.error("llmrouter package not installed")
             raise RuntimeError(
                 "llmrouter package required for training. "
-                "Install with: pip install llmrouter"
+                "Install with: pip install 'ai-core[training]'"
             )
 
         # Change to config directory for relative paths
@@ -301,6 +316,158 @@ class RouterTrainer:
         logger.info(f"Evaluation results: {accuracy}")
         return accuracy
 
+    def _resolve_path(self, path: str | None, default: Path) -> Path:
+        """A path from the YAML config, relative to the config directory."""
+        if not path:
+            return default
+        resolved = Path(path)
+        return resolved if resolved.is_absolute() else Path(self.config.config_dir) / resolved
+
+    def export(self, output_dir: Path | None = None, max_tokens: int | None = None) -> Path:
+        """
+        Export the trained router for torch-free inference.
+
+        Writes the bundle ``ai_core.router_inference.ExportedRouter`` loads:
+        the Longformer encoder as ONNX, once per padded input length, its
+        tokenizer, and the MF head folded into one ``(text_dim, models)``
+        matrix. Scores match MFRouter's ``score_all``:
+        ``w2 · (normalize(P[m]) ⊙ (W1 q))``.
+
+        Args:
+            output_dir: Bundle directory (default: ``config.export_dir``)
+            max_tokens: Longest encoder input (default: ``MAX_INPUT_TOKENS``)
+
+        Returns:
+            The bundle directory
+        """
+        import numpy as np
+        import torch
+        from transformers import AutoModel, AutoTokenizer
+
+        from ..router_inference import ENCODER_FILE, HEAD_FILE, MAX_INPUT_TOKENS, TOKENIZER_FILE
+
+        output_dir = Path(output_dir or self.config.export_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        max_tokens = max_tokens or MAX_INPUT_TOKENS
+
+        with open(self.config.yaml_path) as f:
+            router_config = yaml.safe_load(f) or {}
+        model_path = self._resolve_path(
+            router_config.get("model_path", {}).get("load_model_path"), self.config.model_path
+        )
+        data_path = self._resolve_path(
+            router_config.get("data_path", {}).get("routing_data_train"),
+            self.config.training_data_path,
+        )
+
+        # Same file formats as llmrouter's load_model
+        if model_path.suffix == ".pkl":
+            with open(model_path, "rb") as f:
+                state = pickle.load(f)
+        else:
+            state = torch.load(model_path, map_location="cpu")
+
+        P = state["P.weight"].float().numpy()
+        W1 = state["text_proj.weight"].float().numpy()
+        w2 = state["classifier.weight"].float().numpy()[0]
+        P = P / np.maximum(np.linalg.norm(P, axis=1, keepdims=True), 1e-12)
+        head = W1.T @ (P * w2).T
+
+        # MFRouter numbers models in order of first appearance in the data
+        model_names: list[str] = []
+        with open(data_path) as f:
+            for line in f:
+                name = json.loads(line)["model_name"]
+                if name not in model_names:
+                    model_names.append(name)
+        if len(model_names) != head.shape[1]:
+            raise ValueError(
+                f"Training data names {len(model_names)} models, the model has {head.shape[1]}"
+            )
+
+        tokenizer = AutoTokenizer.from_pretrained(self.config.embedding_model)
+        tokenizer.backend_tokenizer.save(str(output_dir / TOKENIZER_FILE))
+        np.savez(
+            output_dir / HEAD_FILE,
+            head=head.astype(np.float32),
+            model_names=np.array(model_names),
+            pad_token_id=np.array(tokenizer.pad_token_id),
+        )
+
+        class Encoder(torch.nn.Module):
+            def __init__(self, model):
+                super().__init__()
+                self.model = model
+
+            def forward(self, input_ids, attention_mask):
+                return self.model(input_ids=input_ids, attention_mask=attention_mask).last_hidden_state
+
+        # Eval mode on the wrapper: export restores its mode afterwards,
+        # which would otherwise switch dropout back on in the model
+        model = AutoModel.from_pretrained(self.config.embedding_model)
+        encoder = Encoder(model).eval()
+
+        # Longformer pads inputs to a multiple of its attention window, so
+        # shorter lengths wouldn't run any faster
+        window = model.config.attention_window
+        window = max(window) if isinstance(window, list) else window
+        lengths = []
+        length = min(window, max_tokens)
+        while length < max_tokens:
+            lengths.append(length)
+            length *= 2
+        lengths.append(max_tokens)
+
+        for f in output_dir.glob("encoder-*.onnx"):
+            f.unlink()
+        for length in lengths:
+            path = output_dir / ENCODER_FILE.format(length=length)
+            sample = tokenizer(
+                ["Export the router", "Fix a typo", "Refactor the authentication module and add tests"],
+                padding="max_length",
+                truncation=True,
+                max_length=length,
+                return_tensors="pt",
+            )
+            inputs = (sample["input_ids"], sample["attention_mask"])
+            # Traced for this length with a single row: a larger traced
+            # batch gets its size fixed in the graph, a single row doesn't
+            with torch.no_grad():
+                torch.onnx.export(
+                    encoder,
+                    tuple(t[:1] for t in inputs),
+                    str(path),
+                    input_names=["input_ids", "attention_mask"],
+                    output_names=["last_hidden_state"],
+                    dynamic_axes={
+                        "input_ids": {0: "batch"},
+                        "attention_mask": {0: "batch"},
+                        "last_hidden_state": {0: "batch"},
+                    },
+                    opset_version=17,
+                    dynamo=False,
+                )
+                expected = encoder(*inputs).numpy()
+            self._check_encoder(path, inputs, expected)
+
+        logger.info(f"Exported router to {output_dir}", models=model_names, lengths=lengths)
+        return output_dir
+
+    def _check_encoder(self, path: Path, inputs: tuple, expected: Any):
+        """Check an exported encoder against torch on a batch, at real (unpadded) positions."""
+        import numpy as np
+        import onnxruntime
+
+        session = onnxruntime.InferenceSession(str(path), providers=["CPUExecutionProvider"])
+        input_ids, attention_mask = (t.numpy() for t in inputs)
+        (hidden,) = session.run(
+            ["last_hidden_state"], {"input_ids": input_ids, "attention_mask": attention_mask}
+        )
+        mask = attention_mask.astype(bool)
+        error = float(np.abs(hidden[mask] - expected[mask]).max())
+        if error > 1e-3:
+            raise RuntimeError(f"Exported encoder {path.name} differs from torch by {error:.2g}")
+
     def get_cost_analytics(self) -> dict[str, Any]:
         """
         Calculate cost analytics for the trained router.
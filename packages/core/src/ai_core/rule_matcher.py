@@ -0,0 +1,196 @@
+"""
+Ordered regex rules matched in one pass over a command.
+
+Security policies are lists of regexes tried in turn against every shell
+command an agent issues. ``RuleMatcher`` compiles named, ordered rule sets
+(e.g. "blocked", "confirm", "warn") so a command is checked with:
+
+- one Aho-Corasick pass (via ``PatternClassifier``) for the literal each
+  rule starts with, e.g. "git" for ``git\\s+push``
+- a regex search only for rules whose literal occurs, or that have none
+
+and reports the first matching rule, sets in order and rules in list
+order, exactly as looping over every regex would. Rules are matched
+case-insensitively.
+
+Decisions are kept in an LRU shared by all matchers, keyed on the
+matcher's version (a hash of its rules, so reloaded policies never see
+stale decisions) and the normalized command.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+from .logging import get_logger
+from .pattern_classifier import PatternClassifier
+
+logger = get_logger(__name__)
+
+# Decisions remembered across all matchers
+DECISION_CACHE_MAX_ENTRIES = 4096
+# Longer commands (scripts, heredocs) are matched but not cached
+DECISION_CACHE_MAX_COMMAND_LENGTH = 4096
+
+_REGEX_META = set(".^$*+?{}[]()|\\")
+# A character followed by one of these may occur zero times
+_OPTIONAL = set("*?{")
+# A scoped flag group turning case-insensitivity off, e.g. (?-i:...)
+_CASE_SENSITIVE_GROUP = re.compile(r"\(\?[a-zA-Z]*-[a-zA-Z]*i")
+
+RuleMatch = tuple[str, int]
+
+_decisions: OrderedDict[tuple[str, str], RuleMatch | None] = OrderedDict()
+_decisions_lock = threading.Lock()
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+            continue
+        if in_class:
+            if char == "]":
+                in_class = False
+        elif char == "[":
+            in_class = True
+            # "]" right after "[" or "[^" is a literal member
+            if pattern[i + 1:i + 2] == "^":
+                i += 1
+            if pattern[i + 1:i + 2] == "]":
+                i += 1
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return True
+        i += 1
+    return False
+
+
+def leading_literal(pattern: str) -> str | None:
+    """
+    The lowercased literal every match of the pattern starts with, e.g.
+    "git" for ``git\\s+push``, or None when there isn't one.
+    """
+    if _has_top_level_alternation(pattern):
+        return None
+
+    chars: list[str] = []
+    i = 1 if pattern.startswith("^") else 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            # Escaped punctuation is literal; \s, \d, \b and the like aren't
+            if i + 1 >= len(pattern) or pattern[i + 1].isalnum():
+                break
+            literal, step = pattern[i + 1], 2
+        elif char in _REGEX_META:
+            break
+        else:
+            literal, step = char, 1
+
+        following = pattern[i + step:i + step + 1]
+        if following and following in _OPTIONAL:
+            break
+        chars.append(literal)
+        if following == "+":
+            break
+        i += step
+
+    literal = "".join(chars).lower()
+    return literal if literal and literal.isascii() else None
+
+
+class RuleMatcher:
+    """
+    Named, ordered regex rule sets matched with a literal prefilter.
+
+    Example:
+        matcher = RuleMatcher({"blocked": [r"rm\\s+-rf\\s+/$"], "confirm": [r"git\\s+push\\s+--force"]})
+        matcher.first_match("git push --force origin main")  # ("confirm", 0)
+
+    Indices refer to the lists passed in; patterns that don't compile are
+    skipped with a warning and never match.
+    """
+
+    def __init__(self, rule_sets: dict[str, list[str]]):
+        self._sets: list[tuple[str, list[tuple[int, re.Pattern[str], str | None]]]] = []
+        self._literals = PatternClassifier(memo_size=0)
+        self._case_sensitive = False
+
+        for name, patterns in rule_sets.items():
+            rules = []
+            literals = []
+            for index, pattern in enumerate(patterns):
+                try:
+                    compiled = re.compile(pattern, re.IGNORECASE)
+                except re.error as e:
+                    logger.warning("Invalid rule pattern skipped", rule_set=name, pattern=pattern, error=str(e))
+                    continue
+                literal = leading_literal(pattern)
+                if literal:
+                    literals.append(literal)
+                rules.append((index, compiled, literal))
+                if _CASE_SENSITIVE_GROUP.search(pattern):
+                    self._case_sensitive = True
+            self._sets.append((name, rules))
+            self._literals.register(name, literals)
+
+        fingerprint = hashlib.sha256(
+            repr([(name, [r[1].pattern for r in rules]) for name, rules in self._sets]).encode()
+        )
+        self.version = fingerprint.hexdigest()[:16]
+
+    def _normalize(self, command: str) -> str:
+        # Every rule is case-insensitive, so case doesn't change a decision;
+        # only ASCII is folded, as Unicode case-insensitive matching differs
+        # from lower() for a few characters
+        if self._case_sensitive or not command.isascii():
+            return command
+        return command.lower()
+
+    def first_match(self, command: str) -> RuleMatch | None:
+        """
+        The first rule matching the command as (set name, index in its
+        list), sets in order and rules in list order, or None.
+        """
+        if len(command) > DECISION_CACHE_MAX_COMMAND_LENGTH:
+            return self._match(command)
+
+        key = (self.version, self._normalize(command))
+        with _decisions_lock:
+            if key in _decisions:
+                _decisions.move_to_end(key)
+                return _decisions[key]
+
+        match = self._match(command)
+        with _decisions_lock:
+            _decisions[key] = match
+            if len(_decisions) > DECISION_CACHE_MAX_ENTRIES:
+                _decisions.popitem(last=False)
+        return match
+
+    def _match(self, command: str) -> RuleMatch | None:
+        # Literals are searched for in ASCII commands only, where lowering
+        # agrees with case-insensitive matching; other commands try every rule
+        present = self._literals.scan(command).positions if command.isascii() else None
+        for name, rules in self._sets:
+            for index, compiled, literal in rules:
+                if literal and present is not None and literal not in present:
+                    continue
+                if compiled.search(command):
+                    return name, index
+        return None
+
+
+def clear_decision_cache() -> None:
+    """Forget every cached decision."""
+    with _decisions_lock:
+        _decisions.clear()
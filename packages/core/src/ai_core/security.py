@@ -16,6 +16,7 @@ from typing import Any
 import yaml
 
 from .logging import get_logger
+from .rule_matcher import RuleMatcher
 
 logger = get_logger(__name__)
 
@@ -172,6 +173,12 @@ class SecurityValidator:
                 self._compiled_patterns.append((compiled, pc.get("message", "Dangerous pattern"), level))
             except re.error as e:
                 logger.warning("Invalid regex", pattern=pc["pattern"], error=str(e))
+
+        # Commands are checked against every pattern in one pass, with
+        # decisions cached per pattern set and command
+        self._command_matcher = RuleMatcher(
+            {"dangerous": [compiled.pattern for compiled, _, _ in self._compiled_patterns]}
+        )
     
     def _path_matches(self, path: str, prefix: str) -> bool:
         """Check if path is within prefix directory (proper boundary matching)."""
@@ -221,13 +228,14 @@ class SecurityValidator:
             input_summary=f"{operation}: {path}", message="Path not protected", agent_name=agent_name, blocked=False)
     
     def validate_command(self, command: str, agent_name: str | None = None) -> SecurityViolation:
-        for pattern, message, level in self._compiled_patterns:
-            if pattern.search(command):
-                violation = SecurityViolation(action=SecurityAction.BLOCK, threat_level=level,
-                    rule_name="dangerous_command", input_summary=command[:200],
-                    message=message, agent_name=agent_name, blocked=True)
-                self._record_violation(violation)
-                return violation
+        match = self._command_matcher.first_match(command)
+        if match is not None:
+            _, message, level = self._compiled_patterns[match[1]]
+            violation = SecurityViolation(action=SecurityAction.BLOCK, threat_level=level,
+                rule_name="dangerous_command", input_summary=command[:200],
+                message=message, agent_name=agent_name, blocked=True)
+            self._record_violation(violation)
+            return violation
         
         return SecurityViolation(action=SecurityAction.ALLOW, rule_name="command_safe",
             input_summary=command[:200], message="Command safe", agent_name=agent_name, blocked=False)
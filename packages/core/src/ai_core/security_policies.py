@@ -18,6 +18,7 @@ from pathlib import Path
 from typing import Any
 
 from .logging import get_logger
+from .rule_matcher import RuleMatcher
 from .security import SecurityValidator, SecurityViolation, ThreatLevel, SecurityAction
 
 logger = get_logger(__name__)
@@ -89,12 +90,8 @@ class SecurityPolicies:
     allowed_commands: list[str] = field(default_factory=list)
     rules: list[PolicyRule] = field(default_factory=list)
 
-    # Compiled patterns for performance
-    _blocked_compiled: list[re.Pattern[str]] = field(default_factory=list)
-    _confirm_compiled: list[re.Pattern[str]] = field(default_factory=list)
-    _warn_compiled: list[re.Pattern[str]] = field(default_factory=list)
-    _allowed_compiled: list[re.Pattern[str]] = field(default_factory=list)
-    _user_blocked_compiled: list[re.Pattern[str]] = field(default_factory=list)
+    # Every pattern list compiled into one matcher, in validation order
+    _matcher: RuleMatcher | None = field(default=None, repr=False)
 
     def __post_init__(self) -> None:
         """Compile all patterns."""
@@ -102,20 +99,14 @@ class SecurityPolicies:
 
     def _compile_patterns(self) -> None:
         """Compile regex patterns for performance."""
-        def compile_list(patterns: list[str]) -> list[re.Pattern[str]]:
-            compiled = []
-            for p in patterns:
-                try:
-                    compiled.append(re.compile(p, re.IGNORECASE))
-                except re.error:
-                    logger.warning(f"Invalid pattern skipped: {p}")
-            return compiled
-
-        self._blocked_compiled = compile_list(self.blocked_patterns)
-        self._confirm_compiled = compile_list(self.require_confirmation)
-        self._warn_compiled = compile_list(self.warn_patterns)
-        self._allowed_compiled = compile_list(self.allowed_commands)
-        self._user_blocked_compiled = compile_list(self.blocked_commands)
+        self._matcher = RuleMatcher({
+            "allowed": self.allowed_commands,
+            "blocked": self.blocked_patterns,
+            "user_blocked": self.blocked_commands,
+            "confirm": self.require_confirmation,
+            "warn": self.warn_patterns,
+            "rules": [rule.pattern for rule in self.rules],
+        })
 
     @classmethod
     def from_json(cls, path: str | Path) -> "SecurityPolicies":
@@ -306,86 +297,85 @@ class SecurityPolicyValidator:
         5. Warning patterns (suspicious)
         6. Custom rules
         """
-        # 1. Check allowed commands first (whitelist)
-        for pattern in self._policies._allowed_compiled:
-            if pattern.search(command):
-                return PolicyValidationResult(
-                    allowed=True,
-                    tier=AttackTier.BENIGN,
-                    action="allow",
-                    message="Command in allow list",
-                    rule_name="allowed_command",
-                )
+        # One pass finds the first matching pattern across the lists below;
+        # decisions are cached per policy version and command
+        matcher = self._policies._matcher
+        match = matcher.first_match(command) if matcher else None
+        if match is None:
+            return PolicyValidationResult(
+                allowed=True,
+                tier=AttackTier.BENIGN,
+                action="allow",
+                message="No policy violations",
+                rule_name="default_allow",
+            )
+        kind, i = match
 
-        # 2. Check blocked patterns (catastrophic)
-        for i, pattern in enumerate(self._policies._blocked_compiled):
-            if pattern.search(command):
-                return PolicyValidationResult(
-                    allowed=False,
-                    tier=AttackTier.CATASTROPHIC,
-                    action="block",
-                    message=f"Catastrophic pattern matched: {self._policies.blocked_patterns[i]}",
-                    rule_name="blocked_pattern",
-                    patterns_matched=[self._policies.blocked_patterns[i]],
-                )
+        # 1. Allowed commands (whitelist)
+        if kind == "allowed":
+            return PolicyValidationResult(
+                allowed=True,
+                tier=AttackTier.BENIGN,
+                action="allow",
+                message="Command in allow list",
+                rule_name="allowed_command",
+            )
 
-        # 3. Check user blocked commands
-        for i, pattern in enumerate(self._policies._user_blocked_compiled):
-            if pattern.search(command):
-                return PolicyValidationResult(
-                    allowed=False,
-                    tier=AttackTier.DANGEROUS,
-                    action="block",
-                    message=f"User blocked: {self._policies.blocked_commands[i]}",
-                    rule_name="user_blocked",
-                    patterns_matched=[self._policies.blocked_commands[i]],
-                )
+        # 2. Blocked patterns (catastrophic)
+        if kind == "blocked":
+            return PolicyValidationResult(
+                allowed=False,
+                tier=AttackTier.CATASTROPHIC,
+                action="block",
+                message=f"Catastrophic pattern matched: {self._policies.blocked_patterns[i]}",
+                rule_name="blocked_pattern",
+                patterns_matched=[self._policies.blocked_patterns[i]],
+            )
 
-        # 4. Check confirmation required patterns
-        for i, pattern in enumerate(self._policies._confirm_compiled):
-            if pattern.search(command):
-                return PolicyValidationResult(
-                    allowed=True,  # Allowed but needs confirmation
-                    tier=AttackTier.DANGEROUS,
-                    action="confirm",
-                    message=f"Confirmation required: {self._policies.require_confirmation[i]}",
-                    rule_name="require_confirmation",
-                    requires_confirmation=True,
-                    patterns_matched=[self._policies.require_confirmation[i]],
-                )
+        # 3. User blocked commands
+        if kind == "user_blocked":
+            return PolicyValidationResult(
+                allowed=False,
+                tier=AttackTier.DANGEROUS,
+                action="block",
+                message=f"User blocked: {self._policies.blocked_commands[i]}",
+                rule_name="user_blocked",
+                patterns_matched=[self._policies.blocked_commands[i]],
+            )
 
-        # 5. Check warning patterns
-        for i, pattern in enumerate(self._policies._warn_compiled):
-            if pattern.search(command):
-                return PolicyValidationResult(
-                    allowed=True,  # Allowed with warning
-                    tier=AttackTier.SUSPICIOUS,
-                    action="warn",
-                    message=f"Suspicious pattern: {self._policies.warn_patterns[i]}",
-                    rule_name="warn_pattern",
-                    patterns_matched=[self._policies.warn_patterns[i]],
-                )
+        # 4. Confirmation required patterns
+        if kind == "confirm":
+            return PolicyValidationResult(
+                allowed=True,  # Allowed but needs confirmation
+                tier=AttackTier.DANGEROUS,
+                action="confirm",
+                message=f"Confirmation required: {self._policies.require_confirmation[i]}",
+                rule_name="require_confirmation",
+                requires_confirmation=True,
+                patterns_matched=[self._policies.require_confirmation[i]],
+            )
 
-        # 6. Check custom rules
-        for rule in self._policies.rules:
-            if rule.compiled and rule.compiled.search(command):
-                return PolicyValidationResult(
-                    allowed=rule.action != "block",
-                    tier=rule.tier,
-                    action=rule.action,
-                    message=rule.message,
-                    rule_name=f"custom_rule:{rule.category}",
-                    requires_confirmation=rule.action == "confirm",
-                    patterns_matched=[rule.pattern],
-                )
+        # 5. Warning patterns
+        if kind == "warn":
+            return PolicyValidationResult(
+                allowed=True,  # Allowed with warning
+                tier=AttackTier.SUSPICIOUS,
+                action="warn",
+                message=f"Suspicious pattern: {self._policies.warn_patterns[i]}",
+                rule_name="warn_pattern",
+                patterns_matched=[self._policies.warn_patterns[i]],
+            )
 
-        # Default: allow
+        # 6. Custom rules
+        rule = self._policies.rules[i]
         return PolicyValidationResult(
-            allowed=True,
-            tier=AttackTier.BENIGN,
-            action="allow",
-            message="No policy violations",
-            rule_name="default_allow",
+            allowed=rule.action != "block",
+            tier=rule.tier,
+            action=rule.action,
+            message=rule.message,
+            rule_name=f"custom_rule:{rule.category}",
+            requires_confirmation=rule.action == "confirm",
+            patterns_matched=[rule.pattern],
         )
 
     def validate_path(self, path: str, operation: str = "access") -> PolicyValidationResult:
@@ -19,6 +19,7 @@ from enum import Enum
 from typing import Any
 
 from .logging import get_logger
+from .pattern_classifier import get_pattern_classifier
 
 logger = get_logger(__name__)
 
@@ -117,9 +118,23 @@ PLAN_WORTHY_PATTERNS = [
     "breakdown", "plan for", "strategy for",
 ]
 
+# Questions about approach suggest planning needed
+PLANNING_QUESTIONS = ["how should", "what's the best way", "how do i", "where should"]
+
+# Words that mark a short task as a question rather than a command
+QUESTION_WORDS = ["how", "why", "what", "should"]
+
 # Confidence thresholds
 PLAN_SUGGESTION_THRESHOLD = 0.7  # Suggest plan if confidence above this
 
+# All pattern lists are matched in one pass by the shared classifier
+_patterns = get_pattern_classifier()
+_patterns.register("task.direct", DIRECT_PATTERNS)
+_patterns.register("task.complex", COMPLEX_PATTERNS)
+_patterns.register("task.plan", PLAN_WORTHY_PATTERNS)
+_patterns.register("task.planning_question", PLANNING_QUESTIONS)
+_patterns.register("task.question", QUESTION_WORDS)
+
 
 class TaskComplexityClassifier:
     """
@@ -253,12 +268,10 @@ class TaskComplexityClassifier:
         Returns (should_suggest_plan, reason)
         """
         task_lower = task_description.lower().strip()
+        matches = _patterns.scan(task_description.strip())
 
         # Check plan-worthy patterns
-        matched_patterns = []
-        for pattern in PLAN_WORTHY_PATTERNS:
-            if pattern.lower() in task_lower:
-                matched_patterns.append(pattern)
+        matched_patterns = matches.matched("task.plan")
 
         if matched_patterns:
             reason = f"Task matches plan-worthy patterns: {', '.join(matched_patterns[:3])}"
@@ -275,10 +288,9 @@ class TaskComplexityClassifier:
             return True, "Task has multiple components connected with 'and'"
 
         # Questions about approach suggest planning needed
-        planning_questions = ["how should", "what's the best way", "how do i", "where should"]
-        for q in planning_questions:
-            if q in task_lower:
-                return True, f"Task is asking for approach guidance: '{q}'"
+        question = matches.first("task.planning_question")
+        if question:
+            return True, f"Task is asking for approach guidance: '{question}'"
 
         return False, ""
 
@@ -301,31 +313,34 @@ class TaskComplexityClassifier:
                 reason=plan_reason
             )
 
+        # Same scan as the plan check, served from the classifier's memo
+        matches = _patterns.scan(task_description.strip())
+
         # Check direct patterns first
-        for pattern in DIRECT_PATTERNS:
-            if pattern.lower() in task_lower:
-                logger.debug(f"Task matched direct pattern: {pattern}")
-                return ClassificationResult(
-                    execution_mode=ExecutionMode.DIRECT,
-                    suggest_plan=False,
-                    confidence=0.9,
-                    reason=f"Matched direct pattern: {pattern}"
-                )
+        pattern = matches.first("task.direct")
+        if pattern:
+            logger.debug(f"Task matched direct pattern: {pattern}")
+            return ClassificationResult(
+                execution_mode=ExecutionMode.DIRECT,
+                suggest_plan=False,
+                confidence=0.9,
+                reason=f"Matched direct pattern: {pattern}"
+            )
 
         # Check complex patterns
-        for pattern in COMPLEX_PATTERNS:
-            if pattern.lower() in task_lower:
-                logger.debug(f"Task matched complex pattern: {pattern}")
-                return ClassificationResult(
-                    execution_mode=ExecutionMode.COMPLEX,
-                    suggest_plan=False,
-                    confidence=0.85,
-                    reason=f"Matched complex pattern: {pattern}"
-                )
+        pattern = matches.first("task.complex")
+        if pattern:
+            logger.debug(f"Task matched complex pattern: {pattern}")
+            return ClassificationResult(
+                execution_mode=ExecutionMode.COMPLEX,
+                suggest_plan=False,
+                confidence=0.85,
+                reason=f"Matched complex pattern: {pattern}"
+            )
 
         # Short tasks without exploration keywords -> likely direct
         words = task_lower.split()
-        if len(words) <= 5 and not any(p in task_lower for p in ["how", "why", "what", "should"]):
+        if len(words) <= 5 and not matches.has("task.question"):
             # Very short imperative commands
             if words and words[0] in ["run", "execute", "start", "stop", "restart", "build", "test"]:
                 return ClassificationResult(
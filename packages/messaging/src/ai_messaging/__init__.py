@@ -6,12 +6,15 @@ This package provides inter-service communication:
 - Pub/Sub for real-time messaging
 - Message bus for request/response patterns
 - Message schemas
+- Indexed plan storage
+- Packed conversation history
 """
 
 from ai_core import AgentStatus, AgentType, MessageType, TaskStatus
 
 from .bus import MessageBus
 from .client import RedisClient, get_redis_client, redis_client_context
+from .conversation_history import ConversationHistory
 from .messages import (
     AgentHeartbeat,
     AgentStatusMessage,
@@ -24,6 +27,7 @@ from .messages import (
     ToolResult,
     UserNotification,
 )
+from .plan_index import PlanConflictError, PlanIndex
 from .pubsub import Channels, PubSubManager
 from .locks import (
     DistributedLock,
@@ -52,6 +56,11 @@ __all__ = [
     "LockTimeoutError",
     "AgentStatusLock",
     "TaskLock",
+    # Plans
+    "PlanIndex",
+    "PlanConflictError",
+    # Conversations
+    "ConversationHistory",
     # Messages
     "BaseMessage",
     "MessageType",
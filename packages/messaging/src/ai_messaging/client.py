@@ -9,6 +9,7 @@ from typing import Any, AsyncIterator, cast
 import redis.asyncio as redis
 from redis.asyncio.connection import ConnectionPool
 from redis.asyncio.client import Pipeline
+from redis.exceptions import NoScriptError
 
 from ai_core import RedisSettings, get_logger, get_settings
 
@@ -241,7 +242,7 @@ class RedisClient:
         """Get a pipeline instance for batched operations."""
         return self.client.pipeline(transaction=transaction)
 
-    # Sorted Set Operations (for rate limiting)
+    # Sorted Set Operations
     async def zadd(self, name: str, mapping: dict[str, float]) -> int:
         """Add members to sorted set."""
         result = await self.client.zadd(name, mapping)
@@ -257,6 +258,30 @@ class RedisClient:
         result = await self.client.zremrangebyscore(name, min, max)
         return cast(int, result)
 
+    async def zrevrange(self, name: str, start: int, end: int) -> list[str]:
+        """Get members by rank, highest score first."""
+        result = await self.client.zrevrange(name, start, end)
+        return cast(list[str], result)
+
+    async def zrangebylex(
+        self,
+        name: str,
+        min: str,
+        max: str,
+        start: int | None = None,
+        num: int | None = None,
+    ) -> list[str]:
+        """Get members of an equal-score sorted set by lexicographic range."""
+        result = await self.client.zrangebylex(name, min, max, start=start, num=num)
+        return cast(list[str], result)
+
+    async def mget(self, keys: list[str]) -> list[str | None]:
+        """Get values for several keys in one round trip."""
+        if not keys:
+            return []
+        result = await self.client.mget(keys)
+        return cast(list[str | None], result)
+
     async def lrem(self, name: str, count: int, value: str) -> int:
         """Remove elements from list."""
         result = await self.client.lrem(name, count, value)  # type: ignore[misc]
@@ -308,6 +333,32 @@ class RedisClient:
         """Execute a Lua script."""
         return await self.client.eval(script, numkeys, *keys_and_args)  # type: ignore[misc]
 
+    async def script_load(self, script: str) -> str:
+        """Load a Lua script into the script cache and return its SHA1."""
+        result = await self.client.script_load(script)  # type: ignore[misc]
+        return cast(str, result)
+
+    async def evalsha(
+        self,
+        sha: str,
+        numkeys: int,
+        *keys_and_args: str | int,
+        script: str | None = None,
+    ) -> Any:
+        """
+        Execute a cached Lua script by SHA1.
+
+        If Redis no longer has the script (restart, SCRIPT FLUSH) and
+        ``script`` is given, it is reloaded and the call retried once.
+        """
+        try:
+            return await self.client.evalsha(sha, numkeys, *keys_and_args)  # type: ignore[misc]
+        except NoScriptError:
+            if script is None:
+                raise
+            await self.script_load(script)
+            return await self.client.evalsha(sha, numkeys, *keys_and_args)  # type: ignore[misc]
+
 
 # Global client instance
 _redis_client: RedisClient | None = None
@@ -0,0 +1,407 @@
+"""
+Conversation history stored as packed records in Redis.
+
+Each conversation's recent messages live in one list,
+``conversation:{id}:history``, oldest first, one compact JSON record per
+message. The last N messages are a single ``LRANGE -N -1``; the list is
+capped at HISTORY_MAX_MESSAGES since Postgres keeps the full history.
+
+The conversation hash ``conversation:{id}`` carries the counters updated
+with every append, in the same atomic step: ``message_count``,
+``token_count`` (estimated tokens of every message appended) and
+``updated_at``.
+
+Postgres is wired in through two optional callables:
+
+- ``loader(conversation_id, limit)`` returns the newest messages, oldest
+  first, when Redis has no history for a conversation (expired, evicted,
+  cleared); they are written back so the next read is served from Redis
+- ``writer(message)`` persists each appended message in the background
+
+Before this layout each message was a ``message:{id}`` hash listed by ID in
+``conversation:{id}:messages``, newest first; ``backfill`` converts those,
+handing every one of them to the writer before its hash is deleted.
+"""
+
+import asyncio
+import hashlib
+import json
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from typing import Any
+
+from ai_core import get_logger
+
+from .client import RedisClient
+
+logger = get_logger(__name__)
+
+# Newest messages kept per conversation in Redis; older ones only in Postgres
+HISTORY_MAX_MESSAGES = 500
+# Bump when the history layout changes; startup re-runs the backfill
+HISTORY_VERSION = "1"
+HISTORY_VERSION_KEY = "conversations:history:version"
+# Legacy message hashes read per round trip while backfilling
+BACKFILL_READ_BATCH = 200
+
+HistoryLoader = Callable[[str, int], Awaitable[list[dict[str, Any]]]]
+HistoryWriter = Callable[[dict[str, Any]], Awaitable[None]]
+
+# Message hashes are derived from the listed IDs, so they cannot be declared
+# in KEYS; fine for the single Redis instance conversations live on.
+# KEYS[1] = conversation:{id}:messages (legacy, newest first),
+# KEYS[2] = conversation:{id}:history, KEYS[3] = conversation:{id}
+# ARGV[1] = max messages to keep, ARGV[2] = "1" if the history list is the
+# only store (no writer), ARGV[3..] = IDs the writer has stored
+# Only hashes that are stored, or gone, are deleted; the rest stay listed
+# in KEYS[1] for the next run. Returns the number of messages converted.
+BACKFILL_SCRIPT = """
+local stored = {}
+for i = 3, #ARGV do stored[ARGV[i]] = true end
+local ids = redis.call('LRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+local converted = 0
+if redis.call('EXISTS', KEYS[2]) == 0 then
+    local tokens = 0
+    for i = #ids, 1, -1 do
+        local fields = redis.call('HGETALL', 'message:' .. ids[i])
+        if #fields > 0 then
+            local record = {}
+            for j = 1, #fields, 2 do record[fields[j]] = fields[j + 1] end
+            record.id = record.id or ids[i]
+            record.tokens = math.floor(string.len(record.content or '') / 4) + 1
+            tokens = tokens + record.tokens
+            redis.call('RPUSH', KEYS[2], cjson.encode(record))
+            converted = converted + 1
+            if ARGV[2] == '1' then stored[ids[i]] = true end
+        end
+    end
+    redis.call('HSET', KEYS[3], 'token_count', tokens)
+end
+local remaining = {}
+for _, id in ipairs(redis.call('LRANGE', KEYS[1], 0, -1)) do
+    if stored[id] or redis.call('EXISTS', 'message:' .. id) == 0 then
+        redis.call('DEL', 'message:' .. id)
+    else
+        table.insert(remaining, id)
+    end
+end
+redis.call('DEL', KEYS[1])
+for _, id in ipairs(remaining) do redis.call('RPUSH', KEYS[1], id) end
+return converted
+"""
+
+# KEYS[1] = conversation:{id}:history, KEYS[2] = conversation:{id}
+# ARGV[1] = record, ARGV[2] = its tokens, ARGV[3] = its timestamp,
+# ARGV[4] = max messages to keep
+# Returns the number of messages held in Redis.
+APPEND_SCRIPT = """
+local length = redis.call('RPUSH', KEYS[1], ARGV[1])
+if length > tonumber(ARGV[4]) then
+    redis.call('LTRIM', KEYS[1], -tonumber(ARGV[4]), -1)
+    length = tonumber(ARGV[4])
+end
+redis.call('HSET', KEYS[2], 'updated_at', ARGV[3])
+redis.call('HINCRBY', KEYS[2], 'message_count', 1)
+redis.call('HINCRBY', KEYS[2], 'token_count', ARGV[2])
+return length
+"""
+
+# KEYS[1] = conversation:{id}:history, KEYS[2] = conversation:{id}
+# ARGV[1] = max messages to keep, ARGV[2] = token count, ARGV[3..] = records
+# Only fills an empty history, so it cannot clobber a concurrent append.
+FILL_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then return 0 end
+for i = 3, #ARGV do redis.call('RPUSH', KEYS[1], ARGV[i]) end
+redis.call('LTRIM', KEYS[1], -tonumber(ARGV[1]), -1)
+redis.call('HSETNX', KEYS[2], 'token_count', ARGV[2])
+return #ARGV - 2
+"""
+
+# KEYS[1] = conversation:{id}:messages (legacy), KEYS[2] = conversation:{id}:history,
+# KEYS[3] = conversation:{id}
+CLEAR_SCRIPT = """
+for _, id in ipairs(redis.call('LRANGE', KEYS[1], 0, -1)) do
+    redis.call('DEL', 'message:' .. id)
+end
+redis.call('DEL', KEYS[1], KEYS[2])
+redis.call('HSET', KEYS[3], 'token_count', 0)
+return 1
+"""
+
+_SCRIPTS = {
+    name: (script, hashlib.sha1(script.encode()).hexdigest())
+    for name, script in (
+        ("append", APPEND_SCRIPT),
+        ("fill", FILL_SCRIPT),
+        ("clear", CLEAR_SCRIPT),
+        ("backfill", BACKFILL_SCRIPT),
+    )
+}
+
+
+def history_key(conversation_id: str) -> str:
+    return f"conversation:{conversation_id}:history"
+
+
+def _legacy_key(conversation_id: str) -> str:
+    return f"conversation:{conversation_id}:messages"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token), as used for context budgets."""
+    return len(text) // 4 + 1
+
+
+def _pack(message: dict[str, Any]) -> str:
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+class ConversationHistory:
+    """
+    Append and range-read conversation messages in single round trips.
+
+    Example:
+        history = ConversationHistory(redis, loader=load_from_db, writer=save_to_db)
+        await history.append(conversation_id, {"id": ..., "role": "user", "content": ...})
+        messages = await history.recent(conversation_id, limit=20)
+    """
+
+    def __init__(
+        self,
+        redis: RedisClient,
+        loader: HistoryLoader | None = None,
+        writer: HistoryWriter | None = None,
+        max_messages: int = HISTORY_MAX_MESSAGES,
+    ):
+        self.redis = redis
+        self.loader = loader
+        self.writer = writer
+        self.max_messages = max_messages
+        self._pending_writes: set[asyncio.Task[None]] = set()
+
+    @staticmethod
+    def _keys(conversation_id: str) -> list[str]:
+        return [history_key(conversation_id), f"conversation:{conversation_id}"]
+
+    async def _run(self, name: str, keys: list[str], *args: str | int) -> Any:
+        script, sha = _SCRIPTS[name]
+        return await self.redis.evalsha(sha, len(keys), *keys, *args, script=script)
+
+    async def append(
+        self,
+        conversation_id: str,
+        message: dict[str, Any],
+        persist: bool = True,
+    ) -> dict[str, Any]:
+        """
+        Add a message to the end of a conversation.
+
+        The record, the cap on the list and the conversation's counters
+        are written in one atomic step. Unless ``persist`` is False the
+        message is then handed to the writer in the background.
+
+        Args:
+            message: Message fields (id, role, content, agent, user_id,
+                ...); ``conversation_id``, ``timestamp`` and ``tokens``
+                are filled in when missing
+
+        Returns:
+            The stored record
+        """
+        record = dict(message)
+        record["conversation_id"] = conversation_id
+        record["timestamp"] = record.get("timestamp") or datetime.now(timezone.utc).isoformat()
+        record.setdefault("tokens", estimate_tokens(record.get("content") or ""))
+
+        await self._run(
+            "append",
+            self._keys(conversation_id),
+            _pack(record),
+            record["tokens"],
+            record["timestamp"],
+            self.max_messages,
+        )
+
+        if persist and self.writer:
+            task = asyncio.create_task(self._persist(record))
+            self._pending_writes.add(task)
+            task.add_done_callback(self._pending_writes.discard)
+        return record
+
+    async def _persist(self, record: dict[str, Any]) -> None:
+        try:
+            await self.writer(record)  # type: ignore[misc]
+        except Exception as e:
+            logger.warning(
+                "Failed to persist conversation message",
+                message_id=record.get("id"),
+                error=str(e),
+            )
+
+    async def recent(
+        self,
+        conversation_id: str,
+        limit: int = 20,
+        max_tokens: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        The newest ``limit`` messages of a conversation, oldest first.
+
+        Falls back to the loader when Redis holds no history for the
+        conversation and writes what it returns back to Redis.
+
+        Args:
+            max_tokens: Drop the oldest of those messages until their
+                estimated tokens fit this budget
+        """
+        if limit <= 0:
+            return []
+        raw = await self.redis.lrange(history_key(conversation_id), -limit, -1)
+        messages = []
+        for item in raw:
+            try:
+                messages.append(json.loads(item))
+            except json.JSONDecodeError:
+                logger.warning("Skipping undecodable history record", conversation_id=conversation_id)
+
+        if not raw and self.loader:
+            messages = await self._load(conversation_id)
+            messages = messages[-limit:]
+
+        if max_tokens is not None:
+            total = 0
+            for start in range(len(messages) - 1, -1, -1):
+                total += messages[start].get("tokens") or estimate_tokens(messages[start].get("content") or "")
+                if total > max_tokens:
+                    return messages[start + 1:]
+        return messages
+
+    async def _load(self, conversation_id: str) -> list[dict[str, Any]]:
+        try:
+            messages = await self.loader(conversation_id, self.max_messages)  # type: ignore[misc]
+        except Exception as e:
+            logger.warning("Failed to load conversation history", conversation_id=conversation_id, error=str(e))
+            return []
+        if not messages:
+            return []
+
+        records = []
+        for message in messages:
+            record = dict(message)
+            record["conversation_id"] = conversation_id
+            record.setdefault("tokens", estimate_tokens(record.get("content") or ""))
+            records.append(record)
+        filled = await self._run(
+            "fill",
+            self._keys(conversation_id),
+            self.max_messages,
+            sum(r["tokens"] for r in records),
+            *(_pack(r) for r in records),
+        )
+        logger.debug("Conversation history loaded into Redis", conversation_id=conversation_id, messages=filled)
+        return records
+
+    async def token_count(self, conversation_id: str) -> int:
+        """Estimated tokens of every message appended to a conversation."""
+        value = await self.redis.hget(f"conversation:{conversation_id}", "token_count")
+        return int(value or 0)
+
+    async def clear(self, conversation_id: str) -> None:
+        """
+        Drop a conversation's history from Redis, including legacy message
+        hashes, and reset its token count. Postgres is left alone.
+        """
+        await self._run("clear", [_legacy_key(conversation_id), *self._keys(conversation_id)])
+
+    async def flush(self) -> None:
+        """Wait for background writes to the writer to finish."""
+        if self._pending_writes:
+            await asyncio.gather(*self._pending_writes, return_exceptions=True)
+
+    async def backfill(self, batch_size: int = 500) -> int:
+        """
+        Convert conversations stored as ``message:{id}`` hashes into packed
+        history lists. Safe to run while messages are being written and to
+        repeat; a conversation that already has a history list keeps it and
+        only its legacy keys are removed.
+
+        The newest ``max_messages`` of each conversation go into its history
+        list. Every legacy message, including older ones that don't fit the
+        list, is first handed to the writer, and a hash is only deleted once
+        the writer has stored it. Messages the writer fails on stay in the
+        legacy layout and the version is left unset, so the next run retries
+        them. Without a writer the history list is the only store and older
+        messages are kept as they are.
+        """
+        converted = 0
+        complete = True
+        cursor = 0
+        while True:
+            cursor, keys = await self.redis.scan(
+                cursor=cursor, match="conversation:*:messages", count=batch_size
+            )
+            for key in keys:
+                conversation_id = key[len("conversation:"):-len(":messages")]
+                stored, failed = await self._persist_legacy(key, conversation_id)
+                complete = complete and not failed
+                converted += await self._run(
+                    "backfill",
+                    [key, *self._keys(conversation_id)],
+                    self.max_messages,
+                    "0" if self.writer else "1",
+                    *stored,
+                )
+            if cursor == 0:
+                break
+
+        if complete:
+            await self.redis.set(HISTORY_VERSION_KEY, HISTORY_VERSION)
+            logger.info("Conversation history backfilled", messages=converted)
+        else:
+            logger.warning(
+                "Conversation history backfilled with messages left to persist",
+                messages=converted,
+            )
+        return converted
+
+    async def _persist_legacy(self, key: str, conversation_id: str) -> tuple[list[str], int]:
+        """
+        Hand a conversation's legacy messages to the writer, oldest first.
+
+        Returns:
+            The IDs stored, and how many the writer failed on
+        """
+        if not self.writer:
+            return [], 0
+        ids = list(reversed(await self.redis.lrange(key, 0, -1)))
+        stored: list[str] = []
+        failed = 0
+        for offset in range(0, len(ids), BACKFILL_READ_BATCH):
+            batch = ids[offset:offset + BACKFILL_READ_BATCH]
+            pipe = self.redis.pipeline(transaction=False)
+            for message_id in batch:
+                pipe.hgetall(f"message:{message_id}")
+            for message_id, fields in zip(batch, await pipe.execute(), strict=True):
+                if not fields:
+                    continue
+                record = dict(fields)
+                record["id"] = record.get("id") or message_id
+                record["conversation_id"] = conversation_id
+                try:
+                    await self.writer(record)
+                except Exception as e:
+                    failed += 1
+                    logger.warning(
+                        "Failed to persist legacy conversation message",
+                        message_id=record["id"],
+                        error=str(e),
+                    )
+                else:
+                    stored.append(message_id)
+        return stored, failed
+
+    async def ensure_backfilled(self) -> int:
+        """Run ``backfill`` unless the current history layout is already built."""
+        if await self.redis.get(HISTORY_VERSION_KEY) == HISTORY_VERSION:
+            return 0
+        return await self.backfill()
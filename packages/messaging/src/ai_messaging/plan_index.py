@@ -0,0 +1,533 @@
+"""
+Secondary indexes for plans stored in Redis.
+
+Plans live as JSON strings at ``plan:{id}``. Listing them used to SCAN the
+whole keyspace and decode every plan of every user; these indexes make
+lookups proportional to the caller's own plans:
+
+- ``plans:user:{user_id}``, ``plans:conversation:{id}``,
+  ``plans:project:{id}``: sorted sets of plan IDs scored by ``updated_at``
+- ``plans:status:{status}``: set of plan IDs per status
+- ``plans:ids``: every plan ID at score 0, for prefix lookup of short IDs
+
+Every write goes through a Lua script that stores the document and moves
+its index entries in one atomic step, using the previously stored
+document to find stale entries. Writers that bypass this module leave the
+indexes stale until ``backfill`` runs again.
+
+Each write also bumps a ``version`` field on the document. ``update``
+patches individual fields or steps inside Redis, so frequent small changes
+(a step starting or finishing) neither ship the whole plan nor overwrite a
+concurrent change to another field; whole-document ``save`` calls can pass
+the version they read to refuse to overwrite newer changes.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import Any
+
+from ai_core import get_logger
+
+from .client import RedisClient
+
+logger = get_logger(__name__)
+
+# Bump when the index layout changes; startup re-runs the backfill
+INDEX_VERSION = "1"
+INDEX_VERSION_KEY = "plans:index:version"
+
+TERMINAL_STATUSES = ("completed", "cancelled", "failed")
+
+# Index keys are derived from the plan documents, so they cannot all be
+# declared in KEYS; fine for the single Redis instance plans live on.
+_INDEX_FUNCTIONS = """
+local function field(doc, name)
+    local value = doc[name]
+    if type(value) == 'string' and value ~= '' then return value end
+    return nil
+end
+
+local function unindex(id, doc)
+    local user = field(doc, 'user_id')
+    local conversation = field(doc, 'conversation_id')
+    local project = field(doc, 'project_id')
+    local status = field(doc, 'status')
+    if user then redis.call('ZREM', 'plans:user:' .. user, id) end
+    if conversation then redis.call('ZREM', 'plans:conversation:' .. conversation, id) end
+    if project then redis.call('ZREM', 'plans:project:' .. project, id) end
+    if status then redis.call('SREM', 'plans:status:' .. status, id) end
+end
+
+local function index(id, doc, score)
+    local user = field(doc, 'user_id')
+    local conversation = field(doc, 'conversation_id')
+    local project = field(doc, 'project_id')
+    local status = field(doc, 'status')
+    if user then redis.call('ZADD', 'plans:user:' .. user, score, id) end
+    if conversation then redis.call('ZADD', 'plans:conversation:' .. conversation, score, id) end
+    if project then redis.call('ZADD', 'plans:project:' .. project, score, id) end
+    if status then redis.call('SADD', 'plans:status:' .. status, id) end
+    redis.call('ZADD', 'plans:ids', 0, id)
+end
+
+-- cjson decodes [] and {} to the same empty table and encodes it back as
+-- {}, so empty arrays are swapped for a one-element marker array before
+-- decoding and restored after encoding to keep documents' shape.
+local EMPTY = 7357735773
+
+local function load(raw)
+    if not raw then return nil end
+    local ok, doc = pcall(cjson.decode, (string.gsub(raw, '%[%]', '[' .. EMPTY .. ']')))
+    if ok and type(doc) == 'table' then return doc end
+    return nil
+end
+
+local function dump(doc)
+    return (string.gsub(cjson.encode(doc), '%[' .. EMPTY .. '%]', '[]'))
+end
+
+local function items(list)
+    if type(list) ~= 'table' or (#list == 1 and list[1] == EMPTY) then return {} end
+    return list
+end
+"""
+
+# KEYS[1] = plan:{id}
+# ARGV[1] = plan id, ARGV[2] = plan JSON, ARGV[3] = updated_at score,
+# ARGV[4] = version the stored plan must be at, or '' to overwrite regardless
+# Returns the new version, or -1 if the stored version didn't match.
+SAVE_SCRIPT = _INDEX_FUNCTIONS + """
+local doc = load(ARGV[2])
+if not doc then return redis.error_reply('invalid plan document') end
+local old = load(redis.call('GET', KEYS[1]))
+local version = old and tonumber(old.version) or 0
+if ARGV[4] ~= '' and tonumber(ARGV[4]) ~= version then return -1 end
+if old then unindex(ARGV[1], old) end
+doc.version = version + 1
+redis.call('SET', KEYS[1], dump(doc))
+index(ARGV[1], doc, tonumber(ARGV[3]))
+return doc.version
+"""
+
+# KEYS[1] = plan:{id}
+# ARGV[1] = plan id, ARGV[2] = patch JSON (see PlanIndex.update),
+# ARGV[3] = now as ISO 8601, ARGV[4] = now as updated_at score
+# Returns JSON of the resulting version, status and derived fields, or nil
+# if the plan is missing or a precondition doesn't hold.
+UPDATE_SCRIPT = _INDEX_FUNCTIONS + """
+local doc = load(redis.call('GET', KEYS[1]))
+local patch = load(ARGV[2])
+if not doc or not patch then return nil end
+
+if patch.if_status then
+    local allowed = false
+    for _, status in ipairs(items(patch.if_status)) do
+        if status == doc.status then allowed = true end
+    end
+    if not allowed then return nil end
+end
+
+local before = {
+    user_id = doc.user_id, conversation_id = doc.conversation_id,
+    project_id = doc.project_id, status = doc.status,
+}
+
+local function push(name, value, unique)
+    local list = items(doc[name])
+    if #list == 0 then list = {} doc[name] = list end
+    if unique then
+        for _, existing in ipairs(list) do
+            if existing == value then return end
+        end
+    end
+    list[#list + 1] = value
+end
+
+for name, value in pairs(patch.set or {}) do doc[name] = value end
+
+local by_id = {}
+for _, step in ipairs(items(doc.steps)) do
+    if type(step) == 'table' and type(step.id) == 'string' then by_id[step.id] = step end
+end
+for id, changes in pairs(patch.steps or {}) do
+    local step = by_id[id]
+    if not step then return nil end
+    for name, value in pairs(changes) do step[name] = value end
+end
+
+for name, values in pairs(patch.append or {}) do
+    for _, value in ipairs(items(values)) do push(name, value, false) end
+end
+for name, values in pairs(patch.add_unique or {}) do
+    for _, value in ipairs(items(values)) do push(name, value, true) end
+end
+for _, step in ipairs(items(patch.add_steps)) do
+    push('steps', step, false)
+    step.order = #doc.steps
+end
+
+local steps = items(doc.steps)
+if patch.settle then
+    -- Same rules as PlanManager.update_step_status: the plan completes
+    -- once every step is completed or skipped, and fails with any step
+    local all_done = #steps > 0
+    for _, step in ipairs(steps) do
+        if step.status ~= 'completed' and step.status ~= 'skipped' then all_done = false end
+    end
+    for id, changes in pairs(patch.steps or {}) do
+        if changes.status == 'completed' then doc.current_step = by_id[id].order end
+    end
+    if all_done then
+        doc.status = 'completed'
+        doc.completed_at = ARGV[3]
+    end
+    for _, changes in pairs(patch.steps or {}) do
+        if changes.status == 'failed' then doc.status = 'failed' end
+    end
+end
+
+if patch.steps or patch.add_steps or (patch.set and patch.set.steps) then
+    local completed = 0
+    for _, step in ipairs(steps) do
+        if step.status == 'completed' then completed = completed + 1 end
+    end
+    doc.progress = #steps > 0 and completed / #steps * 100 or 0
+end
+
+doc.version = (tonumber(doc.version) or 0) + 1
+doc.updated_at = ARGV[3]
+unindex(ARGV[1], before)
+redis.call('SET', KEYS[1], dump(doc))
+index(ARGV[1], doc, tonumber(ARGV[4]))
+
+return cjson.encode({
+    version = doc.version,
+    status = doc.status,
+    conversation_id = doc.conversation_id,
+    current_step = doc.current_step,
+    progress = doc.progress,
+    completed_at = doc.completed_at,
+    updated_at = doc.updated_at,
+    step_count = #steps,
+})
+"""
+
+# KEYS[1] = plan:{id}, KEYS[2] = plan:{id}:history
+# ARGV[1] = plan id
+DELETE_SCRIPT = _INDEX_FUNCTIONS + """
+local old = load(redis.call('GET', KEYS[1]))
+if old then unindex(ARGV[1], old) end
+redis.call('ZREM', 'plans:ids', ARGV[1])
+return redis.call('DEL', KEYS[1], KEYS[2])
+"""
+
+# KEYS[1] = plan:{id}
+# ARGV[1] = plan id, ARGV[2] = updated_at score
+# Indexes whatever is stored now, so it cannot race a concurrent save.
+REINDEX_SCRIPT = _INDEX_FUNCTIONS + """
+local doc = load(redis.call('GET', KEYS[1]))
+if not doc then return 0 end
+index(ARGV[1], doc, tonumber(ARGV[2]))
+return 1
+"""
+
+# KEYS[1] = sorted set to list, newest first
+# ARGV[1] = offset, ARGV[2] = limit (-1 for all), ARGV[3] = project_id or '',
+# ARGV[4] = owning user_id or '', ARGV[5..] = statuses to keep (none = any)
+# Returns {total, id...}; filters by membership only, never reads documents.
+LIST_SCRIPT = """
+local offset = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local project = ARGV[3]
+local owner = ARGV[4]
+local statuses = {}
+for i = 5, #ARGV do statuses[#statuses + 1] = 'plans:status:' .. ARGV[i] end
+
+if project == '' and owner == '' and #statuses == 0 then
+    local total = redis.call('ZCARD', KEYS[1])
+    local stop = -1
+    if limit >= 0 then stop = offset + limit - 1 end
+    local page = {}
+    if limit ~= 0 then page = redis.call('ZREVRANGE', KEYS[1], offset, stop) end
+    table.insert(page, 1, total)
+    return page
+end
+
+local result = {0}
+local total = 0
+for _, id in ipairs(redis.call('ZREVRANGE', KEYS[1], 0, -1)) do
+    local keep = project == '' or redis.call('ZSCORE', 'plans:project:' .. project, id)
+    if keep and owner ~= '' then
+        keep = redis.call('ZSCORE', 'plans:user:' .. owner, id)
+    end
+    if keep and #statuses > 0 then
+        keep = false
+        for _, key in ipairs(statuses) do
+            if redis.call('SISMEMBER', key, id) == 1 then keep = true break end
+        end
+    end
+    if keep then
+        if total >= offset and (limit < 0 or total < offset + limit) then
+            result[#result + 1] = id
+        end
+        total = total + 1
+    end
+end
+result[1] = total
+return result
+"""
+
+_SCRIPTS = {
+    name: (script, hashlib.sha1(script.encode()).hexdigest())
+    for name, script in (
+        ("save", SAVE_SCRIPT),
+        ("update", UPDATE_SCRIPT),
+        ("delete", DELETE_SCRIPT),
+        ("reindex", REINDEX_SCRIPT),
+        ("list", LIST_SCRIPT),
+    )
+}
+
+
+class PlanConflictError(Exception):
+    """Raised when a plan changed since the version a save was based on."""
+    pass
+
+
+def plan_key(plan_id: str) -> str:
+    return f"plan:{plan_id}"
+
+
+def _timestamp(value: Any) -> float | None:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _score(plan: dict[str, Any]) -> float:
+    """Most recent timestamp on a plan document."""
+    stamps = [
+        _timestamp(plan.get(name))
+        for name in ("updated_at", "completed_at", "approved_at", "created_at")
+    ]
+    return max((s for s in stamps if s is not None), default=0.0)
+
+
+class PlanIndex:
+    """
+    Atomic plan writes and field-level updates, plus indexed listing and
+    short-ID lookup.
+
+    Example:
+        index = PlanIndex(redis)
+        await index.save(plan.to_dict())
+        await index.update(plan_id, steps={step_id: {"status": "completed"}}, settle=True)
+        plans, total = await index.list_for_user(user_id, statuses=["paused"], limit=20)
+    """
+
+    def __init__(self, redis: RedisClient):
+        self.redis = redis
+
+    async def _run(self, name: str, keys: list[str], *args: str | int | float) -> Any:
+        script, sha = _SCRIPTS[name]
+        return await self.redis.evalsha(sha, len(keys), *keys, *args, script=script)
+
+    async def save(self, plan: dict[str, Any], expected_version: int | None = None) -> int:
+        """
+        Store a whole plan document, stamping ``updated_at`` and bumping
+        ``version``, and update its indexes.
+
+        Args:
+            plan: Plan document; ``updated_at`` and ``version`` are set on it
+            expected_version: Only write if the stored plan is still at this
+                version (0 for a plan that isn't stored yet)
+
+        Returns:
+            The plan's new version
+
+        Raises:
+            PlanConflictError: The stored plan is at a different version
+        """
+        now = datetime.now(timezone.utc)
+        plan["updated_at"] = now.isoformat()
+        version = await self._run(
+            "save",
+            [plan_key(plan["id"])],
+            plan["id"],
+            json.dumps(plan),
+            now.timestamp(),
+            "" if expected_version is None else expected_version,
+        )
+        if version < 0:
+            raise PlanConflictError(
+                f"Plan {plan['id']} changed since version {expected_version}"
+            )
+        plan["version"] = version
+        return version
+
+    async def update(
+        self,
+        plan_id: str,
+        fields: dict[str, Any] | None = None,
+        steps: dict[str, dict[str, Any]] | None = None,
+        append: dict[str, list[Any]] | None = None,
+        add_unique: dict[str, list[Any]] | None = None,
+        add_steps: list[dict[str, Any]] | None = None,
+        if_status: list[str] | None = None,
+        settle: bool = False,
+    ) -> dict[str, Any] | None:
+        """
+        Change individual fields of a stored plan in one atomic step.
+
+        Only the changes travel to Redis, which patches the stored document,
+        bumps its version, stamps ``updated_at`` and moves its index entries.
+        Concurrent updates to different fields or steps don't overwrite
+        each other.
+
+        Args:
+            fields: Top-level fields to set
+            steps: Fields to set per step ID; nothing is written if a step
+                doesn't exist
+            append: Values to append to list fields
+            add_unique: Values to add to list fields unless already present
+            add_steps: Steps to append, numbered after the existing ones
+            if_status: Only apply while the plan has one of these statuses
+            settle: Derive the plan's status, ``completed_at`` and
+                ``current_step`` from its step statuses
+
+        Returns:
+            The plan's new ``version``, ``status``, ``progress``,
+            ``current_step``, ``step_count`` and timestamps, or None if
+            the plan doesn't exist or a condition didn't hold
+        """
+        patch: dict[str, Any] = {
+            name: value
+            for name, value in (
+                ("set", fields),
+                ("steps", steps),
+                ("append", append),
+                ("add_unique", add_unique),
+                ("add_steps", add_steps),
+                ("if_status", if_status),
+            )
+            if value
+        }
+        if settle:
+            patch["settle"] = True
+
+        now = datetime.now(timezone.utc)
+        result = await self._run(
+            "update", [plan_key(plan_id)], plan_id, json.dumps(patch), now.isoformat(), now.timestamp()
+        )
+        return json.loads(result) if result else None
+
+    async def delete(self, plan_id: str) -> bool:
+        """Delete a plan, its history and its index entries."""
+        deleted = await self._run(
+            "delete", [plan_key(plan_id), f"{plan_key(plan_id)}:history"], plan_id
+        )
+        return bool(deleted)
+
+    async def resolve_id(self, prefix: str) -> str | None:
+        """Full ID for an unambiguous ID prefix, or None."""
+        if not prefix or any(c in prefix for c in "[]()"):
+            return None
+        matches = await self.redis.zrangebylex("plans:ids", f"[{prefix}", f"[{prefix}\xff", 0, 2)
+        if len(matches) > 1:
+            logger.debug("Ambiguous plan ID prefix", prefix=prefix, matches=matches)
+            return None
+        return matches[0] if matches else None
+
+    async def list_ids(
+        self,
+        index_key: str,
+        statuses: list[str] | None = None,
+        project_id: str | None = None,
+        offset: int = 0,
+        limit: int = -1,
+        user_id: str | None = None,
+    ) -> tuple[list[str], int]:
+        """
+        Plan IDs in an index, newest first, with the total matching count.
+
+        ``user_id`` keeps only that user's plans, for indexes shared between
+        users such as a conversation's.
+        """
+        result = await self._run(
+            "list", [index_key], offset, limit, project_id or "", user_id or "", *(statuses or [])
+        )
+        return [str(plan_id) for plan_id in result[1:]], int(result[0])
+
+    async def get_many(self, plan_ids: list[str]) -> list[dict[str, Any]]:
+        """Decode several plan documents in one round trip, skipping missing ones."""
+        plans = []
+        for plan_id, raw in zip(plan_ids, await self.redis.mget([plan_key(i) for i in plan_ids])):
+            if raw is None:
+                continue
+            try:
+                plans.append(json.loads(raw))
+            except json.JSONDecodeError:
+                logger.warning("Skipping undecodable plan", plan_id=plan_id)
+        return plans
+
+    async def list_for_user(
+        self,
+        user_id: str,
+        statuses: list[str] | None = None,
+        project_id: str | None = None,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """One page of a user's plans, most recently updated first."""
+        ids, total = await self.list_ids(
+            f"plans:user:{user_id}", statuses, project_id, offset, limit
+        )
+        return await self.get_many(ids), total
+
+    async def list_for_conversation(
+        self,
+        conversation_id: str,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """One page of a conversation's plans, most recently updated first."""
+        ids, total = await self.list_ids(
+            f"plans:conversation:{conversation_id}", offset=offset, limit=limit
+        )
+        return await self.get_many(ids), total
+
+    async def backfill(self, batch_size: int = 500) -> int:
+        """
+        Index every stored plan. Safe to run while plans are being written
+        and to repeat; run once after upgrading and whenever writers that
+        bypass ``save`` may have left indexes stale.
+        """
+        indexed = 0
+        cursor = 0
+        while True:
+            cursor, keys = await self.redis.scan(cursor=cursor, match="plan:*", count=batch_size)
+            plan_ids = [key[len("plan:"):] for key in keys if ":" not in key[len("plan:"):]]
+            for plan in await self.get_many(plan_ids):
+                if plan.get("id"):
+                    indexed += await self._run(
+                        "reindex", [plan_key(plan["id"])], plan["id"], _score(plan)
+                    )
+            if cursor == 0:
+                break
+
+        await self.redis.set(INDEX_VERSION_KEY, INDEX_VERSION)
+        logger.info("Plan indexes backfilled", plans=indexed)
+        return indexed
+
+    async def ensure_backfilled(self) -> int:
+        """Run ``backfill`` unless the current index version is already built."""
+        if await self.redis.get(INDEX_VERSION_KEY) == INDEX_VERSION:
+            return 0
+        return await self.backfill()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Content router benchmark.
+
+Routes distinct prompts through ``ContentRouter`` at several concurrency
+levels and reports p50/p99 routing overhead per request, comparing one
+forward pass and thread hop per request (how requests were routed before)
+with the micro-batching worker. Behaviour is covered by
+``tests/unit/test_content_router.py`` and ``tests/unit/test_router_export.py``.
+
+Uses the bundle in ``--export-dir`` (see ``train_content_router.py
+export``); without one, builds a small synthetic bundle (a tokenizer
+trained on the router training queries and a stack of dense layers as
+the encoder), which needs the ``onnx`` package.
+
+Usage:
+    python scripts/bench_content_router.py
+    python scripts/bench_content_router.py --export-dir /home/wyld-core/config/router/export
+    python scripts/bench_content_router.py --concurrency 1 16 64 --requests 512 --layers 8
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add packages to path
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "packages" / "core" / "src"))
+
+from ai_core.content_router import ContentRouter
+from ai_core.router_inference import (
+    ENCODER_FILE,
+    HEAD_FILE,
+    MAX_INPUT_TOKENS,
+    TOKENIZER_FILE,
+    ExportedRouter,
+)
+
+HIDDEN = 768
+# Encoder lengths in the synthetic bundle
+LENGTHS = (64, 128, 256, 512, MAX_INPUT_TOKENS)
+
+
+def training_queries() -> list[str]:
+    path = ROOT / "config" / "router" / "training_data.jsonl"
+    queries: list[str] = []
+    with open(path) as f:
+        for line in f:
+            query = json.loads(line)["query"]
+            if not queries or queries[-1] != query:
+                queries.append(query)
+    return queries
+
+
+def build_synthetic_bundle(directory: Path, queries: list[str], layers: int) -> None:
+    """A tokenizer, a dense-layer encoder per length and a random head in bundle format."""
+    import onnx
+    from onnx import TensorProto, helper, numpy_helper
+    from tokenizers import Tokenizer, models, pre_tokenizers, processors, trainers
+
+    tokenizer = Tokenizer(models.WordLevel(unk_token="<unk>"))
+    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    tokenizer.train_from_iterator(
+        queries, trainers.WordLevelTrainer(special_tokens=["<pad>", "<unk>", "<s>", "</s>"])
+    )
+    tokenizer.post_processor = processors.TemplateProcessing(
+        single="<s> $A </s>", special_tokens=[("<s>", 2), ("</s>", 3)]
+    )
+    tokenizer.save(str(directory / TOKENIZER_FILE))
+
+    rng = np.random.default_rng(7)
+    vocab = tokenizer.get_vocab_size()
+    initializers = [
+        numpy_helper.from_array(rng.normal(0, 0.5, (vocab, HIDDEN)).astype(np.float32), "embeddings"),
+        numpy_helper.from_array(np.array([-1], dtype=np.int64), "last_axis"),
+    ]
+    nodes = [
+        helper.make_node("Gather", ["embeddings", "input_ids"], ["x0"]),
+        helper.make_node("Cast", ["attention_mask"], ["mask_f"], to=TensorProto.FLOAT),
+        helper.make_node("Unsqueeze", ["mask_f", "last_axis"], ["mask"]),
+    ]
+    for n in range(layers):
+        weight = rng.normal(0, 1 / np.sqrt(HIDDEN), (HIDDEN, HIDDEN)).astype(np.float32)
+        initializers.append(numpy_helper.from_array(weight, f"w{n}"))
+        nodes.append(helper.make_node("MatMul", [f"x{n}", f"w{n}"], [f"h{n}"]))
+        nodes.append(helper.make_node("Tanh", [f"h{n}"], [f"x{n + 1}"]))
+    nodes.append(helper.make_node("Mul", [f"x{layers}", "mask"], ["last_hidden_state"]))
+
+    graph = helper.make_graph(
+        nodes,
+        "synthetic_encoder",
+        [
+            helper.make_tensor_value_info("input_ids", TensorProto.INT64, ["batch", "sequence"]),
+            helper.make_tensor_value_info("attention_mask", TensorProto.INT64, ["batch", "sequence"]),
+        ],
+        [helper.make_tensor_value_info("last_hidden_state", TensorProto.FLOAT, ["batch", "sequence", HIDDEN])],
+        initializers,
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 17)])
+    # Newer onnx releases stamp an IR version older runtimes reject; opset 17
+    # only needs IR 8
+    model.ir_version = 8
+    # Dense layers take any length; saved once per length like a Longformer export
+    for length in LENGTHS:
+        onnx.save(model, str(directory / ENCODER_FILE.format(length=length)))
+
+    np.savez(
+        directory / HEAD_FILE,
+        head=rng.normal(size=(HIDDEN, 3)).astype(np.float32),
+        model_names=np.array(["fast", "balanced", "powerful"]),
+        pad_token_id=np.array(tokenizer.token_to_id("<pad>")),
+    )
+
+
+def prompts_for(queries: list[str], count: int, offset: int) -> list[str]:
+    """Distinct prompts of varied length, so none hit the cache."""
+    return [
+        " ".join(queries[(offset + n + k) % len(queries)] for k in range(1 + n % 6)) + f" #{offset + n}"
+        for n in range(count)
+    ]
+
+
+def percentiles(samples: list[float]) -> tuple[float, float]:
+    ordered = sorted(samples)
+    return statistics.median(ordered) * 1000, ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000
+
+
+async def per_request(router: ExportedRouter, text: str) -> float:
+    """How requests were routed before: a forward pass and thread hop each."""
+    start = time.perf_counter()
+    await asyncio.to_thread(router.route_batch, [text])
+    return time.perf_counter() - start
+
+
+async def batched(content_router: ContentRouter, text: str) -> float:
+    start = time.perf_counter()
+    await content_router.route([{"role": "user", "content": text}])
+    return time.perf_counter() - start
+
+
+async def run_level(fn, texts: list[str], concurrency: int) -> tuple[list[float], float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    samples: list[float] = []
+
+    async def one(text: str) -> None:
+        async with semaphore:
+            samples.append(await fn(text))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(t) for t in texts))
+    return samples, time.perf_counter() - start
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the batched content router")
+    parser.add_argument("--export-dir", default=None, help="Exported router bundle (default: synthetic)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64], help="Concurrent requests")
+    parser.add_argument("--requests", type=int, default=256, help="Requests per concurrency level")
+    parser.add_argument("--layers", type=int, default=4, help="Dense layers in the synthetic encoder")
+    args = parser.parse_args()
+
+    queries = training_queries()
+    with tempfile.TemporaryDirectory() as tmp:
+        export_dir = Path(args.export_dir) if args.export_dir else Path(tmp)
+        if not args.export_dir:
+            build_synthetic_bundle(export_dir, queries, args.layers)
+
+        router = ExportedRouter.load(export_dir)
+        content_router = ContentRouter(export_dir=str(export_dir))
+        content_router._cost_tracking_enabled = False
+
+        texts = prompts_for(queries, 64, 0)
+        words = sum(len(t.split()) * 1.3 for t in texts)
+        tokens = sum(count for _, count in router.route_batch(texts))
+        print(f"tokens: {tokens} counted vs {words:.0f} estimated as words x 1.3")
+
+        print(f"\n== routing overhead, {args.requests} distinct prompts per level ==")
+        offset = 1000
+        for concurrency in args.concurrency:
+            old_samples, old_total = await run_level(
+                lambda t: per_request(router, t), prompts_for(queries, args.requests, offset), concurrency
+            )
+            offset += args.requests
+            routed_before = content_router._batcher.routed
+            batches_before = content_router._batcher.batches
+            new_samples, new_total = await run_level(
+                lambda t: batched(content_router, t), prompts_for(queries, args.requests, offset), concurrency
+            )
+            offset += args.requests
+            batches = content_router._batcher.batches - batches_before
+            routed = content_router._batcher.routed - routed_before
+            old_p50, old_p99 = percentiles(old_samples)
+            new_p50, new_p99 = percentiles(new_samples)
+            print(f"  concurrency {concurrency}:")
+            print(f"    pass per request: p50 {old_p50:8.2f} ms  p99 {old_p99:8.2f} ms  "
+                  f"{args.requests / old_total:7.0f} req/s")
+            print(f"    micro-batched:    p50 {new_p50:8.2f} ms  p99 {new_p99:8.2f} ms  "
+                  f"{args.requests / new_total:7.0f} req/s  ({routed / max(batches, 1):.1f} per batch)")
+
+        await content_router._batcher.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
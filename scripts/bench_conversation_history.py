@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Conversation history benchmark.
+
+Seeds a long conversation in the old layout (one ``message:{id}`` hash per
+message, listed newest first in ``conversation:{id}:messages``) into a live
+Redis (configured through the usual REDIS_* environment variables),
+converts it with ``backfill`` and compares loading the last messages the
+old way, LRANGE followed by one HGETALL per message, with
+``ConversationHistory.recent``: time per load and commands sent. It also
+reports the commands per append.
+
+The seeded conversation is deleted afterwards. The backfill, appends,
+loader fallback and token budgets are tested in
+tests/unit/test_conversation_history.py.
+
+Usage:
+    REDIS_HOST=localhost python scripts/bench_conversation_history.py
+    python scripts/bench_conversation_history.py --messages 1000 --limit 50 --rounds 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+# Add packages to path
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "packages" / "core" / "src"))
+sys.path.insert(0, str(ROOT / "packages" / "messaging" / "src"))
+
+from ai_messaging import ConversationHistory, RedisClient
+
+
+class CommandCounter:
+    """Counts commands sent through a RedisClient."""
+
+    def __init__(self, redis: RedisClient):
+        self.count = 0
+        client = redis.client
+        execute = client.execute_command
+
+        async def counted(*args: Any, **kwargs: Any) -> Any:
+            self.count += 1
+            return await execute(*args, **kwargs)
+
+        client.execute_command = counted  # type: ignore[method-assign]
+
+
+def make_message(conversation_id: str, n: int, size: int) -> dict[str, str]:
+    return {
+        "id": str(uuid.uuid4()),
+        "conversation_id": conversation_id,
+        "user_id": "bench-user",
+        "role": "user" if n % 2 == 0 else "assistant",
+        "content": f"message {n} " + "x" * size,
+        "timestamp": f"2026-10-18T00:{n // 60 % 60:02d}:{n % 60:02d}+00:00",
+    }
+
+
+async def seed_legacy(redis: RedisClient, conversation_id: str, count: int, size: int) -> list[dict]:
+    """Store a conversation the way it was stored before packed history."""
+    messages = [make_message(conversation_id, n, size) for n in range(count)]
+    for msg in messages:
+        await redis.hset(f"message:{msg['id']}", mapping=msg)
+        await redis.lpush(f"conversation:{conversation_id}:messages", msg["id"])
+    return messages
+
+
+async def legacy_recent(redis: RedisClient, conversation_id: str, limit: int) -> list[dict]:
+    """How history was loaded before: LRANGE, then one HGETALL per message."""
+    ids = await redis.lrange(f"conversation:{conversation_id}:messages", 0, limit - 1)
+    messages = []
+    for msg_id in reversed(ids):
+        data = await redis.hgetall(f"message:{msg_id}")
+        if data:
+            messages.append(data)
+    return messages
+
+
+async def timed(rounds: int, fn) -> float:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark packed conversation history")
+    parser.add_argument("--messages", type=int, default=300, help="Messages in the seeded conversation")
+    parser.add_argument("--limit", type=int, default=20, help="Messages loaded per chat turn")
+    parser.add_argument("--size", type=int, default=400, help="Characters per message")
+    parser.add_argument("--rounds", type=int, default=100, help="Timed loads per method")
+    args = parser.parse_args()
+
+    redis = RedisClient()
+    await redis.connect()
+    counter = CommandCounter(redis)
+    conversation_id = f"bench-{uuid.uuid4()}"
+    history = ConversationHistory(redis)
+
+    try:
+        print(f"== last {args.limit} of {args.messages} messages ==")
+        await seed_legacy(redis, conversation_id, args.messages, args.size)
+
+        counter.count = 0
+        await legacy_recent(redis, conversation_id, args.limit)
+        old_commands = counter.count
+        old_ms = await timed(args.rounds, lambda: legacy_recent(redis, conversation_id, args.limit))
+
+        await history.backfill()
+
+        counter.count = 0
+        await history.recent(conversation_id, limit=args.limit)
+        new_commands = counter.count
+        new_ms = await timed(args.rounds, lambda: history.recent(conversation_id, limit=args.limit))
+
+        print(f"    LRANGE + HGETALL each: {old_ms:8.3f} ms, {old_commands} commands")
+        print(f"    packed history:        {new_ms:8.3f} ms, {new_commands} command(s)")
+
+        print("\n== appends ==")
+        extra = [make_message(conversation_id, args.messages + n, args.size) for n in range(5)]
+        counter.count = 0
+        for msg in extra:
+            await history.append(conversation_id, msg)
+        print(f"    {counter.count / len(extra):.0f} command(s) per append")
+    finally:
+        await history.clear(conversation_id)
+        await redis.delete(f"conversation:{conversation_id}")
+        await redis.disconnect()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+GitHub API client benchmark.
+
+Runs a fake GitHub API locally (aiohttp, plain HTTP) that serves pull
+requests with ETags, Link pagination and rate limit headers,
+counting connections, requests and rate limit use the way GitHub does:
+304 answers to conditional requests are free.
+
+Compares the previous access pattern (a new session per call, every call
+a full request) with ``GitHubService`` on the shared ``GitHubAPIClient``,
+reporting time, rate limit use and connections, and the time for a
+paginated listing fetched concurrently.
+
+The cache, rate limit and paging behaviour is tested in
+tests/unit/test_github_cache.py.
+
+Usage:
+    python scripts/bench_github_cache.py
+    python scripts/bench_github_cache.py --calls 200 --latency-ms 50 --pulls 450
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import sys
+import time
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+
+# Add packages to path
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "packages" / "core" / "src"))
+sys.path.insert(0, str(ROOT / "packages" / "messaging" / "src"))
+sys.path.insert(0, str(ROOT / "services" / "api" / "src"))
+
+from api.services.github_service import GitHubAPIClient, GitHubService
+
+
+class FakeGitHub:
+    """Just enough of the GitHub REST API for the listing endpoints."""
+
+    def __init__(self, pulls: int, latency: float, limit: int = 5000):
+        self.latency = latency
+        self.limit = limit
+        self.remaining: dict[str, int] = {}
+        self.reset = int(time.time()) + 3600
+        self.requests = 0
+        self.not_modified = 0
+        self.connections: set = set()
+        self.pulls = [self._pull(n) for n in range(1, pulls + 1)]
+
+    @staticmethod
+    def _pull(number: int) -> dict:
+        return {
+            "number": number,
+            "title": f"PR {number}",
+            "body": "x" * 500,
+            "state": "open",
+            "head": {"ref": f"feature-{number}"},
+            "base": {"ref": "main"},
+            "html_url": f"https://github.com/o/r/pull/{number}",
+            "created_at": "2026-01-01T00:00:00Z",
+            "user": {"login": "bench"},
+            "draft": False,
+        }
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/repos/{owner}/{repo}/pulls", self.list_pulls)
+        return app
+
+    async def list_pulls(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        self.connections.add(request.transport.get_extra_info("peername"))
+        await asyncio.sleep(self.latency)
+
+        token = request.headers.get("Authorization", "")
+        remaining = self.remaining.setdefault(token, self.limit)
+        per_page = int(request.query.get("per_page", 30))
+        page = int(request.query.get("page", 1))
+        items = self.pulls[(page - 1) * per_page:page * per_page]
+        body = json.dumps(items)
+        etag = f'"{hashlib.sha1(body.encode()).hexdigest()}"'
+
+        headers = {"ETag": etag, "X-RateLimit-Reset": str(self.reset)}
+        last = max(1, -(-len(self.pulls) // per_page))
+        if last > 1:
+            base = f"{request.url.with_query(None)}?state=open&per_page={per_page}"
+            links = [f'<{base}&page={last}>; rel="last"']
+            if page < last:
+                links.insert(0, f'<{base}&page={page + 1}>; rel="next"')
+            headers["Link"] = ", ".join(links)
+
+        if request.headers.get("If-None-Match") == etag:
+            self.not_modified += 1
+            headers["X-RateLimit-Remaining"] = str(remaining)
+            return web.Response(status=304, headers=headers)
+
+        if remaining <= 0:
+            headers["X-RateLimit-Remaining"] = "0"
+            return web.json_response({"message": "API rate limit exceeded"}, status=403, headers=headers)
+        self.remaining[token] = remaining - 1
+        headers["X-RateLimit-Remaining"] = str(remaining - 1)
+        return web.Response(text=body, content_type="application/json", headers=headers)
+
+    def used(self, pat: str) -> int:
+        return self.limit - self.remaining.get(f"token {pat}", self.limit)
+
+
+async def old_list_pulls(base_url: str, pat: str) -> list[dict]:
+    """The previous pattern: a new session per call, an unconditional request."""
+    async with aiohttp.ClientSession() as session:
+        async with session.get(
+            f"{base_url}/repos/o/r/pulls",
+            headers={"Authorization": f"token {pat}"},
+            params={"state": "open", "per_page": 30},
+        ) as resp:
+            return await resp.json()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the cached GitHub client")
+    parser.add_argument("--calls", type=int, default=100, help="Repeated listing calls")
+    parser.add_argument("--pulls", type=int, default=250, help="Open pull requests in the fake repo")
+    parser.add_argument("--latency-ms", type=float, default=20, help="Fake server latency per request")
+    args = parser.parse_args()
+
+    fake = FakeGitHub(args.pulls, args.latency_ms / 1000)
+    runner = web.AppRunner(fake.app())
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    base_url = f"http://127.0.0.1:{runner.addresses[0][1]}"
+
+    api = GitHubAPIClient(base_url=base_url)
+    service = GitHubService(redis=None, api=api)
+    pages = -(-args.pulls // 100)
+
+    try:
+        print(f"== {args.calls} pull request listings, {args.latency_ms:.0f} ms latency ==")
+        start = time.perf_counter()
+        for _ in range(args.calls):
+            await old_list_pulls(base_url, "old-pat")
+        old_time = time.perf_counter() - start
+        old_connections = len(fake.connections)
+
+        fake.connections.clear()
+        fake.requests = 0
+        start = time.perf_counter()
+        for _ in range(args.calls):
+            await service.list_pull_requests("new-pat", "o", "r", max_pages=pages)
+        new_time = time.perf_counter() - start
+
+        print(f"    session per call, 30 per call: {old_time * 1000:8.0f} ms, "
+              f"{fake.used('old-pat')} rate limit, {old_connections} connections")
+        print(f"    shared client, all {args.pulls}:    {new_time * 1000:8.0f} ms, "
+              f"{fake.used('new-pat')} rate limit, {len(fake.connections)} connections")
+
+        print(f"\n== pagination across {pages} pages ==")
+        fake.latency = 0.1
+        api._cache.clear()
+        start = time.perf_counter()
+        await service.list_pull_requests("page-pat", "o", "r", max_pages=pages)
+        elapsed = time.perf_counter() - start
+        print(f"    {elapsed * 1000:.0f} ms vs {0.1 * pages * 1000:.0f} ms one page after another")
+    finally:
+        await api.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
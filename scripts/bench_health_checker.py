@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Domain health checker benchmark.
+
+Serves many fake domains from a local TLS server (self-signed, generated
+with the openssl CLI) that answers after a fixed delay, and compares a
+sweep of the old sequential checker (a new client per domain, then a one
+second pause) with a concurrent sweep of ``HealthCheckerService`` sharing
+one client. The sequential sweep is timed on a sample and extrapolated.
+It also counts connections opened when the same domains are rechecked.
+
+The database is not touched; results are printed, not stored. Scheduling,
+connection reuse and SSRF refusal are tested in
+tests/unit/test_health_checker.py.
+
+Usage:
+    python scripts/bench_health_checker.py
+    python scripts/bench_health_checker.py --domains 1000 --delay-ms 200 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import ssl
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add packages to path
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "packages" / "core" / "src"))
+sys.path.insert(0, str(ROOT / "packages" / "messaging" / "src"))
+sys.path.insert(0, str(ROOT / "services" / "api" / "src"))
+
+from api.services.health_checker import (
+    DNSCache,
+    HealthCheckerService,
+    _CachedDNSBackend,
+    check_domain_health,
+    create_probe_client,
+)
+
+class FakeDomains:
+    """TLS server answering for every host; hosts starting with ``down-`` return 503."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.connections = 0
+        self.requests = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                self.requests += 1
+                host = next(
+                    (line.split(b":", 1)[1].strip() for line in head.split(b"\r\n")
+                     if line.lower().startswith(b"host:")),
+                    b"",
+                )
+                await asyncio.sleep(self.delay)
+                status = b"503 Service Unavailable" if host.startswith(b"down-") else b"200 OK"
+                writer.write(b"HTTP/1.1 " + status + b"\r\nContent-Length: 2\r\n\r\nok")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, OSError):
+            pass
+        finally:
+            writer.close()
+
+
+class LocalDNS(DNSCache):
+    """Every name resolves to the public-looking address the bench maps to localhost."""
+
+    async def _lookup(self, host: str) -> str | None:  # noqa: ARG002
+        return "203.0.113.1"
+
+
+class LocalBackend(_CachedDNSBackend):
+    def __init__(self, dns: DNSCache, port: int):
+        super().__init__(dns)
+        self.port = port
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):  # noqa: ARG002
+        await self._dns.resolve(host)
+        return await self._backend.connect_tcp("127.0.0.1", self.port, timeout=timeout)
+
+
+def make_server_context(directory: str) -> ssl.SSLContext:
+    cert, key = f"{directory}/cert.pem", f"{directory}/key.pem"
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=bench.test", "-keyout", key, "-out", cert],
+        check=True,
+        capture_output=True,
+    )
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    return context
+
+
+async def sequential_sweep(names: list[str], dns: DNSCache, port: int) -> float:
+    """The old loop: a new client per domain, then a one second pause."""
+    start = time.perf_counter()
+    for name in names:
+        async with create_probe_client(dns, 1, LocalBackend(dns, port)) as client:
+            await check_domain_health(name, client)
+        await asyncio.sleep(1)
+    return time.perf_counter() - start
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the domain health checker")
+    parser.add_argument("--domains", type=int, default=500, help="Fake domains to check")
+    parser.add_argument("--down-ratio", type=float, default=0.1, help="Share of domains returning 503")
+    parser.add_argument("--delay-ms", type=float, default=100, help="Server response delay")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent probes")
+    parser.add_argument("--sample", type=int, default=10, help="Domains timed for the sequential sweep")
+    args = parser.parse_args()
+
+    fake = FakeDomains(args.delay_ms / 1000)
+    with tempfile.TemporaryDirectory() as directory:
+        server = await asyncio.start_server(
+            fake.handle, "127.0.0.1", 0, ssl=make_server_context(directory)
+        )
+    port = server.sockets[0].getsockname()[1]
+
+    down_every = max(1, round(1 / args.down_ratio)) if args.down_ratio else 0
+    domains = {
+        f"domain-{n}": f"{'down-' if down_every and n % down_every == 0 else ''}site-{n}.test"
+        for n in range(args.domains)
+    }
+
+    dns = LocalDNS()
+    client = create_probe_client(dns, args.concurrency, LocalBackend(dns, port))
+    service = HealthCheckerService(client=client, max_concurrent=args.concurrency)
+    service._running = True
+
+    try:
+        print(f"== one sweep of {args.domains} domains, {args.delay_ms:.0f} ms responses ==")
+        sample = list(domains.values())[: args.sample]
+        sequential = await sequential_sweep(sample, dns, port) / len(sample) * len(domains)
+
+        service.sync_schedule(domains)
+        due = service.due_domains()
+        start = time.perf_counter()
+        results = await service.check_domains(due)
+        concurrent = time.perf_counter() - start
+
+        print(f"    sequential (extrapolated): {sequential:8.1f} s")
+        print(f"    concurrent:                {concurrent:8.1f} s")
+        down = sum(r["health_status"] == "down" for r in results)
+        print(f"    {sequential / concurrent:.0f}x shorter; {len(results) - down} up, {down} down")
+
+        print("\n== connection reuse ==")
+        recheck = dict(list(domains.items())[: args.concurrency])
+        await service.check_domains(recheck)
+        connections = fake.connections
+        await service.check_domains(recheck)
+        opened = fake.connections - connections
+        print(f"    {opened} new connections rechecking {len(recheck)} domains")
+    finally:
+        await client.aclose()
+        await asyncio.sleep(0.1)  # Let handlers see the connections close
+        server.close()
+        await server.wait_closed()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
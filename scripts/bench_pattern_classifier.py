@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Pattern classifier benchmark.
+
+Classifies a prompt corpus (the router training queries, alone and joined
+into longer multi-part messages) the way TaskRouter, the task complexity
+classifier and the prompt tier classifier did before, one keyword loop
+each, and with the shared single-pass classifier. Timings cover the three
+consumers end to end, and keyword matching alone as the keyword sets grow
+(extra categories of word pairs from the corpus). Behaviour is covered by
+``tests/unit/test_pattern_classifier.py``.
+
+Usage:
+    python scripts/bench_pattern_classifier.py
+    python scripts/bench_pattern_classifier.py --rounds 10
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add packages to path
+ROOT = Path(__file__).parent.parent
+for src in sorted((ROOT / "packages").glob("*/src")):
+    sys.path.insert(0, str(src))
+sys.path.insert(0, str(ROOT / "services" / "supervisor" / "src"))
+
+from supervisor.router import TASK_PATTERNS, RoutingDecision, RoutingStrategy, TaskRouter
+
+from ai_core import AgentType, configure_logging, get_logger, pattern_classifier
+from ai_core.model_selector import PromptTier
+from ai_core.pattern_classifier import PatternClassifier, _Automaton, get_pattern_classifier
+from ai_core.prompt_tier import PromptTierClassifier, TaskCategory
+from ai_core.task_complexity_classifier import (
+    COMPLEX_PATTERNS,
+    DIRECT_PATTERNS,
+    PLAN_WORTHY_PATTERNS,
+    ClassificationResult,
+    ExecutionMode,
+    TaskComplexityClassifier,
+)
+
+logger = get_logger(__name__)
+
+
+def build_corpus() -> list[str]:
+    """Distinct training queries, then multi-part messages built from them."""
+    queries: list[str] = []
+    with open(ROOT / "config" / "router" / "training_data.jsonl") as f:
+        for line in f:
+            query = json.loads(line)["query"]
+            if not queries or queries[-1] != query:
+                queries.append(query)
+    combined = [
+        " ".join(queries[(n * 7 + k) % len(queries)] for k in range(parts))
+        for n in range(len(queries))
+        for parts in (3, 12)
+    ]
+    return queries + combined
+
+
+# How each consumer classified before, one keyword loop at a time
+
+
+def legacy_plan_worthy(task_description: str) -> tuple[bool, str]:
+    task_lower = task_description.lower().strip()
+    matched_patterns = [p for p in PLAN_WORTHY_PATTERNS if p.lower() in task_lower]
+    if matched_patterns:
+        reason = f"Task matches plan-worthy patterns: {', '.join(matched_patterns[:3])}"
+        logger.debug(f"Suggesting plan mode: {reason}")
+        return True, reason
+    if len(task_lower.split()) > 30:
+        return True, "Task description is lengthy, suggesting plan mode for clarity"
+    if task_lower.count(" and ") >= 3:
+        return True, "Task has multiple components connected with 'and'"
+    for q in ["how should", "what's the best way", "how do i", "where should"]:
+        if q in task_lower:
+            return True, f"Task is asking for approach guidance: '{q}'"
+    return False, ""
+
+
+def legacy_task_complexity(task_description: str) -> ClassificationResult:
+    task_lower = task_description.lower().strip()
+    suggest_plan, plan_reason = legacy_plan_worthy(task_description)
+    if suggest_plan:
+        return ClassificationResult(ExecutionMode.PLAN, True, 0.85, plan_reason)
+    for pattern in DIRECT_PATTERNS:
+        if pattern.lower() in task_lower:
+            logger.debug(f"Task matched direct pattern: {pattern}")
+            return ClassificationResult(ExecutionMode.DIRECT, False, 0.9, f"Matched direct pattern: {pattern}")
+    for pattern in COMPLEX_PATTERNS:
+        if pattern.lower() in task_lower:
+            logger.debug(f"Task matched complex pattern: {pattern}")
+            return ClassificationResult(ExecutionMode.COMPLEX, False, 0.85, f"Matched complex pattern: {pattern}")
+    words = task_lower.split()
+    if len(words) <= 5 and not any(p in task_lower for p in ["how", "why", "what", "should"]):
+        if words and words[0] in ["run", "execute", "start", "stop", "restart", "build", "test"]:
+            return ClassificationResult(ExecutionMode.DIRECT, False, 0.8, "Short imperative command")
+    return ClassificationResult(
+        ExecutionMode.COMPLEX, False, 0.6, "No pattern match, defaulting to complex for safety"
+    )
+
+
+def legacy_prompt_tier(message: str, tools_count: int, has_context: bool) -> tuple[PromptTier, TaskCategory]:
+    msg_lower = message.lower()
+    msg_len = len(message)
+    if msg_len < 50 and tools_count == 0:
+        return PromptTier.MINIMAL, TaskCategory.CHAT
+    if any(kw in msg_lower for kw in PromptTierClassifier.COMPLEX_KEYWORDS):
+        return PromptTier.FULL, TaskCategory.COMPLEX
+    if any(kw in msg_lower for kw in PromptTierClassifier.CODE_KEYWORDS):
+        if msg_len > 500 or tools_count > 5:
+            return PromptTier.FULL, TaskCategory.WRITE
+        return PromptTier.STANDARD, TaskCategory.WRITE
+    if any(kw in msg_lower for kw in PromptTierClassifier.SIMPLE_KEYWORDS):
+        if tools_count == 0:
+            return PromptTier.MINIMAL, TaskCategory.CHAT
+        return PromptTier.MINIMAL, TaskCategory.SEARCH
+    if tools_count > 10:
+        return PromptTier.FULL, TaskCategory.EXECUTE
+    if tools_count > 3:
+        return PromptTier.STANDARD, TaskCategory.EXECUTE
+    if msg_len > 1000 and has_context:
+        return PromptTier.STANDARD, TaskCategory.COMPLEX
+    return PromptTier.STANDARD, TaskCategory.READ
+
+
+def legacy_route_by_pattern(patterns: dict[str, AgentType], task_type: str) -> AgentType | None:
+    task_lower = task_type.lower()
+    if task_lower in patterns:
+        return patterns[task_lower]
+    for pattern, agent in patterns.items():
+        if pattern.endswith("_"):
+            if task_lower.startswith(pattern) or task_lower.startswith(pattern[:-1]):
+                return agent
+        elif task_lower.startswith(pattern) or pattern in task_lower:
+            return agent
+    return None
+
+
+def legacy_analyze_task(patterns: dict[str, AgentType], task_type: str, payload: dict | None) -> RoutingDecision:
+    primary = legacy_route_by_pattern(patterns, task_type)
+    if primary:
+        return RoutingDecision(RoutingStrategy.SINGLE, primary, reasoning=f"Matched pattern for {task_type}", confidence=0.9)
+    if payload:
+        payload_str = str(payload).lower()
+        for keywords, agent, reasoning in (
+            (["code", "function", "class", "bug", "test"], AgentType.CODE, "Payload contains code-related keywords"),
+            (["sql", "query", "database", "table"], AgentType.DATA, "Payload contains data-related keywords"),
+            (["docker", "nginx", "server", "deploy"], AgentType.INFRA, "Payload contains infrastructure keywords"),
+        ):
+            if any(kw in payload_str for kw in keywords):
+                return RoutingDecision(RoutingStrategy.SINGLE, agent, reasoning=reasoning, confidence=0.7)
+    return RoutingDecision(
+        RoutingStrategy.SINGLE,
+        AgentType.RESEARCH,
+        reasoning="No clear pattern match, defaulting to research",
+        confidence=0.5,
+    )
+
+
+def task_type_for(n: int, text: str) -> str:
+    """Task types as agents send them: known, prefixed, and free-form."""
+    known = list(TASK_PATTERNS)
+    choice = n % 4
+    if choice == 0:
+        return known[n % len(known)]
+    if choice == 1:
+        return known[n % len(known)].rstrip("_") + "_" + text.split()[0].lower()
+    if choice == 2:
+        return "chat_" + "_".join(text.lower().split()[:3])
+    return "user_request"
+
+
+def extra_categories(corpus: list[str], keywords: int) -> dict[str, list[str]]:
+    """Word pairs from the corpus, in categories of 50, as larger keyword sets."""
+    pairs: dict[str, None] = {}
+    for text in corpus:
+        words = text.lower().split()
+        for first, second in zip(words, words[1:]):
+            pairs[f"{first} {second}"] = None
+            if len(pairs) >= keywords:
+                break
+        if len(pairs) >= keywords:
+            break
+    pairs_list = list(pairs)
+    return {f"extra.{n // 50}": pairs_list[n:n + 50] for n in range(0, len(pairs_list), 50)}
+
+
+def micros(samples: list[float]) -> tuple[float, float]:
+    ordered = sorted(samples)
+    return statistics.median(ordered) * 1e6, ordered[int(len(ordered) * 0.99)] * 1e6
+
+
+def time_each(texts: list[str], fn, rounds: int) -> list[float]:
+    samples = []
+    for _ in range(rounds):
+        for n, text in enumerate(texts):
+            start = time.perf_counter()
+            fn(n, text)
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the shared pattern classifier")
+    parser.add_argument("--rounds", type=int, default=3, help="Timed passes over the corpus")
+    args = parser.parse_args()
+    configure_logging("WARNING", "console")
+
+    corpus = build_corpus()
+    task_classifier = TaskComplexityClassifier()
+    prompt_classifier = PromptTierClassifier()
+    router = TaskRouter()
+    shared = get_pattern_classifier()
+    print(f"corpus: {len(corpus)} messages, {statistics.mean(map(len, corpus)):.0f} characters on average")
+
+    real_new_automaton = pattern_classifier._new_automaton
+    backend = type(real_new_automaton()).__module__
+
+    print(f"\n== all three consumers on the same message, {args.rounds} passes ==")
+
+    def legacy_all(n: int, text: str) -> None:
+        legacy_task_complexity(text)
+        legacy_prompt_tier(text, 4, True)
+        legacy_analyze_task(TASK_PATTERNS, task_type_for(n, text), {"message": text})
+
+    def shared_all(n: int, text: str) -> None:
+        task_classifier._classify_by_patterns(text)
+        prompt_classifier._do_classify(text, 4, True)
+        router.analyze_task(task_type_for(n, text), {"message": text})
+
+    timings = [("keyword loops", time_each(corpus, legacy_all, args.rounds))]
+    memo_size = shared._memo_size
+    shared._memo_size = 0
+    timings.append((f"single pass ({backend}), no memo", time_each(corpus, shared_all, args.rounds)))
+    pattern_classifier._new_automaton = _Automaton
+    shared._compiled = False
+    timings.append(("single pass (pure Python), no memo", time_each(corpus, shared_all, args.rounds)))
+    pattern_classifier._new_automaton = real_new_automaton
+    shared._compiled = False
+    shared._memo_size = memo_size
+    shared._memo.clear()
+    timings.append((f"single pass ({backend}), memoized", time_each(corpus, shared_all, args.rounds)))
+
+    baseline = statistics.fmean(timings[0][1])
+    for label, samples in timings:
+        p50, p99 = micros(samples)
+        mean = statistics.fmean(samples)
+        print(f"    {label:42s} p50 {p50:7.1f} us  p99 {p99:7.1f} us  mean {mean * 1e6:7.1f} us  "
+              f"({baseline / mean:.1f}x)")
+
+    print("\n== keyword matching only, hits for every category ==")
+    for extra in (0, 600, 2800):
+        categories = {c: list(shared._keywords[c]) for c in shared.categories()}
+        categories.update(extra_categories(corpus, extra))
+        total = sum(len(k) for k in categories.values())
+        scanner = PatternClassifier(memo_size=0)
+        for category, keywords in categories.items():
+            scanner.register(category, keywords)
+        scanner.scan("")
+
+        def loops(n: int, text: str) -> None:
+            lowered = text.lower()
+            {c: [k for k in keywords if k in lowered] for c, keywords in categories.items()}
+
+        old = statistics.fmean(time_each(corpus, loops, 1))
+        new = statistics.fmean(time_each(corpus, lambda n, text: scanner.scan(text), 1))
+        print(f"    {total:5d} keywords: loops {old * 1e6:8.1f} us  single pass {new * 1e6:6.1f} us  "
+              f"({old / new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Plan index benchmark.
+
+Seeds plans for many users into a live Redis (configured through the usual
+REDIS_* environment variables), then compares listing one user's plans by
+the old keyspace SCAN with the indexed ``PlanManager.list_plans``. Index
+consistency is tested in tests/unit/test_plan_index.py.
+
+It also times step status updates on a large plan, rewriting the whole
+document each time versus field-level updates, and counts how many
+concurrent whole-plan rewrites survive. Field-level updates are tested in
+tests/unit/test_plan_index.py as well.
+
+Seeded plans are deleted afterwards.
+
+Usage:
+    REDIS_HOST=localhost python scripts/bench_plan_index.py
+    python scripts/bench_plan_index.py --users 500 --plans-per-user 20
+    python scripts/bench_plan_index.py --steps 100 --output-size 20000
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add packages to path
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "packages" / "core" / "src"))
+sys.path.insert(0, str(ROOT / "packages" / "messaging" / "src"))
+sys.path.insert(0, str(ROOT / "services" / "api" / "src"))
+
+from ai_messaging import RedisClient
+
+from api.plan_mode import PlanManager, PlanStatus, StepStatus
+
+STATUSES = ["pending", "approved", "executing", "paused", "completed", "failed", "cancelled"]
+
+async def scan_user_plans(redis: RedisClient, user_id: str) -> list[dict]:
+    """How plans were listed before the indexes: every key, every document."""
+    plans = []
+    cursor = 0
+    while True:
+        cursor, keys = await redis.scan(cursor=cursor, match="plan:*", count=100)
+        for key in keys:
+            if ":history" in key:
+                continue
+            plan_data = await redis.get(key)
+            if plan_data:
+                plan = json.loads(plan_data)
+                if plan.get("user_id") == user_id:
+                    plans.append(plan)
+        if cursor == 0:
+            break
+    return plans
+
+
+async def seed(manager: PlanManager, run: str, args: argparse.Namespace) -> list[str]:
+    plan_ids = []
+    for u in range(args.users):
+        for p in range(args.plans_per_user):
+            plan = await manager.create_plan(
+                conversation_id=f"{run}-conv-{u}",
+                user_id=f"{run}-user-{u}",
+                title=f"Plan {p}",
+                description="Seeded by bench_plan_index",
+                project_id=f"{run}-project-{p % 3}",
+            )
+            plan.status = PlanStatus(STATUSES[p % len(STATUSES)])
+            await manager._save_plan(plan)
+            plan_ids.append(plan.id)
+    manager._active_plans.clear()
+    return plan_ids
+
+
+async def bench_listing(manager: PlanManager, run: str, args: argparse.Namespace) -> None:
+    print("\n== list one user's plans ==")
+    user_id = f"{run}-user-0"
+
+    scanned, indexed = [], []
+    for _ in range(args.repeats):
+        start = time.perf_counter()
+        await scan_user_plans(manager.redis, user_id)
+        scanned.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        _, total = await manager.list_plans(user_id, limit=100)
+        indexed.append(time.perf_counter() - start)
+
+    scan_ms = statistics.median(scanned) * 1000
+    index_ms = statistics.median(indexed) * 1000
+    print(f"    SCAN + GET all plans: {scan_ms:8.2f} ms")
+    print(f"    indexed:              {index_ms:8.2f} ms")
+    print(f"    {scan_ms / index_ms:.0f}x lower median latency for {total} plans")
+
+
+async def bench_step_updates(manager: PlanManager, run: str, args: argparse.Namespace) -> None:
+    print(f"\n== step updates on a {args.steps}-step plan ==")
+    plan = await manager.create_plan(f"{run}-conv-big", f"{run}-user-big", "Big", "", f"{run}-project-big")
+    steps = [{"title": f"Step {n}", "description": "x" * args.output_size} for n in range(args.steps)]
+    try:
+        await manager.set_steps(plan.id, steps)
+        step_ids = [step.id for step in (await manager.get_plan(plan.id)).steps]
+
+        # Before: load the plan, change one step, write the whole plan back
+        start = time.perf_counter()
+        for step_id in step_ids:
+            loaded = await manager._load_plan(plan.id)
+            next(s for s in loaded.steps if s.id == step_id).status = StepStatus.IN_PROGRESS
+            await manager.index.save(loaded.to_dict())
+        rewrite = (time.perf_counter() - start) / len(step_ids)
+
+        start = time.perf_counter()
+        for step_id in step_ids:
+            await manager.update_step_status(plan.id, step_id, StepStatus.COMPLETED)
+        field_level = (time.perf_counter() - start) / len(step_ids)
+
+        print(f"    load + rewrite plan:  {rewrite * 1000:8.2f} ms per update")
+        print(f"    field-level update:   {field_level * 1000:8.2f} ms per update")
+        print(f"    {rewrite / field_level:.1f}x lower latency")
+
+        # Concurrent updaters: rewriting the whole plan loses writes
+        await manager.set_steps(plan.id, steps)
+        step_ids = [step.id for step in (await manager.get_plan(plan.id)).steps]
+
+        async def rewrite_step(step_id: str) -> None:
+            loaded = await manager._load_plan(plan.id)
+            next(s for s in loaded.steps if s.id == step_id).status = StepStatus.IN_PROGRESS
+            await manager.index.save(loaded.to_dict())
+
+        await asyncio.gather(*(rewrite_step(step_id) for step_id in step_ids))
+        kept_rewrite = sum(
+            s.status == StepStatus.IN_PROGRESS for s in (await manager.get_plan(plan.id)).steps
+        )
+        await asyncio.gather(*(
+            manager.update_step_status(plan.id, step_id, StepStatus.COMPLETED) for step_id in step_ids
+        ))
+        kept_field = sum(
+            s.status == StepStatus.COMPLETED for s in (await manager.get_plan(plan.id)).steps
+        )
+        print(f"    concurrent rewrites kept {kept_rewrite}/{len(step_ids)} step updates")
+        print(f"    concurrent field-level updates kept {kept_field}/{len(step_ids)}")
+    finally:
+        await manager.index.delete(plan.id)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the Redis plan indexes")
+    parser.add_argument("--users", type=int, default=200, help="Users to seed")
+    parser.add_argument("--plans-per-user", type=int, default=10, help="Plans per seeded user")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed list calls per method")
+    parser.add_argument("--steps", type=int, default=50, help="Steps in the large plan")
+    parser.add_argument("--output-size", type=int, default=10_000, help="Characters of text per step")
+    args = parser.parse_args()
+
+    redis = RedisClient()
+    await redis.connect()
+    manager = PlanManager(redis)
+    run = f"bench-{uuid.uuid4().hex[:8]}"
+
+    print(f"Seeding {args.users * args.plans_per_user} plans for {args.users} users...")
+    plan_ids = await seed(manager, run, args)
+    try:
+        await bench_listing(manager, run, args)
+        await bench_step_updates(manager, run, args)
+    finally:
+        for plan_id in plan_ids:
+            await manager.index.delete(plan_id)
+        await redis.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+PTY output throughput benchmark.
+
+Spawns a process that writes sustained output to a PTY slave and pumps
+the master side to a simulated WebSocket client, the way the terminal
+endpoint does. ``--mode event`` uses PtyStreamer (add_reader, adaptive
+reads, frame coalescing, flow control); ``--mode poll`` replays the
+previous loop that polled with a 4 KB ``os.read`` every 10 ms. Reports
+throughput, frame counts, reads, CPU time, and idle wakeups.
+
+Usage:
+    python scripts/bench_pty_throughput.py
+    python scripts/bench_pty_throughput.py --mb 64 --mode both
+    python scripts/bench_pty_throughput.py --client-delay 0.005 --mode event
+"""
+
+import argparse
+import asyncio
+import errno
+import fcntl
+import os
+import pty
+import subprocess
+import sys
+import time
+import tty
+from pathlib import Path
+
+# Add packages to path
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "packages" / "core" / "src"))
+sys.path.insert(0, str(ROOT / "services" / "api" / "src"))
+
+from api.websocket.pty_stream import PtyStreamer
+
+# Writes --mb MiB of line-oriented output, like a verbose build log
+WRITER = """
+import sys
+line = (b"[build] compiling module %06d ... ok " + b"x" * 40 + b"\\n")
+total = int(sys.argv[1])
+out = sys.stdout.buffer
+written = 0
+i = 0
+while written < total:
+    chunk = b"".join(line % n for n in range(i, i + 256))
+    out.write(chunk)
+    written += len(chunk)
+    i += 256
+out.flush()
+"""
+
+
+class SimulatedClient:
+    """Stands in for WebSocket.send_bytes with an optional per-frame delay."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.frames = 0
+        self.bytes = 0
+        self.max_frame = 0
+
+    async def send_bytes(self, data: bytes) -> None:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.frames += 1
+        self.bytes += len(data)
+        self.max_frame = max(self.max_frame, len(data))
+
+
+def open_pty() -> tuple[int, int]:
+    master_fd, slave_fd = pty.openpty()
+    # Raw mode so byte counts on both sides match
+    tty.setraw(slave_fd)
+    flags = fcntl.fcntl(master_fd, fcntl.F_GETFL)
+    fcntl.fcntl(master_fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+    return master_fd, slave_fd
+
+
+async def poll_loop(master_fd: int, client: SimulatedClient, stats: dict) -> None:
+    """The previous read_from_pty loop."""
+    while True:
+        await asyncio.sleep(0.01)
+        stats["wakeups"] += 1
+        try:
+            data = os.read(master_fd, 4096)
+            if data:
+                stats["reads"] += 1
+                await client.send_bytes(data)
+        except OSError as e:
+            if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+                continue
+            break
+
+
+async def measure_idle(mode: str, seconds: float) -> int:
+    """Count read wakeups for a terminal with no output."""
+    master_fd, slave_fd = open_pty()
+    client = SimulatedClient(0.0)
+    try:
+        if mode == "poll":
+            stats = {"wakeups": 0, "reads": 0}
+            task = asyncio.create_task(poll_loop(master_fd, client, stats))
+            await asyncio.sleep(seconds)
+            task.cancel()
+            return stats["wakeups"]
+
+        streamer = PtyStreamer(master_fd, client.send_bytes)
+        wakeups = 0
+        original = streamer._on_readable
+
+        def counted() -> None:
+            nonlocal wakeups
+            wakeups += 1
+            original()
+
+        streamer._on_readable = counted  # type: ignore[method-assign]
+        streamer.start()
+        await asyncio.sleep(seconds)
+        await streamer.stop()
+        return wakeups
+    finally:
+        os.close(master_fd)
+        os.close(slave_fd)
+
+
+async def run(args: argparse.Namespace, mode: str) -> None:
+    total = int(args.mb * 1024 * 1024)
+    master_fd, slave_fd = open_pty()
+    client = SimulatedClient(args.client_delay)
+
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-c", WRITER, str(total)],
+        stdin=subprocess.DEVNULL,
+        stdout=slave_fd,
+        stderr=subprocess.DEVNULL,
+    )
+    os.close(slave_fd)
+
+    stats = {"wakeups": 0, "reads": 0, "pauses": 0}
+    if mode == "poll":
+        task = asyncio.create_task(poll_loop(master_fd, client, stats))
+    else:
+        streamer = PtyStreamer(master_fd, client.send_bytes)
+        streamer.start()
+        task = asyncio.create_task(streamer.wait_closed())
+
+    deadline = start + args.timeout
+    while client.bytes < total and time.perf_counter() < deadline:
+        await asyncio.sleep(0.005)
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+
+    if mode == "event":
+        stats["reads"] = streamer.reads
+        stats["pauses"] = streamer.pauses
+        await streamer.stop()
+    task.cancel()
+    try:
+        await task
+    except (asyncio.CancelledError, Exception):
+        pass
+    proc.kill()
+    proc.wait()
+    os.close(master_fd)
+
+    mb = client.bytes / (1024 * 1024)
+    print(f"\n== {mode} ==")
+    status = "complete" if client.bytes >= total else f"timed out after {args.timeout:.0f}s"
+    print(f"  delivered {mb:.1f} of {args.mb:.1f} MiB in {elapsed:.2f}s ({status})")
+    print(f"  throughput: {mb / elapsed:.1f} MiB/s, server CPU {cpu:.2f}s")
+    print(f"  frames: {client.frames} (mean {client.bytes / max(client.frames, 1) / 1024:.1f} KiB, "
+          f"max {client.max_frame / 1024:.1f} KiB), reads: {stats['reads']}")
+    if mode == "event":
+        print(f"  flow-control pauses: {stats['pauses']}")
+    idle = await measure_idle(mode, args.idle)
+    print(f"  idle terminal: {idle} read wakeups in {args.idle:.1f}s")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark PTY output throughput")
+    parser.add_argument("--mb", type=float, default=16, help="MiB of output to stream")
+    parser.add_argument("--client-delay", type=float, default=0.0, help="Seconds per frame for the client")
+    parser.add_argument("--idle", type=float, default=1.0, help="Seconds to measure idle wakeups")
+    parser.add_argument("--timeout", type=float, default=60, help="Give up after this many seconds")
+    parser.add_argument("--mode", choices=["event", "poll", "both"], default="both")
+    args = parser.parse_args()
+
+    modes = ["event", "poll"] if args.mode == "both" else [args.mode]
+    for mode in modes:
+        await run(args, mode)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Streaming transcription latency benchmark.
+
+Generates a synthetic dictation (tone "utterances" separated by pauses,
+over background noise, plus a stray click) and transcribes it with a local
+stub backend whose latency grows with clip length like a hosted speech
+model. Compares:
+
+- buffered: the whole recording sent once the speaker stops
+- streaming: 16-bit PCM fed in real time to ``start_stream``, with
+  utterances cut at pauses and transcribed while recording continues
+
+and reports end-of-speech latency: the time from the last audio to the
+final transcript. Segmentation, ordering and concurrency are tested in
+tests/unit/test_transcription.py.
+
+Usage:
+    python scripts/bench_stt_streaming.py
+    python scripts/bench_stt_streaming.py --utterances 12 --speed 8
+"""
+
+import argparse
+import asyncio
+import io
+import sys
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+# Add packages to path
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "packages" / "core" / "src"))
+sys.path.insert(0, str(ROOT / "services" / "voice" / "src"))
+
+from voice_service.transcription import TranscriptionBackend, TranscriptionService  # noqa: E402
+from voice_service.vad import pcm_to_wav  # noqa: E402
+
+SAMPLE_RATE = 16000
+WORDS = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india", "juliet"]
+
+def word_frequency(index: int) -> float:
+    return 300.0 + 80.0 * index
+
+
+def synthesize_dictation(utterances: int, rng: np.random.Generator) -> tuple[bytes, list[str]]:
+    """Tone bursts (one word each) with pauses, noise and a click."""
+    parts = [rng.normal(0, 30, int(0.6 * SAMPLE_RATE))]
+    spoken = []
+    for i in range(utterances):
+        word = i % len(WORDS)
+        spoken.append(WORDS[word])
+        seconds = rng.uniform(1.5, 3.5)
+        t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+        # Syllable-like amplitude envelope with short dips that must not split the utterance
+        envelope = 0.55 + 0.45 * np.sin(2 * np.pi * 3 * t) ** 2
+        parts.append(6000 * envelope * np.sin(2 * np.pi * word_frequency(word) * t) + rng.normal(0, 30, t.size))
+        parts.append(rng.normal(0, 30, int(rng.uniform(0.7, 1.2) * SAMPLE_RATE)))
+        if i == utterances // 2:
+            # A 60 ms click is noise, not speech
+            parts.append(rng.normal(0, 8000, int(0.06 * SAMPLE_RATE)))
+            parts.append(rng.normal(0, 30, int(0.8 * SAMPLE_RATE)))
+    audio = np.clip(np.concatenate(parts), -32768, 32767).astype("<i2")
+    return audio.tobytes(), spoken
+
+
+class StubBackend(TranscriptionBackend):
+    """Recognizes the synthetic words; latency = base + per-second cost."""
+
+    def __init__(self, base: float, per_second: float, speed: float):
+        self.base = base
+        self.per_second = per_second
+        self.speed = speed
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+
+    async def transcribe(self, audio_data, filename, language=None, prompt=None,  # noqa: ARG002
+                         response_format="json", temperature=0.0):  # noqa: ARG002
+        with wave.open(io.BytesIO(audio_data)) as wav:
+            rate = wav.getframerate()
+            samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype="<i2").astype(np.float32)
+        duration = samples.size / rate
+
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep((self.base + self.per_second * duration) / self.speed)
+        finally:
+            self.active -= 1
+
+        # Each word is a tone; read them back in order, one per 0.5 s window with energy
+        text = []
+        window = rate // 2
+        for start in range(0, samples.size - window + 1, window):
+            chunk = samples[start : start + window]
+            if np.sqrt(np.mean(chunk * chunk)) < 500:
+                continue
+            spectrum = np.abs(np.fft.rfft(chunk))
+            if spectrum.max() < 20 * spectrum.mean():
+                continue  # Broadband noise, not a tone
+            peak = np.fft.rfftfreq(chunk.size, 1 / rate)[int(np.argmax(spectrum))]
+            word = WORDS[min(range(len(WORDS)), key=lambda i: abs(word_frequency(i) - peak))]
+            if not text or text[-1] != word:
+                text.append(word)
+        return {"text": " ".join(text), "duration": duration}
+
+
+async def run_buffered(service: TranscriptionService, pcm: bytes, speed: float) -> tuple[str, float]:
+    # Recording time passes before anything is sent
+    await asyncio.sleep(len(pcm) / 2 / SAMPLE_RATE / speed)
+    start = time.monotonic()
+    result = await service.transcribe_bytes(pcm_to_wav(pcm, SAMPLE_RATE), filename="dictation.wav")
+    return result["text"], time.monotonic() - start
+
+
+async def run_streaming(
+    service: TranscriptionService, pcm: bytes, speed: float, chunk_ms: int
+) -> tuple[list[dict], str, float]:
+    stream = service.start_stream(sample_rate=SAMPLE_RATE)
+    partials: list[dict] = []
+
+    async def collect() -> None:
+        async for partial in stream.results():
+            partials.append(partial)
+
+    collector = asyncio.create_task(collect())
+    chunk_bytes = SAMPLE_RATE * 2 * chunk_ms // 1000
+    for i in range(0, len(pcm), chunk_bytes):
+        stream.feed(pcm[i : i + chunk_bytes])
+        await asyncio.sleep(chunk_ms / 1000 / speed)
+
+    start = time.monotonic()
+    stream.end()
+    await collector
+    return partials, stream.text, time.monotonic() - start
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark streaming transcription with a stub backend")
+    parser.add_argument("--utterances", type=int, default=8, help="Words in the dictation")
+    parser.add_argument("--speed", type=float, default=4.0, help="Run faster than real time by this factor")
+    parser.add_argument("--base-latency", type=float, default=0.4, help="Stub backend fixed latency (s)")
+    parser.add_argument("--per-second", type=float, default=0.15, help="Stub backend cost per audio second (s)")
+    parser.add_argument("--chunk-ms", type=int, default=100, help="Audio per WebSocket message")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    pcm, spoken = synthesize_dictation(args.utterances, np.random.default_rng(args.seed))
+    expected = " ".join(spoken)
+    seconds = len(pcm) / 2 / SAMPLE_RATE
+    print(f"{seconds:.1f}s dictation, {args.utterances} utterances, running {args.speed:g}x real time")
+
+    buffered_backend = StubBackend(args.base_latency, args.per_second, args.speed)
+    text, buffered_latency = await run_buffered(TranscriptionService(buffered_backend), pcm, args.speed)
+    buffered_latency *= args.speed
+    print(f"\n  buffered   end-of-speech latency {buffered_latency * 1000:7.0f} ms  ({buffered_backend.calls} call)")
+    print(f"    {text}")
+
+    backend = StubBackend(args.base_latency, args.per_second, args.speed)
+    service = TranscriptionService(backend)
+    partials, text, latency = await run_streaming(service, pcm, args.speed, args.chunk_ms)
+    latency *= args.speed
+    print(
+        f"  streaming  end-of-speech latency {latency * 1000:7.0f} ms  "
+        f"({backend.calls} calls, up to {backend.max_active} at once)"
+    )
+    for partial in partials:
+        print(f"    #{partial['index']} {partial['start']:6.2f}-{partial['end']:6.2f}s  {partial['text']}")
+
+    print(f"\n  {buffered_latency / latency:.1f}x lower end-of-speech latency than buffered")
+    if text != expected:
+        print(f"  transcript differs from the dictation: {expected}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
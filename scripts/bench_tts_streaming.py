@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Streaming TTS latency benchmark.
+
+Starts a local fake of the OpenAI speech endpoint that streams audio with
+a configurable time-to-first-byte and generation rate, points the voice
+service at it, and measures:
+
+- buffered: ``synthesize`` for the whole text (the previous streaming path
+  waited for this before sending anything)
+- sequential: one sentence at a time, each streamed, no lookahead
+- streaming: ``synthesize_stream`` with sentence splitting and lookahead
+- llm-fed: ``synthesize_stream`` fed token by token at LLM speed
+- phrase cache: repeated acknowledgements served from the cache
+
+For each run it reports time to first audio, total time, and how long a
+real-time player would have stalled waiting for audio. Ordering, caching
+and cancellation are tested in tests/unit/test_synthesis.py.
+
+Usage:
+    python scripts/bench_tts_streaming.py
+    python scripts/bench_tts_streaming.py --ttfb 0.4 --realtime-factor 3 --lookahead 3
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import time
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+# Add packages to path
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "packages" / "core" / "src"))
+sys.path.insert(0, str(ROOT / "services" / "voice" / "src"))
+
+# Audio bytes per character of text and playback rate, roughly 48 kbps MP3
+BYTES_PER_CHAR = 400
+PLAYBACK_BYTES_PER_SECOND = 6000
+
+TEXT = (
+    "Sure, I can help with that. I looked through the deployment logs for the last hour. "
+    "The API containers restarted twice, both times after the health check timed out. "
+    "The database connection pool was exhausted during the nightly export, which blocked new requests. "
+    "I recommend moving the export to a read replica and raising the pool size to twenty. "
+    "Would you like me to prepare that change?"
+)
+
+PHRASES = ["Okay.", "Working on it.", "Done!", "Something went wrong, please try again."]
+
+def fake_audio(text: str) -> bytes:
+    """Deterministic stand-in for the audio of ``text``."""
+    seed = hashlib.sha256(text.encode()).digest()
+    size = len(text) * BYTES_PER_CHAR
+    return (seed * (size // len(seed) + 1))[:size]
+
+
+class FakeTTSServer:
+    """Minimal HTTP/1.1 server for POST /v1/audio/speech with chunked audio."""
+
+    def __init__(self, ttfb: float, realtime_factor: float, chunk_size: int = 4096):
+        self.ttfb = ttfb
+        self.bytes_per_second = PLAYBACK_BYTES_PER_SECOND * realtime_factor
+        self.chunk_size = chunk_size
+        self.requests = 0
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> int:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                headers = {}
+                for line in head.decode().split("\r\n")[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                await self._respond(json.loads(body), writer)
+        except (asyncio.IncompleteReadError, asyncio.CancelledError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, request: dict, writer: asyncio.StreamWriter) -> None:
+        self.requests += 1
+        audio = fake_audio(request["input"])
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: audio/mpeg\r\n"
+            b"Transfer-Encoding: chunked\r\nConnection: keep-alive\r\n\r\n"
+        )
+        await writer.drain()
+        await asyncio.sleep(self.ttfb)
+        for i in range(0, len(audio), self.chunk_size):
+            chunk = audio[i : i + self.chunk_size]
+            await asyncio.sleep(len(chunk) / self.bytes_per_second)
+            writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+class Playback:
+    """Tracks when audio arrives versus when a real-time player needs it."""
+
+    def __init__(self, started: float):
+        self.started = started
+        self.first_audio: float | None = None
+        self.play_until = 0.0
+        self.stall = 0.0
+
+    def receive(self, chunk: bytes) -> None:
+        now = time.monotonic()
+        if self.first_audio is None:
+            self.first_audio = now - self.started
+            self.play_until = now
+        elif now > self.play_until:
+            self.stall += now - self.play_until
+            self.play_until = now
+        self.play_until += len(chunk) / PLAYBACK_BYTES_PER_SECOND
+
+    def report(self, name: str) -> float:
+        total = time.monotonic() - self.started
+        print(
+            f"  {name:<12} first audio {self.first_audio * 1000:7.0f} ms   "
+            f"total {total * 1000:7.0f} ms   player stalled {self.stall * 1000:6.0f} ms"
+        )
+        return total
+
+
+async def llm_tokens(text: str, tokens_per_second: float) -> AsyncIterator[str]:
+    """Yield ``text`` in ~4 character tokens at LLM speed."""
+    for i in range(0, len(text), 4):
+        await asyncio.sleep(1 / tokens_per_second)
+        yield text[i : i + 4]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark streaming TTS against a fake server")
+    parser.add_argument("--ttfb", type=float, default=0.25, help="Fake server time to first byte (s)")
+    parser.add_argument(
+        "--realtime-factor", type=float, default=1.5, help="Fake generation speed vs playback"
+    )
+    parser.add_argument("--lookahead", type=int, default=2, help="Sentences synthesized ahead")
+    parser.add_argument("--tokens-per-second", type=float, default=60.0, help="Simulated LLM speed")
+    args = parser.parse_args()
+
+    server = FakeTTSServer(args.ttfb, args.realtime_factor)
+    port = await server.start()
+    os.environ["VOICE_OPENAI_BASE_URL"] = f"http://127.0.0.1:{port}/v1"
+    os.environ["VOICE_OPENAI_API_KEY"] = "fake"
+    os.environ["VOICE_TTS_STREAM_LOOKAHEAD"] = str(args.lookahead)
+
+    from voice_service.segmenter import split_sentences
+    from voice_service.synthesis import get_synthesis_service
+
+    service = get_synthesis_service()
+    config = service.config
+    sentences = split_sentences(TEXT, config.tts_segment_min_chars, config.tts_segment_max_chars)
+    audio_bytes = sum(len(fake_audio(sentence)) for sentence in sentences)
+    options = service.resolve_options()
+    print(f"{len(TEXT)} chars in {len(sentences)} sentences, {audio_bytes / PLAYBACK_BYTES_PER_SECOND:.1f}s of audio")
+
+    try:
+        print("\n== whole text ==")
+        playback = Playback(time.monotonic())
+        playback.receive(await service.synthesize(TEXT))
+        playback.report("buffered")
+
+        service.cache.clear()
+        playback = Playback(time.monotonic())
+        for sentence in sentences:
+            async for chunk in service._stream_segment(sentence, options, "mp3", config.tts_stream_chunk_size):
+                playback.receive(chunk)
+        playback.report("sequential")
+
+        service.cache.clear()
+        playback = Playback(time.monotonic())
+        async for chunk in service.synthesize_stream(TEXT):
+            playback.receive(chunk)
+        playback.report("streaming")
+
+        print("\n== fed by an LLM ==")
+        service.cache.clear()
+        playback = Playback(time.monotonic())
+        async for chunk in service.synthesize_stream(llm_tokens(TEXT, args.tokens_per_second)):
+            playback.receive(chunk)
+        generation = len(TEXT) / 4 / args.tokens_per_second
+        playback.report("llm-fed")
+        print(f"  (LLM took {generation * 1000:.0f} ms to produce the text)")
+
+        print("\n== phrase cache ==")
+        service.cache.clear()
+        before = server.requests
+        cold, warm = [], []
+        for timings in (cold, warm):
+            for phrase in PHRASES:
+                start = time.monotonic()
+                async for _ in service.synthesize_stream(phrase):
+                    pass
+                timings.append(time.monotonic() - start)
+        print(f"  cold p50 {sorted(cold)[len(cold) // 2] * 1000:.1f} ms, warm p50 {sorted(warm)[len(warm) // 2] * 1000:.2f} ms")
+        print(f"  {server.requests - before} API requests for {len(PHRASES) * 2} phrases")
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
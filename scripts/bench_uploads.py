@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Upload storage benchmark.
+
+Times storing uploads the old way (8 KB writes, a copy per upload)
+against the content-addressed store and reports disk use of both.
+
+Deduplication, downloads, deletes and the legacy layout are tested in
+tests/unit/test_uploads.py.
+
+Usage:
+    python scripts/bench_uploads.py
+    python scripts/bench_uploads.py --uploads 100 --distinct 10 --size-mb 8
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from uuid import uuid4
+
+import aiofiles
+
+# Add packages to path
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "packages" / "core" / "src"))
+sys.path.insert(0, str(ROOT / "packages" / "messaging" / "src"))
+sys.path.insert(0, str(ROOT / "packages" / "memory" / "src"))
+sys.path.insert(0, str(ROOT / "services" / "api" / "src"))
+
+from api.services.upload_store import UploadStore
+
+
+def disk_usage(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+async def old_store(directory: Path, user_id: str, data: bytes) -> None:
+    """How uploads were stored: a new copy per upload, 8 KB writes."""
+    upload_dir = directory / user_id
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    source = io.BytesIO(data)
+    async with aiofiles.open(upload_dir / f"{uuid4()}.png", "wb") as f:
+        while chunk := source.read(8192):
+            await f.write(chunk)
+
+
+async def bench_storage(args: argparse.Namespace, payloads: list[bytes]) -> None:
+    print(f"== {args.uploads} uploads of {args.distinct} distinct {args.size_mb} MB files ==")
+    with tempfile.TemporaryDirectory() as old_dir, tempfile.TemporaryDirectory() as new_dir:
+        start = time.perf_counter()
+        for n in range(args.uploads):
+            await old_store(Path(old_dir), f"user-{n % 3}", payloads[n % len(payloads)])
+        old_time = time.perf_counter() - start
+
+        store = UploadStore(new_dir)
+        start = time.perf_counter()
+        for n in range(args.uploads):
+            await store.save(f"user-{n % 3}", io.BytesIO(payloads[n % len(payloads)]), "a.png", "image/png")
+        new_time = time.perf_counter() - start
+
+        old_bytes, new_bytes = disk_usage(Path(old_dir)), disk_usage(Path(new_dir))
+        print(f"    copy per upload:    {old_time * 1000:8.0f} ms, {old_bytes / 1024 / 1024:8.1f} MB on disk")
+        print(f"    content-addressed:  {new_time * 1000:8.0f} ms, {new_bytes / 1024 / 1024:8.1f} MB on disk")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark content-addressed uploads")
+    parser.add_argument("--uploads", type=int, default=60, help="Uploads to store")
+    parser.add_argument("--distinct", type=int, default=6, help="Distinct files among them")
+    parser.add_argument("--size-mb", type=float, default=4, help="Size of each file")
+    args = parser.parse_args()
+
+    size = int(args.size_mb * 1024 * 1024)
+    payloads = [os.urandom(size) for _ in range(args.distinct)]
+    await bench_storage(args, payloads)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
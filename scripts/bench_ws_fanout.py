@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+WebSocket fan-out benchmark.
+
+Simulates hundreds of chat clients, a share of them slow or stalled,
+and publishes a mix of agent progress frames to all of them through
+ConnectionManager. Reports delivery latency seen by fast clients, the
+publisher's per-message fan-out cost, and drop/coalesce/disconnect
+counts. ``--mode serial`` replays the same load with one awaited send
+per socket in turn (the previous broadcast behaviour) for comparison.
+
+Usage:
+    python scripts/bench_ws_fanout.py
+    python scripts/bench_ws_fanout.py --fast 400 --slow 80 --stalled 10 --rate 500
+    python scripts/bench_ws_fanout.py --mode serial --stalled 0
+"""
+
+import argparse
+import asyncio
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add packages to path
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "packages" / "core" / "src"))
+sys.path.insert(0, str(ROOT / "services" / "api" / "src"))
+
+from api.websocket.manager import ConnectionManager, encode_message
+
+SEQ_RE = re.compile(r'"seq":(\d+)')
+
+
+class SimulatedClient:
+    """Stands in for a FastAPI WebSocket with a fixed per-frame send delay."""
+
+    def __init__(self, kind: str, delay: float, sent_at: dict[int, float]):
+        self.kind = kind
+        self.delay = delay
+        self.sent_at = sent_at
+        self.latencies: list[float] = []
+        self.received = 0
+        self.closed_code: int | None = None
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_text(self, text: str) -> None:
+        if self.kind == "stalled":
+            # Never drains, like a browser tab whose TCP window is full
+            await asyncio.Event().wait()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.received += 1
+        match = SEQ_RE.search(text)
+        if match:
+            self.latencies.append(time.perf_counter() - self.sent_at[int(match.group(1))])
+
+    async def close(self, code: int = 1000) -> None:
+        self.closed_code = code
+
+
+def make_message(seq: int) -> dict:
+    """Mixed agent traffic: streamed tokens, progress, actions and thinking."""
+    kind = seq % 4
+    if kind == 0:
+        return {"type": "token", "conversation_id": "c1", "token": "lorem ", "seq": seq}
+    if kind == 1:
+        return {
+            "type": "step_update",
+            "conversation_id": "c1",
+            "plan_id": "p1",
+            "current_step": seq // 4,
+            "steps": [{"id": i, "status": "running"} for i in range(8)],
+            "seq": seq,
+        }
+    if kind == 2:
+        return {"type": "agent_action", "agent": "code", "action": "edit_file", "seq": seq}
+    return {"type": "thinking_stream", "content": "considering options " * 4, "seq": seq}
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run(args: argparse.Namespace, mode: str) -> None:
+    sent_at: dict[int, float] = {}
+    clients = (
+        [SimulatedClient("fast", 0.0, sent_at) for _ in range(args.fast)]
+        + [SimulatedClient("slow", args.slow_delay, sent_at) for _ in range(args.slow)]
+        + [SimulatedClient("stalled", 0.0, sent_at) for _ in range(args.stalled)]
+    )
+
+    manager = ConnectionManager(max_connections_per_user=1)
+    if mode == "queued":
+        for i, client in enumerate(clients):
+            await manager.connect(client, user_id=f"user-{i}", username=f"user-{i}")
+
+    interval = 1.0 / args.rate
+    total = int(args.rate * args.duration)
+    publish_costs: list[float] = []
+    start = time.perf_counter()
+
+    published = 0
+    for seq in range(total):
+        if mode == "serial" and time.perf_counter() - start > args.duration * 2:
+            # Serial sends fall behind without bound; stop and report what got out
+            break
+        published += 1
+        target = start + seq * interval
+        delay = target - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        message = make_message(seq)
+        sent_at[seq] = time.perf_counter()
+        if mode == "queued":
+            await manager.broadcast(message)
+        else:
+            text = encode_message(message)
+            for client in clients:
+                await client.send_text(text)
+        publish_costs.append(time.perf_counter() - sent_at[seq])
+
+    elapsed = time.perf_counter() - start
+    # Let queues drain briefly before reporting
+    await asyncio.sleep(0.5)
+
+    fast_latencies = [lat for c in clients if c.kind == "fast" for lat in c.latencies]
+    slow_received = [c.received for c in clients if c.kind == "slow"]
+
+    print(f"\n== {mode} ==")
+    print(f"  clients: {args.fast} fast, {args.slow} slow ({args.slow_delay * 1000:.0f} ms/frame), "
+          f"{args.stalled} stalled")
+    print(f"  published {published} of {total} messages in {elapsed:.2f}s "
+          f"(target {args.duration:.2f}s, {published / elapsed:.0f} msg/s)")
+    print(f"  fan-out cost per message: p50 {percentile(publish_costs, 50) * 1000:.3f} ms, "
+          f"p99 {percentile(publish_costs, 99) * 1000:.3f} ms")
+    print(f"  fast client latency: p50 {percentile(fast_latencies, 50) * 1000:.2f} ms, "
+          f"p99 {percentile(fast_latencies, 99) * 1000:.2f} ms, "
+          f"max {max(fast_latencies, default=0) * 1000:.2f} ms")
+    if slow_received:
+        print(f"  slow client frames received: mean {statistics.mean(slow_received):.0f} of {published}")
+
+    if mode == "queued":
+        stats = manager.get_queue_stats()
+        disconnected = sum(1 for c in clients if c.closed_code is not None)
+        print(f"  dropped {stats['frames_dropped']}, coalesced {stats['frames_coalesced']}, "
+              f"max queue depth {stats['max_queue_depth']}, disconnected {disconnected}")
+        for connection in list(manager._websocket_to_connection.values()):
+            await manager.disconnect(connection.websocket)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark WebSocket fan-out")
+    parser.add_argument("--fast", type=int, default=300, help="Fast clients")
+    parser.add_argument("--slow", type=int, default=50, help="Slow clients")
+    parser.add_argument("--stalled", type=int, default=5, help="Clients that never drain")
+    parser.add_argument("--slow-delay", type=float, default=0.05, help="Seconds per frame for slow clients")
+    parser.add_argument("--rate", type=float, default=200, help="Messages per second")
+    parser.add_argument("--duration", type=float, default=5, help="Seconds to publish for")
+    parser.add_argument("--mode", choices=["queued", "serial", "both"], default="queued")
+    args = parser.parse_args()
+
+    if args.mode in ("serial", "both") and args.stalled:
+        print("Note: serial mode blocks forever on stalled clients; running it with --stalled 0")
+    modes = ["queued", "serial"] if args.mode == "both" else [args.mode]
+    for mode in modes:
+        if mode == "serial":
+            args.stalled = 0
+        await run(args, mode)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Remove stored upload content that no upload references anymore.
+
+Deleting a file through the API only removes the user's reference; the
+content blob stays until this runs. Safe to run while the API is serving
+uploads (recently written blobs are kept for ``--grace-seconds``) and
+safe to repeat, e.g. from cron.
+
+Usage:
+    python scripts/gc_uploads.py
+    python scripts/gc_uploads.py --directory /var/lib/ai-infra/uploads --grace-seconds 600
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add packages to path
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "packages" / "core" / "src"))
+sys.path.insert(0, str(ROOT / "packages" / "messaging" / "src"))
+sys.path.insert(0, str(ROOT / "services" / "api" / "src"))
+
+from api.services.upload_store import GC_GRACE_SECONDS, UploadStore
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Garbage-collect unreferenced upload blobs")
+    parser.add_argument(
+        "--directory",
+        default=os.environ.get("API_UPLOAD_DIRECTORY", "/var/lib/ai-infra/uploads"),
+        help="Upload directory (default: $API_UPLOAD_DIRECTORY or the API default)",
+    )
+    parser.add_argument(
+        "--grace-seconds",
+        type=float,
+        default=GC_GRACE_SECONDS,
+        help="Keep unreferenced blobs modified more recently than this",
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats = UploadStore(args.directory).collect_garbage(grace_seconds=args.grace_seconds)
+    elapsed = time.perf_counter() - start
+    print(
+        f"Removed {stats['removed']} blobs ({stats['bytes_freed'] / 1024 / 1024:.1f} MB), "
+        f"kept {stats['kept']} recent, {stats['referenced']} referenced, in {elapsed:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Convert conversation history stored as per-message hashes into packed
+history lists.
+
+The API runs this automatically at startup when the history version is
+missing; use the script to convert by hand, e.g. after restoring a Redis
+backup taken before the upgrade. Every message is written to the Postgres
+messages table before its hash is deleted, so API_DATABASE_URL must point
+at the API's database. Safe to run while the API is serving traffic and safe
+to repeat.
+
+Usage:
+    REDIS_HOST=localhost API_DATABASE_URL=postgresql+asyncpg://... python scripts/migrate_conversation_history.py
+    python scripts/migrate_conversation_history.py --force
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add packages to path
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "packages" / "core" / "src"))
+sys.path.insert(0, str(ROOT / "packages" / "messaging" / "src"))
+sys.path.insert(0, str(ROOT / "packages" / "memory" / "src"))
+sys.path.insert(0, str(ROOT / "services" / "api" / "src"))
+
+from api.database import close_db
+from api.services.conversation_history import get_conversation_history
+
+from ai_messaging import RedisClient
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Convert conversation history to packed lists")
+    parser.add_argument("--force", action="store_true", help="Convert even if already done")
+    parser.add_argument("--batch-size", type=int, default=500, help="Keys per SCAN batch")
+    args = parser.parse_args()
+
+    redis = RedisClient()
+    await redis.connect()
+    try:
+        history = get_conversation_history(redis)
+        start = time.perf_counter()
+        if args.force:
+            converted = await history.backfill(batch_size=args.batch_size)
+        else:
+            converted = await history.ensure_backfilled()
+        elapsed = time.perf_counter() - start
+        if converted or args.force:
+            print(f"Converted {converted} messages in {elapsed:.2f}s")
+        else:
+            print("Conversation history already converted (use --force to rerun)")
+    finally:
+        await redis.disconnect()
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Build the Redis plan indexes for plans stored before they existed.
+
+The API runs this automatically at startup when the index version is
+missing; use the script to rebuild by hand, e.g. after restoring a Redis
+backup or if a writer bypassed ``PlanIndex.save``. Safe to run while the
+API is serving traffic and safe to repeat.
+
+Usage:
+    REDIS_HOST=localhost python scripts/migrate_plan_indexes.py
+    python scripts/migrate_plan_indexes.py --force
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add packages to path
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "packages" / "core" / "src"))
+sys.path.insert(0, str(ROOT / "packages" / "messaging" / "src"))
+
+from ai_messaging import PlanIndex, RedisClient
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill Redis plan indexes")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if already built")
+    parser.add_argument("--batch-size", type=int, default=500, help="Keys per SCAN batch")
+    args = parser.parse_args()
+
+    redis = RedisClient()
+    await redis.connect()
+    try:
+        index = PlanIndex(redis)
+        start = time.perf_counter()
+        if args.force:
+            indexed = await index.backfill(batch_size=args.batch_size)
+        else:
+            indexed = await index.ensure_backfilled()
+        elapsed = time.perf_counter() - start
+        if indexed or args.force:
+            print(f"Indexed {indexed} plans in {elapsed:.2f}s")
+        else:
+            print("Plan indexes already built (use --force to rebuild)")
+    finally:
+        await redis.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
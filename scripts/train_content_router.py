@@ -6,6 +6,7 @@ Usage:
     python scripts/train_content_router.py generate --samples 10000
     python scripts/train_content_router.py train --epochs 50
     python scripts/train_content_router.py evaluate
+    python scripts/train_content_router.py export
     python scripts/train_content_router.py full
     python scripts/train_content_router.py analytics
 """
@@ -121,23 +122,49 @@ def cmd_evaluate(args):
         return 1
 
 
+def cmd_export(args):
+    """Export the trained model for torch-free inference."""
+    config = TrainingConfig(config_dir=args.config_dir)
+    trainer = RouterTrainer(config)
+
+    print("Exporting MFRouter model...")
+    print(f"  Model path: {config.model_path}")
+
+    try:
+        output_dir = trainer.export(Path(args.output) if getattr(args, "output", None) else None)
+        print(f"\nExported to: {output_dir}")
+        print("  Point CONTENT_ROUTER_EXPORT_DIR at it (default: <config dir>/export)")
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        return 1
+    except Exception as e:
+        print(f"Export failed: {e}")
+        print("\nNote: Install the training extra: pip install -e 'packages/core[training]'")
+        return 1
+
+
 def cmd_full(args):
-    """Run full training pipeline: generate -> train -> evaluate."""
+    """Run full training pipeline: generate -> train -> evaluate -> export."""
     print("=" * 60)
     print("Full Training Pipeline")
     print("=" * 60)
 
-    print("\n[1/3] Generating training data...")
+    print("\n[1/4] Generating training data...")
     cmd_generate(args)
 
-    print("\n[2/3] Training model...")
+    print("\n[2/4] Training model...")
     result = cmd_train(args)
     if result:
         return result
 
-    print("\n[3/3] Evaluating model...")
+    print("\n[3/4] Evaluating model...")
     cmd_evaluate(args)
 
+    print("\n[4/4] Exporting model...")
+    result = cmd_export(args)
+    if result:
+        return result
+
     print("\n" + "=" * 60)
     print("Pipeline complete!")
     print("=" * 60)
@@ -197,6 +224,9 @@ Examples:
   # Evaluate model accuracy
   python train_content_router.py evaluate
 
+  # Export for serving (ONNX encoder + NumPy head, no torch at runtime)
+  python train_content_router.py export
+
   # Run full pipeline
   python train_content_router.py full
 
@@ -236,6 +266,12 @@ Examples:
     # Evaluate command
     subparsers.add_parser("evaluate", help="Evaluate the trained model")
 
+    # Export command
+    export_parser = subparsers.add_parser("export", help="Export the model for serving")
+    export_parser.add_argument(
+        "--output", default=None, help="Bundle directory (default: <config dir>/export)"
+    )
+
     # Full pipeline command
     full_parser = subparsers.add_parser("full", help="Run full training pipeline")
     full_parser.add_argument(
@@ -271,6 +307,7 @@ Examples:
         "generate": cmd_generate,
         "train": cmd_train,
         "evaluate": cmd_evaluate,
+        "export": cmd_export,
         "full": cmd_full,
         "analytics": cmd_analytics,
         "embeddings": cmd_embeddings,
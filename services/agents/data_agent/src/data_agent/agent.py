@@ -9,10 +9,15 @@ from base_agent import BaseAgent
 from base_agent.agent import AgentConfig
 
 from .tools import (
+    bulk_import_csv,
+    close_query_cursor,
     create_backup,
+    database_health,
     execute_query,
     export_to_csv,
     export_to_json,
+    export_to_parquet,
+    fetch_more_rows,
     get_schema,
     import_from_csv,
     list_backups,
@@ -28,6 +33,8 @@ from .tools import (
     qdrant_delete_points,
     qdrant_scroll_points,
 )
+from .tools.db import close_pools
+from .tools.sql_tools import close_cursors
 
 logger = get_logger(__name__)
 
@@ -35,13 +42,13 @@ DATA_AGENT_SYSTEM_PROMPT = """You are the Data Agent for AI Infrastructure, spec
 
 Your capabilities:
 1. **SQL Operations**
-   - Execute read-only SQL queries
+   - Execute read-only SQL queries, paging large results with fetch_more_rows
    - List and inspect table schemas
    - Analyze database structure
 
 2. **ETL Operations**
-   - Export data to CSV and JSON formats
-   - Import and preview CSV data
+   - Export data to CSV, JSON, NDJSON and Parquet formats (streamed, any table size)
+   - Preview CSV data and bulk load it into existing tables
    - Transform data with filters, mappings, and selections
 
 3. **Backup Operations**
@@ -112,7 +119,7 @@ class DataAgent(BaseAgent):
     Provides tools for:
     - SQL query execution (read-only)
     - Schema inspection
-    - Data export (CSV, JSON)
+    - Data export (CSV, JSON, NDJSON, Parquet) and bulk CSV import
     - Data transformation
     - Database backups and restores
     """
@@ -139,13 +146,18 @@ class DataAgent(BaseAgent):
         """Register data agent tools."""
         # SQL tools
         self.register_tool(execute_query._tool)
+        self.register_tool(fetch_more_rows._tool)
+        self.register_tool(close_query_cursor._tool)
         self.register_tool(list_tables._tool)
         self.register_tool(get_schema._tool)
+        self.register_tool(database_health._tool)
 
         # ETL tools
         self.register_tool(export_to_csv._tool)
         self.register_tool(export_to_json._tool)
+        self.register_tool(export_to_parquet._tool)
         self.register_tool(import_from_csv._tool)
+        self.register_tool(bulk_import_csv._tool)
         self.register_tool(transform_data._tool)
 
         # Backup tools
@@ -202,6 +214,8 @@ async def main() -> None:
         pass
     finally:
         await agent.stop()
+        await close_cursors()
+        await close_pools()
         await redis_client.close()
 
 
@@ -4,13 +4,18 @@ Data Agent tools.
 
 from .backup_tools import create_backup, list_backups, restore_backup
 from .etl_tools import (
+    bulk_import_csv,
     export_to_csv,
     export_to_json,
+    export_to_parquet,
     import_from_csv,
     transform_data,
 )
 from .sql_tools import (
+    close_query_cursor,
+    database_health,
     execute_query,
+    fetch_more_rows,
     get_schema,
     list_tables,
 )
@@ -27,12 +32,17 @@ from .qdrant_tools import (
 __all__ = [
     # SQL tools
     "execute_query",
+    "fetch_more_rows",
+    "close_query_cursor",
     "list_tables",
     "get_schema",
+    "database_health",
     # ETL tools
     "export_to_csv",
     "export_to_json",
+    "export_to_parquet",
     "import_from_csv",
+    "bulk_import_csv",
     "transform_data",
     # Backup tools
     "create_backup",
@@ -16,6 +16,7 @@ from ai_messaging import RedisClient
 from base_agent import BaseAgent
 from base_agent.agent import AgentConfig
 
+from .log_index import get_log_index_service
 from .tools import (
     # Docker tools
     docker_build,
@@ -239,6 +240,16 @@ class InfraAgent(BaseAgent):
 
         super().__init__(config, redis_client, memory)
 
+    async def start(self) -> None:
+        """Start the infra agent and begin indexing configured log files."""
+        await super().start()
+        get_log_index_service().start()
+
+    async def stop(self, graceful_timeout: float = 30.0) -> None:
+        """Stop log indexing and the agent."""
+        await get_log_index_service().stop()
+        await super().stop(graceful_timeout)
+
     def get_system_prompt(self) -> str:
         """Get the infra agent's system prompt with dynamic context."""
         return self._inject_dynamic_context(INFRA_AGENT_SYSTEM_PROMPT)
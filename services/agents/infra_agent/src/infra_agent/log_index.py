@@ -0,0 +1,515 @@
+"""
+Incremental log indexing for the Infra Agent monitoring tools.
+
+Log files are tailed from a byte-offset checkpoint, so each refresh only
+reads what was appended since the last one. The indexed bytes are split
+into segments (roughly one per time bucket, bounded in size) that record
+their offsets and timestamp range, plus an optional inverted index from
+lowercased tokens to the segments containing them. Time-range and term
+queries then mmap and scan only the candidate segments instead of
+re-reading the whole file.
+"""
+
+import asyncio
+import mmap
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from ai_core import get_logger
+
+logger = get_logger(__name__)
+
+# Files indexed in the background (comma separated)
+DEFAULT_WATCHED_FILES = "/var/log/syslog,/var/log/nginx/access.log,/var/log/nginx/error.log"
+
+# Bytes read per indexing step; timestamps are sampled at chunk edges
+CHUNK_BYTES = 64 * 1024
+
+# Segments close at a time-bucket boundary once they reach the minimum
+# size, and unconditionally at the maximum size
+BUCKET_SECONDS = 60
+SEGMENT_MIN_BYTES = 256 * 1024
+SEGMENT_MAX_BYTES = 4 * 1024 * 1024
+
+# Token index limits; segments indexed after the vocabulary fills up are
+# marked incomplete and always scanned for term queries
+MAX_VOCABULARY = 500_000
+TOKEN_RE = re.compile(rb"[a-z_][a-z0-9_]{2,63}")
+
+MAX_INDEXES = 32
+
+# Only the line prefix is searched for a timestamp
+TIMESTAMP_SCAN_BYTES = 160
+
+_MONTHS = {
+    m: i
+    for i, m in enumerate(
+        [b"jan", b"feb", b"mar", b"apr", b"may", b"jun",
+         b"jul", b"aug", b"sep", b"oct", b"nov", b"dec"],
+        start=1,
+    )
+}
+
+# ISO 8601 / RFC 3339 (journald, JSON logs, rsyslog high-precision)
+_ISO_RE = re.compile(
+    rb"(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2}):(\d{2})(?:[.,]\d+)?(Z|[+-]\d{2}:?\d{2})?"
+)
+# nginx error log: 2024/01/02 15:04:05
+_SLASH_RE = re.compile(rb"(\d{4})/(\d{2})/(\d{2}) (\d{2}):(\d{2}):(\d{2})")
+# nginx/apache access log: [02/Jan/2024:15:04:05 +0000]
+_CLF_RE = re.compile(rb"\[(\d{2})/([A-Za-z]{3})/(\d{4}):(\d{2}):(\d{2}):(\d{2}) ([+-]\d{4})\]")
+# BSD syslog: Jan  2 15:04:05
+_SYSLOG_RE = re.compile(rb"^([A-Za-z]{3}) +(\d{1,2}) (\d{2}):(\d{2}):(\d{2})")
+
+
+def _tz_offset(value: bytes | None) -> int | None:
+    """Seconds east of UTC for ``Z``/``+0000``/``+00:00``, or None if absent."""
+    if not value:
+        return None
+    if value == b"Z":
+        return 0
+    digits = value[1:].replace(b":", b"")
+    seconds = int(digits[:2]) * 3600 + int(digits[2:4]) * 60
+    return -seconds if value[:1] == b"-" else seconds
+
+
+def _to_epoch(
+    year: int, month: int, day: int, hour: int, minute: int, second: int, offset: int | None
+) -> float:
+    if offset is None:
+        # No zone in the log line: the host's local time
+        return datetime(year, month, day, hour, minute, second).timestamp()
+    naive = datetime(year, month, day, hour, minute, second) - timedelta(seconds=offset)
+    return (naive - datetime(1970, 1, 1)).total_seconds()
+
+
+def parse_line_timestamp(line: bytes) -> float | None:
+    """Extract a unix timestamp from the start of a log line, if present."""
+    head = line[:TIMESTAMP_SCAN_BYTES]
+    try:
+        if m := _SYSLOG_RE.match(head):
+            month = _MONTHS.get(m.group(1).lower())
+            if month:
+                now = datetime.now()
+                ts = _to_epoch(now.year, month, *map(int, m.group(2, 3, 4, 5)), None)
+                # Syslog omits the year; a date in the future belongs to last year
+                if ts > now.timestamp() + 86400:
+                    ts = _to_epoch(now.year - 1, month, *map(int, m.group(2, 3, 4, 5)), None)
+                return ts
+        if m := _ISO_RE.search(head):
+            return _to_epoch(*map(int, m.group(1, 2, 3, 4, 5, 6)), _tz_offset(m.group(7)))
+        if m := _CLF_RE.search(head):
+            month = _MONTHS.get(m.group(2).lower())
+            if month:
+                day, year = int(m.group(1)), int(m.group(3))
+                return _to_epoch(
+                    year, month, day, *map(int, m.group(4, 5, 6)), _tz_offset(m.group(7))
+                )
+        if m := _SLASH_RE.search(head):
+            return _to_epoch(*map(int, m.group(1, 2, 3, 4, 5, 6)), None)
+    except ValueError:
+        pass
+    return None
+
+
+def _tokens(data: bytes) -> set[bytes]:
+    """Lowercased word tokens (letter first, 3+ characters) in ``data``."""
+    return set(TOKEN_RE.findall(data.lower()))
+
+
+_RELATIVE_RE = re.compile(r"^(\d+(?:\.\d+)?)\s*([smhd])$")
+_RELATIVE_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_time(value: str | float | None) -> float | None:
+    """
+    Parse a query time bound.
+
+    Accepts unix seconds, relative durations back from now (``15m``,
+    ``2h``, ``1d``) and ISO 8601 timestamps.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = value.strip()
+    if m := _RELATIVE_RE.match(text):
+        return time.time() - float(m.group(1)) * _RELATIVE_UNITS[m.group(2)]
+    try:
+        return float(text)
+    except ValueError:
+        return datetime.fromisoformat(text.replace("Z", "+00:00")).timestamp()
+
+
+@dataclass(slots=True)
+class _Segment:
+    """A contiguous byte range of the log and the timestamps seen in it."""
+
+    start: int
+    end: int
+    min_ts: float | None = None
+    max_ts: float | None = None
+    tokens_complete: bool = True
+
+    def overlaps(self, since: float | None, until: float | None) -> bool:
+        if self.min_ts is None:
+            # Untimestamped segments can't be excluded
+            return True
+        if since is not None and self.max_ts < since:
+            return False
+        if until is not None and self.min_ts > until:
+            return False
+        return True
+
+
+@dataclass(slots=True)
+class LogMatch:
+    """A matching log line."""
+
+    offset: int
+    line: str
+    timestamp: float | None
+
+
+@dataclass
+class SearchStats:
+    """Work done by a query, reported alongside results."""
+
+    segments_total: int = 0
+    segments_scanned: int = 0
+    bytes_scanned: int = 0
+
+
+class LogIndex:
+    """
+    Incremental segment index over a single log file.
+
+    ``refresh()`` picks up appended lines from the last checkpoint and
+    restarts from zero when the file is rotated (new inode) or truncated.
+    Only complete lines are indexed; a trailing partial line is picked up
+    on the next refresh.
+    """
+
+    def __init__(self, path: Path, index_tokens: bool = True) -> None:
+        self.path = path
+        self.index_tokens = index_tokens
+        self._lock = threading.Lock()
+        self._reset(None)
+
+    def _reset(self, identity: tuple[int, int] | None) -> None:
+        self._identity = identity
+        self._offset = 0
+        self._segments: list[_Segment] = []
+        self._postings: dict[bytes, list[int]] = {}
+        self._vocabulary_full = False
+
+    @property
+    def indexed_bytes(self) -> int:
+        return self._offset
+
+    @property
+    def segment_count(self) -> int:
+        return len(self._segments)
+
+    def refresh(self) -> int:
+        """Index newly appended data; returns the number of bytes indexed."""
+        with self._lock:
+            try:
+                stat = self.path.stat()
+            except FileNotFoundError:
+                self._reset(None)
+                return 0
+
+            identity = (stat.st_dev, stat.st_ino)
+            if identity != self._identity or stat.st_size < self._offset:
+                if self._identity is not None:
+                    logger.info("Log rotated, reindexing", path=str(self.path))
+                self._reset(identity)
+
+            if stat.st_size == self._offset:
+                return 0
+
+            with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Stop at the last complete line
+                end = mm.rfind(b"\n", self._offset) + 1
+                if end <= self._offset:
+                    return 0
+                start = self._offset
+                self._index_range(mm, start, end)
+                self._offset = end
+                return end - start
+
+    def _index_range(self, mm: mmap.mmap, start: int, end: int) -> None:
+        pos = start
+        while pos < end:
+            chunk_end = min(pos + CHUNK_BYTES, end)
+            if chunk_end < end:
+                newline = mm.rfind(b"\n", pos, chunk_end)
+                # Lines longer than a chunk extend it to their end
+                chunk_end = newline + 1 if newline >= 0 else mm.find(b"\n", chunk_end, end) + 1
+            self._add_chunk(mm, pos, chunk_end)
+            pos = chunk_end
+
+    def _edge_timestamps(self, mm: mmap.mmap, start: int, end: int) -> tuple[float | None, float | None]:
+        """Timestamps of the first and last lines of a chunk that carry one."""
+        first = last = None
+        pos = start
+        for _ in range(8):
+            if pos >= end:
+                break
+            line_end = mm.find(b"\n", pos, end)
+            line_end = end if line_end < 0 else line_end
+            first = parse_line_timestamp(mm[pos:min(pos + TIMESTAMP_SCAN_BYTES, line_end)])
+            if first is not None:
+                break
+            pos = line_end + 1
+
+        line_end = end - 1
+        for _ in range(8):
+            if line_end <= start:
+                break
+            line_start = mm.rfind(b"\n", start, line_end) + 1
+            line_start = max(line_start, start)
+            last = parse_line_timestamp(mm[line_start:min(line_start + TIMESTAMP_SCAN_BYTES, line_end)])
+            if last is not None:
+                break
+            line_end = line_start - 1
+        return first, last
+
+    def _add_chunk(self, mm: mmap.mmap, start: int, end: int) -> None:
+        first_ts, last_ts = self._edge_timestamps(mm, start, end)
+        segment = self._segments[-1] if self._segments else None
+
+        if segment is not None:
+            size = segment.end - segment.start
+            new_bucket = (
+                first_ts is not None
+                and segment.min_ts is not None
+                and int(first_ts // BUCKET_SECONDS) != int(segment.min_ts // BUCKET_SECONDS)
+            )
+            if size >= SEGMENT_MAX_BYTES or (new_bucket and size >= SEGMENT_MIN_BYTES):
+                segment = None
+
+        if segment is None:
+            segment = _Segment(start=start, end=start)
+            self._segments.append(segment)
+
+        segment.end = end
+        for ts in (first_ts, last_ts):
+            if ts is None:
+                continue
+            segment.min_ts = ts if segment.min_ts is None else min(segment.min_ts, ts)
+            segment.max_ts = ts if segment.max_ts is None else max(segment.max_ts, ts)
+
+        if self.index_tokens:
+            self._index_tokens(mm[start:end], len(self._segments) - 1, segment)
+
+    def _index_tokens(self, data: bytes, segment_id: int, segment: _Segment) -> None:
+        postings = self._postings
+        for token in _tokens(data):
+            ids = postings.get(token)
+            if ids is None:
+                if len(postings) >= MAX_VOCABULARY:
+                    if not self._vocabulary_full:
+                        logger.warning("Log token vocabulary full", path=str(self.path))
+                        self._vocabulary_full = True
+                    segment.tokens_complete = False
+                    continue
+                postings[token] = [segment_id]
+            elif ids[-1] != segment_id:
+                ids.append(segment_id)
+
+    def _candidates(
+        self,
+        since: float | None,
+        until: float | None,
+        terms: set[bytes],
+    ) -> tuple[list[_Segment], int]:
+        with self._lock:
+            segments = list(self._segments)
+            candidate_ids = set(range(len(segments)))
+            if terms and self.index_tokens:
+                for term in terms:
+                    term_ids = set(self._postings.get(term, ()))
+                    term_ids.update(i for i in candidate_ids if not segments[i].tokens_complete)
+                    candidate_ids &= term_ids
+        candidates = [
+            segments[i] for i in sorted(candidate_ids) if segments[i].overlaps(since, until)
+        ]
+        return candidates, len(segments)
+
+    def search(
+        self,
+        pattern: re.Pattern[bytes],
+        since: float | None = None,
+        until: float | None = None,
+        terms: list[str] | None = None,
+        stats: SearchStats | None = None,
+    ) -> Iterator[LogMatch]:
+        """
+        Yield lines matching ``pattern``, newest first.
+
+        ``terms`` are words that must all occur on the line; they are split
+        into index tokens and answered from the token index to skip
+        segments (numbers and words under three characters are left to
+        ``pattern``). Lines whose own
+        timestamp falls outside ``since``/``until`` are dropped; lines
+        without one are kept when their segment overlaps the range.
+        """
+        stats = stats or SearchStats()
+        term_tokens: set[bytes] = set()
+        for term in terms or []:
+            term_tokens |= _tokens(term.encode())
+        segments, stats.segments_total = self._candidates(since, until, term_tokens)
+        if not segments:
+            return
+
+        time_filtered = since is not None or until is not None
+
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with mm:
+            for segment in reversed(segments):
+                if segment.end > len(mm):
+                    # Truncated since the last refresh
+                    continue
+                stats.segments_scanned += 1
+                stats.bytes_scanned += segment.end - segment.start
+
+                # Segments are scanned forward; keep matches to replay newest first
+                found: deque[LogMatch] = deque()
+                pos = segment.start
+                while pos < segment.end:
+                    m = pattern.search(mm, pos, segment.end)
+                    if m is None:
+                        break
+                    line_start = mm.rfind(b"\n", segment.start, m.start()) + 1
+                    line_start = max(line_start, segment.start)
+                    line_end = mm.find(b"\n", m.start(), segment.end)
+                    line_end = segment.end if line_end < 0 else line_end
+                    pos = line_end + 1
+
+                    raw = mm[line_start:line_end]
+                    if term_tokens and not term_tokens <= _tokens(raw):
+                        continue
+                    ts = parse_line_timestamp(raw)
+                    if time_filtered and ts is not None:
+                        if (since is not None and ts < since) or (until is not None and ts > until):
+                            continue
+                    found.append(LogMatch(line_start, raw.decode(errors="replace"), ts))
+
+                while found:
+                    yield found.pop()
+
+
+def tail_lines(path: Path, count: int) -> list[str]:
+    """Last ``count`` lines of a file, read backwards from the end via mmap."""
+    if count <= 0 or path.stat().st_size == 0:
+        return []
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        end = len(mm)
+        if mm[end - 1:end] == b"\n":
+            end -= 1
+        start = end
+        for _ in range(count):
+            newline = mm.rfind(b"\n", 0, start)
+            if newline < 0:
+                start = 0
+                break
+            start = newline
+        data = mm[start:end].lstrip(b"\n") if start else mm[0:end]
+    return data.decode(errors="replace").splitlines()
+
+
+class LogIndexService:
+    """
+    Process-wide registry of log indexes.
+
+    Configured files (``LOG_INDEX_FILES``) are refreshed in the background
+    every ``LOG_INDEX_INTERVAL`` seconds once ``start()`` is called; any
+    other permitted file is indexed on first query. Queries refresh the
+    index first, which only reads data appended since the last refresh.
+    """
+
+    def __init__(
+        self,
+        watched: list[str] | None = None,
+        interval: float | None = None,
+        index_tokens: bool | None = None,
+    ) -> None:
+        if watched is None:
+            watched = os.environ.get("LOG_INDEX_FILES", DEFAULT_WATCHED_FILES).split(",")
+        self.watched = [Path(p.strip()).resolve() for p in watched if p.strip()]
+        self.interval = interval or float(os.environ.get("LOG_INDEX_INTERVAL", "5"))
+        if index_tokens is None:
+            index_tokens = os.environ.get("LOG_INDEX_TOKENS", "true").lower() in ("1", "true", "yes")
+        self.index_tokens = index_tokens
+        self._indexes: OrderedDict[Path, LogIndex] = OrderedDict()
+        self._lock = threading.Lock()
+        self._task: asyncio.Task | None = None
+
+    def get(self, path: Path) -> LogIndex:
+        """Get (or create) the index for a file."""
+        path = path.resolve()
+        with self._lock:
+            index = self._indexes.get(path)
+            if index is None:
+                index = LogIndex(path, index_tokens=self.index_tokens)
+                self._indexes[path] = index
+                # Evict the least recently used ad-hoc index
+                evictable = [p for p in self._indexes if p != path and p not in self.watched]
+                if len(self._indexes) > MAX_INDEXES and evictable:
+                    del self._indexes[evictable[0]]
+            else:
+                self._indexes.move_to_end(path)
+            return index
+
+    async def refresh(self, path: Path) -> LogIndex:
+        index = self.get(path)
+        await asyncio.to_thread(index.refresh)
+        return index
+
+    async def _tail_loop(self) -> None:
+        while True:
+            for path in self.watched:
+                if not path.exists():
+                    continue
+                try:
+                    await self.refresh(path)
+                except Exception as e:
+                    logger.warning("Log index refresh failed", path=str(path), error=str(e))
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start background tailing of the configured files."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._tail_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+_log_index_service: LogIndexService | None = None
+
+
+def get_log_index_service() -> LogIndexService:
+    """Get the global log index service."""
+    global _log_index_service
+    if _log_index_service is None:
+        _log_index_service = LogIndexService()
+    return _log_index_service
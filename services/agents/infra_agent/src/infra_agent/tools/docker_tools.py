@@ -2,14 +2,26 @@
 Docker operation tools for the Infra Agent.
 
 Provides comprehensive Docker and Docker Compose management capabilities.
+Container, image and stats queries go through the Docker Engine API client
+(``ai_core.docker_client``) over the daemon socket; Compose, build and prune
+operations still use the ``docker`` CLI.
 """
 
 import asyncio
 import json
 import os
+import shlex
+from datetime import datetime, timezone
 from pathlib import Path
 
 from ai_core import CapabilityCategory, get_logger
+from ai_core.docker_client import (
+    DockerAPIError,
+    format_bytes,
+    format_ports,
+    get_docker_client,
+    summarize_stats,
+)
 from base_agent import ToolResult, tool
 
 logger = get_logger(__name__)
@@ -28,6 +40,23 @@ def _is_allowed_container(name: str) -> bool:
     return any(name_lower.startswith(prefix) for prefix in ALLOWED_CONTAINER_PREFIXES)
 
 
+def _container_name(container: dict) -> str:
+    """Primary name of a container from the list API."""
+    names = container.get("Names") or [""]
+    return names[0].lstrip("/")
+
+
+def _created_since(timestamp: int) -> str:
+    """Rough ``CreatedSince``-style age for an image."""
+    age = datetime.now(timezone.utc) - datetime.fromtimestamp(timestamp, timezone.utc)
+    if age.days >= 30:
+        return f"{age.days // 30} months ago"
+    if age.days >= 1:
+        return f"{age.days} days ago"
+    hours = age.seconds // 3600
+    return f"{hours} hours ago" if hours else f"{age.seconds // 60} minutes ago"
+
+
 async def _run_docker_command(
     args: list[str],
     cwd: Path | None = None,
@@ -75,37 +104,29 @@ async def docker_ps(
 ) -> ToolResult:
     """List Docker containers."""
     try:
-        args = [
-            "ps",
-            "--format",
-            '{"id":"{{.ID}}","name":"{{.Names}}","image":"{{.Image}}","status":"{{.Status}}","ports":"{{.Ports}}"}',
-        ]
-
-        if show_all:
-            args.insert(1, "-a")
+        filters = {"name": [name_filter]} if name_filter else None
+        raw = await get_docker_client().list_containers(all=show_all, filters=filters)
 
-        if name_filter:
-            args.extend(["--filter", f"name={name_filter}"])
-
-        code, stdout, stderr = await _run_docker_command(args)
-
-        if code != 0:
-            return ToolResult.fail(f"Docker error: {stderr}")
-
-        # Parse JSON lines
         containers = []
-        for line in stdout.splitlines():
-            if line.strip():
-                container = json.loads(line)
-                # Only show allowed containers
-                if _is_allowed_container(container["name"]):
-                    containers.append(container)
+        for item in raw:
+            container = {
+                "id": item.get("Id", "")[:12],
+                "name": _container_name(item),
+                "image": item.get("Image"),
+                "status": item.get("Status"),
+                "ports": format_ports(item.get("Ports", [])),
+            }
+            # Only show allowed containers
+            if _is_allowed_container(container["name"]):
+                containers.append(container)
 
         return ToolResult.ok(
             containers,
             count=len(containers),
         )
 
+    except (DockerAPIError, OSError) as e:
+        return ToolResult.fail(f"Docker error: {e}")
     except Exception as e:
         logger.error("Docker ps failed", error=str(e))
         return ToolResult.fail(f"Docker ps failed: {e}")
@@ -144,17 +165,7 @@ async def docker_logs(
         if not _is_allowed_container(container):
             return ToolResult.fail(f"Container not in allowed list: {container}")
 
-        args = ["logs", "--tail", str(lines)]
-
-        if since:
-            args.extend(["--since", since])
-
-        args.append(container)
-
-        code, stdout, stderr = await _run_docker_command(args)
-
-        if code != 0:
-            return ToolResult.fail(f"Docker error: {stderr}")
+        stdout, stderr = await get_docker_client().logs(container, tail=lines, since=since)
 
         # Docker sends logs to stderr for some containers
         logs = stdout if stdout else stderr
@@ -165,6 +176,8 @@ async def docker_logs(
             lines=len(logs.splitlines()),
         )
 
+    except (DockerAPIError, OSError) as e:
+        return ToolResult.fail(f"Docker error: {e}")
     except Exception as e:
         logger.error("Docker logs failed", container=container, error=str(e))
         return ToolResult.fail(f"Docker logs failed: {e}")
@@ -199,20 +212,23 @@ async def docker_exec(
         if not _is_allowed_container(container):
             return ToolResult.fail(f"Container not in allowed list: {container}")
 
-        # Split command into args
-        args = ["exec", container] + command.split()
-
-        code, stdout, stderr = await _run_docker_command(args)
+        code, stdout, stderr = await get_docker_client().exec(
+            container, shlex.split(command), timeout=300
+        )
 
         if code != 0:
-            return ToolResult.fail(f"Exec error: {stderr}")
+            return ToolResult.fail(f"Exec error: {stderr or stdout}")
 
         return ToolResult.ok(
-            stdout if stdout else "Command completed",
+            stdout.strip() if stdout.strip() else "Command completed",
             container=container,
             command=command,
         )
 
+    except asyncio.TimeoutError:
+        return ToolResult.fail(f"Exec timed out: {command}")
+    except (DockerAPIError, OSError) as e:
+        return ToolResult.fail(f"Exec error: {e}")
     except Exception as e:
         logger.error("Docker exec failed", container=container, error=str(e))
         return ToolResult.fail(f"Docker exec failed: {e}")
@@ -238,17 +254,9 @@ async def docker_inspect(container: str) -> ToolResult:
         if not _is_allowed_container(container):
             return ToolResult.fail(f"Container not in allowed list: {container}")
 
-        args = ["inspect", container]
-
-        code, stdout, stderr = await _run_docker_command(args)
-
-        if code != 0:
-            return ToolResult.fail(f"Docker error: {stderr}")
-
-        info = json.loads(stdout)
-        if info:
+        container_info = (await get_docker_client().inspect_containers([container]))[container]
+        if container_info:
             # Extract key information
-            container_info = info[0]
             result = {
                 "id": container_info.get("Id", "")[:12],
                 "name": container_info.get("Name", "").lstrip("/"),
@@ -278,8 +286,8 @@ async def docker_inspect(container: str) -> ToolResult:
 
         return ToolResult.fail("Container not found")
 
-    except json.JSONDecodeError as e:
-        return ToolResult.fail(f"Failed to parse inspect output: {e}")
+    except (DockerAPIError, OSError) as e:
+        return ToolResult.fail(f"Docker error: {e}")
     except Exception as e:
         logger.error("Docker inspect failed", container=container, error=str(e))
         return ToolResult.fail(f"Docker inspect failed: {e}")
@@ -579,34 +587,28 @@ async def docker_images(
 ) -> ToolResult:
     """List Docker images."""
     try:
-        args = [
-            "images",
-            "--format",
-            '{"repository":"{{.Repository}}","tag":"{{.Tag}}","id":"{{.ID}}","size":"{{.Size}}","created":"{{.CreatedSince}}"}',
-        ]
+        filters = {"reference": [name_filter]} if name_filter else None
+        raw = await get_docker_client().list_images(all=show_all, filters=filters)
 
-        if show_all:
-            args.insert(1, "-a")
-
-        if name_filter:
-            args.extend(["--filter", f"reference={name_filter}"])
-
-        code, stdout, stderr = await _run_docker_command(args)
-
-        if code != 0:
-            return ToolResult.fail(f"Docker error: {stderr}")
-
-        # Parse JSON lines
         images = []
-        for line in stdout.splitlines():
-            if line.strip():
-                images.append(json.loads(line))
+        for item in raw:
+            for repo_tag in item.get("RepoTags") or ["<none>:<none>"]:
+                repository, _, tag = repo_tag.rpartition(":")
+                images.append({
+                    "repository": repository,
+                    "tag": tag,
+                    "id": item.get("Id", "").removeprefix("sha256:")[:12],
+                    "size": format_bytes(item.get("Size", 0), binary=False),
+                    "created": _created_since(item.get("Created", 0)),
+                })
 
         return ToolResult.ok(
             images,
             count=len(images),
         )
 
+    except (DockerAPIError, OSError) as e:
+        return ToolResult.fail(f"Docker error: {e}")
     except Exception as e:
         logger.error("Docker images failed", error=str(e))
         return ToolResult.fail(f"Docker images failed: {e}")
@@ -630,19 +632,20 @@ async def docker_images(
 async def docker_pull(image: str) -> ToolResult:
     """Pull a Docker image."""
     try:
-        args = ["pull", image]
-
-        code, stdout, stderr = await _run_docker_command(args)
-
-        if code != 0:
-            return ToolResult.fail(f"Pull failed: {stderr}")
+        statuses: list[str] = []
+        async for event in get_docker_client().pull_image(image):
+            status = event.get("status")
+            if status and "progress" not in event:
+                statuses.append(f"{event.get('id', '')}: {status}".lstrip(": "))
 
         return ToolResult.ok({
             "message": f"Successfully pulled: {image}",
             "image": image,
-            "output": stdout,
+            "output": "\n".join(statuses[-50:]),
         })
 
+    except (DockerAPIError, OSError) as e:
+        return ToolResult.fail(f"Pull failed: {e}")
     except Exception as e:
         logger.error("Docker pull failed", image=image, error=str(e))
         return ToolResult.fail(f"Docker pull failed: {e}")
@@ -728,37 +731,34 @@ async def docker_build(
 async def docker_stats(container: str | None = None) -> ToolResult:
     """Get container resource usage."""
     try:
-        args = [
-            "stats",
-            "--no-stream",
-            "--format",
-            '{"name":"{{.Name}}","cpu":"{{.CPUPerc}}","memory":"{{.MemUsage}}","mem_percent":"{{.MemPerc}}","net_io":"{{.NetIO}}","block_io":"{{.BlockIO}}","pids":"{{.PIDs}}"}',
-        ]
+        client = get_docker_client()
 
         if container:
             if not _is_allowed_container(container):
                 return ToolResult.fail(f"Container not in allowed list: {container}")
-            args.append(container)
-
-        code, stdout, stderr = await _run_docker_command(args)
-
-        if code != 0:
-            return ToolResult.fail(f"Docker error: {stderr}")
-
-        # Parse JSON lines
-        stats = []
-        for line in stdout.splitlines():
-            if line.strip():
-                stat = json.loads(line)
-                # Only include allowed containers
-                if _is_allowed_container(stat["name"]):
-                    stats.append(stat)
+            names = [container]
+        else:
+            names = [
+                _container_name(c)
+                for c in await client.list_containers()
+                if _is_allowed_container(_container_name(c))
+            ]
+
+        # Sample all containers concurrently instead of one CLI sampling pass
+        samples = await client.stats_many(names)
+        stats = [
+            summarize_stats(name, sample)
+            for name, sample in samples.items()
+            if sample is not None
+        ]
 
         return ToolResult.ok(
             stats,
             count=len(stats),
         )
 
+    except (DockerAPIError, OSError) as e:
+        return ToolResult.fail(f"Docker error: {e}")
     except Exception as e:
         logger.error("Docker stats failed", error=str(e))
         return ToolResult.fail(f"Docker stats failed: {e}")
@@ -780,45 +780,38 @@ async def docker_stats(container: str | None = None) -> ToolResult:
 async def docker_health_check(container: str | None = None) -> ToolResult:
     """Check container health status."""
     try:
-        args = [
-            "ps",
-            "--format",
-            '{"name":"{{.Names}}","status":"{{.Status}}","health":"{{.Status}}"}',
-        ]
-
-        if container:
-            if not _is_allowed_container(container):
-                return ToolResult.fail(f"Container not in allowed list: {container}")
-            args.extend(["--filter", f"name={container}"])
-
-        code, stdout, stderr = await _run_docker_command(args)
+        if container and not _is_allowed_container(container):
+            return ToolResult.fail(f"Container not in allowed list: {container}")
 
-        if code != 0:
-            return ToolResult.fail(f"Docker error: {stderr}")
+        filters = {"name": [container]} if container else None
+        raw = await get_docker_client().list_containers(filters=filters)
 
         # Parse and enrich with health info
         containers = []
-        for line in stdout.splitlines():
-            if line.strip():
-                info = json.loads(line)
-                if not _is_allowed_container(info["name"]):
-                    continue
-
-                # Extract health status from status string
-                status = info["status"].lower()
-                if "healthy" in status:
-                    health = "healthy"
-                elif "unhealthy" in status:
-                    health = "unhealthy"
-                elif "starting" in status:
-                    health = "starting"
-                elif "up" in status:
-                    health = "running"
-                else:
-                    health = "unknown"
-
-                info["health_status"] = health
-                containers.append(info)
+        for item in raw:
+            info = {
+                "name": _container_name(item),
+                "status": item.get("Status", ""),
+                "health": item.get("Status", ""),
+            }
+            if not _is_allowed_container(info["name"]):
+                continue
+
+            # Extract health status from status string
+            status = info["status"].lower()
+            if "unhealthy" in status:
+                health = "unhealthy"
+            elif "healthy" in status:
+                health = "healthy"
+            elif "starting" in status:
+                health = "starting"
+            elif "up" in status:
+                health = "running"
+            else:
+                health = "unknown"
+
+            info["health_status"] = health
+            containers.append(info)
 
         # Summary
         healthy = sum(1 for c in containers if c["health_status"] == "healthy")
@@ -836,6 +829,8 @@ async def docker_health_check(container: str | None = None) -> ToolResult:
             },
         )
 
+    except (DockerAPIError, OSError) as e:
+        return ToolResult.fail(f"Docker error: {e}")
     except Exception as e:
         logger.error("Docker health check failed", error=str(e))
         return ToolResult.fail(f"Docker health check failed: {e}")
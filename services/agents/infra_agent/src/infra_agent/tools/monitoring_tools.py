@@ -18,6 +18,8 @@ from typing import Any
 from ai_core import CapabilityCategory, get_logger
 from base_agent import ToolResult, tool
 
+from ..log_index import SearchStats, get_log_index_service, parse_time, tail_lines
+
 logger = get_logger(__name__)
 
 
@@ -431,7 +433,10 @@ async def get_disk_io(
 @tool(
     name="search_logs",
     description="""Search through log files for patterns.
-    Supports regex patterns and multiple log sources.""",
+    Supports regex patterns, time ranges and multiple log sources.
+    Files are indexed incrementally, so repeated searches only scan the
+    time segments (and, with terms, the segments containing those words)
+    that can match. Returns the most recent matches.""",
     parameters={
         "type": "object",
         "properties": {
@@ -454,6 +459,19 @@ async def get_disk_io(
                 "description": "Case sensitive search",
                 "default": False,
             },
+            "since": {
+                "type": "string",
+                "description": "Only lines at or after this time (e.g., '15m', '2h', ISO timestamp)",
+            },
+            "until": {
+                "type": "string",
+                "description": "Only lines at or before this time (e.g., '5m', ISO timestamp)",
+            },
+            "terms": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Words that must all appear on matching lines (uses the token index)",
+            },
         },
         "required": ["pattern"],
     },
@@ -465,6 +483,9 @@ async def search_logs(
     log_file: str = "/var/log/syslog",
     lines: int = 50,
     case_sensitive: bool = False,
+    since: str | None = None,
+    until: str | None = None,
+    terms: list[str] | None = None,
 ) -> ToolResult:
     """Search through log files."""
     try:
@@ -476,18 +497,33 @@ async def search_logs(
         if not log_path.exists():
             return ToolResult.fail(f"Log file not found: {log_file}")
 
-        # Build grep command
-        # -E = extended regex, -i = case insensitive
-        grep_opts = "-Ei" if not case_sensitive else "-E"
-        cmd = f"grep {grep_opts} '{pattern}' {log_file} | tail -n {lines}"
-
-        code, stdout, stderr = await _run_command(cmd)
-
-        # grep returns 1 if no matches
-        if code not in (0, 1):
-            return ToolResult.fail(f"Search failed: {stderr}")
+        try:
+            flags = re.MULTILINE if case_sensitive else re.MULTILINE | re.IGNORECASE
+            regex = re.compile(pattern.encode(), flags)
+        except re.error as e:
+            return ToolResult.fail(f"Invalid pattern: {e}")
 
-        matches = stdout.splitlines() if stdout else []
+        try:
+            since_ts = parse_time(since)
+            until_ts = parse_time(until)
+        except ValueError as e:
+            return ToolResult.fail(f"Invalid time range: {e}")
+
+        lines = max(1, min(lines, 1000))
+        index = await get_log_index_service().refresh(log_path)
+        stats = SearchStats()
+
+        def collect() -> list[str]:
+            # Matches stream newest first; stop as soon as the limit is reached
+            found = []
+            for match in index.search(regex, since_ts, until_ts, terms, stats):
+                found.append(match.line)
+                if len(found) >= lines:
+                    break
+            found.reverse()
+            return found
+
+        matches = await asyncio.to_thread(collect)
 
         return ToolResult.ok({
             "message": f"Found {len(matches)} matches in {log_file}",
@@ -495,6 +531,9 @@ async def search_logs(
             "pattern": pattern,
             "matches": matches,
             "count": len(matches),
+            "segments_scanned": stats.segments_scanned,
+            "segments_total": stats.segments_total,
+            "bytes_scanned": stats.bytes_scanned,
         })
 
     except Exception as e:
@@ -541,13 +580,7 @@ async def tail_log(
         # Limit lines
         lines = min(lines, 500)
 
-        cmd = f"tail -n {lines} {log_file}"
-        code, stdout, stderr = await _run_command(cmd)
-
-        if code != 0:
-            return ToolResult.fail(f"tail failed: {stderr}")
-
-        log_lines = stdout.splitlines()
+        log_lines = await asyncio.to_thread(tail_lines, log_path, lines)
 
         return ToolResult.ok({
             "message": f"Retrieved last {len(log_lines)} lines from {log_file}",
@@ -29,6 +29,7 @@ from .tools import (
     test_api_batch,
     validate_json_schema,
     measure_api_performance,
+    run_load_test,
     check_api_health,
     # Browser lifecycle tools
     browser_launch,
@@ -136,6 +137,7 @@ Your capabilities:
    - Test individual API endpoints
    - Run batch API tests
    - Measure API performance (response times, throughput)
+   - Run open-loop load tests with latency percentiles and compare against a baseline
    - Validate JSON responses against schemas
    - Check health of multiple endpoints
 
@@ -339,6 +341,7 @@ class QAAgent(BaseAgent):
         self.register_tool(test_api_batch._tool)
         self.register_tool(validate_json_schema._tool)
         self.register_tool(measure_api_performance._tool)
+        self.register_tool(run_load_test._tool)
         self.register_tool(check_api_health._tool)
 
         # Browser lifecycle tools
@@ -0,0 +1,317 @@
+"""
+Test impact analysis for the QA Agent.
+
+Maps test files to the source files they (transitively) import so that,
+after an edit, only the affected tests need to run first. The static
+import graph can be refined with coverage.py dynamic contexts
+(``pytest --cov-context=test``) when a ``.coverage`` database is present.
+"""
+
+import ast
+import os
+import sqlite3
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ai_core import get_logger
+
+logger = get_logger(__name__)
+
+# Directories never treated as part of the import graph
+SKIP_DIRS = {
+    ".git",
+    "node_modules",
+    "__pycache__",
+    ".venv",
+    "venv",
+    ".tox",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+    "build",
+    "dist",
+}
+
+
+def is_test_file(path: Path) -> bool:
+    """Check whether a path looks like a pytest test module."""
+    name = path.name
+    return name.endswith(".py") and (name.startswith("test_") or name.endswith("_test.py"))
+
+
+def find_test_files(scope: Path) -> list[Path]:
+    """List test modules under ``scope`` (or ``scope`` itself if it is a file)."""
+    if scope.is_file():
+        return [scope]
+    files = []
+    for dirpath, dirnames, filenames in os.walk(scope):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS and not d.startswith(".")]
+        files.extend(Path(dirpath) / name for name in filenames if is_test_file(Path(name)))
+    return sorted(files)
+
+
+@dataclass
+class _ParsedModule:
+    """Imports parsed from a single file, keyed by its stat signature."""
+
+    size: int
+    mtime_ns: int
+    imports: set[str] = field(default_factory=set)
+
+
+class ImportGraph:
+    """
+    Static import graph of a Python project.
+
+    Module names are derived from file paths relative to the project's
+    source roots (the project root plus any ``src`` directories). Parsed
+    imports are cached per file and only re-parsed when the file's size or
+    mtime changes, so repeated analyses after small edits are cheap.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root.resolve()
+        self._parsed: dict[Path, _ParsedModule] = {}
+        self._module_to_file: dict[str, Path] = {}
+        self._file_to_module: dict[Path, str] = {}
+        self._reverse: dict[Path, set[Path]] = {}
+
+    def _source_roots(self, files: list[Path]) -> list[Path]:
+        roots = {self.root}
+        for file in files:
+            for parent in file.parents:
+                if parent == self.root or self.root not in parent.parents:
+                    break
+                if parent.name == "src":
+                    roots.add(parent)
+        # Longest roots first so the most specific root wins
+        return sorted(roots, key=lambda p: len(p.parts), reverse=True)
+
+    def _module_name(self, file: Path, roots: list[Path]) -> str | None:
+        for root in roots:
+            try:
+                rel = file.relative_to(root)
+            except ValueError:
+                continue
+            parts = list(rel.with_suffix("").parts)
+            if parts and parts[-1] == "__init__":
+                parts.pop()
+            if parts:
+                return ".".join(parts)
+        return None
+
+    def _iter_python_files(self) -> list[Path]:
+        files = []
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS and not d.startswith(".")]
+            for name in filenames:
+                if name.endswith(".py"):
+                    files.append(Path(dirpath) / name)
+        return files
+
+    def _parse_imports(self, file: Path, module: str) -> set[str]:
+        try:
+            tree = ast.parse(file.read_bytes(), filename=str(file))
+        except (OSError, SyntaxError, ValueError):
+            return set()
+
+        package = module if file.name == "__init__.py" else module.rpartition(".")[0]
+        imports: set[str] = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                imports.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                base = node.module or ""
+                if node.level:
+                    parts = package.split(".") if package else []
+                    if node.level > 1:
+                        parts = parts[: len(parts) - (node.level - 1)]
+                    base = ".".join(p for p in [*parts, base] if p)
+                if base:
+                    imports.add(base)
+                    # ``from pkg import module`` may name a submodule
+                    imports.update(f"{base}.{alias.name}" for alias in node.names)
+        return imports
+
+    def build(self) -> None:
+        """(Re)build the graph, re-parsing only files that changed."""
+        files = self._iter_python_files()
+        roots = self._source_roots(files)
+
+        self._module_to_file.clear()
+        self._file_to_module.clear()
+        for file in files:
+            module = self._module_name(file, roots)
+            if module:
+                self._module_to_file.setdefault(module, file)
+                self._file_to_module[file] = module
+
+        live = set(files)
+        for stale in set(self._parsed) - live:
+            del self._parsed[stale]
+
+        for file, module in self._file_to_module.items():
+            try:
+                stat = file.stat()
+            except OSError:
+                continue
+            cached = self._parsed.get(file)
+            if cached and cached.size == stat.st_size and cached.mtime_ns == stat.st_mtime_ns:
+                continue
+            self._parsed[file] = _ParsedModule(
+                stat.st_size, stat.st_mtime_ns, self._parse_imports(file, module)
+            )
+
+        self._reverse = {}
+        for file, parsed in self._parsed.items():
+            for imported in parsed.imports:
+                for target in self._resolve(imported):
+                    if target != file:
+                        self._reverse.setdefault(target, set()).add(file)
+
+    def _resolve(self, module: str) -> list[Path]:
+        """
+        Files executed by importing ``module``.
+
+        Importing ``pkg.mod`` runs ``pkg/__init__.py`` as well as
+        ``pkg/mod.py``; trailing attribute names (``pkg.mod.Class``)
+        simply don't resolve and are ignored.
+        """
+        targets = []
+        parts = module.split(".")
+        for i in range(1, len(parts) + 1):
+            target = self._module_to_file.get(".".join(parts[:i]))
+            if target is not None:
+                targets.append(target)
+        return targets
+
+    def dependents(self, changed: list[Path]) -> set[Path]:
+        """All files that transitively import any of the changed files."""
+        seen: set[Path] = set()
+        queue = deque(p.resolve() for p in changed)
+        while queue:
+            current = queue.popleft()
+            if current in seen:
+                continue
+            seen.add(current)
+            queue.extend(self._reverse.get(current, ()))
+        return seen
+
+    def test_files(self) -> list[Path]:
+        """All test modules known to the graph."""
+        return sorted(f for f in self._file_to_module if is_test_file(f))
+
+
+def coverage_context_tests(coverage_file: Path, changed: list[Path]) -> set[str] | None:
+    """
+    Return test node IDs whose recorded coverage touches the changed files.
+
+    Reads a coverage.py SQLite database recorded with per-test contexts.
+    Returns ``None`` when the database is missing or has no contexts, so
+    callers can fall back to the static import graph.
+    """
+    if not coverage_file.exists():
+        return None
+
+    paths = [str(p.resolve()) for p in changed]
+    if not paths:
+        return set()
+
+    try:
+        conn = sqlite3.connect(f"file:{coverage_file}?mode=ro", uri=True)
+    except sqlite3.Error:
+        return None
+
+    try:
+        placeholders = ",".join("?" for _ in paths)
+        rows = conn.execute(
+            f"""
+            SELECT DISTINCT c.context
+            FROM line_bits lb
+            JOIN file f ON f.id = lb.file_id
+            JOIN context c ON c.id = lb.context_id
+            WHERE f.path IN ({placeholders}) AND c.context != ''
+            """,
+            paths,
+        ).fetchall()
+    except sqlite3.Error as e:
+        logger.debug("Coverage contexts unavailable", file=str(coverage_file), error=str(e))
+        return None
+    finally:
+        conn.close()
+
+    if not rows:
+        return None
+
+    # pytest-cov contexts look like "tests/test_x.py::test_y|run"
+    return {context.split("|", 1)[0] for (context,) in rows}
+
+
+@dataclass
+class ImpactResult:
+    """Tests selected by impact analysis."""
+
+    affected: list[str]
+    remaining: list[str]
+    source: str
+
+
+_graphs: dict[Path, ImportGraph] = {}
+
+
+def get_import_graph(root: Path) -> ImportGraph:
+    """Get the cached import graph for a project root, refreshing it."""
+    root = root.resolve()
+    graph = _graphs.get(root)
+    if graph is None:
+        graph = ImportGraph(root)
+        _graphs[root] = graph
+    graph.build()
+    return graph
+
+
+def select_tests(
+    root: Path,
+    changed_files: list[Path],
+    test_path: Path | None = None,
+    coverage_file: Path | None = None,
+) -> ImpactResult:
+    """
+    Select tests affected by ``changed_files``.
+
+    Tests under ``test_path`` that import a changed file (directly or
+    transitively), changed tests themselves, and all tests below a changed
+    ``conftest.py`` are returned as ``affected``; the rest as ``remaining``.
+    When per-test coverage contexts are available they add tests whose
+    dynamic coverage touched a changed file.
+    """
+    graph = get_import_graph(root)
+    scope = (test_path or root).resolve()
+    tests = [t for t in graph.test_files() if t == scope or scope in t.parents]
+
+    changed = [p.resolve() for p in changed_files]
+    impacted = graph.dependents(changed)
+    conftest_dirs = [p.parent for p in changed if p.name == "conftest.py"]
+
+    affected: set[str] = set()
+    for test in tests:
+        if test in impacted or any(d == test.parent or d in test.parents for d in conftest_dirs):
+            affected.add(str(test))
+
+    source = "import_graph"
+    if coverage_file is not None:
+        node_ids = coverage_context_tests(coverage_file, changed)
+        if node_ids is not None:
+            source = "import_graph+coverage"
+            for node_id in node_ids:
+                file_part = node_id.split("::", 1)[0]
+                candidate = (root / file_part).resolve()
+                if str(candidate) in affected:
+                    continue
+                if candidate == scope or scope in candidate.parents:
+                    affected.add(str(candidate) + node_id[len(file_part):])
+
+    affected_files = {a.split("::", 1)[0] for a in affected}
+    remaining = [str(t) for t in tests if str(t) not in affected_files]
+    return ImpactResult(affected=sorted(affected), remaining=remaining, source=source)
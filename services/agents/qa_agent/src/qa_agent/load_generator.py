@@ -0,0 +1,439 @@
+"""
+Open-loop HTTP load generation for the QA Agent.
+
+Provides a constant-arrival-rate / ramp load generator that measures latency
+from each request's *intended* start time (avoiding coordinated omission),
+records latencies into a streaming log-linear histogram and reports
+per-second throughput/error timelines as plain, comparable data.
+"""
+
+import asyncio
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from ai_core import get_logger
+
+logger = get_logger(__name__)
+
+# Safety limits for agent-issued load tests
+MAX_DURATION_SECONDS = 300
+MAX_RATE_PER_SECOND = 5000
+MAX_CONNECTIONS = 512
+
+DEFAULT_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+class LatencyHistogram:
+    """
+    Streaming HDR-style latency histogram.
+
+    Values are recorded as integer microseconds into log-linear buckets:
+    values below ``2 ** sub_bucket_bits`` are exact, larger values keep
+    ``sub_bucket_bits - 1`` bits of precision (~0.1% relative error with
+    the default of 11 bits). Memory is proportional to the number of
+    distinct buckets touched, not the number of samples.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 11) -> None:
+        self._sub_bucket_bits = sub_bucket_bits
+        self._sub_bucket_count = 1 << sub_bucket_bits
+        self._half_count = self._sub_bucket_count >> 1
+        self._counts: dict[int, int] = {}
+        self.total_count = 0
+        self.min_us: int | None = None
+        self.max_us: int | None = None
+        self.sum_us = 0
+
+    def _index_for(self, value: int) -> int:
+        if value < self._sub_bucket_count:
+            return value
+        shift = value.bit_length() - self._sub_bucket_bits
+        return self._sub_bucket_count + (shift - 1) * self._half_count + (
+            (value >> shift) - self._half_count
+        )
+
+    def _value_for(self, index: int) -> int:
+        """Highest value equivalent to the given bucket index."""
+        if index < self._sub_bucket_count:
+            return index
+        offset = index - self._sub_bucket_count
+        shift = offset // self._half_count + 1
+        sub = offset % self._half_count + self._half_count
+        return ((sub + 1) << shift) - 1
+
+    def record(self, value_us: int | float, count: int = 1) -> None:
+        """Record a latency value in microseconds."""
+        value = max(0, int(value_us))
+        index = self._index_for(value)
+        self._counts[index] = self._counts.get(index, 0) + count
+        self.total_count += count
+        self.sum_us += value * count
+        if self.min_us is None or value < self.min_us:
+            self.min_us = value
+        if self.max_us is None or value > self.max_us:
+            self.max_us = value
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add all samples from another histogram with the same precision."""
+        if other._sub_bucket_bits != self._sub_bucket_bits:
+            raise ValueError("Cannot merge histograms with different precision")
+        for index, count in other._counts.items():
+            self._counts[index] = self._counts.get(index, 0) + count
+        self.total_count += other.total_count
+        self.sum_us += other.sum_us
+        if other.min_us is not None and (self.min_us is None or other.min_us < self.min_us):
+            self.min_us = other.min_us
+        if other.max_us is not None and (self.max_us is None or other.max_us > self.max_us):
+            self.max_us = other.max_us
+
+    def percentile(self, percentile: float) -> int | None:
+        """Return the value (microseconds) at the given percentile."""
+        if self.total_count == 0:
+            return None
+        target = max(1, math.ceil(self.total_count * percentile / 100.0))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= target:
+                return min(self._value_for(index), self.max_us or 0)
+        return self.max_us
+
+    @property
+    def mean_us(self) -> float | None:
+        if self.total_count == 0:
+            return None
+        return self.sum_us / self.total_count
+
+    def summary(self, percentiles: tuple[float, ...] = DEFAULT_PERCENTILES) -> dict[str, Any]:
+        """Return a JSON-serializable summary in milliseconds."""
+        if self.total_count == 0:
+            return {"count": 0}
+
+        def ms(value: float | None) -> float | None:
+            return round(value / 1000, 3) if value is not None else None
+
+        result: dict[str, Any] = {
+            "count": self.total_count,
+            "min_ms": ms(self.min_us),
+            "max_ms": ms(self.max_us),
+            "mean_ms": ms(self.mean_us),
+        }
+        for p in percentiles:
+            key = f"p{p:g}".replace(".", "")
+            result[f"{key}_ms"] = ms(self.percentile(p))
+        return result
+
+
+@dataclass
+class LoadProfile:
+    """
+    Arrival-rate profile for an open-loop load test.
+
+    The rate ramps linearly from ``start_rate`` to ``rate`` over
+    ``ramp_seconds`` and then holds at ``rate`` until ``duration_seconds``.
+    A ``ramp_seconds`` of 0 gives a constant arrival rate.
+    """
+
+    rate: float
+    duration_seconds: float
+    ramp_seconds: float = 0.0
+    start_rate: float = 1.0
+
+    def __post_init__(self) -> None:
+        if self.rate <= 0:
+            raise ValueError("rate must be positive")
+        if self.duration_seconds <= 0:
+            raise ValueError("duration_seconds must be positive")
+        self.rate = min(self.rate, MAX_RATE_PER_SECOND)
+        self.duration_seconds = min(self.duration_seconds, MAX_DURATION_SECONDS)
+        self.ramp_seconds = max(0.0, min(self.ramp_seconds, self.duration_seconds))
+        self.start_rate = max(0.1, min(self.start_rate, self.rate))
+
+    def rate_at(self, elapsed: float) -> float:
+        """Target arrival rate (requests/second) at the given offset."""
+        if self.ramp_seconds and elapsed < self.ramp_seconds:
+            fraction = elapsed / self.ramp_seconds
+            return self.start_rate + (self.rate - self.start_rate) * fraction
+        return self.rate
+
+    def schedule(self) -> list[float]:
+        """Intended send offsets (seconds from start) for every request."""
+        offsets: list[float] = []
+        t = 0.0
+        while t < self.duration_seconds:
+            offsets.append(t)
+            t += 1.0 / self.rate_at(t)
+        return offsets
+
+
+@dataclass
+class LoadTestConfig:
+    """Request and client settings for a load test."""
+
+    url: str
+    method: str = "GET"
+    headers: dict[str, str] = field(default_factory=dict)
+    body: dict[str, Any] | None = None
+    timeout: float = 10.0
+    max_connections: int = 64
+    max_in_flight: int = 1000
+
+
+@dataclass
+class _SecondBucket:
+    """Per-second throughput/error accounting."""
+
+    requests: int = 0
+    errors: int = 0
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+
+@dataclass
+class LoadTestResult:
+    """Structured result of a load test run."""
+
+    config: LoadTestConfig
+    profile: LoadProfile
+    histogram: LatencyHistogram
+    service_histogram: LatencyHistogram
+    timeline: dict[int, _SecondBucket]
+    status_codes: dict[int, int]
+    error_types: dict[str, int]
+    scheduled: int
+    completed: int
+    errors: int
+    elapsed_seconds: float
+    max_schedule_lag_ms: float
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dict suitable for storage/comparison."""
+        timeline = []
+        for second in sorted(self.timeline):
+            bucket = self.timeline[second]
+            timeline.append({
+                "second": second,
+                "requests": bucket.requests,
+                "errors": bucket.errors,
+                "p50_ms": _us_to_ms(bucket.histogram.percentile(50)),
+                "p99_ms": _us_to_ms(bucket.histogram.percentile(99)),
+            })
+
+        return {
+            "url": self.config.url,
+            "method": self.config.method,
+            "profile": {
+                "rate": self.profile.rate,
+                "duration_seconds": self.profile.duration_seconds,
+                "ramp_seconds": self.profile.ramp_seconds,
+                "start_rate": self.profile.start_rate,
+            },
+            "scheduled_requests": self.scheduled,
+            "completed_requests": self.completed,
+            "failed_requests": self.errors,
+            "error_rate": round(self.errors / self.scheduled, 4) if self.scheduled else 0.0,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "throughput_rps": round(self.completed / self.elapsed_seconds, 2)
+            if self.elapsed_seconds
+            else 0.0,
+            "max_schedule_lag_ms": round(self.max_schedule_lag_ms, 3),
+            # Latency measured from the intended send time (coordinated-omission corrected)
+            "latency": self.histogram.summary(),
+            # Latency measured from the actual send time (what the server saw)
+            "service_time": self.service_histogram.summary(),
+            "status_codes": {str(k): v for k, v in sorted(self.status_codes.items())},
+            "error_types": self.error_types,
+            "timeline": timeline,
+        }
+
+
+def _us_to_ms(value: int | None) -> float | None:
+    return round(value / 1000, 3) if value is not None else None
+
+
+class LoadGenerator:
+    """
+    Open-loop load generator.
+
+    Requests are dispatched at the times given by the ``LoadProfile``
+    regardless of whether earlier requests have completed, so a slow server
+    shows up as growing latency instead of a silently reduced request rate.
+    A single ``aiohttp`` session with a bounded connection pool is reused
+    for the whole run.
+    """
+
+    def __init__(self, config: LoadTestConfig, profile: LoadProfile) -> None:
+        self.config = config
+        self.profile = profile
+        self._histogram = LatencyHistogram()
+        self._service_histogram = LatencyHistogram()
+        self._timeline: dict[int, _SecondBucket] = {}
+        self._status_codes: dict[int, int] = {}
+        self._error_types: dict[str, int] = {}
+        self._completed = 0
+        self._errors = 0
+        self._max_lag = 0.0
+
+    def _bucket(self, second: int) -> _SecondBucket:
+        bucket = self._timeline.get(second)
+        if bucket is None:
+            bucket = _SecondBucket()
+            self._timeline[second] = bucket
+        return bucket
+
+    def _record_error(self, second: int, error_type: str) -> None:
+        self._errors += 1
+        self._error_types[error_type] = self._error_types.get(error_type, 0) + 1
+        self._bucket(second).errors += 1
+
+    async def _fire(
+        self,
+        session: Any,
+        semaphore: asyncio.Semaphore,
+        start: float,
+        offset: float,
+    ) -> None:
+        intended = start + offset
+        second = int(offset)
+        self._bucket(second).requests += 1
+        request_kwargs: dict[str, Any] = {}
+        if self.config.body is not None:
+            request_kwargs["json"] = self.config.body
+
+        async with semaphore:
+            sent = time.perf_counter()
+            try:
+                async with session.request(
+                    self.config.method, self.config.url, **request_kwargs
+                ) as response:
+                    # Drain the body so the connection returns to the pool
+                    await response.read()
+                    status = response.status
+            except asyncio.TimeoutError:
+                self._record_error(second, "timeout")
+                return
+            except Exception as e:
+                self._record_error(second, type(e).__name__)
+                return
+
+        done = time.perf_counter()
+        latency_us = (done - intended) * 1_000_000
+        self._histogram.record(latency_us)
+        self._service_histogram.record((done - sent) * 1_000_000)
+        self._bucket(second).histogram.record(latency_us)
+        self._status_codes[status] = self._status_codes.get(status, 0) + 1
+        self._completed += 1
+        if status >= 400:
+            self._record_error(second, f"http_{status}")
+
+    async def run(self) -> LoadTestResult:
+        """Execute the load test and return its result."""
+        import aiohttp
+
+        offsets = self.profile.schedule()
+        connector = aiohttp.TCPConnector(
+            limit=min(self.config.max_connections, MAX_CONNECTIONS),
+            keepalive_timeout=30,
+        )
+        headers = {
+            "User-Agent": "AI-Infrastructure-QA-Agent",
+            "Accept": "application/json",
+            **self.config.headers,
+        }
+        semaphore = asyncio.Semaphore(self.config.max_in_flight)
+        tasks: set[asyncio.Task[None]] = set()
+
+        async with aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.config.timeout),
+            headers=headers,
+        ) as session:
+            start = time.perf_counter()
+            for offset in offsets:
+                delay = start + offset - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    self._max_lag = max(self._max_lag, -delay * 1000)
+                task = asyncio.create_task(self._fire(session, semaphore, start, offset))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            elapsed = time.perf_counter() - start
+
+        logger.info(
+            "Load test complete",
+            url=self.config.url,
+            scheduled=len(offsets),
+            completed=self._completed,
+            errors=self._errors,
+        )
+
+        return LoadTestResult(
+            config=self.config,
+            profile=self.profile,
+            histogram=self._histogram,
+            service_histogram=self._service_histogram,
+            timeline=self._timeline,
+            status_codes=self._status_codes,
+            error_types=self._error_types,
+            scheduled=len(offsets),
+            completed=self._completed,
+            errors=self._errors,
+            elapsed_seconds=elapsed,
+            max_schedule_lag_ms=self._max_lag,
+        )
+
+
+def compare_results(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    tolerance_percent: float = 10.0,
+    error_rate_tolerance: float = 0.01,
+) -> dict[str, Any]:
+    """
+    Compare two ``LoadTestResult.to_dict()`` payloads.
+
+    Returns per-metric deltas and a list of regressions where latency or
+    throughput moved by more than ``tolerance_percent``, or where the error
+    rate grew by more than ``error_rate_tolerance`` (absolute).
+    """
+    comparisons: dict[str, Any] = {}
+    regressions: list[str] = []
+
+    def compare(name: str, old: float | None, new: float | None, higher_is_worse: bool) -> None:
+        if old is None or new is None:
+            return
+        delta = new - old
+        percent = (delta / old * 100) if old else (0.0 if delta == 0 else math.inf)
+        comparisons[name] = {
+            "baseline": old,
+            "current": new,
+            "delta": round(delta, 4),
+            "delta_percent": round(percent, 2) if math.isfinite(percent) else None,
+        }
+        worse = percent > tolerance_percent if higher_is_worse else percent < -tolerance_percent
+        if worse:
+            regressions.append(name)
+
+    old_latency = baseline.get("latency", {})
+    new_latency = current.get("latency", {})
+    for key in ("p50_ms", "p90_ms", "p99_ms", "p999_ms", "mean_ms"):
+        compare(f"latency.{key}", old_latency.get(key), new_latency.get(key), True)
+    compare("throughput_rps", baseline.get("throughput_rps"), current.get("throughput_rps"), False)
+
+    old_errors = baseline.get("error_rate", 0.0)
+    new_errors = current.get("error_rate", 0.0)
+    comparisons["error_rate"] = {"baseline": old_errors, "current": new_errors}
+    if new_errors - old_errors > error_rate_tolerance:
+        regressions.append("error_rate")
+
+    return {
+        "regressed": bool(regressions),
+        "regressions": regressions,
+        "tolerance_percent": tolerance_percent,
+        "metrics": comparisons,
+    }
@@ -0,0 +1,338 @@
+"""
+Single-pass secret scanner for the QA Agent.
+
+All secret patterns are compiled into one bytes-level alternation, so each
+file buffer is scanned once to find the lines that may hold a secret; only
+those lines are then matched against every pattern, line by line, so
+overlapping findings (a GitHub token inside a ``token = ...`` assignment)
+are all reported.
+Binary files are skipped by sniffing for NUL bytes, files are fanned out
+across a process pool, and per-file results are cached by content hash
+(with a stat fast-path) so rescans only touch files that changed.
+"""
+
+import asyncio
+import fnmatch
+import hashlib
+import os
+import re
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from ai_core import get_logger
+
+logger = get_logger(__name__)
+
+# Patterns for secret detection
+SECRET_PATTERNS = [
+    (r"(?i)(api[_-]?key|apikey)\s*[=:]\s*['\"]?([a-zA-Z0-9_-]{20,})['\"]?", "API Key"),
+    (r"(?i)(secret[_-]?key|secretkey)\s*[=:]\s*['\"]?([a-zA-Z0-9_-]{20,})['\"]?", "Secret Key"),
+    (r"(?i)(password|passwd|pwd)\s*[=:]\s*['\"]([^'\"\n]+)['\"]", "Password"),
+    (r"(?i)(aws[_-]?access[_-]?key[_-]?id)\s*[=:]\s*['\"]?(AKIA[A-Z0-9]{16})['\"]?", "AWS Access Key"),
+    (r"(?i)(aws[_-]?secret[_-]?access[_-]?key)\s*[=:]\s*['\"]?([a-zA-Z0-9/+=]{40})['\"]?", "AWS Secret Key"),
+    (r"-----BEGIN (RSA |DSA |EC |OPENSSH )?PRIVATE KEY-----", "Private Key"),
+    (r"(?i)(token|bearer)\s*[=:]\s*['\"]?([a-zA-Z0-9_-]{20,})['\"]?", "Token"),
+    (r"(?i)ghp_[a-zA-Z0-9]{36}", "GitHub Personal Access Token"),
+    (r"(?i)gho_[a-zA-Z0-9]{36}", "GitHub OAuth Token"),
+    (r"(?i)sk-[a-zA-Z0-9]{48}", "OpenAI API Key"),
+    (r"(?i)sk-ant-[a-zA-Z0-9-]{95}", "Anthropic API Key"),
+    (r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", "Email Address"),
+]
+
+# Directories pruned during the walk
+SKIP_DIRS = {".git", "node_modules", "__pycache__"}
+
+# Files to skip
+SKIP_FILE_PATTERNS = ["*.pyc", "*.min.js", "*.min.css", "package-lock.json", "*.lock"]
+
+PLACEHOLDER_MARKERS = (
+    b"example",
+    b"placeholder",
+    b"your_",
+    b"xxx",
+    b"changeme",
+    b"${",
+    b"{{",
+)
+
+# Bytes inspected when sniffing for binary content
+BINARY_SNIFF_BYTES = 8192
+
+# Files larger than this are not scanned
+MAX_FILE_SIZE = 10 * 1024 * 1024
+
+# Scans with fewer files than this run in a thread instead of the process pool
+PROCESS_POOL_THRESHOLD = 64
+
+# Number of files handed to a worker process per task
+WORKER_BATCH_SIZE = 32
+
+MAX_CACHE_ENTRIES = 50_000
+
+
+def _is_skipped_name(name: str) -> bool:
+    return any(fnmatch.fnmatch(name, p) for p in SKIP_FILE_PATTERNS)
+
+
+def should_skip_file(path: Path) -> bool:
+    """Check if a file is under a skipped directory or matches a skipped pattern."""
+    return any(part in SKIP_DIRS for part in path.parts[:-1]) or _is_skipped_name(path.name)
+
+
+def _compile_patterns(patterns: list[tuple[str, str]]) -> re.Pattern[bytes]:
+    """Compile all patterns into one alternation, used to find candidate lines."""
+    alternatives = []
+    for pattern, _ in patterns:
+        if pattern.startswith("(?i)"):
+            alternatives.append(f"(?i:{pattern[4:]})")
+        else:
+            alternatives.append(f"(?:{pattern})")
+    return re.compile("|".join(alternatives).encode())
+
+
+COMBINED_PATTERN = _compile_patterns(SECRET_PATTERNS)
+LINE_PATTERNS = [(re.compile(pattern.encode()), secret_type) for pattern, secret_type in SECRET_PATTERNS]
+
+
+def is_binary(data: bytes) -> bool:
+    """Sniff whether a buffer looks like binary content."""
+    return b"\x00" in data[:BINARY_SNIFF_BYTES]
+
+
+def _scan_line(text: bytes, line: int, findings: list[dict[str, Any]]) -> None:
+    for pattern, secret_type in LINE_PATTERNS:
+        for match in pattern.finditer(text):
+            value = match.group(0)
+            lowered = value.lower()
+            # Don't report if it looks like an example or placeholder
+            if any(marker in lowered for marker in PLACEHOLDER_MARKERS):
+                continue
+
+            decoded = value.decode("utf-8", errors="replace")
+            findings.append({
+                "line": line,
+                "type": secret_type,
+                "match": decoded[:50] + "..." if len(decoded) > 50 else decoded,
+                "severity": "high" if "key" in secret_type.lower() else "medium",
+            })
+
+
+def scan_buffer(data: bytes) -> list[dict[str, Any]]:
+    """
+    Scan a whole file buffer and return findings.
+
+    One pass of the combined alternation finds every line a pattern could
+    match on (each pattern matching on a line makes some combined match
+    start on or run into it); those lines are then matched per pattern,
+    giving the same findings, in the same order, as matching every line
+    against every pattern.
+    """
+    findings: list[dict[str, Any]] = []
+    # Start of the first line not yet matched, and its number
+    next_line = 0
+    line = 1
+
+    for match in COMBINED_PATTERN.finditer(data):
+        start, end = match.span()
+        if end <= next_line:
+            continue
+
+        line_start = max(data.rfind(b"\n", 0, start) + 1, next_line)
+        line += data.count(b"\n", next_line, line_start)
+        # Every line the match touches
+        while line_start < end:
+            line_end = data.find(b"\n", line_start)
+            if line_end == -1:
+                line_end = len(data)
+            _scan_line(data[line_start:line_end], line, findings)
+            line_start = line_end + 1
+            line += 1
+        next_line = line_start
+
+    return findings
+
+
+@dataclass
+class _FileScan:
+    """Result of scanning a single file in a worker."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    digest: str | None
+    findings: list[dict[str, Any]] | None
+    binary: bool = False
+    from_cache: bool = False
+
+
+def _scan_files(
+    paths: list[str],
+    known_digests: dict[str, list[dict[str, Any]]],
+) -> list[_FileScan]:
+    """Worker entry point: read, hash and scan a batch of files."""
+    results = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            if stat.st_size > MAX_FILE_SIZE:
+                continue
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            continue
+
+        if is_binary(data):
+            results.append(_FileScan(path, stat.st_size, stat.st_mtime_ns, None, None, True))
+            continue
+
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        findings = known_digests.get(digest)
+        from_cache = findings is not None
+        if findings is None:
+            findings = scan_buffer(data)
+        results.append(
+            _FileScan(path, stat.st_size, stat.st_mtime_ns, digest, findings, from_cache=from_cache)
+        )
+    return results
+
+
+class SecretScanner:
+    """
+    Parallel secret scanner with a content-hash result cache.
+
+    A file whose (size, mtime) is unchanged since the last scan is answered
+    from the stat index without being read; a changed file is re-read and
+    hashed, and only rescanned if its content hash is new.
+    """
+
+    def __init__(self, max_workers: int | None = None) -> None:
+        self._max_workers = max_workers or os.cpu_count() or 2
+        self._executor: ProcessPoolExecutor | None = None
+        # digest -> findings
+        self._results: OrderedDict[str, list[dict[str, Any]]] = OrderedDict()
+        # path -> (size, mtime_ns, digest or None for binary)
+        self._stat_index: dict[str, tuple[int, int, str | None]] = {}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+        return self._executor
+
+    def shutdown(self) -> None:
+        """Shut down the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def _remember(self, digest: str, findings: list[dict[str, Any]]) -> None:
+        self._results[digest] = findings
+        self._results.move_to_end(digest)
+        while len(self._results) > MAX_CACHE_ENTRIES:
+            self._results.popitem(last=False)
+
+    @staticmethod
+    def iter_files(
+        root: Path,
+        file_pattern: str = "**/*",
+        include_env_files: bool = True,
+    ) -> list[str]:
+        """Walk ``root`` pruning skipped directories and return matching files."""
+        if root.is_file():
+            return [str(root)]
+
+        match_all = file_pattern in ("**/*", "*", "**")
+        pattern = file_pattern.removeprefix("**/")
+        files = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+            for name in filenames:
+                if _is_skipped_name(name):
+                    continue
+                if not include_env_files and name.startswith(".env"):
+                    continue
+                full = os.path.join(dirpath, name)
+                if not match_all:
+                    rel = os.path.relpath(full, root)
+                    if not (
+                        fnmatch.fnmatch(rel, pattern)
+                        or ("/" not in pattern and fnmatch.fnmatch(name, pattern))
+                    ):
+                        continue
+                if os.path.isfile(full):
+                    files.append(full)
+        return files
+
+    async def scan(self, paths: list[str]) -> dict[str, Any]:
+        """Scan the given files and return per-file findings and cache stats."""
+        findings_by_path: dict[str, list[dict[str, Any]]] = {}
+        to_read: list[str] = []
+        binary_skipped = 0
+
+        for path in paths:
+            cached = self._stat_index.get(path)
+            if cached is not None:
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                size, mtime_ns, digest = cached
+                if stat.st_size == size and stat.st_mtime_ns == mtime_ns:
+                    if digest is None:
+                        binary_skipped += 1
+                        continue
+                    if digest in self._results:
+                        findings_by_path[path] = self._results[digest]
+                        continue
+            to_read.append(path)
+
+        stat_hits = len(findings_by_path)
+
+        if len(to_read) < PROCESS_POOL_THRESHOLD:
+            # Small rescans stay in-process where the digest cache is directly usable
+            scanned = await asyncio.to_thread(_scan_files, to_read, dict(self._results))
+        else:
+            # Shipping the whole digest cache to every worker costs more than
+            # rescanning; the stat index already filters out unchanged files.
+            loop = asyncio.get_running_loop()
+            executor = self._get_executor()
+            chunks = await asyncio.gather(*[
+                loop.run_in_executor(executor, _scan_files, to_read[i:i + WORKER_BATCH_SIZE], {})
+                for i in range(0, len(to_read), WORKER_BATCH_SIZE)
+            ])
+            scanned = [result for chunk in chunks for result in chunk]
+
+        content_hits = 0
+        rescanned = 0
+        for result in scanned:
+            self._stat_index[result.path] = (result.size, result.mtime_ns, result.digest)
+            if result.binary or result.digest is None or result.findings is None:
+                binary_skipped += 1
+                continue
+            if result.from_cache:
+                content_hits += 1
+            else:
+                rescanned += 1
+            self._remember(result.digest, result.findings)
+            findings_by_path[result.path] = result.findings
+
+        return {
+            "findings_by_path": findings_by_path,
+            "files_scanned": len(findings_by_path),
+            "binary_skipped": binary_skipped,
+            "cache_hits": stat_hits + content_hits,
+            "rescanned": rescanned,
+        }
+
+
+_scanner: SecretScanner | None = None
+
+
+def get_secret_scanner() -> SecretScanner:
+    """Get the process-wide secret scanner (keeps its cache across tool calls)."""
+    global _scanner
+    if _scanner is None:
+        _scanner = SecretScanner()
+    return _scanner
@@ -0,0 +1,257 @@
+"""
+Sharded pytest execution for the QA Agent.
+
+Runs pytest across several worker processes (pytest-xdist when installed,
+otherwise one pytest subprocess per shard) and reads results from JUnit
+XML reports instead of scraping terminal output.
+"""
+
+import asyncio
+import os
+import tempfile
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from ai_core import get_logger
+
+logger = get_logger(__name__)
+
+MAX_WORKERS = 16
+
+# Failure details are truncated to keep tool output small
+MAX_FAILURE_DETAIL_CHARS = 2000
+
+
+@dataclass
+class JUnitResults:
+    """Aggregated results parsed from one or more JUnit XML reports."""
+
+    passed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    errors: int = 0
+    duration: float = 0.0
+    failures: list[dict[str, Any]] = field(default_factory=list)
+    # Test node ID -> duration, used to balance future shards
+    test_durations: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def total(self) -> int:
+        return self.passed + self.failed + self.skipped + self.errors
+
+    def merge(self, other: "JUnitResults") -> None:
+        self.passed += other.passed
+        self.failed += other.failed
+        self.skipped += other.skipped
+        self.errors += other.errors
+        self.duration = max(self.duration, other.duration)
+        self.failures.extend(other.failures)
+        self.test_durations.update(other.test_durations)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "passed": self.passed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "total": self.total,
+            "duration_seconds": round(self.duration, 3),
+            "failures": self.failures,
+        }
+
+
+def _node_id(file: str, classname: str, name: str) -> str:
+    """Rebuild a pytest node ID from an xunit1 test case's file and dotted classname."""
+    file = os.path.normpath(file)
+    module = file.removesuffix(".py").replace(os.sep, ".")
+    classes = classname.removeprefix(module).lstrip(".")
+    return "::".join([file, *classes.split("."), name] if classes else [file, name])
+
+
+def parse_junit_xml(path: Path) -> JUnitResults:
+    """Parse a pytest JUnit XML report."""
+    results = JUnitResults()
+    try:
+        root = ET.parse(path).getroot()
+    except (ET.ParseError, OSError) as e:
+        logger.warning("Could not parse JUnit report", path=str(path), error=str(e))
+        return results
+
+    suites = [root] if root.tag == "testsuite" else root.findall("testsuite")
+    for suite in suites:
+        results.duration += float(suite.get("time", 0) or 0)
+        for case in suite.iter("testcase"):
+            classname = case.get("classname", "")
+            name = case.get("name", "")
+            file = case.get("file")
+            if file:
+                results.test_durations[_node_id(file, classname, name)] = float(case.get("time", 0) or 0)
+
+            failure = case.find("failure")
+            error = case.find("error")
+            if failure is not None or error is not None:
+                element = failure if failure is not None else error
+                if failure is not None:
+                    results.failed += 1
+                else:
+                    results.errors += 1
+                details = (element.text or "").strip()
+                results.failures.append({
+                    "test": f"{classname}::{name}" if classname else name,
+                    "kind": "failure" if failure is not None else "error",
+                    "message": element.get("message", "")[:500],
+                    "details": details[:MAX_FAILURE_DETAIL_CHARS],
+                })
+            elif case.find("skipped") is not None:
+                results.skipped += 1
+            else:
+                results.passed += 1
+    return results
+
+
+def split_shards(
+    tests: list[str],
+    shards: int,
+    durations: dict[str, float] | None = None,
+) -> list[list[str]]:
+    """
+    Split test node IDs into balanced shards.
+
+    Uses longest-processing-time-first greedy assignment with known
+    durations (keyed by node ID; a test file costs the sum of its tests),
+    falling back to file size as a cost estimate.
+    """
+    shards = max(1, min(shards, len(tests)))
+    durations = durations or {}
+
+    file_durations: dict[str, float] = {}
+    for node_id, duration in durations.items():
+        file = node_id.split("::", 1)[0]
+        file_durations[file] = file_durations.get(file, 0.0) + duration
+
+    def cost(test: str) -> float:
+        file, sep, rest = test.partition("::")
+        file = os.path.normpath(file)
+        known = durations.get(f"{file}::{rest}") if sep else file_durations.get(file)
+        if known is not None:
+            return known
+        try:
+            return os.path.getsize(file) / 10_000
+        except OSError:
+            return 1.0
+
+    costs = {test: cost(test) for test in tests}
+    buckets: list[tuple[float, list[str]]] = [(0.0, []) for _ in range(shards)]
+    for test in sorted(tests, key=costs.__getitem__, reverse=True):
+        index = min(range(shards), key=lambda i: buckets[i][0])
+        load, items = buckets[index]
+        items.append(test)
+        buckets[index] = (load + costs[test], items)
+    return [items for _, items in buckets if items]
+
+
+_xdist_available: bool | None = None
+
+# Working directory -> test durations from previous runs
+_durations: dict[Path, dict[str, float]] = {}
+
+
+async def _has_xdist(cwd: Path) -> bool:
+    global _xdist_available
+    if _xdist_available is None:
+        process = await asyncio.create_subprocess_exec(
+            "python", "-c", "import xdist",
+            cwd=cwd,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        _xdist_available = (await process.wait()) == 0
+    return _xdist_available
+
+
+async def _run_pytest(
+    args: list[str],
+    cwd: Path,
+    junit_path: Path,
+    timeout: float,
+) -> tuple[int, str]:
+    cmd = [
+        "python", "-m", "pytest", *args,
+        f"--junitxml={junit_path}",
+        # xunit1 records each test's file, which shard balancing relies on
+        "-o", "junit_family=xunit1",
+        "--color=no",
+        "-q",
+    ]
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        cwd=cwd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        return -1, "Command timed out"
+    return process.returncode or 0, stdout.decode(errors="replace").strip()
+
+
+async def run_sharded(
+    tests: list[str],
+    cwd: Path,
+    workers: int = 1,
+    extra_args: list[str] | None = None,
+    timeout: float = 300.0,
+) -> tuple[int, JUnitResults, str]:
+    """
+    Run pytest over ``tests`` across ``workers`` processes.
+
+    Returns ``(exit_code, results, output)`` where ``exit_code`` is the
+    worst shard exit code and ``output`` is the combined (truncated)
+    terminal output for context. Per-test durations are remembered per
+    ``cwd`` and used to balance shards on later runs.
+    """
+    extra_args = extra_args or []
+    workers = max(1, min(workers, MAX_WORKERS))
+
+    with tempfile.TemporaryDirectory(prefix="qa-junit-") as tmp:
+        tmp_dir = Path(tmp)
+
+        durations = _durations.setdefault(cwd, {})
+
+        if workers == 1 or len(tests) <= 1 or await _has_xdist(cwd):
+            args = [*tests, *extra_args]
+            if workers > 1:
+                args.extend(["-n", str(workers)])
+            junit = tmp_dir / "junit.xml"
+            code, output = await _run_pytest(args, cwd, junit, timeout)
+            results = parse_junit_xml(junit)
+            durations.update(results.test_durations)
+            return code, results, output
+
+        shards = split_shards(tests, workers, durations)
+        logger.debug("Running sharded pytest", shards=len(shards), tests=len(tests))
+        runs = await asyncio.gather(*[
+            _run_pytest([*shard, *extra_args], cwd, tmp_dir / f"junit-{i}.xml", timeout)
+            for i, shard in enumerate(shards)
+        ])
+
+        results = JUnitResults()
+        outputs = []
+        for i, (code, output) in enumerate(runs):
+            results.merge(parse_junit_xml(tmp_dir / f"junit-{i}.xml"))
+            outputs.append(f"--- shard {i} (exit {code}) ---\n{output[-2000:]}")
+        durations.update(results.test_durations)
+
+        # pytest exit code 5 means "no tests collected"; it only counts if no shard ran tests
+        codes = [code for code, _ in runs]
+        failing = [code for code in codes if code not in (0, 5)]
+        if failing:
+            exit_code = failing[0] if -1 in failing else max(failing)
+        else:
+            exit_code = 0 if 0 in codes else 5
+        return exit_code, results, "\n".join(outputs)
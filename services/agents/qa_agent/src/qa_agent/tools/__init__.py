@@ -28,6 +28,7 @@ from .api_test_tools import (
     test_api_batch,
     validate_json_schema,
     measure_api_performance,
+    run_load_test,
     check_api_health,
 )
 
@@ -144,6 +145,7 @@ __all__ = [
     "test_api_batch",
     "validate_json_schema",
     "measure_api_performance",
+    "run_load_test",
     "check_api_health",
     # Browser lifecycle tools
     "browser_launch",
@@ -5,6 +5,7 @@ These tools provide API testing capabilities:
 - HTTP endpoint testing
 - Request/response validation
 - Performance testing
+- Open-loop load testing
 - Schema validation
 """
 
@@ -16,6 +17,8 @@ from typing import Any
 from ai_core import CapabilityCategory, get_logger
 from base_agent import ToolResult, tool
 
+from ..load_generator import LoadGenerator, LoadProfile, LoadTestConfig, compare_results
+
 logger = get_logger(__name__)
 
 
@@ -436,6 +439,137 @@ async def measure_api_performance(
         return ToolResult.fail(f"Performance test failed: {e}")
 
 
+@tool(
+    name="run_load_test",
+    description="""Run an open-loop load test against an HTTP endpoint.
+    Requests are sent at a fixed arrival rate (optionally ramping up) regardless of
+    how fast the server responds, and latency is measured from each request's
+    scheduled start so server stalls are not hidden. Returns p50/p90/p99/p99.9
+    latency, throughput, status codes and a per-second timeline. Pass a previous
+    result as `baseline` to get a regression comparison.""",
+    parameters={
+        "type": "object",
+        "properties": {
+            "url": {
+                "type": "string",
+                "description": "URL to test",
+            },
+            "method": {
+                "type": "string",
+                "enum": ["GET", "POST", "PUT", "PATCH", "DELETE"],
+                "description": "HTTP method",
+                "default": "GET",
+            },
+            "rate": {
+                "type": "number",
+                "description": "Target arrival rate in requests per second",
+                "default": 10,
+            },
+            "duration_seconds": {
+                "type": "number",
+                "description": "Total test duration in seconds (max 300)",
+                "default": 10,
+            },
+            "ramp_seconds": {
+                "type": "number",
+                "description": "Linearly ramp from start_rate to rate over this many seconds",
+                "default": 0,
+            },
+            "start_rate": {
+                "type": "number",
+                "description": "Arrival rate at the start of the ramp",
+                "default": 1,
+            },
+            "max_connections": {
+                "type": "integer",
+                "description": "Maximum pooled keep-alive connections",
+                "default": 64,
+            },
+            "timeout": {
+                "type": "number",
+                "description": "Per-request timeout in seconds",
+                "default": 10,
+            },
+            "headers": {
+                "type": "object",
+                "description": "Request headers",
+            },
+            "body": {
+                "type": "object",
+                "description": "Request body (JSON)",
+            },
+            "baseline": {
+                "type": "object",
+                "description": "Result of a previous run_load_test call to compare against",
+            },
+            "tolerance_percent": {
+                "type": "number",
+                "description": "Allowed latency/throughput change before flagging a regression",
+                "default": 10,
+            },
+        },
+        "required": ["url"],
+    },
+    permission_level=1,
+    capability_category=CapabilityCategory.WEB,
+)
+async def run_load_test(
+    url: str,
+    method: str = "GET",
+    rate: float = 10,
+    duration_seconds: float = 10,
+    ramp_seconds: float = 0,
+    start_rate: float = 1,
+    max_connections: int = 64,
+    timeout: float = 10,
+    headers: dict[str, str] | None = None,
+    body: dict[str, Any] | None = None,
+    baseline: dict[str, Any] | None = None,
+    tolerance_percent: float = 10,
+) -> ToolResult:
+    """Run an open-loop load test."""
+    try:
+        profile = LoadProfile(
+            rate=rate,
+            duration_seconds=duration_seconds,
+            ramp_seconds=ramp_seconds,
+            start_rate=start_rate,
+        )
+        config = LoadTestConfig(
+            url=url,
+            method=method,
+            headers=headers or {},
+            body=body,
+            timeout=timeout,
+            max_connections=max_connections,
+        )
+
+        result = (await LoadGenerator(config, profile).run()).to_dict()
+        latency = result["latency"]
+
+        output: dict[str, Any] = {
+            "message": (
+                f"Load test complete: {result['completed_requests']}/{result['scheduled_requests']} "
+                f"completed at {result['throughput_rps']} req/s, "
+                f"p99 {latency.get('p99_ms')}ms, {result['failed_requests']} errors"
+            ),
+            **result,
+        }
+
+        if baseline:
+            output["comparison"] = compare_results(
+                baseline, result, tolerance_percent=tolerance_percent
+            )
+
+        return ToolResult.ok(output)
+
+    except ValueError as e:
+        return ToolResult.fail(f"Invalid load profile: {e}")
+    except Exception as e:
+        logger.error("Load test failed", url=url, error=str(e))
+        return ToolResult.fail(f"Load test failed: {e}")
+
+
 @tool(
     name="check_api_health",
     description="""Check health of multiple API endpoints at once.
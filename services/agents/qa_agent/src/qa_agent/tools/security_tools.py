@@ -8,44 +8,16 @@ import re
 from pathlib import Path
 from typing import Any
 
-import aiofiles
-
 from ai_core import get_logger
 from base_agent import ToolResult, tool
 
+from ..secret_scanner import SecretScanner, get_secret_scanner, should_skip_file
+
 logger = get_logger(__name__)
 
 # Workspace configuration
 WORKSPACE_DIR = Path(os.environ.get("WORKSPACE_DIR", "/app/workspace"))
 
-# Patterns for secret detection
-SECRET_PATTERNS = [
-    (r"(?i)(api[_-]?key|apikey)\s*[=:]\s*['\"]?([a-zA-Z0-9_-]{20,})['\"]?", "API Key"),
-    (r"(?i)(secret[_-]?key|secretkey)\s*[=:]\s*['\"]?([a-zA-Z0-9_-]{20,})['\"]?", "Secret Key"),
-    (r"(?i)(password|passwd|pwd)\s*[=:]\s*['\"]([^'\"]+)['\"]", "Password"),
-    (r"(?i)(aws[_-]?access[_-]?key[_-]?id)\s*[=:]\s*['\"]?(AKIA[A-Z0-9]{16})['\"]?", "AWS Access Key"),
-    (r"(?i)(aws[_-]?secret[_-]?access[_-]?key)\s*[=:]\s*['\"]?([a-zA-Z0-9/+=]{40})['\"]?", "AWS Secret Key"),
-    (r"-----BEGIN (RSA |DSA |EC |OPENSSH )?PRIVATE KEY-----", "Private Key"),
-    (r"(?i)(token|bearer)\s*[=:]\s*['\"]?([a-zA-Z0-9_-]{20,})['\"]?", "Token"),
-    (r"(?i)ghp_[a-zA-Z0-9]{36}", "GitHub Personal Access Token"),
-    (r"(?i)gho_[a-zA-Z0-9]{36}", "GitHub OAuth Token"),
-    (r"(?i)sk-[a-zA-Z0-9]{48}", "OpenAI API Key"),
-    (r"(?i)sk-ant-[a-zA-Z0-9-]{95}", "Anthropic API Key"),
-    (r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", "Email Address"),
-]
-
-# Files to skip
-SKIP_PATTERNS = [
-    r"\.git/",
-    r"node_modules/",
-    r"__pycache__/",
-    r"\.pyc$",
-    r"\.min\.js$",
-    r"\.min\.css$",
-    r"package-lock\.json$",
-    r"\.lock$",
-]
-
 
 def _validate_workspace_path(path: str) -> Path:
     """Validate and resolve a path within workspace."""
@@ -60,15 +32,6 @@ def _validate_workspace_path(path: str) -> Path:
     return resolved
 
 
-def _should_skip_file(path: Path) -> bool:
-    """Check if file should be skipped."""
-    path_str = str(path)
-    for pattern in SKIP_PATTERNS:
-        if re.search(pattern, path_str):
-            return True
-    return False
-
-
 @tool(
     name="check_secrets",
     description="Scan files for hardcoded secrets and credentials",
@@ -105,64 +68,17 @@ async def check_secrets(
         if not scan_path.exists():
             return ToolResult.fail(f"Path not found: {path}")
 
-        findings: list[dict[str, Any]] = []
-        files_scanned = 0
-
-        # Collect files
-        if scan_path.is_file():
-            files = [scan_path]
-        else:
-            files = list(scan_path.glob(file_pattern))
-
-        for file_path in files:
-            if not file_path.is_file():
-                continue
-
-            if _should_skip_file(file_path):
-                continue
-
-            # Skip .env files if not requested
-            if not include_env_files and file_path.name.startswith(".env"):
-                continue
-
-            # Skip binary files
-            try:
-                async with aiofiles.open(file_path, "r", errors="ignore") as f:
-                    content = await f.read()
-            except Exception:
-                continue
+        # Walk in a thread so large trees don't block the event loop
+        files = await asyncio.to_thread(
+            SecretScanner.iter_files, scan_path, file_pattern, include_env_files
+        )
+        scan = await get_secret_scanner().scan(files)
 
-            files_scanned += 1
-
-            rel_path = str(file_path.relative_to(WORKSPACE_DIR))
-
-            for line_num, line in enumerate(content.splitlines(), 1):
-                for pattern, secret_type in SECRET_PATTERNS:
-                    matches = re.finditer(pattern, line)
-                    for match in matches:
-                        # Don't report if it looks like an example or placeholder
-                        value = match.group(0)
-                        if any(
-                            placeholder in value.lower()
-                            for placeholder in [
-                                "example",
-                                "placeholder",
-                                "your_",
-                                "xxx",
-                                "changeme",
-                                "${",
-                                "{{",
-                            ]
-                        ):
-                            continue
-
-                        findings.append({
-                            "file": rel_path,
-                            "line": line_num,
-                            "type": secret_type,
-                            "match": value[:50] + "..." if len(value) > 50 else value,
-                            "severity": "high" if "key" in secret_type.lower() else "medium",
-                        })
+        findings: list[dict[str, Any]] = []
+        for file_path, file_findings in sorted(scan["findings_by_path"].items()):
+            rel_path = str(Path(file_path).relative_to(WORKSPACE_DIR))
+            for finding in file_findings:
+                findings.append({"file": rel_path, **finding})
 
         # Categorize findings
         by_severity = {"high": 0, "medium": 0, "low": 0}
@@ -171,7 +87,10 @@ async def check_secrets(
             by_severity[sev] = by_severity.get(sev, 0) + 1
 
         result = {
-            "files_scanned": files_scanned,
+            "files_scanned": scan["files_scanned"],
+            "files_rescanned": scan["rescanned"],
+            "cache_hits": scan["cache_hits"],
+            "binary_skipped": scan["binary_skipped"],
             "findings": findings[:50],  # Limit output
             "finding_count": len(findings),
             "by_severity": by_severity,
@@ -341,7 +260,7 @@ async def validate_permissions(
             if not file_path.exists():
                 continue
 
-            if _should_skip_file(file_path):
+            if should_skip_file(file_path):
                 continue
 
             # Skip if only checking sensitive and file isn't sensitive
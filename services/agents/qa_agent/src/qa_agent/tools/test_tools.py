@@ -11,6 +11,9 @@ from typing import Any
 from ai_core import get_logger
 from base_agent import ToolResult, tool
 
+from ..impact_analysis import find_test_files, select_tests
+from ..sharded_runner import JUnitResults, run_sharded
+
 logger = get_logger(__name__)
 
 # Workspace configuration
@@ -105,9 +108,35 @@ def _parse_pytest_output(output: str) -> dict[str, Any]:
     return results
 
 
+def _results_from_run(code: int, junit: JUnitResults, output: str) -> dict[str, Any]:
+    """Build run_tests counts from a JUnit report, falling back to output parsing."""
+    if junit.total == 0 and code not in (0, 5):
+        # No report (e.g. collection crashed before pytest wrote one)
+        parsed = _parse_pytest_output(output)
+        return {
+            "passed": parsed["passed"],
+            "failed": parsed["failed"],
+            "skipped": parsed["skipped"],
+            "errors": parsed["errors"],
+            "failures": parsed["failures"],
+        }
+    data = junit.to_dict()
+    return {
+        "passed": data["passed"],
+        "failed": data["failed"],
+        "skipped": data["skipped"],
+        "errors": data["errors"],
+        "duration_seconds": data["duration_seconds"],
+        "failures": data["failures"],
+    }
+
+
 @tool(
     name="run_tests",
-    description="Run tests using pytest",
+    description="""Run tests using pytest. Results are read from JUnit XML.
+    Pass changed_files to run only the tests affected by those files first
+    (import graph plus per-test coverage contexts when available), and
+    workers > 1 to shard tests across processes.""",
     parameters={
         "type": "object",
         "properties": {
@@ -134,6 +163,21 @@ def _parse_pytest_output(output: str) -> dict[str, Any]:
                 "description": "Stop on first failure",
                 "default": False,
             },
+            "changed_files": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Files edited since the last run; enables test impact mode",
+            },
+            "run_remaining": {
+                "type": "boolean",
+                "description": "In impact mode, run unaffected tests after the affected ones pass",
+                "default": False,
+            },
+            "workers": {
+                "type": "integer",
+                "description": "Number of worker processes to shard tests across",
+                "default": 1,
+            },
         },
     },
     permission_level=1,
@@ -144,47 +188,106 @@ async def run_tests(
     markers: str | None = None,
     verbose: bool = False,
     failfast: bool = False,
+    changed_files: list[str] | None = None,
+    run_remaining: bool = False,
+    workers: int = 1,
 ) -> ToolResult:
     """Run pytest tests."""
     try:
         test_path = _validate_workspace_path(path)
 
-        cmd = ["python", "-m", "pytest", str(test_path)]
+        extra_args: list[str] = []
 
         if pattern:
-            cmd.extend(["-k", pattern])
+            extra_args.extend(["-k", pattern])
 
         if markers:
-            cmd.extend(["-m", markers])
+            extra_args.extend(["-m", markers])
 
         if verbose:
-            cmd.append("-v")
+            extra_args.append("-v")
 
         if failfast:
-            cmd.append("-x")
-
-        # Add color output
-        cmd.append("--color=no")
+            extra_args.append("-x")
+
+        phases: list[tuple[str, list[str]]] = []
+        result: dict[str, Any] = {}
+
+        if changed_files:
+            changed = [_validate_workspace_path(f) for f in changed_files]
+            impact = await asyncio.to_thread(
+                select_tests,
+                WORKSPACE_DIR,
+                changed,
+                test_path,
+                WORKSPACE_DIR / ".coverage",
+            )
+            result["impact"] = {
+                "source": impact.source,
+                "affected_tests": len(impact.affected),
+                "remaining_tests": len(impact.remaining),
+            }
+            if impact.affected:
+                phases.append(("affected", impact.affected))
+            if run_remaining and impact.remaining:
+                phases.append(("remaining", impact.remaining))
+            if not phases:
+                return ToolResult.ok({
+                    **result,
+                    "exit_code": 0,
+                    "passed": 0,
+                    "failed": 0,
+                    "skipped": 0,
+                    "errors": 0,
+                    "success": True,
+                    "output": "No tests affected by the changed files",
+                })
+        elif workers > 1 and test_path.is_dir():
+            tests = await asyncio.to_thread(find_test_files, test_path)
+            phases.append(("all", [str(t) for t in tests] or [str(test_path)]))
+        else:
+            phases.append(("all", [str(test_path)]))
 
-        code, stdout, stderr = await _run_command(cmd, cwd=WORKSPACE_DIR)
+        totals = {"passed": 0, "failed": 0, "skipped": 0, "errors": 0}
+        failures: list[dict[str, Any]] = []
+        outputs: list[str] = []
+        phase_results: list[dict[str, Any]] = []
+        code = 0
 
-        output = stdout if stdout else stderr
-        parsed = _parse_pytest_output(output)
+        for phase, tests in phases:
+            code, junit, output = await run_sharded(
+                tests, WORKSPACE_DIR, workers=workers, extra_args=extra_args
+            )
+            counts = _results_from_run(code, junit, output)
+            for key in totals:
+                totals[key] += counts[key]
+            failures.extend(counts["failures"])
+            outputs.append(output)
+            phase_results.append({
+                "phase": phase,
+                "tests": len(tests),
+                "exit_code": code,
+                **{key: counts[key] for key in totals},
+            })
+            # Affected tests run first; stop early if they already fail
+            if code not in (0, 5):
+                break
 
-        result = {
+        result.update({
             "exit_code": code,
-            "passed": parsed["passed"],
-            "failed": parsed["failed"],
-            "skipped": parsed["skipped"],
-            "errors": parsed["errors"],
-            "success": code == 0,
-        }
+            **totals,
+            "success": code in (0, 5) if changed_files else code == 0,
+        })
+
+        if len(phase_results) > 1 or changed_files:
+            result["phases"] = phase_results
 
-        if parsed["failures"]:
-            result["failures"] = parsed["failures"]
+        if failures:
+            result["failures"] = failures[:20]
 
         # Include truncated output
-        result["output"] = output[:5000] if len(output) > 5000 else output
+        output = "\n".join(outputs)
+        result["output"] = output[-5000:] if len(output) > 5000 else output
 
         return ToolResult.ok(result)
 
@@ -10,12 +10,22 @@ from typing import Any, Optional
 from uuid import uuid4
 
 from ai_core import get_logger
-from ai_messaging import PubSubManager, RedisClient
+from ai_messaging import ConversationHistory, PlanConflictError, PubSubManager, RedisClient
 
-from .plan_mode import Plan, PlanManager, PlanStatus, StepStatus, format_plan_for_display
+from .plan_mode import (
+    PLAN_STATUS_FILTERS,
+    Plan,
+    PlanManager,
+    PlanStatus,
+    StepStatus,
+    format_plan_for_display,
+)
 
 logger = get_logger(__name__)
 
+# Plans shown per page of `/plan list`
+PLAN_LIST_PAGE_SIZE = 10
+
 
 # Command definitions
 COMMANDS = {
@@ -34,7 +44,7 @@ COMMANDS = {
         "usage": "/plan [subcommand] [args]",
         "aliases": ["p"],
         "subcommands": {
-            "list": "List plans by status: /plan list [active|paused|completed|failed|stuck|all]",
+            "list": "List plans by status: /plan list [active|paused|completed|failed|stuck|all] [page]",
             "view": "View plan details: /plan view <plan_id>",
             "edit": "Edit plan: /plan edit <plan_id>",
             "delete": "Delete plan: /plan delete <plan_id>",
@@ -225,8 +235,7 @@ class CommandHandler:
 
         if conversation_id:
             # Clear messages from Redis
-            msgs_key = f"conversation:{conversation_id}:messages"
-            await self.redis.delete(msgs_key)
+            await ConversationHistory(self.redis).clear(conversation_id)
 
         return {
             "type": "command_result",
@@ -500,7 +509,7 @@ class CommandHandler:
 - `/plan status` - Show current plan status
 
 **Browse & Manage:**
-- `/plan list [status]` - List plans (active, paused, completed, failed, stuck, all)
+- `/plan list [status] [page]` - List plans (active, paused, completed, failed, stuck, all)
 - `/plan view <id>` - View plan details with progress
 - `/plan edit <id>` - Edit plan (opens editor)
 - `/plan delete <id>` - Delete a plan
@@ -519,76 +528,38 @@ class CommandHandler:
         }
 
     async def _plan_list(self, args: str, context: dict[str, Any]) -> dict[str, Any]:
-        """List plans by status."""
-        import json as json_mod
-
+        """List plans by status, a page at a time."""
         user_id = context.get("user_id")
-        status_filter = args.strip().lower() if args else "all"
+        parts = args.lower().split() if args else []
+        status_filter = parts[0] if parts else "all"
+        page = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 1
+        page = max(page, 1)
 
         # Valid status filters
-        valid_statuses = {"active", "paused", "completed", "failed", "stuck", "all"}
-        if status_filter not in valid_statuses:
+        if status_filter not in PLAN_STATUS_FILTERS:
             status_filter = "all"
 
-        # Scan all plans for this user
-        plans = []
-        cursor = 0
-        while True:
-            cursor, keys = await self.redis.scan(cursor=cursor, match="plan:*", count=100)
-            for key in keys:
-                if ":history" in key:
-                    continue
-                plan_data = await self.redis.get(key)
-                if plan_data:
-                    try:
-                        plan = json_mod.loads(plan_data)
-                        if plan.get("user_id") == user_id:
-                            plans.append(plan)
-                    except json_mod.JSONDecodeError:
-                        continue
-            if cursor == 0:
-                break
-
-        # Apply status filter
-        status_map = {
-            "active": ["executing", "approved"],
-            "paused": ["paused"],
-            "completed": ["completed"],
-            "failed": ["failed"],
-            "stuck": ["paused", "failed"],
-            "all": None,
-        }
-
-        filter_statuses = status_map.get(status_filter)
-        if filter_statuses:
-            filtered_plans = []
-            for plan in plans:
-                plan_status = plan.get("status", "")
-                if plan_status in filter_statuses:
-                    if status_filter == "stuck":
-                        steps = plan.get("steps", [])
-                        completed = sum(1 for s in steps if s.get("status") == "completed")
-                        if completed > 0:
-                            filtered_plans.append(plan)
-                    else:
-                        filtered_plans.append(plan)
-            plans = filtered_plans
-
-        # Sort by created_at descending
-        plans.sort(key=lambda p: p.get("created_at", ""), reverse=True)
+        plans, total = await self.plan_manager.list_plans(
+            user_id,
+            status_filter=status_filter,
+            offset=(page - 1) * PLAN_LIST_PAGE_SIZE,
+            limit=PLAN_LIST_PAGE_SIZE,
+        )
 
         # Format plan list for display
         if not plans:
             return {
                 "type": "command_result",
                 "command": "plan",
-                "content": f"No plans found with status: **{status_filter}**",
+                "content": f"No plans found with status: **{status_filter}**"
+                + (f" on page {page}" if total else ""),
                 "action": "plan_list",
                 "plans": [],
+                "total": total,
                 "timestamp": datetime.now(timezone.utc).isoformat(),
             }
 
-        lines = [f"**Plans ({status_filter}):** {len(plans)} found\n"]
+        lines = [f"**Plans ({status_filter}):** {total} found\n"]
         status_icons = {
             "executing": "▶️",
             "approved": "✅",
@@ -601,7 +572,7 @@ class CommandHandler:
             "drafting": "📝",
         }
 
-        for plan in plans[:10]:  # Show first 10
+        for plan in plans:
             icon = status_icons.get(plan.get("status", ""), "○")
             steps = plan.get("steps", [])
             completed = sum(1 for s in steps if s.get("status") == "completed")
@@ -610,8 +581,11 @@ class CommandHandler:
 
             lines.append(f"- {icon} `{plan_id}` **{title}** ({completed}/{len(steps)} steps)")
 
-        if len(plans) > 10:
-            lines.append(f"\n*...and {len(plans) - 10} more*")
+        shown = (page - 1) * PLAN_LIST_PAGE_SIZE + len(plans)
+        if shown < total:
+            lines.append(
+                f"\n*...and {total - shown} more — `/plan list {status_filter} {page + 1}`*"
+            )
 
         lines.append("\n*Use `/plan view <id>` to see details*")
 
@@ -622,6 +596,8 @@ class CommandHandler:
             "action": "plan_list",
             "plans": [{"id": p.get("id"), "title": p.get("title"), "status": p.get("status")} for p in plans],
             "filter": status_filter,
+            "total": total,
+            "page": page,
             "timestamp": datetime.now(timezone.utc).isoformat(),
         }
 
@@ -757,11 +733,8 @@ class CommandHandler:
                 "timestamp": datetime.now(timezone.utc).isoformat(),
             }
 
-        # Delete the plan
-        await self.redis.delete(f"plan:{plan_id}")
-        await self.redis.delete(f"plan:{plan_id}:history")
-        if plan.conversation_id:
-            await self.redis.delete(f"conversation:{plan.conversation_id}:active_plan")
+        # Delete the plan, its history and index entries
+        await self.plan_manager.delete_plan(plan.id)
 
         return {
             "type": "command_result",
@@ -1014,18 +987,41 @@ class CommandHandler:
                 "timestamp": datetime.now(timezone.utc).isoformat(),
             }
 
-        # Reset step statuses from start_step onwards
-        for i, step in enumerate(plan.steps):
-            if i >= start_step:
-                step.status = StepStatus.PENDING
-                step.result = None
-                step.error = None
+        def reset(plan: Plan) -> None:
+            # Reset step statuses from start_step onwards
+            for i, step in enumerate(plan.steps):
+                if i >= start_step:
+                    step.status = StepStatus.PENDING
+                    step.result = None
+                    step.error = None
 
-        # Set plan to PENDING so user can review/edit before approving
-        plan.status = PlanStatus.PENDING
+            # Set plan to PENDING so user can review/edit before approving
+            plan.status = PlanStatus.PENDING
 
-        # Save updated plan
-        await self.plan_manager._save_plan(plan)
+        reset(plan)
+        try:
+            await self.plan_manager._save_plan(plan)
+        except PlanConflictError:
+            # The supervisor updated the plan since it was read; redo the
+            # reset once on the current version
+            plan = await self.plan_manager.get_plan(plan.id)
+            if not plan:
+                return {
+                    "type": "command_error",
+                    "command": "plan",
+                    "error": f"Plan not found: {plan_id}",
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                }
+            reset(plan)
+            try:
+                await self.plan_manager._save_plan(plan)
+            except PlanConflictError:
+                return {
+                    "type": "command_error",
+                    "command": "plan",
+                    "error": "The plan is being updated, please try again",
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                }
 
         step_info = f" from step {start_step + 1}" if start_step > 0 else ""
 
@@ -66,6 +66,13 @@ class APIConfig(BaseSettings):
         default=60, description="Requests per minute per user"
     )
     rate_limit_burst: int = Field(default=10, description="Burst allowance")
+    rate_limit_lease_size: int = Field(
+        default=0,
+        description="Tokens each API worker leases from Redis at once (0 = check every request)",
+    )
+    rate_limit_lease_ttl_ms: int = Field(
+        default=1000, description="How long unused leased tokens stay valid locally"
+    )
 
     # File Upload
     upload_max_size_mb: int = Field(default=50, description="Max upload size in MB")
@@ -93,6 +100,13 @@ class APIConfig(BaseSettings):
     ws_max_connections_per_user: int = Field(
         default=5, description="Max WebSocket connections per user"
     )
+    ws_event_window_ms: int = Field(
+        default=50,
+        description="Window for merging high-frequency agent events into one frame (0 disables)",
+    )
+    ws_per_message_deflate: bool = Field(
+        default=True, description="Negotiate permessage-deflate compression for WebSocket frames"
+    )
 
     @property
     def upload_max_size_bytes(self) -> int:
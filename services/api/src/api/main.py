@@ -12,7 +12,7 @@ from fastapi.responses import JSONResponse, Response
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 from ai_core import configure_cost_tracker, configure_logging, get_logger, get_settings
-from ai_messaging import get_redis_client
+from ai_messaging import PlanIndex, get_redis_client
 
 from .config import get_api_config
 from .database import close_db, get_session_factory, init_db
@@ -44,6 +44,9 @@ from .websocket.browser import router as browser_ws_router
 from .websocket.handlers import AgentResponseHandler
 from .websocket.manager import get_connection_manager
 from .websocket.terminal import router as terminal_router
+from .services.conversation_history import get_conversation_history
+from .services.file_watcher import get_file_watcher_manager
+from .services.github_service import close_github_api_client
 from .services.usage_sync_service import get_usage_sync_service
 
 logger = get_logger(__name__)
@@ -83,6 +86,11 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         redis = await get_redis_client()
         await redis.ping()
         logger.info("Redis connected")
+
+        # Index plans written before the plan indexes existed (no-op once built)
+        await PlanIndex(redis).ensure_backfilled()
+        # Convert conversations stored as per-message hashes (no-op once done)
+        await get_conversation_history(redis).ensure_backfilled()
     except Exception as e:
         logger.error("Redis connection failed", error=str(e))
 
@@ -91,7 +99,11 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     try:
         redis = await get_redis_client()
         manager = get_connection_manager()
-        agent_handler = AgentResponseHandler(manager, redis)
+        agent_handler = AgentResponseHandler(
+            manager,
+            redis,
+            event_window_seconds=get_api_config().ws_event_window_ms / 1000,
+        )
         asyncio.create_task(agent_handler.start())
         logger.info("Agent response handler started")
     except Exception as e:
@@ -121,6 +133,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     if agent_handler:
         await agent_handler.stop()
 
+    # Stop workspace file watchers
+    await get_file_watcher_manager().stop_all()
+
+    # Close the shared GitHub API session
+    await close_github_api_client()
+
     # Close database
     await close_db()
 
@@ -233,6 +251,7 @@ def main() -> None:
         port=config.port,
         reload=config.reload,
         log_level="info" if not config.debug else "debug",
+        ws_per_message_deflate=config.ws_per_message_deflate,
     )
 
 
@@ -2,7 +2,10 @@
 Rate limiting middleware.
 """
 
+import hashlib
+import math
 import time
+from dataclasses import dataclass
 from typing import Callable
 
 from fastapi import Request, Response, status
@@ -17,22 +20,203 @@ from ..config import get_api_config
 logger = get_logger(__name__)
 
 
+
+# GCRA over a single stored timestamp: the key holds the theoretical
+# arrival time (TAT, microseconds) of the next request. A request for N
+# tokens is granted as many as fit before TAT runs more than
+# ``capacity`` emission intervals ahead of now. Redis TIME is used so all
+# API workers share one clock.
+GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000000 + tonumber(t[2])
+
+local tat = tonumber(redis.call('GET', KEYS[1]))
+if not tat or tat < now then
+    tat = now
+end
+
+local available = math.floor((now + capacity * interval - tat) / interval)
+if available < 1 then
+    return {0, 0, tat + interval - capacity * interval - now, tat - now}
+end
+
+local granted = math.min(requested, available)
+tat = tat + granted * interval
+redis.call('SET', KEYS[1], string.format('%.0f', tat), 'PX', math.ceil((tat - now) / 1000))
+return {granted, available - granted, 0, tat - now}
+"""
+
+GCRA_SCRIPT_SHA = hashlib.sha1(GCRA_SCRIPT.encode()).hexdigest()
+
+# Distinct from the sliding-window limiter's ``ratelimit:{identifier}``
+# sorted sets, which workers still running it keep writing until they're
+# replaced and which would otherwise fail the script with WRONGTYPE
+KEY_PREFIX = "ratelimit:gcra:"
+
+# Bound on identifiers holding a local lease before expired ones are pruned
+MAX_LEASES = 10_000
+
+
+@dataclass
+class RateLimitDecision:
+    """Outcome of a rate limit check."""
+
+    allowed: bool
+    remaining: int
+    # Unix timestamp at which the bucket is full again
+    reset_at: int
+    # Seconds until the next request would be allowed (0 when allowed)
+    retry_after: int
+
+
+@dataclass
+class _Lease:
+    """Tokens granted by Redis and held by this worker."""
+
+    tokens: int
+    remaining: int
+    reset_at: int
+    retry_after_until: float
+    expires_at: float
+
+
+class GCRARateLimiter:
+    """
+    Generic cell rate algorithm limiter backed by one Redis key per identifier.
+
+    Each check is a single EVALSHA of ``GCRA_SCRIPT``. The bucket refills at
+    ``requests_per_minute`` and holds up to ``capacity`` tokens, so a quiet
+    client can burst ``capacity`` requests and is then held to the steady
+    rate.
+
+    With ``lease_size`` > 1 each worker takes up to that many tokens per
+    round trip and answers following requests for the identifier from the
+    local lease until it is used up or ``lease_ttl`` passes. Denials are
+    also cached locally until a token would be available. Leased tokens are
+    already charged in Redis, so workers never admit more than the global
+    limit; unused tokens simply expire with the lease.
+    """
+
+    def __init__(
+        self,
+        redis: RedisClient,
+        requests_per_minute: int,
+        capacity: int,
+        lease_size: int = 0,
+        lease_ttl: float = 1.0,
+    ):
+        self.redis = redis
+        self.requests_per_minute = max(1, requests_per_minute)
+        self.capacity = max(1, capacity)
+        self.lease_size = max(1, min(lease_size, self.capacity))
+        self.lease_ttl = lease_ttl
+        # Microseconds between tokens
+        self.interval_us = max(1, 60_000_000 // self.requests_per_minute)
+        self._leases: dict[str, _Lease] = {}
+        self._script_loaded = False
+
+        self.redis_calls = 0
+        self.local_hits = 0
+
+    async def acquire(self, identifier: str) -> RateLimitDecision:
+        """Take one token for ``identifier``."""
+        if self.lease_size > 1:
+            decision = self._take_from_lease(identifier)
+            if decision is not None:
+                self.local_hits += 1
+                return decision
+
+        granted, remaining, retry_after_us, reset_after_us = await self._call(
+            identifier, self.lease_size
+        )
+        now = time.time()
+        reset_at = int(now + math.ceil(reset_after_us / 1_000_000))
+        retry_after = math.ceil(retry_after_us / 1_000_000)
+
+        if self.lease_size > 1:
+            monotonic = time.monotonic()
+            if len(self._leases) >= MAX_LEASES:
+                self._prune_leases(monotonic)
+            self._leases[identifier] = _Lease(
+                tokens=max(0, granted - 1),
+                remaining=remaining,
+                reset_at=reset_at,
+                retry_after_until=monotonic + retry_after_us / 1_000_000,
+                expires_at=monotonic + self.lease_ttl,
+            )
+
+        if granted < 1:
+            return RateLimitDecision(False, 0, reset_at, max(1, retry_after))
+        return RateLimitDecision(True, remaining + granted - 1, reset_at, 0)
+
+    def _take_from_lease(self, identifier: str) -> RateLimitDecision | None:
+        lease = self._leases.get(identifier)
+        if lease is None:
+            return None
+
+        now = time.monotonic()
+        if lease.tokens > 0 and now < lease.expires_at:
+            lease.tokens -= 1
+            return RateLimitDecision(True, lease.remaining + lease.tokens, lease.reset_at, 0)
+        if lease.tokens == 0 and now < lease.retry_after_until:
+            # Redis already said no; nothing can free a token before this
+            retry_after = max(1, math.ceil(lease.retry_after_until - now))
+            return RateLimitDecision(False, 0, lease.reset_at, retry_after)
+
+        del self._leases[identifier]
+        return None
+
+    def _prune_leases(self, now: float) -> None:
+        expired = [
+            identifier
+            for identifier, lease in self._leases.items()
+            if lease.expires_at <= now and lease.retry_after_until <= now
+        ]
+        for identifier in expired:
+            del self._leases[identifier]
+        if len(self._leases) >= MAX_LEASES:
+            self._leases.clear()
+
+    async def _call(self, identifier: str, requested: int) -> tuple[int, int, int, int]:
+        if not self._script_loaded:
+            await self.redis.script_load(GCRA_SCRIPT)
+            self._script_loaded = True
+
+        self.redis_calls += 1
+        result = await self.redis.evalsha(
+            GCRA_SCRIPT_SHA,
+            1,
+            f"{KEY_PREFIX}{identifier}",
+            self.interval_us,
+            self.capacity,
+            requested,
+            script=GCRA_SCRIPT,
+        )
+        granted, remaining, retry_after_us, reset_after_us = (int(v) for v in result)
+        return granted, remaining, retry_after_us, reset_after_us
+
+
 class RateLimitMiddleware(BaseHTTPMiddleware):
     """
-    Token bucket rate limiting middleware.
+    GCRA rate limiting middleware.
 
     Uses Redis for distributed rate limiting across multiple API instances.
 
     Features:
     - Per-user rate limiting (by JWT user ID or IP)
     - Configurable requests per minute
-    - Burst allowance
-    - Redis-backed for distributed systems
+    - Burst allowance on top of a minute's worth of requests
+    - One atomic Redis script call per check, or per leased batch of tokens
     """
 
     def __init__(self, app, redis: RedisClient | None = None):
         super().__init__(app)
         self._redis = redis
+        self._limiter: GCRARateLimiter | None = None
 
     async def get_redis(self) -> RedisClient:
         """Get Redis client lazily."""
@@ -40,6 +224,19 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             self._redis = await get_redis_client()
         return self._redis
 
+    async def get_limiter(self) -> GCRARateLimiter:
+        """Build the limiter from config on first use."""
+        if self._limiter is None:
+            config = get_api_config()
+            self._limiter = GCRARateLimiter(
+                redis=await self.get_redis(),
+                requests_per_minute=config.rate_limit_requests_per_minute,
+                capacity=config.rate_limit_requests_per_minute + config.rate_limit_burst,
+                lease_size=config.rate_limit_lease_size,
+                lease_ttl=config.rate_limit_lease_ttl_ms / 1000,
+            )
+        return self._limiter
+
     async def dispatch(
         self,
         request: Request,
@@ -59,14 +256,9 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         identifier = self._get_identifier(request)
 
         # Check rate limit
-        is_allowed, remaining, reset_at = await self._check_rate_limit(
-            identifier=identifier,
-            limit=config.rate_limit_requests_per_minute,
-            window=60,  # 1 minute window
-            burst=config.rate_limit_burst,
-        )
+        decision = await self._check_rate_limit(identifier)
 
-        if not is_allowed:
+        if not decision.allowed:
             logger.warning(
                 "Rate limit exceeded",
                 identifier=identifier,
@@ -77,12 +269,12 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 content={
                     "error": "Rate limit exceeded",
                     "detail": "Too many requests. Please try again later.",
-                    "retry_after": reset_at,
+                    "retry_after": decision.retry_after,
                 },
                 headers={
-                    "Retry-After": str(reset_at),
+                    "Retry-After": str(decision.retry_after),
                     "X-RateLimit-Remaining": "0",
-                    "X-RateLimit-Reset": str(reset_at),
+                    "X-RateLimit-Reset": str(decision.reset_at),
                 },
             )
 
@@ -93,8 +285,8 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         response.headers["X-RateLimit-Limit"] = str(
             config.rate_limit_requests_per_minute
         )
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Reset"] = str(reset_at)
+        response.headers["X-RateLimit-Remaining"] = str(decision.remaining)
+        response.headers["X-RateLimit-Reset"] = str(decision.reset_at)
 
         return response
 
@@ -114,54 +306,15 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         client_ip = request.client.host if request.client else "unknown"
         return f"ip:{client_ip}"
 
-    async def _check_rate_limit(
-        self,
-        identifier: str,
-        limit: int,
-        window: int,
-        burst: int,
-    ) -> tuple[bool, int, int]:
-        """
-        Check and update rate limit using sliding window.
-
-        Args:
-            identifier: Unique identifier (user or IP)
-            limit: Max requests per window
-            window: Window size in seconds
-            burst: Additional burst allowance
-
-        Returns:
-            Tuple of (is_allowed, remaining_requests, reset_timestamp)
-        """
-        redis = await self.get_redis()
-        key = f"ratelimit:{identifier}"
-        now = int(time.time())
-        window_start = now - window
-
+    async def _check_rate_limit(self, identifier: str) -> RateLimitDecision:
+        """Take a token for the identifier, failing open if Redis is unavailable."""
         try:
-            # Use Redis pipeline for atomic operations
-            async with redis.pipeline() as pipe:
-                # Remove old entries
-                await pipe.zremrangebyscore(key, 0, window_start)
-                # Count current requests
-                await pipe.zcard(key)
-                # Add current request
-                await pipe.zadd(key, {str(now): now})
-                # Set expiry
-                await pipe.expire(key, window * 2)
-                # Execute
-                results = await pipe.execute()
-
-            current_count = results[1]
-            effective_limit = limit + burst
-            remaining = max(0, effective_limit - current_count - 1)
-            reset_at = now + window
-
-            is_allowed = current_count < effective_limit
-
-            return is_allowed, remaining, reset_at
-
+            limiter = await self.get_limiter()
+            return await limiter.acquire(identifier)
         except Exception as e:
             logger.error("Rate limit check failed", error=str(e))
             # Allow request on Redis failure (fail open)
-            return True, limit, now + window
+            config = get_api_config()
+            return RateLimitDecision(
+                True, config.rate_limit_requests_per_minute, int(time.time()) + 60, 0
+            )
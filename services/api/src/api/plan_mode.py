@@ -15,10 +15,20 @@ from typing import Any, Optional
 from uuid import uuid4
 
 from ai_core import get_logger
-from ai_messaging import RedisClient
+from ai_messaging import PlanConflictError, PlanIndex, RedisClient
 
 logger = get_logger(__name__)
 
+# Status filters accepted by the plan list endpoint and `/plan list`
+PLAN_STATUS_FILTERS: dict[str, list[str] | None] = {
+    "active": ["executing", "approved"],
+    "paused": ["paused"],
+    "completed": ["completed"],
+    "failed": ["failed"],
+    "stuck": ["paused", "failed"],  # ...with at least one completed step
+    "all": None,
+}
+
 
 class PlanStatus(str, Enum):
     """Status of a plan."""
@@ -98,6 +108,7 @@ class Plan:
     status: PlanStatus = PlanStatus.DRAFTING
     steps: list[PlanStep] = field(default_factory=list)
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: Optional[datetime] = None
     approved_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     current_step: int = 0
@@ -106,6 +117,7 @@ class Plan:
     files_explored: list[str] = field(default_factory=list)
     project_id: Optional[str] = None  # Scope plan to a project
     branch: Optional[str] = None  # Git branch the plan was created on
+    version: int = 0  # Bumped by every write; 0 until first saved
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -118,6 +130,7 @@ class Plan:
             "status": self.status.value,
             "steps": [s.to_dict() for s in self.steps],
             "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
             "approved_at": self.approved_at.isoformat() if self.approved_at else None,
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
             "current_step": self.current_step,
@@ -126,6 +139,7 @@ class Plan:
             "exploration_notes": self.exploration_notes,
             "files_explored": self.files_explored,
             "branch": self.branch,
+            "version": self.version,
         }
 
     @property
@@ -141,11 +155,18 @@ class PlanManager:
     """
     Manages plan creation, approval, and execution.
 
-    Stores plans in Redis for real-time access and persistence.
+    Stores plans in Redis for real-time access and persistence, indexed
+    by user, conversation, project and status (see ``PlanIndex``).
+
+    Status changes, step progress and notes are applied as field-level
+    updates inside Redis rather than by rewriting the plan, so they are
+    safe alongside the supervisor updating the same plan. Whole-plan reads
+    always go to Redis; plans kept in memory only resolve partial IDs.
     """
 
     def __init__(self, redis: RedisClient):
         self.redis = redis
+        self.index = PlanIndex(redis)
         self._active_plans: dict[str, Plan] = {}
 
     async def create_plan(
@@ -177,12 +198,9 @@ class PlanManager:
 
     async def start_exploration(self, plan_id: str) -> bool:
         """Transition a plan to exploring phase."""
-        plan = await self.get_plan(plan_id)
-        if not plan:
+        if not await self._update(plan_id, fields={"status": PlanStatus.EXPLORING.value}):
             return False
 
-        plan.status = PlanStatus.EXPLORING
-        await self._save_plan(plan)
         logger.info("Plan exploration started", plan_id=plan_id)
         return True
 
@@ -193,31 +211,23 @@ class PlanManager:
         file_path: str | None = None,
     ) -> bool:
         """Add an exploration note and optionally track a file explored."""
-        plan = await self.get_plan(plan_id)
-        if not plan:
-            return False
-
-        plan.exploration_notes.append(note)
-        if file_path and file_path not in plan.files_explored:
-            plan.files_explored.append(file_path)
+        changes: dict[str, Any] = {"append": {"exploration_notes": [note]}}
+        if file_path:
+            changes["add_unique"] = {"files_explored": [file_path]}
 
-        await self._save_plan(plan)
-        return True
+        return await self._update(plan_id, **changes) is not None
 
     async def finish_exploration(self, plan_id: str) -> bool:
         """Transition from exploring to drafting phase."""
-        plan = await self.get_plan(plan_id)
-        if not plan or plan.status != PlanStatus.EXPLORING:
+        updated = await self._update(
+            plan_id,
+            fields={"status": PlanStatus.DRAFTING.value},
+            if_status=[PlanStatus.EXPLORING.value],
+        )
+        if not updated:
             return False
 
-        plan.status = PlanStatus.DRAFTING
-        await self._save_plan(plan)
-        logger.info(
-            "Plan exploration finished, now drafting",
-            plan_id=plan_id,
-            files_explored=len(plan.files_explored),
-            notes_count=len(plan.exploration_notes),
-        )
+        logger.info("Plan exploration finished, now drafting", plan_id=plan_id)
         return True
 
     async def add_step(
@@ -233,13 +243,9 @@ class PlanManager:
         changes: Optional[list[dict[str, Any]]] = None,
     ) -> Optional[PlanStep]:
         """Add a step to a plan."""
-        plan = await self.get_plan(plan_id)
-        if not plan:
-            return None
-
         step = PlanStep(
             id=str(uuid4()),
-            order=len(plan.steps) + 1,
+            order=0,  # Numbered by Redis after the plan's current steps
             title=title,
             description=description,
             agent=agent,
@@ -250,9 +256,11 @@ class PlanManager:
             changes=changes or [],
         )
 
-        plan.steps.append(step)
-        await self._save_plan(plan)
+        updated = await self._update(plan_id, add_steps=[step.to_dict()])
+        if not updated:
+            return None
 
+        step.order = updated["step_count"]
         logger.debug("Step added to plan", plan_id=plan_id, step_id=step.id)
         return step
 
@@ -262,11 +270,7 @@ class PlanManager:
         steps: list[dict[str, Any]],
     ) -> bool:
         """Set all steps for a plan at once."""
-        plan = await self.get_plan(plan_id)
-        if not plan:
-            return False
-
-        plan.steps = [
+        plan_steps = [
             PlanStep(
                 id=s.get("id") or str(uuid4()),
                 order=i + 1,
@@ -282,55 +286,101 @@ class PlanManager:
             for i, s in enumerate(steps)
         ]
 
-        plan.status = PlanStatus.PENDING
-        await self._save_plan(plan)
-        return True
+        updated = await self._update(
+            plan_id,
+            fields={
+                "steps": [step.to_dict() for step in plan_steps],
+                "status": PlanStatus.PENDING.value,
+            },
+        )
+        return updated is not None
+
+    async def update_plan(self, plan_id: str, **fields: Any) -> bool:
+        """Set top-level plan fields such as title, description or metadata."""
+        return await self._update(plan_id, fields=fields) is not None
 
     async def get_plan(self, plan_id: str) -> Optional[Plan]:
         """Get a plan by ID (supports partial ID matching)."""
-        # Check exact match in memory cache
-        if plan_id in self._active_plans:
-            return self._active_plans[plan_id]
-
-        # Check partial match in memory cache
-        for full_id, plan in self._active_plans.items():
-            if full_id.startswith(plan_id):
-                return plan
-
-        # Try exact match from Redis
-        plan = await self._load_plan(plan_id)
+        # Always read from Redis: the supervisor updates plans field by field,
+        # so a cached copy may be stale and its version would fail _save_plan.
+        # The cache only resolves partial IDs without a round trip.
+        full_id = next((i for i in self._active_plans if i.startswith(plan_id)), plan_id)
+        plan = await self._load_plan(full_id)
         if plan:
             return plan
 
-        # Try partial ID match - scan for plans starting with this ID
-        cursor = 0
-        while True:
-            cursor, keys = await self.redis.scan(cursor=cursor, match=f"plan:{plan_id}*", count=100)
-            for key in keys:
-                if ":history" in key:
-                    continue
-                # Extract the full plan ID from key (plan:<uuid>)
-                full_id = key.replace("plan:", "")
-                plan = await self._load_plan(full_id)
-                if plan:
-                    return plan
-            if cursor == 0:
-                break
+        # Try partial ID match through the ID prefix index
+        full_id = await self.index.resolve_id(plan_id)
+        if full_id:
+            return await self._load_plan(full_id)
 
         return None
 
+    async def list_plans(
+        self,
+        user_id: str,
+        status_filter: str | None = None,
+        project_id: str | None = None,
+        conversation_id: str | None = None,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """
+        One page of a user's plans, most recently updated first.
+
+        Returns:
+            Plan dicts for the page and the total number matching the filters
+        """
+        statuses = PLAN_STATUS_FILTERS.get(status_filter or "all")
+        index_key = f"plans:user:{user_id}"
+        owner = None
+        if conversation_id:
+            # Conversation indexes aren't per user; never leak another user's
+            # plan. Filtered before paging, so pages and totals stay right
+            index_key = f"plans:conversation:{conversation_id}"
+            owner = user_id
+
+        if status_filter != "stuck":
+            ids, total = await self.index.list_ids(
+                index_key,
+                statuses=statuses,
+                project_id=project_id,
+                offset=offset,
+                limit=limit,
+                user_id=owner,
+            )
+            plans = await self.index.get_many(ids)
+        else:
+            # "Stuck" also needs step progress, which only the documents
+            # have; only the caller's paused and failed plans are read
+            ids, _ = await self.index.list_ids(
+                index_key, statuses=statuses, project_id=project_id, user_id=owner
+            )
+            stuck = [
+                plan
+                for plan in await self.index.get_many(ids)
+                if any(s.get("status") == "completed" for s in plan.get("steps", []))
+            ]
+            plans, total = stuck[offset:offset + limit], len(stuck)
+
+        return plans, total
+
+    async def delete_plan(self, plan_id: str) -> bool:
+        """Delete a plan, its history and its index entries."""
+        plan = await self.get_plan(plan_id)
+        if not plan:
+            return False
+
+        await self.index.delete(plan.id)
+        active_key = f"conversation:{plan.conversation_id}:active_plan"
+        if plan.conversation_id and await self.redis.get(active_key) == plan.id:
+            await self.redis.delete(active_key)
+
+        self._active_plans.pop(plan.id, None)
+        return True
+
     async def get_active_plan(self, conversation_id: str) -> Optional[Plan]:
         """Get the active plan for a conversation."""
-        # Check memory cache first
-        for plan in self._active_plans.values():
-            if plan.conversation_id == conversation_id and plan.status not in (
-                PlanStatus.COMPLETED,
-                PlanStatus.CANCELLED,
-                PlanStatus.FAILED,
-            ):
-                return plan
-
-        # Check Redis
         plan_id = await self.redis.get(f"conversation:{conversation_id}:active_plan")
         if plan_id:
             return await self.get_plan(plan_id)
@@ -339,39 +389,38 @@ class PlanManager:
 
     async def approve_plan(self, plan_id: str) -> bool:
         """Approve a plan for execution."""
-        plan = await self.get_plan(plan_id)
-        if not plan or plan.status != PlanStatus.PENDING:
+        updated = await self._update(
+            plan_id,
+            fields={
+                "status": PlanStatus.APPROVED.value,
+                "approved_at": datetime.now(timezone.utc).isoformat(),
+            },
+            if_status=[PlanStatus.PENDING.value],
+        )
+        if not updated:
             return False
 
-        plan.status = PlanStatus.APPROVED
-        plan.approved_at = datetime.now(timezone.utc)
-        await self._save_plan(plan)
-
         logger.info("Plan approved", plan_id=plan_id)
         return True
 
     async def reject_plan(self, plan_id: str) -> bool:
         """Reject/cancel a plan."""
-        plan = await self.get_plan(plan_id)
-        if not plan:
+        if not await self._update(plan_id, fields={"status": PlanStatus.CANCELLED.value}):
             return False
 
-        plan.status = PlanStatus.CANCELLED
-        await self._save_plan(plan)
-
         logger.info("Plan rejected", plan_id=plan_id)
         return True
 
     async def start_execution(self, plan_id: str) -> bool:
         """Start executing a plan."""
-        plan = await self.get_plan(plan_id)
-        if not plan or plan.status != PlanStatus.APPROVED:
+        updated = await self._update(
+            plan_id,
+            fields={"status": PlanStatus.EXECUTING.value, "current_step": 0},
+            if_status=[PlanStatus.APPROVED.value],
+        )
+        if not updated:
             return False
 
-        plan.status = PlanStatus.EXECUTING
-        plan.current_step = 0
-        await self._save_plan(plan)
-
         logger.info("Plan execution started", plan_id=plan_id)
         return True
 
@@ -383,88 +432,101 @@ class PlanManager:
         output: Optional[str] = None,
         error: Optional[str] = None,
     ) -> bool:
-        """Update the status of a step."""
-        plan = await self.get_plan(plan_id)
-        if not plan:
-            return False
+        """
+        Update the status of a step.
 
-        for step in plan.steps:
-            if step.id == step_id:
-                step.status = status
+        Moves the plan's current step forward when the step completes, and
+        completes or fails the plan once its steps are all done or one fails.
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        changes: dict[str, Any] = {"status": status.value}
 
-                if status == StepStatus.IN_PROGRESS:
-                    step.started_at = datetime.now(timezone.utc)
-                elif status in (StepStatus.COMPLETED, StepStatus.FAILED, StepStatus.SKIPPED):
-                    step.completed_at = datetime.now(timezone.utc)
+        if status == StepStatus.IN_PROGRESS:
+            changes["started_at"] = now
+        elif status in (StepStatus.COMPLETED, StepStatus.FAILED, StepStatus.SKIPPED):
+            changes["completed_at"] = now
 
-                if output:
-                    step.output = output
-                if error:
-                    step.error = error
+        if output:
+            changes["output"] = output
+        if error:
+            changes["error"] = error
 
-                # Update current step pointer
-                if status == StepStatus.COMPLETED:
-                    plan.current_step = step.order
-
-                # Check if all steps completed
-                all_done = all(
-                    s.status in (StepStatus.COMPLETED, StepStatus.SKIPPED)
-                    for s in plan.steps
-                )
-                if all_done:
-                    plan.status = PlanStatus.COMPLETED
-                    plan.completed_at = datetime.now(timezone.utc)
-
-                # Check for failure
-                if status == StepStatus.FAILED:
-                    plan.status = PlanStatus.FAILED
-
-                await self._save_plan(plan)
-                return True
-
-        return False
+        updated = await self._update(plan_id, steps={step_id: changes}, settle=True)
+        return updated is not None
 
     async def pause_execution(self, plan_id: str) -> bool:
         """Pause plan execution."""
-        plan = await self.get_plan(plan_id)
-        if not plan:
-            return False
-
         # Allow pausing from either APPROVED or EXECUTING status
-        if plan.status not in (PlanStatus.EXECUTING, PlanStatus.APPROVED):
-            return False
-
-        plan.status = PlanStatus.PAUSED
-        await self._save_plan(plan)
-        return True
+        updated = await self._update(
+            plan_id,
+            fields={"status": PlanStatus.PAUSED.value},
+            if_status=[PlanStatus.EXECUTING.value, PlanStatus.APPROVED.value],
+        )
+        return updated is not None
 
     async def resume_execution(self, plan_id: str) -> bool:
         """Resume paused plan execution."""
-        plan = await self.get_plan(plan_id)
-        if not plan or plan.status != PlanStatus.PAUSED:
-            return False
-
-        plan.status = PlanStatus.EXECUTING
-        await self._save_plan(plan)
-        return True
+        updated = await self._update(
+            plan_id,
+            fields={"status": PlanStatus.EXECUTING.value},
+            if_status=[PlanStatus.PAUSED.value],
+        )
+        return updated is not None
+
+    async def _update(self, plan_id: str, **changes: Any) -> Optional[dict[str, Any]]:
+        """
+        Apply a field-level update (see ``PlanIndex.update``) to a plan by
+        full or partial ID.
+
+        Returns:
+            The plan's new status and derived fields, or None if the plan
+            doesn't exist or a condition didn't hold
+        """
+        plan_id = next((i for i in self._active_plans if i.startswith(plan_id)), plan_id)
+        updated = await self.index.update(plan_id, **changes)
+        if updated is None:
+            full_id = await self.index.resolve_id(plan_id)
+            if not full_id or full_id == plan_id:
+                return None
+            plan_id = full_id
+            updated = await self.index.update(plan_id, **changes)
+            if updated is None:
+                return None
+
+        # The cached copy is stale now; get_plan reloads it
+        self._active_plans.pop(plan_id, None)
+        await self._track_active(plan_id, updated.get("conversation_id"), updated["status"])
+        return updated
 
     async def _save_plan(self, plan: Plan) -> None:
-        """Save plan to Redis."""
-        import json
+        """
+        Save a whole plan to Redis and update its indexes atomically.
+
+        Raises:
+            PlanConflictError: The plan changed in Redis since it was loaded;
+                reload it with ``get_plan`` and reapply the change to retry
+        """
+        data = plan.to_dict()
+        try:
+            plan.version = await self.index.save(data, expected_version=plan.version)
+        except PlanConflictError:
+            self._active_plans.pop(plan.id, None)
+            raise
+        plan.updated_at = datetime.fromisoformat(data["updated_at"])
 
-        key = f"plan:{plan.id}"
-        await self.redis.set(key, json.dumps(plan.to_dict()))
+        await self._track_active(plan.id, plan.conversation_id, plan.status)
+        self._active_plans[plan.id] = plan
 
-        # Also store active plan reference
-        if plan.status not in (PlanStatus.COMPLETED, PlanStatus.CANCELLED, PlanStatus.FAILED):
-            await self.redis.set(
-                f"conversation:{plan.conversation_id}:active_plan",
-                plan.id,
-            )
-        else:
-            await self.redis.delete(f"conversation:{plan.conversation_id}:active_plan")
+    async def _track_active(self, plan_id: str, conversation_id: Optional[str], status: str) -> None:
+        """Store the conversation's active plan reference while the plan is live."""
+        if not conversation_id:
+            return
 
-        self._active_plans[plan.id] = plan
+        key = f"conversation:{conversation_id}:active_plan"
+        if status not in (PlanStatus.COMPLETED, PlanStatus.CANCELLED, PlanStatus.FAILED):
+            await self.redis.set(key, plan_id)
+        else:
+            await self.redis.delete(key)
 
     async def _load_plan(self, plan_id: str) -> Optional[Plan]:
         """Load plan from Redis."""
@@ -485,12 +547,17 @@ class PlanManager:
                 description=plan_data["description"],
                 status=PlanStatus(plan_data["status"]),
                 created_at=datetime.fromisoformat(plan_data["created_at"]),
+                updated_at=(
+                    datetime.fromisoformat(plan_data["updated_at"])
+                    if plan_data.get("updated_at") else None
+                ),
                 current_step=plan_data.get("current_step", 0),
                 metadata=plan_data.get("metadata", {}),
                 exploration_notes=plan_data.get("exploration_notes", []),
                 files_explored=plan_data.get("files_explored", []),
                 project_id=plan_data.get("project_id"),
                 branch=plan_data.get("branch"),
+                version=plan_data.get("version", 0),
             )
 
             if plan_data.get("approved_at"):
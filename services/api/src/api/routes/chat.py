@@ -111,7 +111,7 @@ async def websocket_chat(
     handler = MessageHandler(manager, redis)
 
     # Send welcome message
-    await websocket.send_json({
+    connection.send({
         "type": "connected",
         "user_id": user.sub,
         "username": user.username,
@@ -152,5 +152,6 @@ async def websocket_stats() -> dict:
     return {
         "total_connections": manager.get_connection_count(),
         "connected_users": manager.get_connected_users(),
+        "queues": manager.get_queue_stats(),
         "timestamp": datetime.now(timezone.utc).isoformat(),
     }
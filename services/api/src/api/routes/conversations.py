@@ -20,6 +20,7 @@ from ai_messaging import RedisClient
 
 from ..database import get_db_session
 from ..dependencies import CurrentUserDep, RedisDep, get_redis
+from ..services.conversation_history import get_conversation_history
 from ..schemas.conversation import (
     ConversationCreate,
     ConversationListResponse,
@@ -215,7 +216,8 @@ async def get_conversation(
     """
     Get conversation with message history.
 
-    Conversation metadata comes from DB, messages from Redis.
+    Conversation metadata comes from DB, messages (newest first) from
+    Redis, which reloads them from the DB when it has none.
     """
     from sqlalchemy.orm import selectinload
 
@@ -236,42 +238,17 @@ async def get_conversation(
             detail=f"Conversation {conversation_id} not found",
         )
 
-    # Get messages from Redis
-    messages_key = f"conversation:{conversation_id}:messages"
-    message_ids = await redis.lrange(messages_key, 0, message_limit - 1)
-
-    messages = []
-    for msg_id in message_ids or []:
-        msg_key = f"message:{msg_id}"
-        msg_data = await redis.hgetall(msg_key)
-        if msg_data:
-            messages.append({
-                "id": msg_id,
-                "role": msg_data.get("role", "user"),
-                "content": msg_data.get("content", ""),
-                "agent": msg_data.get("agent"),
-                "timestamp": msg_data.get("timestamp", ""),
-            })
-
-    # Fallback: if Redis returned no messages, query PostgreSQL
-    if not messages:
-        from database.models import Message
-
-        msg_result = await db.execute(
-            select(Message)
-            .where(Message.conversation_id == conversation_id)
-            .order_by(Message.created_at.asc())
-            .limit(message_limit)
-        )
-        db_messages = msg_result.scalars().all()
-        for msg in db_messages:
-            messages.append({
-                "id": msg.id,
-                "role": msg.role,
-                "content": msg.content,
-                "agent": msg.agent,
-                "timestamp": msg.created_at.isoformat() if msg.created_at else "",
-            })
+    history = await get_conversation_history(redis).recent(conversation_id, limit=message_limit)
+    messages = [
+        {
+            "id": msg.get("id"),
+            "role": msg.get("role", "user"),
+            "content": msg.get("content", ""),
+            "agent": msg.get("agent"),
+            "timestamp": msg.get("timestamp", ""),
+        }
+        for msg in reversed(history)
+    ]
 
     return ConversationWithMessagesResponse(
         conversation=ConversationResponse.from_conversation(conversation),
@@ -363,11 +340,7 @@ async def delete_conversation(
     await db.flush()
 
     # Clean up Redis
-    messages_key = f"conversation:{conversation_id}:messages"
-    message_ids = await redis.lrange(messages_key, 0, -1)
-    for msg_id in message_ids or []:
-        await redis.delete(f"message:{msg_id}")
-    await redis.delete(messages_key)
+    await get_conversation_history(redis).clear(conversation_id)
     await redis.delete(f"conversation:{conversation_id}")
 
     # Remove from user's list
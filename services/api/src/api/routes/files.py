@@ -2,24 +2,28 @@
 File upload and management routes.
 """
 
+import asyncio
 import os
+import re
 import shutil
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
-from uuid import uuid4
 
-import aiofiles
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile, status
+from fastapi.responses import FileResponse, Response
 
 from ai_core import get_logger
 
 from ..config import APIConfig
 from ..dependencies import ConfigDep, CurrentUserDep
+from ..services.upload_store import UploadStore
 
 logger = get_logger(__name__)
 
+# File IDs are UUIDs; anything else can't name an upload
+FILE_ID_PATTERN = re.compile(r"^[0-9a-fA-F-]{36}$")
+
 router = APIRouter(prefix="/files", tags=["Files"])
 
 
@@ -52,77 +56,96 @@ async def upload_file(
             detail=f"File type {file.content_type} not allowed",
         )
 
-    # Generate file ID and path
-    file_id = str(uuid4())
-    file_ext = Path(file.filename).suffix if file.filename else ""
-    safe_filename = f"{file_id}{file_ext}"
-
-    # Ensure upload directory exists
-    upload_dir = Path(config.upload_directory) / current_user.sub
-    upload_dir.mkdir(parents=True, exist_ok=True)
+    store = UploadStore(config.upload_directory)
 
-    file_path = upload_dir / safe_filename
-
-    # Save file
+    # Save file (stored once per distinct content)
     try:
-        async with aiofiles.open(file_path, "wb") as f:
-            while chunk := await file.read(8192):
-                await f.write(chunk)
+        ref = await store.save(
+            current_user.sub,
+            file.file,
+            filename=file.filename,
+            content_type=file.content_type,
+        )
 
         logger.info(
             "File uploaded",
-            file_id=file_id,
+            file_id=ref["id"],
             filename=file.filename,
             size=file_size,
             user_id=current_user.sub,
         )
 
         return {
-            "id": file_id,
-            "filename": file.filename,
-            "content_type": file.content_type,
-            "size": file_size,
-            "uploaded_at": datetime.now(timezone.utc).isoformat(),
+            "id": ref["id"],
+            "filename": ref["filename"],
+            "content_type": ref["content_type"],
+            "size": ref["size"],
+            "uploaded_at": ref["uploaded_at"],
         }
 
     except Exception as e:
         logger.error("File upload failed", error=str(e))
-        # Clean up partial file
-        if file_path.exists():
-            file_path.unlink()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to save file",
         )
 
 
+def _legacy_file(config: APIConfig, user_id: str, file_id: str) -> Path | None:
+    """A file stored as <user>/<file_id>.<ext>, before uploads were content-addressed."""
+    upload_dir = Path(config.upload_directory) / user_id
+    if not upload_dir.exists():
+        return None
+    matching_files = list(upload_dir.glob(f"{file_id}*"))
+    return matching_files[0] if matching_files else None
+
+
+def _not_found(file_id: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"File {file_id} not found",
+    )
+
+
 @router.get("/{file_id}")
 async def download_file(
     file_id: str,
+    request: Request,
     current_user: CurrentUserDep,
     config: ConfigDep,
-) -> FileResponse:
+) -> Response:
     """
     Download a file by ID.
-    """
-    # Find file in user's directory
-    upload_dir = Path(config.upload_directory) / current_user.sub
-
-    if not upload_dir.exists():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"File {file_id} not found",
-        )
 
-    # Look for file with matching ID
-    matching_files = list(upload_dir.glob(f"{file_id}*"))
-    if not matching_files:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"File {file_id} not found",
+    Responses carry the content hash as a strong ETag (answering
+    If-None-Match with 304) and support Range requests.
+    """
+    if not FILE_ID_PATTERN.match(file_id):
+        raise _not_found(file_id)
+
+    store = UploadStore(config.upload_directory)
+    ref = await asyncio.to_thread(store.get, current_user.sub, file_id)
+    if ref:
+        etag = f'"{ref["sha256"]}"'
+        headers = {"ETag": etag, "Cache-Control": "private, max-age=31536000, immutable"}
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        blob = store.blob_path(ref["sha256"])
+        if not blob.exists():
+            logger.error("Upload blob missing", file_id=file_id, sha256=ref["sha256"])
+            raise _not_found(file_id)
+
+        return FileResponse(
+            path=str(blob),
+            media_type=ref["content_type"] or "application/octet-stream",
+            filename=ref["filename"] or file_id,
+            headers=headers,
         )
 
-    file_path = matching_files[0]
+    file_path = _legacy_file(config, current_user.sub, file_id)
+    if not file_path:
+        raise _not_found(file_id)
 
     # Determine media type from extension
     ext_to_media_type = {
@@ -155,30 +178,28 @@ async def delete_file(
 ) -> dict[str, str]:
     """
     Delete a file by ID.
-    """
-    upload_dir = Path(config.upload_directory) / current_user.sub
 
-    if not upload_dir.exists():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"File {file_id} not found",
-        )
-
-    # Look for file with matching ID
-    matching_files = list(upload_dir.glob(f"{file_id}*"))
-    if not matching_files:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"File {file_id} not found",
-        )
-
-    file_path = matching_files[0]
+    Only the user's reference is removed; the stored content is reclaimed
+    by garbage collection once nothing references it.
+    """
+    if not FILE_ID_PATTERN.match(file_id):
+        raise _not_found(file_id)
 
+    store = UploadStore(config.upload_directory)
     try:
+        if await asyncio.to_thread(store.delete, current_user.sub, file_id):
+            logger.info("File deleted", file_id=file_id, user_id=current_user.sub)
+            return {"message": f"File {file_id} deleted"}
+
+        file_path = _legacy_file(config, current_user.sub, file_id)
+        if not file_path:
+            raise _not_found(file_id)
         file_path.unlink()
         logger.info("File deleted", file_id=file_id, user_id=current_user.sub)
         return {"message": f"File {file_id} deleted"}
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Failed to delete file", file_id=file_id, error=str(e))
         raise HTTPException(
@@ -195,26 +216,34 @@ async def list_files(
     """
     List all files for the current user.
     """
-    upload_dir = Path(config.upload_directory) / current_user.sub
+    store = UploadStore(config.upload_directory)
+    files = [
+        {
+            "id": ref["id"],
+            "filename": ref["filename"],
+            "size": ref["size"],
+            "modified_at": ref["uploaded_at"],
+        }
+        for ref in await asyncio.to_thread(store.list_refs, current_user.sub)
+    ]
 
-    if not upload_dir.exists():
-        return {"files": [], "count": 0}
-
-    files = []
-    for file_path in upload_dir.iterdir():
-        if file_path.is_file():
-            stat = file_path.stat()
-            # Extract file ID from filename
-            file_id = file_path.stem
-
-            files.append({
-                "id": file_id,
-                "filename": file_path.name,
-                "size": stat.st_size,
-                "modified_at": datetime.fromtimestamp(
-                    stat.st_mtime, tz=timezone.utc
-                ).isoformat(),
-            })
+    # Files stored before uploads were content-addressed
+    upload_dir = Path(config.upload_directory) / current_user.sub
+    if upload_dir.exists():
+        for file_path in upload_dir.iterdir():
+            if file_path.is_file():
+                stat = file_path.stat()
+                # Extract file ID from filename
+                file_id = file_path.stem
+
+                files.append({
+                    "id": file_id,
+                    "filename": file_path.name,
+                    "size": stat.st_size,
+                    "modified_at": datetime.fromtimestamp(
+                        stat.st_mtime, tz=timezone.utc
+                    ).isoformat(),
+                })
 
     return {
         "files": sorted(files, key=lambda f: f["modified_at"], reverse=True),
@@ -28,6 +28,7 @@ from ai_core import (
 from ai_memory import LearningScope, PAIPhase, QdrantStore
 
 from ..dependencies import CurrentUserDep, DbSessionDep, RedisDep
+from ..services.conversation_history import get_conversation_history
 
 logger = get_logger(__name__)
 
@@ -1301,19 +1302,12 @@ Analyze this evidence carefully. Consider:
 async def _get_conversation_context(redis, conversation_id: str) -> str:
     """Fetch conversation history from Redis."""
     try:
-        # Get message IDs from the conversation list
-        message_ids = await redis.lrange(f"conversation:{conversation_id}:messages", 0, -1)
-        if not message_ids:
-            return ""
-
         messages_text = []
-        for msg_id in message_ids[-20:]:  # Last 20 messages for context
-            msg_data = await redis.hgetall(f"message:{msg_id}")
-            if msg_data:
-                role = msg_data.get("role", "unknown")
-                content = msg_data.get("content", "")
-                if content:
-                    messages_text.append(f"[{role}]: {content}")
+        for msg in await get_conversation_history(redis).recent(conversation_id, limit=20):
+            role = msg.get("role", "unknown")
+            content = msg.get("content", "")
+            if content:
+                messages_text.append(f"[{role}]: {content}")
 
         return "\n\n".join(messages_text)
     except Exception as e:
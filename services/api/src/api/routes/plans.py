@@ -34,31 +34,6 @@ logger = get_logger(__name__)
 router = APIRouter(prefix="/plans", tags=["Plans"])
 
 
-async def _scan_user_plans(redis: RedisClient, user_id: str) -> list[dict]:
-    """Scan Redis for all plans belonging to a user."""
-    plans = []
-    cursor = 0
-
-    while True:
-        cursor, keys = await redis.scan(cursor=cursor, match="plan:*", count=100)
-        for key in keys:
-            # Skip history keys (they are LISTs, not strings)
-            if ":history" in key:
-                continue
-            plan_data = await redis.get(key)
-            if plan_data:
-                try:
-                    plan = json.loads(plan_data)
-                    if plan.get("user_id") == user_id:
-                        plans.append(plan)
-                except json.JSONDecodeError:
-                    continue
-        if cursor == 0:
-            break
-
-    return plans
-
-
 async def _get_plan_history(redis: RedisClient, plan_id: str) -> list[dict]:
     """Get modification history for a plan."""
     history_key = f"plan:{plan_id}:history"
@@ -100,11 +75,12 @@ async def list_plans(
     redis: RedisClient = Depends(get_redis),
     status_filter: str | None = Query(None, alias="status", description="Filter by status: active, paused, completed, failed, stuck, all"),
     project_id: str | None = Query(None, description="Filter by project"),
-    limit: int = Query(50, le=100),
-    offset: int = Query(0),
+    conversation_id: str | None = Query(None, description="Filter by conversation"),
+    limit: int = Query(50, ge=1, le=100),
+    offset: int = Query(0, ge=0),
 ) -> PlanListResponse:
     """
-    List all plans for the current user with optional filters.
+    List the current user's plans, most recently updated first.
 
     Status filters:
     - active: executing or approved plans
@@ -114,58 +90,22 @@ async def list_plans(
     - stuck: paused or failed plans with partial progress
     - all: no filter (default)
     """
-    # Scan all plans for this user
-    all_plans = await _scan_user_plans(redis, current_user.sub)
-
-    # Apply status filter
-    status_map = {
-        "active": ["executing", "approved"],
-        "paused": ["paused"],
-        "completed": ["completed"],
-        "failed": ["failed"],
-        "stuck": ["paused", "failed"],
-        "all": None,
-    }
-
-    filter_statuses = status_map.get(status_filter or "all")
-
-    filtered_plans = []
-    for plan in all_plans:
-        plan_status = plan.get("status", "")
-
-        # Apply project filter
-        if project_id and plan.get("project_id") != project_id:
-            continue
-
-        # Apply status filter
-        if filter_statuses:
-            if plan_status not in filter_statuses:
-                continue
-
-            # For "stuck" filter, also require partial progress
-            if status_filter == "stuck":
-                steps = plan.get("steps", [])
-                completed = sum(1 for s in steps if s.get("status") == "completed")
-                if completed == 0:
-                    continue
-
-        filtered_plans.append(plan)
-
-    # Sort by created_at descending
-    filtered_plans.sort(
-        key=lambda p: p.get("created_at", ""),
-        reverse=True,
+    plan_manager = PlanManager(redis)
+    plans, total = await plan_manager.list_plans(
+        current_user.sub,
+        status_filter=status_filter,
+        project_id=project_id,
+        conversation_id=conversation_id,
+        offset=offset,
+        limit=limit,
     )
 
-    # Apply pagination
-    total = len(filtered_plans)
-    paginated = filtered_plans[offset:offset + limit]
-
     return PlanListResponse(
-        plans=[PlanListItem.from_plan(p) for p in paginated],
+        plans=[PlanListItem.from_plan(p) for p in plans],
         total=total,
         offset=offset,
         limit=limit,
+        has_more=offset + len(plans) < total,
         filter_status=status_filter,
     )
 
@@ -233,27 +173,28 @@ async def update_plan(
         )
 
     changes = {}
+    fields = {}
 
     if request.title is not None:
         changes["title"] = {"old": plan.title, "new": request.title}
-        plan.title = request.title
+        fields["title"] = request.title
 
     if request.description is not None:
         changes["description"] = {"old": plan.description, "new": request.description}
-        plan.description = request.description
-
-    if request.steps is not None:
-        changes["steps"] = {"count": len(request.steps)}
-        await plan_manager.set_steps(plan_id, request.steps)
-        # Reload plan after step update
-        plan = await plan_manager.get_plan(plan_id)
+        fields["description"] = request.description
 
     if request.metadata is not None:
         changes["metadata"] = request.metadata
-        plan.metadata.update(request.metadata)
+        fields["metadata"] = {**plan.metadata, **request.metadata}
 
-    # Save changes
-    await plan_manager._save_plan(plan)
+    if request.steps is not None:
+        changes["steps"] = {"count": len(request.steps)}
+        await plan_manager.set_steps(plan.id, request.steps)
+
+    # Save changes field by field, leaving concurrent step progress intact
+    if fields:
+        await plan_manager.update_plan(plan.id, **fields)
+    plan = await plan_manager.get_plan(plan.id)
 
     # Record history
     await _add_history_entry(
@@ -311,13 +252,8 @@ async def delete_plan(
             detail="Cannot delete a plan that is currently executing. Pause or cancel it first.",
         )
 
-    # Delete plan from Redis
-    await redis.delete(f"plan:{plan_id}")
-    await redis.delete(f"plan:{plan_id}:history")
-
-    # Remove from conversation active plan reference
-    if plan.conversation_id:
-        await redis.delete(f"conversation:{plan.conversation_id}:active_plan")
+    # Delete plan, its history and index entries
+    await plan_manager.delete_plan(plan.id)
 
     logger.info(
         "Plan deleted",
@@ -12,17 +12,22 @@ import uuid
 from datetime import datetime, timezone
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ai_core import get_logger
+from ai_core import get_git_service, get_logger
 from database.models import Domain, Project
 
 from ..database import get_db_session
 from ..dependencies import CurrentUserDep, GitHubServiceDep
+from ..services.file_tree import (
+    get_file_tree_cache,
+    is_binary_file,
+    search_tree,
+)
 from ..services.github_service import GitHubService
 from ..schemas.workspace import (
     DeployHistoryEntry,
@@ -71,20 +76,6 @@ logger = get_logger(__name__)
 
 router = APIRouter(prefix="/projects/{project_id}", tags=["Workspace"])
 
-# File extensions considered binary
-BINARY_EXTENSIONS = {
-    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".ico", ".bmp", ".tiff",
-    ".mp3", ".mp4", ".wav", ".ogg", ".webm", ".avi", ".mov",
-    ".zip", ".tar", ".gz", ".bz2", ".7z", ".rar",
-    ".pdf", ".doc", ".docx", ".xls", ".xlsx",
-    ".exe", ".dll", ".so", ".dylib",
-    ".woff", ".woff2", ".ttf", ".eot", ".otf",
-    ".sqlite", ".db",
-}
-
-# Always hidden directories
-ALWAYS_HIDDEN = {".git", "node_modules", "__pycache__", ".next", ".venv", "venv"}
-
 # Max file sizes
 MAX_READ_SIZE = 5 * 1024 * 1024  # 5MB
 MAX_WRITE_SIZE = 2 * 1024 * 1024  # 2MB
@@ -172,49 +163,6 @@ def validate_path(root_path: str, relative_path: str) -> str:
     return resolved
 
 
-def is_binary_file(filepath: str) -> bool:
-    """Check if a file is binary based on extension."""
-    ext = os.path.splitext(filepath)[1].lower()
-    return ext in BINARY_EXTENSIONS
-
-
-def parse_gitignore(root_path: str) -> list[str]:
-    """Parse .gitignore patterns from project root."""
-    gitignore_path = os.path.join(root_path, ".gitignore")
-    patterns = []
-    if os.path.isfile(gitignore_path):
-        try:
-            with open(gitignore_path, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith("#"):
-                        patterns.append(line)
-        except (OSError, UnicodeDecodeError):
-            pass
-    return patterns
-
-
-def should_hide(name: str, is_dir: bool, gitignore_patterns: list[str], show_hidden: bool) -> bool:
-    """Determine if a file/directory should be hidden."""
-    if name in ALWAYS_HIDDEN:
-        return True
-
-    if not show_hidden:
-        # Hide dotfiles
-        if name.startswith("."):
-            return True
-
-        # Check gitignore patterns (simple matching)
-        for pattern in gitignore_patterns:
-            pattern_clean = pattern.rstrip("/")
-            if pattern.endswith("/") and is_dir and name == pattern_clean:
-                return True
-            if name == pattern_clean:
-                return True
-
-    return False
-
-
 def get_language(filepath: str) -> str | None:
     """Detect language from file extension."""
     ext = os.path.splitext(filepath)[1].lower()
@@ -227,85 +175,10 @@ def get_language(filepath: str) -> str | None:
     return EXTENSION_LANGUAGES.get(ext)
 
 
-def build_file_tree(
-    root_path: str,
-    base_path: str,
-    depth: int,
-    max_depth: int,
-    gitignore_patterns: list[str],
-    show_hidden: bool,
-) -> list[FileNode]:
-    """Recursively build a file tree."""
-    if depth > max_depth:
-        return []
-
-    nodes = []
-    try:
-        entries = sorted(os.scandir(base_path), key=lambda e: (not e.is_dir(), e.name.lower()))
-    except PermissionError:
-        return []
-
-    for entry in entries:
-        if should_hide(entry.name, entry.is_dir(), gitignore_patterns, show_hidden):
-            continue
-
-        rel_path = os.path.relpath(entry.path, root_path)
-
-        if entry.is_dir(follow_symlinks=False):
-            children = None
-            if depth < max_depth:
-                children = build_file_tree(
-                    root_path, entry.path, depth + 1, max_depth, gitignore_patterns, show_hidden
-                )
-
-            nodes.append(FileNode(
-                name=entry.name,
-                path=rel_path,
-                type=FileNodeType.DIRECTORY,
-                children=children,
-            ))
-        elif entry.is_file(follow_symlinks=False):
-            try:
-                stat = entry.stat()
-                nodes.append(FileNode(
-                    name=entry.name,
-                    path=rel_path,
-                    type=FileNodeType.FILE,
-                    size=stat.st_size,
-                    modified_at=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc).isoformat(),
-                    is_binary=is_binary_file(entry.name),
-                ))
-            except OSError:
-                continue
-
-    return nodes
-
-
 async def run_git_command(cwd: str, *args: str, check: bool = True) -> subprocess.CompletedProcess:
-    """Run a git command asynchronously."""
-    cmd = ["git"] + list(args)
+    """Run a git command asynchronously (uncached; writes invalidate cached git state)."""
     try:
-        proc = await asyncio.create_subprocess_exec(
-            *cmd,
-            cwd=cwd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, stderr = await proc.communicate()
-
-        result = subprocess.CompletedProcess(
-            args=cmd,
-            returncode=proc.returncode or 0,
-            stdout=stdout.decode("utf-8", errors="replace"),
-            stderr=stderr.decode("utf-8", errors="replace"),
-        )
-
-        if check and result.returncode != 0:
-            raise subprocess.CalledProcessError(
-                result.returncode, cmd, result.stdout, result.stderr
-            )
-
-        return result
+        return await get_git_service().get(cwd).run(*args, check=check)
     except FileNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -393,12 +266,20 @@ def _parse_hook_failures(stderr: str) -> list[HookFailure]:
 async def list_files(
     project_id: str,
     current_user: CurrentUserDep,
+    response: Response,
     db: AsyncSession = Depends(get_db_session),
     path: str = Query("", description="Subdirectory path to list"),
     depth: int = Query(3, ge=1, le=10, description="Max tree depth"),
     show_hidden: bool = Query(False, description="Show hidden files"),
-) -> FileTreeResponse:
-    """Get the directory tree for a project."""
+    if_none_match: str | None = Header(None),
+) -> FileTreeResponse | Response:
+    """
+    Get the directory tree for a project.
+
+    Served from the project's cached tree. Directories below ``depth`` come
+    back with ``children: null`` and are expanded by requesting them as
+    ``path``. Responses carry an ETag; a matching If-None-Match gets 304.
+    """
     project = await get_project_with_root(project_id, current_user, db)
     base_path = validate_path(project.root_path, path)
 
@@ -408,12 +289,25 @@ async def list_files(
             detail=f"Directory not found: {path}",
         )
 
-    gitignore_patterns = parse_gitignore(project.root_path)
-    nodes = build_file_tree(
-        project.root_path, base_path, 1, depth, gitignore_patterns, show_hidden
-    )
+    tree = await get_file_tree_cache().get(project_id, project.root_path)
+    rel_path = os.path.relpath(base_path, tree.root_path) if path else ""
 
-    return FileTreeResponse(root=path or ".", nodes=nodes)
+    # Without a watcher, rendering is what refreshes stale listings
+    nodes = None if tree.watched else tree.list_dir(rel_path, depth, show_hidden)
+    etag = tree.etag(rel_path, depth, show_hidden)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if if_none_match and etag in {tag.strip() for tag in if_none_match.split(",")}:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if nodes is None:
+        nodes = tree.list_dir(rel_path, depth, show_hidden)
+
+    response.headers.update(headers)
+    return FileTreeResponse(
+        root=path or ".",
+        nodes=[FileNode.model_validate(node) for node in nodes or []],
+    )
 
 
 @router.get("/files/content", response_model=None)
@@ -509,6 +403,7 @@ async def write_file_content(
     with open(filepath, "w", encoding="utf-8") as f:
         f.write(request.content)
 
+    get_file_tree_cache().invalidate(project_id, path)
     logger.info("File written", project_id=project_id, path=path, size=len(content_bytes))
 
     return FileContentResponse(
@@ -542,6 +437,7 @@ async def create_file(
 
     if is_directory:
         os.makedirs(filepath, exist_ok=True)
+        get_file_tree_cache().invalidate(project_id, path)
         return FileNode(
             name=os.path.basename(filepath),
             path=path,
@@ -555,6 +451,7 @@ async def create_file(
         with open(filepath, "w", encoding="utf-8") as f:
             f.write(content)
 
+        get_file_tree_cache().invalidate(project_id, path)
         stat = os.stat(filepath)
         return FileNode(
             name=os.path.basename(filepath),
@@ -594,6 +491,7 @@ async def delete_file(
     else:
         os.remove(filepath)
 
+    get_file_tree_cache().invalidate(project_id, path)
     logger.info("File deleted", project_id=project_id, path=path)
     return {"message": f"Deleted: {path}"}
 
@@ -625,6 +523,7 @@ async def rename_file(
     # Ensure destination parent exists
     os.makedirs(os.path.dirname(new_filepath), exist_ok=True)
     os.rename(old_filepath, new_filepath)
+    get_file_tree_cache().invalidate(project_id, request.old_path, request.new_path)
 
     is_dir = os.path.isdir(new_filepath)
     stat = os.stat(new_filepath)
@@ -648,97 +547,21 @@ async def search_files(
     glob_pattern: str = Query("*", alias="glob", description="File glob pattern"),
     max_results: int = Query(100, ge=1, le=500),
 ) -> FileSearchResponse:
-    """Search across project files using grep."""
+    """Search across project files, skipping anything the project ignores."""
     project = await get_project_with_root(project_id, current_user, db)
+    tree = await get_file_tree_cache().get(project_id, project.root_path)
 
-    # Use grep for searching (--null separates filename with NUL byte for safe parsing)
-    cmd = [
-        "grep", "-rn", "--null", "--include", glob_pattern,
-        "-B", "1", "-A", "1",
-        "--max-count", "10",  # Max matches per file
-        q, project.root_path,
-    ]
-
-    # Add exclusions
-    for hidden in ALWAYS_HIDDEN:
-        cmd.insert(3, f"--exclude-dir={hidden}")
-
-    # Exclude .env files from search
-    cmd.insert(3, "--exclude=.env*")
-
-    try:
-        proc = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=10.0)
-        output = stdout.decode("utf-8", errors="replace")
-    except (asyncio.TimeoutError, FileNotFoundError):
-        return FileSearchResponse(query=q, matches=[], total_matches=0, files_searched=0)
-
-    # Parse grep output (--null produces "filename\0linenum:content" for matches
-    # and "filename\0linenum-content" for context lines)
-    matches: list[FileSearchResult] = []
-    files_seen: set[str] = set()
-    current_match: dict | None = None
-
-    for line in output.split("\n"):
-        if not line or line == "--":
-            if current_match:
-                matches.append(FileSearchResult(**current_match))
-                current_match = None
-            continue
-
-        # Split on NUL byte to safely extract filename
-        if "\x00" in line:
-            filepath, rest = line.split("\x00", 1)
-        else:
-            # Fallback for lines without NUL (shouldn't happen with --null)
-            continue
-
-        # Parse "linenum:content" (match) or "linenum-content" (context)
-        # Match lines use ":" separator, context lines use "-"
-        match_sep = re.match(r'^(\d+)([:=-])(.*)', rest, re.DOTALL)
-        if not match_sep:
-            continue
-
-        line_num_str, separator, content = match_sep.group(1), match_sep.group(2), match_sep.group(3)
-        line_num = int(line_num_str)
-        rel_path = os.path.relpath(filepath, project.root_path)
-
-        if separator == ":":
-            # This is a match line
-            files_seen.add(rel_path)
-
-            if current_match:
-                matches.append(FileSearchResult(**current_match))
-
-            current_match = {
-                "path": rel_path,
-                "line_number": line_num,
-                "line_content": content,
-                "context_before": [],
-                "context_after": [],
-            }
-
-            if len(matches) >= max_results:
-                break
-        elif separator == "-" and current_match:
-            # Context line — determine if before or after current match
-            if line_num < current_match["line_number"]:
-                current_match["context_before"].append(content)
-            else:
-                current_match["context_after"].append(content)
-
-    if current_match:
-        matches.append(FileSearchResult(**current_match))
+    # Reads file contents, so keep it off the event loop
+    results, files_matched = await asyncio.to_thread(
+        search_tree, tree, q, glob_pattern, max_results
+    )
+    matches = [FileSearchResult(**result) for result in results]
 
     return FileSearchResponse(
         query=q,
-        matches=matches[:max_results],
+        matches=matches,
         total_matches=len(matches),
-        files_searched=len(files_seen),
+        files_searched=files_matched,
     )
 
 
@@ -782,80 +605,46 @@ async def git_status(
             detail="Git is not initialized in this project. Run 'git init' first.",
         )
 
-    # Get branch name
+    # Branch, upstream tracking and file status in one cached call
+    repo = get_git_service().get(project.root_path)
     try:
-        branch_result = await run_git_command(
-            project.root_path, "rev-parse", "--abbrev-ref", "HEAD"
+        git_state = await repo.status()
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Git is not installed on this server",
+        )
+    except subprocess.CalledProcessError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"git status failed: {e.stderr.strip()}",
         )
-        branch = branch_result.stdout.strip()
-    except subprocess.CalledProcessError:
-        branch = None
-
-    # Get status
-    status_result = await run_git_command(
-        project.root_path, "status", "--porcelain", check=False
-    )
 
     modified = []
-    untracked = []
+    untracked = list(git_state.untracked)
     staged = []
 
-    for line in status_result.stdout.strip().split("\n"):
-        if not line or len(line) < 4:
-            continue
-        # Git porcelain format: XY <space> <path>
-        # X = index status, Y = worktree status, position 2 = space, position 3+ = path
-        index_status = line[0]
-        work_status = line[1]
-        # Find the path - it starts after "XY " (positions 0, 1, 2)
-        # But handle edge cases where there might be extra spaces
-        filepath = line[3:].lstrip() if len(line) > 3 else ""
-
-        if not filepath:
-            continue
-
-        # Handle renames (format: "old -> new")
-        if " -> " in filepath:
-            filepath = filepath.split(" -> ")[1]
-
-        if index_status in ("M", "A", "D", "R"):
+    for entry in git_state.entries:
+        if entry.index_status in ("M", "A", "D", "R"):
             staged.append(GitFileStatus(
-                path=filepath,
-                status={"M": "modified", "A": "added", "D": "deleted", "R": "renamed"}[index_status],
+                path=entry.path,
+                status={"M": "modified", "A": "added", "D": "deleted", "R": "renamed"}[entry.index_status],
             ))
 
-        if work_status == "M":
-            modified.append(GitFileStatus(path=filepath, status="modified"))
-        elif work_status == "D":
-            modified.append(GitFileStatus(path=filepath, status="deleted"))
-        elif index_status == "?" and work_status == "?":
-            untracked.append(filepath)
-
-    # Check ahead/behind
-    ahead = 0
-    behind = 0
-    has_remote = False
-    try:
-        remote_result = await run_git_command(
-            project.root_path, "rev-list", "--left-right", "--count", f"HEAD...@{{upstream}}"
-        )
-        parts = remote_result.stdout.strip().split("\t")
-        if len(parts) == 2:
-            ahead = int(parts[0])
-            behind = int(parts[1])
-            has_remote = True
-    except (subprocess.CalledProcessError, ValueError):
-        pass
+        if entry.worktree_status == "M":
+            modified.append(GitFileStatus(path=entry.path, status="modified"))
+        elif entry.worktree_status == "D":
+            modified.append(GitFileStatus(path=entry.path, status="deleted"))
 
     return GitStatusResponse(
-        branch=branch,
+        branch=git_state.branch,
         is_clean=not modified and not untracked and not staged,
         modified=modified,
         untracked=untracked,
         staged=staged,
-        ahead=ahead,
-        behind=behind,
-        has_remote=has_remote,
+        ahead=git_state.ahead,
+        behind=git_state.behind,
+        has_remote=git_state.has_upstream,
     )
 
 
@@ -1208,9 +997,9 @@ async def git_log(
     """Get recent commit history."""
     project = await get_project_with_root(project_id, current_user, db)
 
+    repo = get_git_service().get(project.root_path)
     try:
-        result = await run_git_command(
-            project.root_path,
+        result = await repo.query(
             "log",
             f"-{limit}",
             "--format=%H|%h|%s|%an|%aI|%+",
@@ -1250,14 +1039,7 @@ async def git_log(
             entries.append(entry)
         i += 1
 
-    # Get current branch
-    try:
-        branch_result = await run_git_command(
-            project.root_path, "rev-parse", "--abbrev-ref", "HEAD"
-        )
-        branch = branch_result.stdout.strip()
-    except subprocess.CalledProcessError:
-        branch = None
+    branch = await repo.current_branch()
 
     return GitLogResponse(entries=entries, branch=branch)
 
@@ -1271,17 +1053,16 @@ async def git_diff(
     """Get diff of uncommitted changes."""
     project = await get_project_with_root(project_id, current_user, db)
 
-    # Get both staged and unstaged diff
-    result = await run_git_command(
-        project.root_path, "diff", "HEAD", check=False
+    # Get both staged and unstaged diff (cached until files change)
+    repo = get_git_service().get(project.root_path)
+    result, stat_result = await asyncio.gather(
+        repo.query("diff", "HEAD", worktree=True, check=False),
+        repo.query("diff", "HEAD", "--stat", worktree=True, check=False),
     )
 
     diff_text = result.stdout
 
     # Parse stats
-    stat_result = await run_git_command(
-        project.root_path, "diff", "HEAD", "--stat", check=False
-    )
 
     files_changed = 0
     insertions = 0
@@ -1326,18 +1107,20 @@ async def git_file_content(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid path")
 
-    # Use git show to get file content at ref
+    # Read the blob through the repository's persistent cat-file worker
     try:
-        result = await run_git_command(
-            project.root_path, "show", f"{ref}:{path.lstrip('/')}", check=True
+        data = await get_git_service().get(project.root_path).read_object(
+            f"{ref}:{path.lstrip('/')}"
         )
-        content = result.stdout
     except Exception:
+        data = None
+    if data is None:
         # File might not exist at this ref (new file)
         raise HTTPException(
             status_code=404,
             detail=f"File not found at ref '{ref}'"
         )
+    content = data.decode("utf-8", errors="replace")
 
     return GitFileContentResponse(
         content=content,
@@ -1360,13 +1143,8 @@ async def list_branches(
     project = await get_project_with_root(project_id, current_user, db)
 
     # Get current branch
-    try:
-        current_result = await run_git_command(
-            project.root_path, "rev-parse", "--abbrev-ref", "HEAD"
-        )
-        current = current_result.stdout.strip()
-    except subprocess.CalledProcessError:
-        current = "main"
+    repo = get_git_service().get(project.root_path)
+    current = await repo.current_branch() or "main"
 
     branches: list[Branch] = []
 
@@ -1376,7 +1154,7 @@ async def list_branches(
         args.insert(1, "-a")
 
     try:
-        result = await run_git_command(project.root_path, *args)
+        result = await repo.query(*args)
         for line in result.stdout.strip().split("\n"):
             if not line:
                 continue
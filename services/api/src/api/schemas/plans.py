@@ -181,6 +181,7 @@ class PlanListResponse(BaseModel):
     total: int
     offset: int
     limit: int
+    has_more: bool = False
     filter_status: str | None = None
 
 
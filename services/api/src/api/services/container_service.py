@@ -6,10 +6,12 @@ Handles:
 - Container lifecycle (create, start, stop, remove)
 - Executing commands in containers
 - Container health monitoring
+
+Lifecycle, exec and inspection calls use the Docker Engine API over the
+daemon socket; image builds still go through ``docker build``.
 """
 
 import asyncio
-import json
 import os
 from dataclasses import dataclass
 from enum import Enum
@@ -17,12 +19,16 @@ from pathlib import Path
 from typing import Any
 
 from ai_core import get_logger
+from ai_core.docker_client import DockerAPIError, get_docker_client
 
 logger = get_logger(__name__)
 
 DOCKER_TEMPLATES_PATH = Path("/home/wyld-core/infrastructure/docker/templates")
 WYLD_NETWORK = "wyld-projects"
 
+# Default limit for commands run in a project container
+EXEC_TIMEOUT = 300.0
+
 
 class ProjectType(str, Enum):
     NODE = "node"
@@ -63,30 +69,35 @@ class ContainerConfig:
     env_vars: dict[str, str] | None = None
 
 
+_MEMORY_UNITS = {"b": 1, "k": 1024, "m": 1024**2, "g": 1024**3}
+
+
+def _parse_memory(limit: str) -> int:
+    """Convert a ``--memory`` style limit (``2g``, ``512m``) to bytes."""
+    value = limit.strip().lower()
+    unit = _MEMORY_UNITS.get(value[-1:])
+    if unit:
+        return int(float(value[:-1]) * unit)
+    return int(value)
+
+
 class ContainerService:
     """Manages Docker containers for Wyld projects."""
 
     def __init__(self):
         self._network_ensured = False
 
-    def _ensure_network_sync(self) -> None:
-        """Ensure the Wyld Docker network exists (synchronous version)."""
+    async def _ensure_network(self) -> None:
+        """Ensure the Wyld Docker network exists."""
         if self._network_ensured:
             return
 
         try:
-            import subprocess
-            result = subprocess.run(
-                ["docker", "network", "inspect", WYLD_NETWORK],
-                capture_output=True,
-            )
-            if result.returncode != 0:
-                subprocess.run(
-                    ["docker", "network", "create", WYLD_NETWORK],
-                    capture_output=True,
-                )
+            client = get_docker_client()
+            if not await client.network_exists(WYLD_NETWORK):
+                await client.create_network(WYLD_NETWORK)
             self._network_ensured = True
-        except Exception as e:
+        except (DockerAPIError, OSError) as e:
             logger.warning(f"Failed to ensure Docker network: {e}")
 
     async def _run_command(
@@ -134,14 +145,12 @@ class ContainerService:
         """Get the current status of a project's container."""
         container_name = self._get_container_name(project_id)
 
-        result = await self._run_command([
-            "docker", "inspect", "-f", "{{.State.Status}}", container_name
-        ])
-
-        if result["returncode"] != 0:
+        try:
+            info = await get_docker_client().inspect_container(container_name)
+        except (DockerAPIError, OSError):
             return ContainerStatus.NOT_FOUND
 
-        status = result["stdout"].strip()
+        status = info.get("State", {}).get("Status", "")
         if status == "running":
             return ContainerStatus.RUNNING
         elif status in ("exited", "created"):
@@ -195,23 +204,32 @@ class ContainerService:
     async def create_container(self, config: ContainerConfig) -> dict[str, Any]:
         """Create a container for the project."""
         # Ensure Docker network exists
-        self._ensure_network_sync()
+        await self._ensure_network()
 
         container_name = self._get_container_name(config.project_id)
         image_name = self._get_image_name(config.project_id)
+        client = get_docker_client()
 
         # Check if image exists, build if not
-        result = await self._run_command(["docker", "image", "inspect", image_name])
-        if result["returncode"] != 0:
+        try:
+            image_exists = await client.image_exists(image_name)
+        except (DockerAPIError, OSError) as e:
+            return {"success": False, "error": str(e)}
+        if not image_exists:
             build_result = await self.build_image(config)
             if not build_result.get("success"):
                 return build_result
 
         # Remove existing container if any
-        await self._run_command(["docker", "rm", "-f", container_name])
+        try:
+            await client.remove_container(container_name, force=True)
+        except DockerAPIError as e:
+            if e.docker_status != 404:
+                return {"success": False, "error": str(e)}
+        except OSError as e:
+            return {"success": False, "error": str(e)}
 
         # Build environment variables
-        env_args = []
         base_env = {
             "PAI_PROJECT_ID": config.project_id,
             "PAI_PROJECT_NAME": config.project_name,
@@ -221,82 +239,81 @@ class ContainerService:
         if config.env_vars:
             base_env.update(config.env_vars)
 
-        for key, value in base_env.items():
-            env_args.extend(["-e", f"{key}={value}"])
-
         # Build port mappings
-        port_args = []
-        if config.expose_ports:
-            for port in config.expose_ports:
-                port_args.extend(["-p", f"{port}:{port}"])
-
-        cmd = [
-            "docker", "create",
-            "--name", container_name,
-            "--network", WYLD_NETWORK,
-            # Mount project directory
-            "-v", f"{config.root_path}:/app",
-            # Mount Claude CLI credentials (read-write needed for session state)
-            "-v", "/home/wyld-api/.claude:/home/wyld/.claude",
-            # Resource limits
-            "--memory", config.memory_limit,
-            "--cpus", config.cpu_limit,
-            # Allow access to host services
-            "--add-host", "host.docker.internal:host-gateway",
-            # Environment
-            *env_args,
-            # Ports
-            *port_args,
-            # Labels
-            "--label", f"wyld.project.id={config.project_id}",
-            "--label", f"wyld.project.type={config.project_type.value}",
-            # Image
-            image_name,
-        ]
+        exposed_ports: dict[str, dict] = {}
+        port_bindings: dict[str, list[dict[str, str]]] = {}
+        for port in config.expose_ports or []:
+            exposed_ports[f"{port}/tcp"] = {}
+            port_bindings[f"{port}/tcp"] = [{"HostPort": str(port)}]
+
+        container_config = {
+            "Image": image_name,
+            "Env": [f"{key}={value}" for key, value in base_env.items()],
+            "ExposedPorts": exposed_ports,
+            "Labels": {
+                "wyld.project.id": config.project_id,
+                "wyld.project.type": config.project_type.value,
+            },
+            "HostConfig": {
+                "NetworkMode": WYLD_NETWORK,
+                "Binds": [
+                    # Mount project directory
+                    f"{config.root_path}:/app",
+                    # Mount Claude CLI credentials (read-write needed for session state)
+                    "/home/wyld-api/.claude:/home/wyld/.claude",
+                ],
+                # Resource limits
+                "Memory": _parse_memory(config.memory_limit),
+                "NanoCpus": int(float(config.cpu_limit) * 1e9),
+                # Allow access to host services
+                "ExtraHosts": ["host.docker.internal:host-gateway"],
+                "PortBindings": port_bindings,
+            },
+        }
 
         logger.info(f"Creating container: {container_name}", project_id=config.project_id)
-        result = await self._run_command(cmd)
+        try:
+            await client.create_container(container_name, container_config)
+        except (DockerAPIError, OSError) as e:
+            return {"success": False, "error": str(e)}
 
-        if result["returncode"] == 0:
-            return {"success": True, "container": container_name}
-        else:
-            return {"success": False, "error": result["stderr"]}
+        return {"success": True, "container": container_name}
 
     async def start_container(self, project_id: str) -> dict[str, Any]:
         """Start a project's container."""
         container_name = self._get_container_name(project_id)
 
-        result = await self._run_command(["docker", "start", container_name])
+        try:
+            await get_docker_client().start_container(container_name)
+        except (DockerAPIError, OSError) as e:
+            return {"success": False, "error": str(e)}
 
-        if result["returncode"] == 0:
-            logger.info(f"Container started: {container_name}")
-            return {"success": True}
-        else:
-            return {"success": False, "error": result["stderr"]}
+        logger.info(f"Container started: {container_name}")
+        return {"success": True}
 
     async def stop_container(self, project_id: str) -> dict[str, Any]:
         """Stop a project's container."""
         container_name = self._get_container_name(project_id)
 
-        result = await self._run_command(["docker", "stop", container_name])
+        try:
+            await get_docker_client().stop_container(container_name)
+        except (DockerAPIError, OSError) as e:
+            return {"success": False, "error": str(e)}
 
-        if result["returncode"] == 0:
-            logger.info(f"Container stopped: {container_name}")
-            return {"success": True}
-        else:
-            return {"success": False, "error": result["stderr"]}
+        logger.info(f"Container stopped: {container_name}")
+        return {"success": True}
 
     async def remove_container(self, project_id: str) -> dict[str, Any]:
         """Remove a project's container."""
         container_name = self._get_container_name(project_id)
 
-        result = await self._run_command(["docker", "rm", "-f", container_name])
+        try:
+            await get_docker_client().remove_container(container_name, force=True)
+        except (DockerAPIError, OSError) as e:
+            return {"success": False, "error": str(e)}
 
-        if result["returncode"] == 0:
-            logger.info(f"Container removed: {container_name}")
-            return {"success": True}
-        else:
-            return {"success": False, "error": result["stderr"]}
+        logger.info(f"Container removed: {container_name}")
+        return {"success": True}
 
     async def exec_command(
         self,
@@ -304,33 +321,32 @@ class ContainerService:
         command: list[str],
         user: str = "wyld",
         workdir: str = "/app",
+        timeout: float = EXEC_TIMEOUT,
     ) -> dict[str, Any]:
         """Execute a command in the project's container."""
         container_name = self._get_container_name(project_id)
 
-        cmd = [
-            "docker", "exec",
-            "-u", user,
-            "-w", workdir,
-            container_name,
-            *command,
-        ]
+        try:
+            returncode, stdout, stderr = await get_docker_client().exec(
+                container_name, command, user=user, workdir=workdir, timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            return {"returncode": -1, "stdout": "", "stderr": f"Command timed out after {timeout}s"}
+        except (DockerAPIError, OSError) as e:
+            return {"returncode": -1, "stdout": "", "stderr": str(e)}
 
-        return await self._run_command(cmd)
+        return {"returncode": returncode, "stdout": stdout, "stderr": stderr}
 
     async def get_container_info(self, project_id: str) -> dict[str, Any]:
         """Get detailed information about a project's container."""
         container_name = self._get_container_name(project_id)
 
-        result = await self._run_command([
-            "docker", "inspect", container_name
-        ])
-
-        if result["returncode"] != 0:
+        try:
+            info = await get_docker_client().inspect_container(container_name)
+        except (DockerAPIError, OSError):
             return {"exists": False}
 
         try:
-            info = json.loads(result["stdout"])[0]
             return {
                 "exists": True,
                 "status": info["State"]["Status"],
@@ -341,7 +357,7 @@ class ContainerService:
                 "cpu_limit": info["HostConfig"]["NanoCpus"],
                 "mounts": [m["Source"] for m in info["Mounts"]],
             }
-        except (json.JSONDecodeError, KeyError, IndexError):
+        except KeyError:
             return {"exists": False, "error": "Failed to parse container info"}
 
     async def get_container_logs(
@@ -352,11 +368,12 @@ class ContainerService:
         """Get recent logs from a project's container."""
         container_name = self._get_container_name(project_id)
 
-        result = await self._run_command([
-            "docker", "logs", "--tail", str(tail), container_name
-        ])
+        try:
+            stdout, stderr = await get_docker_client().logs(container_name, tail=tail)
+        except (DockerAPIError, OSError) as e:
+            return str(e)
 
-        return result["stdout"] + result["stderr"]
+        return stdout + stderr
 
 
 # Global instance
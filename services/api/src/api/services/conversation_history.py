@@ -0,0 +1,89 @@
+"""
+PostgreSQL side of the conversation history kept in Redis.
+
+Messages are appended to Redis by ``ai_messaging.ConversationHistory`` and
+written through to the ``messages`` table in the background; when Redis
+has no history for a conversation it is reloaded from the table.
+"""
+
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from ai_messaging import ConversationHistory, RedisClient
+
+from ..database import db_session_context
+
+_history: ConversationHistory | None = None
+
+
+async def load_messages(conversation_id: str, limit: int) -> list[dict[str, Any]]:
+    """The newest ``limit`` stored messages of a conversation, oldest first."""
+    from database.models import Message
+
+    async with db_session_context() as session:
+        result = await session.execute(
+            select(Message)
+            .where(Message.conversation_id == conversation_id)
+            .order_by(Message.created_at.desc())
+            .limit(limit)
+        )
+        rows = list(reversed(result.scalars().all()))
+
+    return [
+        {
+            "id": msg.id,
+            "user_id": msg.user_id,
+            "role": msg.role,
+            "content": msg.content,
+            "agent": msg.agent,
+            "timestamp": msg.created_at.isoformat() if msg.created_at else "",
+        }
+        for msg in rows
+    ]
+
+
+async def persist_message(message: dict[str, Any]) -> None:
+    """
+    Insert an appended message into the messages table.
+
+    A message that is already stored is left as it is, so messages can be
+    persisted again, e.g. when legacy history is backfilled.
+    """
+    from database.models import Message
+
+    created_at = None
+    if message.get("timestamp"):
+        try:
+            created_at = datetime.fromisoformat(message["timestamp"])
+        except ValueError:
+            pass
+        else:
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+
+    values = {
+        "id": message["id"],
+        "conversation_id": message["conversation_id"],
+        "role": message["role"],
+        "content": message["content"],
+        "agent": message.get("agent"),
+        "user_id": message.get("user_id"),
+    }
+    if created_at:
+        values["created_at"] = created_at
+
+    async with db_session_context() as session:
+        await session.execute(
+            insert(Message).values(**values).on_conflict_do_nothing(index_elements=["id"])
+        )
+
+
+def get_conversation_history(redis: RedisClient) -> ConversationHistory:
+    """Get the conversation history store backed by PostgreSQL."""
+    global _history
+    if _history is None:
+        _history = ConversationHistory(redis, loader=load_messages, writer=persist_message)
+    return _history
@@ -0,0 +1,616 @@
+"""
+In-memory workspace file trees.
+
+Each project gets a tree of directory listings that is filled lazily as
+directories are first requested and then kept current from
+ProjectFileWatcher events, so the IDE sidebar no longer rescans the
+project on every request. Only directories whose contents changed are
+rescanned, and each change bumps a version on the directory and its
+ancestors which is used to build ETags for unchanged subtrees.
+
+Ignore handling follows git: nested ``.gitignore`` files apply relative to
+their own directory, deeper files override shallower ones, the last
+matching pattern in a file wins, ``!`` re-includes, and ``.git/info/exclude``
+applies with the lowest precedence.
+
+When watchdog isn't available the tree falls back to rescanning any
+directory listing older than ``UNWATCHED_TTL`` seconds.
+"""
+
+import fnmatch
+import os
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from ai_core import get_git_service, get_logger
+
+from .file_watcher import FileChangeEvent, get_file_watcher_manager
+
+logger = get_logger(__name__)
+
+# Always hidden directories
+ALWAYS_HIDDEN = {".git", "node_modules", "__pycache__", ".next", ".venv", "venv"}
+
+# File extensions considered binary
+BINARY_EXTENSIONS = {
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".ico", ".bmp", ".tiff",
+    ".mp3", ".mp4", ".wav", ".ogg", ".webm", ".avi", ".mov",
+    ".zip", ".tar", ".gz", ".bz2", ".7z", ".rar",
+    ".pdf", ".doc", ".docx", ".xls", ".xlsx",
+    ".exe", ".dll", ".so", ".dylib",
+    ".woff", ".woff2", ".ttf", ".eot", ".otf",
+    ".sqlite", ".db",
+}
+
+# Seconds a listing is trusted when no watcher is running
+UNWATCHED_TTL = 2.0
+
+# Projects kept in memory at once
+MAX_TREES = 32
+
+# Files larger than this are skipped by search
+SEARCH_MAX_FILE_SIZE = 10 * 1024 * 1024
+
+
+def is_binary_file(filepath: str) -> bool:
+    """Check if a file is binary based on extension."""
+    ext = os.path.splitext(filepath)[1].lower()
+    return ext in BINARY_EXTENSIONS
+
+
+# --- gitignore matching ---
+
+
+@dataclass
+class IgnoreRule:
+    """One compiled gitignore pattern."""
+
+    pattern: str
+    regex: re.Pattern[str]
+    negated: bool
+    dir_only: bool
+
+
+def _translate_segment(segment: str) -> str:
+    """Translate one path segment of a gitignore glob to a regex."""
+    out = []
+    i = 0
+    while i < len(segment):
+        char = segment[i]
+        if char == "\\" and i + 1 < len(segment):
+            out.append(re.escape(segment[i + 1]))
+            i += 2
+            continue
+        if char == "*":
+            # A '**' that isn't a whole segment behaves like '*'
+            while i + 1 < len(segment) and segment[i + 1] == "*":
+                i += 1
+            out.append("[^/]*")
+        elif char == "?":
+            out.append("[^/]")
+        elif char == "[":
+            end = segment.find("]", i + 2 if segment[i + 1:i + 2] in ("!", "^") else i + 1)
+            if end == -1:
+                out.append(re.escape(char))
+            else:
+                body = segment[i + 1:end]
+                if body[:1] in ("!", "^"):
+                    body = "^" + body[1:]
+                out.append("[" + body.replace("\\", "\\\\") + "]")
+                i = end
+        else:
+            out.append(re.escape(char))
+        i += 1
+    return "".join(out)
+
+
+def compile_gitignore_pattern(line: str) -> IgnoreRule | None:
+    """Compile a line from a .gitignore file, or None for blanks and comments."""
+    line = line.rstrip("\n").rstrip("\r")
+    # Trailing spaces are ignored unless escaped
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        stripped += " "
+    line = stripped
+
+    if not line or line.startswith("#"):
+        return None
+
+    negated = False
+    if line.startswith("!"):
+        negated = True
+        line = line[1:]
+    elif line.startswith("\\!") or line.startswith("\\#"):
+        line = line[1:]
+
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+
+    # A slash anywhere but the end anchors the pattern to the ignore file's directory
+    anchored = "/" in line
+    line = line.lstrip("/")
+
+    segments = line.split("/")
+    parts = []
+    for index, segment in enumerate(segments):
+        last = index == len(segments) - 1
+        if segment == "**":
+            # Leading/middle '**/' matches zero or more directories, trailing '/**' everything inside
+            parts.append(".*" if last else "(?:[^/]*/)*")
+            continue
+        parts.append(_translate_segment(segment))
+        if not last:
+            parts.append("/")
+
+    regex = "".join(parts)
+    if not anchored:
+        regex = "(?:.*/)?" + regex
+
+    try:
+        compiled = re.compile(regex)
+    except re.error:
+        return None
+    return IgnoreRule(pattern=line, regex=compiled, negated=negated, dir_only=dir_only)
+
+
+class GitIgnore:
+    """Rules from one ignore file, matched against paths relative to its directory."""
+
+    def __init__(self, rules: list[IgnoreRule]):
+        self.rules = rules
+
+    @classmethod
+    def from_lines(cls, lines: list[str]) -> "GitIgnore":
+        rules = [rule for rule in map(compile_gitignore_pattern, lines) if rule is not None]
+        return cls(rules)
+
+    @classmethod
+    def from_file(cls, path: str) -> "GitIgnore | None":
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                ignore = cls.from_lines(f.readlines())
+        except OSError:
+            return None
+        return ignore if ignore.rules else None
+
+    def match(self, rel_path: str, is_dir: bool) -> bool | None:
+        """True if ignored, False if re-included, None if no rule applies."""
+        for rule in reversed(self.rules):
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.regex.fullmatch(rel_path):
+                return not rule.negated
+        return None
+
+
+# --- Tree ---
+
+
+def _normalize(rel_path: str) -> str:
+    """Normalize a project-relative path to the tree's form ('' is the root)."""
+    path = os.path.normpath(rel_path.replace(os.sep, "/")).strip("/")
+    return "" if path == "." else path
+
+
+def _parent(rel_path: str) -> str:
+    return os.path.dirname(_normalize(rel_path))
+
+
+class _Dir:
+    """A directory listing in the cached tree."""
+
+    __slots__ = ("name", "parent", "dirs", "files", "ignore", "loaded", "loaded_at", "version")
+
+    def __init__(self, name: str, parent: "_Dir | None"):
+        self.name = name
+        self.parent = parent
+        self.dirs: dict[str, _Dir] = {}
+        # name -> (size, mtime)
+        self.files: dict[str, tuple[int, float]] = {}
+        self.ignore: GitIgnore | None = None
+        self.loaded = False
+        self.loaded_at = 0.0
+        self.version = 0
+
+
+class ProjectFileTree:
+    """Lazily loaded, incrementally patched file tree for one project."""
+
+    def __init__(self, project_id: str, root_path: str):
+        self.project_id = project_id
+        self.root_path = os.path.realpath(root_path)
+        # Distinguishes ETags across tree rebuilds and API restarts
+        self.tree_id = uuid.uuid4().hex[:8]
+        self.watched = False
+        self._root = _Dir("", None)
+        self._lock = threading.RLock()
+        self._counter = 0
+        self._ignore_version = 0
+        self._info_exclude = GitIgnore.from_file(
+            os.path.join(self.root_path, ".git", "info", "exclude")
+        )
+
+    # Lookup and loading
+
+    def _abs(self, rel_path: str) -> str:
+        return os.path.join(self.root_path, rel_path) if rel_path else self.root_path
+
+    @staticmethod
+    def _rel(node: _Dir) -> str:
+        parts = []
+        while node.parent is not None:
+            parts.append(node.name)
+            node = node.parent
+        return "/".join(reversed(parts))
+
+    def _find(self, rel_path: str) -> _Dir | None:
+        """Look up an already loaded directory without touching the disk."""
+        node = self._root
+        for part in filter(None, rel_path.split("/")):
+            if not node.loaded:
+                return None
+            node = node.dirs.get(part)
+            if node is None:
+                return None
+        return node
+
+    def _get(self, rel_path: str) -> _Dir | None:
+        """Look up a directory, loading listings along the way."""
+        node = self._root
+        for part in filter(None, rel_path.split("/")):
+            self._ensure_fresh(node)
+            node = node.dirs.get(part)
+            if node is None:
+                return None
+        self._ensure_fresh(node)
+        return node
+
+    def _ensure_fresh(self, node: _Dir) -> None:
+        if not node.loaded:
+            self._scan(node)
+        elif not self.watched and time.monotonic() - node.loaded_at > UNWATCHED_TTL:
+            self._scan(node)
+
+    def _scan(self, node: _Dir) -> None:
+        """(Re)read one directory listing, keeping unchanged child directories."""
+        path = self._abs(self._rel(node))
+        dirs: dict[str, _Dir] = {}
+        files: dict[str, tuple[int, float]] = {}
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.name in ALWAYS_HIDDEN:
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            dirs[entry.name] = node.dirs.get(entry.name) or _Dir(entry.name, node)
+                        elif entry.is_file(follow_symlinks=False):
+                            stat = entry.stat(follow_symlinks=False)
+                            files[entry.name] = (stat.st_size, stat.st_mtime)
+                    except OSError:
+                        continue
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            pass
+
+        changed = dirs.keys() != node.dirs.keys() or files != node.files
+        if files.get(".gitignore") != node.files.get(".gitignore") or not node.loaded:
+            node.ignore = (
+                GitIgnore.from_file(os.path.join(path, ".gitignore"))
+                if ".gitignore" in files
+                else None
+            )
+            if node.loaded:
+                # Rules apply to the whole subtree, so every ETag below changes
+                self._ignore_version += 1
+
+        was_loaded = node.loaded
+        node.dirs = dirs
+        node.files = files
+        node.loaded = True
+        node.loaded_at = time.monotonic()
+
+        if changed and was_loaded:
+            self._bump(node)
+
+    def _bump(self, node: _Dir | None) -> None:
+        self._counter += 1
+        while node is not None:
+            node.version = self._counter
+            node = node.parent
+
+    # Ignore rules
+
+    def _is_ignored(self, parent: _Dir, name: str, is_dir: bool) -> bool:
+        rel = name
+        node: _Dir | None = parent
+        while node is not None:
+            if node.ignore is not None:
+                result = node.ignore.match(rel, is_dir)
+                if result is not None:
+                    return result
+            if node.parent is not None:
+                rel = f"{node.name}/{rel}"
+            node = node.parent
+        if self._info_exclude is not None:
+            return bool(self._info_exclude.match(rel, is_dir))
+        return False
+
+    def _is_hidden(self, parent: _Dir, name: str, is_dir: bool, show_hidden: bool) -> bool:
+        if show_hidden:
+            return False
+        return name.startswith(".") or self._is_ignored(parent, name, is_dir)
+
+    # Public API
+
+    def list_dir(self, rel_path: str, depth: int, show_hidden: bool) -> list[dict[str, Any]] | None:
+        """
+        Render a directory as FileNode-shaped dicts down to ``depth`` levels.
+
+        Directories below the depth limit have ``children=None`` and are
+        expanded by requesting them as ``rel_path``. Returns None if the
+        directory isn't part of the tree.
+        """
+        with self._lock:
+            rel_path = _normalize(rel_path)
+            node = self._get(rel_path)
+            if node is None:
+                return None
+            return self._render(node, rel_path, 1, depth, show_hidden)
+
+    def _render(
+        self,
+        node: _Dir,
+        rel_path: str,
+        depth: int,
+        max_depth: int,
+        show_hidden: bool,
+    ) -> list[dict[str, Any]]:
+        self._ensure_fresh(node)
+        nodes: list[dict[str, Any]] = []
+
+        for name in sorted(node.dirs, key=str.lower):
+            if self._is_hidden(node, name, True, show_hidden):
+                continue
+            path = f"{rel_path}/{name}" if rel_path else name
+            children = None
+            if depth < max_depth:
+                children = self._render(node.dirs[name], path, depth + 1, max_depth, show_hidden)
+            nodes.append({"name": name, "path": path, "type": "directory", "children": children})
+
+        for name in sorted(node.files, key=str.lower):
+            if self._is_hidden(node, name, False, show_hidden):
+                continue
+            size, mtime = node.files[name]
+            nodes.append({
+                "name": name,
+                "path": f"{rel_path}/{name}" if rel_path else name,
+                "type": "file",
+                "size": size,
+                "modified_at": datetime.fromtimestamp(mtime, tz=timezone.utc).isoformat(),
+                "is_binary": is_binary_file(name),
+            })
+
+        return nodes
+
+    def etag(self, rel_path: str, depth: int, show_hidden: bool) -> str:
+        """Weak ETag for a rendered subtree; changes whenever its content may have."""
+        with self._lock:
+            node = self._get(_normalize(rel_path))
+            version = node.version if node is not None else -1
+            return (
+                f'W/"{self.tree_id}-{version}-{self._ignore_version}-{depth}-{int(show_hidden)}"'
+            )
+
+    def iter_files(self, include_dotfiles: bool = True) -> Iterator[str]:
+        """Yield the relative path of every file not excluded by ignore rules."""
+        stack: list[tuple[str, _Dir]] = [("", self._root)]
+        while stack:
+            rel_path, node = stack.pop()
+            with self._lock:
+                self._ensure_fresh(node)
+                files = [
+                    name for name in node.files
+                    if (include_dotfiles or not name.startswith("."))
+                    and not self._is_ignored(node, name, False)
+                ]
+                dirs = [
+                    (name, child) for name, child in node.dirs.items()
+                    if (include_dotfiles or not name.startswith("."))
+                    and not self._is_ignored(node, name, True)
+                ]
+            for name in sorted(files):
+                yield f"{rel_path}/{name}" if rel_path else name
+            for name, child in sorted(dirs, key=lambda item: item[0], reverse=True):
+                stack.append((f"{rel_path}/{name}" if rel_path else name, child))
+
+    def invalidate(self, *rel_paths: str) -> None:
+        """Rescan the loaded parent directories of the given paths."""
+        self._rescan_dirs({_parent(path) for path in rel_paths})
+
+    def apply_events(self, events: list[FileChangeEvent]) -> None:
+        """Patch the tree from file watcher events."""
+        dirs: set[str] = set()
+        for event in events:
+            dirs.add(_parent(event.path))
+            if event.dest_path:
+                dirs.add(_parent(event.dest_path))
+            if event.is_directory and event.event_type in ("created", "modified"):
+                # The directory's own listing may have changed too
+                dirs.add(_normalize(event.path))
+        self._rescan_dirs(dirs)
+
+    def _rescan_dirs(self, rel_dirs: set[str]) -> None:
+        with self._lock:
+            for rel_dir in rel_dirs:
+                node = self._find(rel_dir)
+                if node is not None and node.loaded:
+                    self._scan(node)
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            loaded = 0
+            files = 0
+            stack = [self._root]
+            while stack:
+                node = stack.pop()
+                if node.loaded:
+                    loaded += 1
+                    files += len(node.files)
+                    stack.extend(node.dirs.values())
+        return {
+            "project_id": self.project_id,
+            "watched": self.watched,
+            "loaded_dirs": loaded,
+            "files": files,
+            "version": self._counter,
+        }
+
+
+class FileTreeCache:
+    """Keeps one ProjectFileTree per recently used project, fed by file watchers."""
+
+    def __init__(self, max_trees: int = MAX_TREES):
+        self.max_trees = max_trees
+        self._trees: OrderedDict[str, ProjectFileTree] = OrderedDict()
+
+    async def get(self, project_id: str, root_path: str) -> ProjectFileTree:
+        """Get the tree for a project, creating it and its watcher on first use."""
+        tree = self._trees.get(project_id)
+        if tree is not None and tree.root_path == os.path.realpath(root_path):
+            self._trees.move_to_end(project_id)
+            return tree
+
+        if tree is not None:
+            await self.drop(project_id)
+
+        tree = ProjectFileTree(project_id, root_path)
+        self._trees[project_id] = tree
+
+        watchers = get_file_watcher_manager()
+        await watchers.start_watching(project_id, tree.root_path, self._on_change)
+        tree.watched = watchers.is_active(project_id)
+        # Watcher events also expire cached git status for this tree
+        get_git_service().get(tree.root_path).watched = tree.watched
+        logger.debug("File tree cached", project_id=project_id, watched=tree.watched)
+
+        while len(self._trees) > self.max_trees:
+            oldest = next(iter(self._trees))
+            await self.drop(oldest)
+
+        return tree
+
+    def peek(self, project_id: str) -> ProjectFileTree | None:
+        """Get a project's tree only if it is already cached."""
+        return self._trees.get(project_id)
+
+    def invalidate(self, project_id: str, *rel_paths: str) -> None:
+        """Refresh listings after the API itself changed files."""
+        tree = self._trees.get(project_id)
+        if tree is not None:
+            tree.invalidate(*rel_paths)
+            get_git_service().invalidate(tree.root_path)
+
+    async def drop(self, project_id: str) -> None:
+        self._trees.pop(project_id, None)
+        await get_file_watcher_manager().stop_watching(project_id)
+
+    def _on_change(self, project_id: str, events: list[FileChangeEvent]) -> None:
+        tree = self._trees.get(project_id)
+        if tree is not None:
+            tree.apply_events(events)
+            get_git_service().invalidate(tree.root_path)
+
+
+def search_tree(
+    tree: ProjectFileTree,
+    query: str,
+    glob_pattern: str = "*",
+    max_results: int = 100,
+    max_per_file: int = 10,
+    timeout: float = 10.0,
+) -> tuple[list[dict[str, Any]], int]:
+    """
+    Search file contents of a tree, grep-style, with one line of context.
+
+    Plain queries are matched literally; queries with regex metacharacters
+    are treated as basic regular expressions like grep's default. Returns
+    (matches, number of files with a match).
+    """
+    if any(char in query for char in ".[]*^$\\"):
+        # BRE: these are literal unless escaped
+        translated = re.sub(r"(?<!\\)([+?(){}|])", r"\\\1", query)
+        try:
+            regex: re.Pattern[str] | None = re.compile(translated)
+        except re.error:
+            regex = None
+    else:
+        regex = None
+    needle = query.encode("utf-8")
+
+    deadline = time.monotonic() + timeout
+    matches: list[dict[str, Any]] = []
+    files_matched = 0
+
+    for rel_path in tree.iter_files():
+        if time.monotonic() > deadline or len(matches) >= max_results:
+            break
+        name = os.path.basename(rel_path)
+        if name.startswith(".env") or is_binary_file(name):
+            continue
+        if not fnmatch.fnmatchcase(name, glob_pattern):
+            continue
+
+        path = os.path.join(tree.root_path, rel_path)
+        try:
+            if os.path.getsize(path) > SEARCH_MAX_FILE_SIZE:
+                continue
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            continue
+        if b"\0" in data[:8192]:
+            continue
+        if regex is None and needle not in data:
+            continue
+
+        lines = data.decode("utf-8", errors="replace").splitlines()
+        found = 0
+        for index, line in enumerate(lines):
+            hit = regex.search(line) if regex is not None else query in line
+            if not hit:
+                continue
+            matches.append({
+                "path": rel_path,
+                "line_number": index + 1,
+                "line_content": line,
+                "context_before": lines[max(0, index - 1):index],
+                "context_after": lines[index + 1:index + 2],
+            })
+            found += 1
+            if found >= max_per_file or len(matches) >= max_results:
+                break
+        if found:
+            files_matched += 1
+
+    return matches, files_matched
+
+
+# Global instance
+_file_tree_cache: FileTreeCache | None = None
+
+
+def get_file_tree_cache() -> FileTreeCache:
+    """Get or create the global file tree cache."""
+    global _file_tree_cache
+    if _file_tree_cache is None:
+        _file_tree_cache = FileTreeCache()
+    return _file_tree_cache
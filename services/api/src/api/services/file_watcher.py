@@ -22,10 +22,17 @@ DEBOUNCE_MS = 100
 class FileChangeEvent:
     """Represents a file change event."""
 
-    def __init__(self, event_type: str, path: str, is_directory: bool = False):
+    def __init__(
+        self,
+        event_type: str,
+        path: str,
+        is_directory: bool = False,
+        dest_path: str | None = None,
+    ):
         self.event_type = event_type  # created, modified, deleted, moved
         self.path = path
         self.is_directory = is_directory
+        self.dest_path = dest_path  # set for moved events
         self.timestamp = time.time()
 
 
@@ -43,7 +50,8 @@ class ProjectFileWatcher:
         self.on_change = on_change
         self._observer = None
         self._pending_events: list[FileChangeEvent] = []
-        self._debounce_task: asyncio.Task | None = None
+        self._debounce_task: asyncio.TimerHandle | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
         self._running = False
 
     def _should_ignore(self, path: str) -> bool:
@@ -52,6 +60,10 @@ class ProjectFileWatcher:
         parts = rel_path.split(os.sep)
         return any(part in IGNORE_DIRS for part in parts)
 
+    @property
+    def running(self) -> bool:
+        return self._running
+
     async def start(self) -> None:
         """Start watching the directory."""
         try:
@@ -77,13 +89,21 @@ class ProjectFileWatcher:
 
                     evt_type = event_type_map.get(event.event_type)
                     if evt_type:
+                        dest_path = getattr(event, "dest_path", None)
                         change = FileChangeEvent(
                             event_type=evt_type,
                             path=rel_path,
                             is_directory=event.is_directory,
+                            dest_path=(
+                                os.path.relpath(dest_path, self.watcher.root_path)
+                                if dest_path
+                                else None
+                            ),
                         )
-                        self.watcher._queue_event(change)
+                        # watchdog calls us from its observer thread
+                        self.watcher._loop.call_soon_threadsafe(self.watcher._queue_event, change)
 
+            self._loop = asyncio.get_running_loop()
             self._observer = Observer()
             handler = Handler(self)
             self._observer.schedule(handler, self.root_path, recursive=True)
@@ -122,7 +142,7 @@ class ProjectFileWatcher:
         if self._debounce_task:
             self._debounce_task.cancel()
 
-        loop = asyncio.get_event_loop()
+        loop = self._loop or asyncio.get_event_loop()
         self._debounce_task = loop.call_later(
             DEBOUNCE_MS / 1000.0,
             lambda: asyncio.ensure_future(self._flush_events()),
@@ -185,6 +205,11 @@ class FileWatcherManager:
         """Check if a project is being watched."""
         return project_id in self._watchers
 
+    def is_active(self, project_id: str) -> bool:
+        """Check if a project's watcher is actually receiving events."""
+        watcher = self._watchers.get(project_id)
+        return watcher is not None and watcher.running
+
 
 # Global instance
 _watcher_manager: FileWatcherManager | None = None
@@ -7,11 +7,16 @@ PAT resolution chain: project override > Redis admin override > .env GITHUB_PAT
 
 import asyncio
 import base64
+import hashlib
 import os
 import re
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any
-from urllib.parse import urlparse
+from urllib.parse import parse_qs, urlencode, urlparse
 
 import aiohttp
 from cryptography.fernet import Fernet
@@ -35,6 +40,19 @@ REDIS_GITHUB_GLOBAL_PAT_TS = "github:global_pat_ts"
 # GitHub API base URL
 GITHUB_API_BASE = "https://api.github.com"
 
+# Cached GET responses (ETag validators and bodies) kept across requests
+RESPONSE_CACHE_MAX_ENTRIES = 2000
+# Pages of 100 fetched for pull request and issue listings
+MAX_LIST_PAGES = 3
+# Pages of a paginated listing fetched at once
+MAX_CONCURRENT_PAGES = 4
+# Requests left in the rate limit window below which requests are spread out
+RATE_LIMIT_RESERVE = 100
+# Longest a request is held back to spread the remaining rate limit
+MAX_THROTTLE_DELAY_SECONDS = 5.0
+# Per-request timeout for GitHub API calls
+REQUEST_TIMEOUT_SECONDS = 30
+
 
 class GitHubEncryption:
     """Handles encryption/decryption of PAT values using Fernet."""
@@ -96,6 +114,268 @@ class GitHubEncryption:
             raise ValueError("Failed to decrypt PAT") from e
 
 
+class GitHubRateLimitError(Exception):
+    """Raised when the rate limit is exhausted and no cached response can be served."""
+
+    pass
+
+
+@dataclass
+class GitHubResponse:
+    """A GitHub API response, possibly replayed from the ETag cache."""
+
+    status: int
+    data: Any
+    headers: Mapping[str, str]
+    links: dict[str, str] = field(default_factory=dict)
+    from_cache: bool = False
+
+
+class GitHubAPIError(Exception):
+    """Raised when GitHub answers a request with an unexpected status."""
+
+    def __init__(self, response: GitHubResponse):
+        self.response = response
+        super().__init__(f"GitHub API error: {response.status}")
+
+
+@dataclass
+class _CachedResponse:
+    etag: str | None
+    last_modified: str | None
+    data: Any
+    headers: Mapping[str, str]
+    links: dict[str, str]
+
+
+@dataclass
+class _RateLimit:
+    remaining: int
+    reset: float
+
+
+class GitHubAPIClient:
+    """
+    Shared GitHub REST client.
+
+    Keeps one aiohttp session for all requests, so connections and TLS
+    sessions are reused. GET responses are cached per (PAT, URL) with their
+    ETag/Last-Modified validators and revalidated with If-None-Match;
+    GitHub doesn't count 304 answers against the rate limit. Rate limit
+    headers are tracked per PAT: when few requests remain, requests are
+    spread over the rest of the window, and once none remain, cached
+    responses are served as-is instead of calling GitHub.
+    """
+
+    def __init__(
+        self,
+        base_url: str = GITHUB_API_BASE,
+        cache_size: int = RESPONSE_CACHE_MAX_ENTRIES,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.cache_size = cache_size
+        self._session: aiohttp.ClientSession | None = None
+        self._cache: OrderedDict[tuple[str, str], _CachedResponse] = OrderedDict()
+        self._rate_limits: dict[str, _RateLimit] = {}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=50, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS),
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the shared session."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    @staticmethod
+    def _pat_key(pat: str) -> str:
+        # Cache and rate limit state are per token; don't keep tokens as keys
+        return hashlib.sha256(pat.encode()).hexdigest()
+
+    def _url(self, path: str, params: Mapping[str, Any] | None = None) -> str:
+        url = path if path.startswith("http") else f"{self.base_url}{path}"
+        if params:
+            url = f"{url}?{urlencode(sorted(params.items()))}"
+        return url
+
+    def rate_limit(self, pat: str) -> dict[str, Any] | None:
+        """Last seen rate limit state for a PAT: {remaining, reset}."""
+        state = self._rate_limits.get(self._pat_key(pat))
+        if state is None:
+            return None
+        return {"remaining": state.remaining, "reset": state.reset}
+
+    async def request(
+        self,
+        method: str,
+        pat: str,
+        path: str,
+        params: Mapping[str, Any] | None = None,
+        json: Any = None,
+        headers: Mapping[str, str] | None = None,
+    ) -> GitHubResponse:
+        """
+        Make a GitHub API request.
+
+        Args:
+            method: HTTP method
+            pat: Personal access token
+            path: API path (e.g. "/user/repos") or absolute URL
+            params: Query parameters
+            json: JSON body
+            headers: Request headers (auth, accept, ...)
+
+        Returns:
+            The response; a 304 is returned as the cached 200 response
+        """
+        pat_key = self._pat_key(pat)
+        url = self._url(path, params)
+        cache_key = (pat_key, url)
+        cached = self._cache.get(cache_key) if method == "GET" else None
+
+        state = self._rate_limits.get(pat_key)
+        if state and state.remaining <= RATE_LIMIT_RESERVE:
+            wait = state.reset - time.time()
+            if wait > 0:
+                if state.remaining <= 0:
+                    if cached:
+                        return self._hit(cache_key, cached)
+                    raise GitHubRateLimitError(
+                        f"GitHub rate limit exhausted, resets in {int(wait)}s"
+                    )
+                await asyncio.sleep(min(wait / state.remaining, MAX_THROTTLE_DELAY_SECONDS))
+
+        request_headers = dict(headers or {})
+        if cached:
+            if cached.etag:
+                request_headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                request_headers["If-Modified-Since"] = cached.last_modified
+
+        async with self._get_session().request(
+            method, url, headers=request_headers, json=json
+        ) as resp:
+            self._track_rate_limit(pat_key, resp)
+
+            if resp.status == 304 and cached:
+                return self._hit(cache_key, cached)
+
+            try:
+                data = await resp.json(content_type=None)
+            except ValueError:
+                data = None
+            response = GitHubResponse(
+                status=resp.status,
+                data=data,
+                headers=resp.headers.copy(),
+                links={
+                    str(rel): str(link["url"]) for rel, link in resp.links.items()
+                },
+            )
+
+        if method == "GET" and response.status == 200:
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                self._cache[cache_key] = _CachedResponse(
+                    etag=etag,
+                    last_modified=last_modified,
+                    data=response.data,
+                    headers=response.headers,
+                    links=response.links,
+                )
+                self._cache.move_to_end(cache_key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return response
+
+    def _hit(self, cache_key: tuple[str, str], cached: _CachedResponse) -> GitHubResponse:
+        if cache_key in self._cache:
+            self._cache.move_to_end(cache_key)
+        return GitHubResponse(
+            status=200,
+            data=cached.data,
+            headers=cached.headers,
+            links=cached.links,
+            from_cache=True,
+        )
+
+    def _track_rate_limit(self, pat_key: str, resp: aiohttp.ClientResponse) -> None:
+        remaining = resp.headers.get("X-RateLimit-Remaining")
+        reset = resp.headers.get("X-RateLimit-Reset")
+        retry_after = resp.headers.get("Retry-After")
+        try:
+            if retry_after and resp.status in (403, 429):
+                # Secondary rate limit: back off for the time GitHub asks for
+                self._rate_limits[pat_key] = _RateLimit(0, time.time() + float(retry_after))
+            elif remaining is not None and reset is not None:
+                self._rate_limits[pat_key] = _RateLimit(int(remaining), float(reset))
+        except ValueError:
+            pass
+
+    async def get_paginated(
+        self,
+        pat: str,
+        path: str,
+        params: Mapping[str, Any] | None = None,
+        headers: Mapping[str, str] | None = None,
+        max_pages: int = 1,
+    ) -> list[Any]:
+        """
+        GET a paginated listing, fetching up to ``max_pages`` pages.
+
+        The first page's Link header says how many pages there are; the
+        rest are then fetched concurrently and joined in page order.
+        """
+        first = await self.request("GET", pat, path, params=params, headers=headers)
+        if first.status != 200 or not isinstance(first.data, list):
+            raise GitHubAPIError(first)
+
+        last_page = 1
+        last_url = first.links.get("last")
+        if last_url:
+            page = parse_qs(urlparse(last_url).query).get("page", ["1"])[0]
+            last_page = min(int(page), max_pages) if page.isdigit() else 1
+
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
+
+        async def fetch(page: int) -> list[Any]:
+            async with semaphore:
+                response = await self.request(
+                    "GET", pat, path, params={**(params or {}), "page": page}, headers=headers
+                )
+            if response.status != 200 or not isinstance(response.data, list):
+                raise GitHubAPIError(response)
+            return response.data
+
+        rest = await asyncio.gather(*(fetch(page) for page in range(2, last_page + 1)))
+        return [item for page in [first.data, *rest] for item in page]
+
+
+# Global instance
+_github_api_client: GitHubAPIClient | None = None
+
+
+def get_github_api_client() -> GitHubAPIClient:
+    """Get or create the shared GitHub API client."""
+    global _github_api_client
+    if _github_api_client is None:
+        _github_api_client = GitHubAPIClient()
+    return _github_api_client
+
+
+async def close_github_api_client() -> None:
+    """Close the shared GitHub API client's session."""
+    if _github_api_client is not None:
+        await _github_api_client.close()
+
+
 class GitHubService:
     """
     GitHub operations with PAT resolution and repo management.
@@ -106,9 +386,10 @@ class GitHubService:
     3. Environment GITHUB_PAT (from .env, auto-imported)
     """
 
-    def __init__(self, redis: RedisClient):
+    def __init__(self, redis: RedisClient, api: GitHubAPIClient | None = None):
         self.redis = redis
         self.encryption = GitHubEncryption()
+        self.api = api or get_github_api_client()
 
     # === PAT Resolution ===
 
@@ -257,6 +538,19 @@ class GitHubService:
             "User-Agent": "Wyld-Core-API",
         }
 
+    async def _request(
+        self,
+        method: str,
+        pat: str,
+        path: str,
+        params: dict[str, Any] | None = None,
+        json: Any = None,
+    ) -> GitHubResponse:
+        """Make an authenticated request through the shared client."""
+        return await self.api.request(
+            method, pat, path, params=params, json=json, headers=self._get_headers(pat)
+        )
+
     async def test_pat(self, pat: str) -> dict[str, Any]:
         """
         Test a PAT against GitHub API.
@@ -265,34 +559,29 @@ class GitHubService:
             {success: bool, username: str | None, scopes: list | None, error: str | None}
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{GITHUB_API_BASE}/user",
-                    headers=self._get_headers(pat),
-                ) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        scopes = resp.headers.get("X-OAuth-Scopes", "").split(", ")
-                        return {
-                            "success": True,
-                            "username": data.get("login"),
-                            "scopes": [s for s in scopes if s],
-                            "error": None,
-                        }
-                    elif resp.status == 401:
-                        return {
-                            "success": False,
-                            "username": None,
-                            "scopes": None,
-                            "error": "Invalid or expired token",
-                        }
-                    else:
-                        return {
-                            "success": False,
-                            "username": None,
-                            "scopes": None,
-                            "error": f"GitHub API error: {resp.status}",
-                        }
+            resp = await self._request("GET", pat, "/user")
+            if resp.status == 200:
+                scopes = resp.headers.get("X-OAuth-Scopes", "").split(", ")
+                return {
+                    "success": True,
+                    "username": resp.data.get("login"),
+                    "scopes": [s for s in scopes if s],
+                    "error": None,
+                }
+            elif resp.status == 401:
+                return {
+                    "success": False,
+                    "username": None,
+                    "scopes": None,
+                    "error": "Invalid or expired token",
+                }
+            else:
+                return {
+                    "success": False,
+                    "username": None,
+                    "scopes": None,
+                    "error": f"GitHub API error: {resp.status}",
+                }
         except Exception as e:
             logger.error("PAT test failed", error=str(e))
             return {
@@ -312,34 +601,33 @@ class GitHubService:
             List of repo objects with id, name, full_name, html_url, clone_url, private, description
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{GITHUB_API_BASE}/user/repos",
-                    headers=self._get_headers(pat),
-                    params={
-                        "sort": "updated",
-                        "direction": "desc",
-                        "per_page": per_page,
-                        "page": page,
-                    },
-                ) as resp:
-                    if resp.status != 200:
-                        logger.error("Failed to list repos", status=resp.status)
-                        return []
-
-                    repos = await resp.json()
-                    return [
-                        {
-                            "id": r["id"],
-                            "name": r["name"],
-                            "full_name": r["full_name"],
-                            "html_url": r["html_url"],
-                            "clone_url": r["clone_url"],
-                            "private": r["private"],
-                            "description": r.get("description"),
-                        }
-                        for r in repos
-                    ]
+            resp = await self._request(
+                "GET",
+                pat,
+                "/user/repos",
+                params={
+                    "sort": "updated",
+                    "direction": "desc",
+                    "per_page": per_page,
+                    "page": page,
+                },
+            )
+            if resp.status != 200:
+                logger.error("Failed to list repos", status=resp.status)
+                return []
+
+            return [
+                {
+                    "id": r["id"],
+                    "name": r["name"],
+                    "full_name": r["full_name"],
+                    "html_url": r["html_url"],
+                    "clone_url": r["clone_url"],
+                    "private": r["private"],
+                    "description": r.get("description"),
+                }
+                for r in resp.data
+            ]
         except Exception as e:
             logger.error("Failed to list repos", error=str(e))
             return []
@@ -358,36 +646,35 @@ class GitHubService:
             Repo object or None on failure
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{GITHUB_API_BASE}/user/repos",
-                    headers=self._get_headers(pat),
-                    json={
-                        "name": name,
-                        "description": description,
-                        "private": private,
-                        "auto_init": False,
-                    },
-                ) as resp:
-                    if resp.status not in (200, 201):
-                        error = await resp.json()
-                        logger.error(
-                            "Failed to create repo",
-                            status=resp.status,
-                            error=error,
-                        )
-                        return None
-
-                    repo = await resp.json()
-                    return {
-                        "id": repo["id"],
-                        "name": repo["name"],
-                        "full_name": repo["full_name"],
-                        "html_url": repo["html_url"],
-                        "clone_url": repo["clone_url"],
-                        "private": repo["private"],
-                        "description": repo.get("description"),
-                    }
+            resp = await self._request(
+                "POST",
+                pat,
+                "/user/repos",
+                json={
+                    "name": name,
+                    "description": description,
+                    "private": private,
+                    "auto_init": False,
+                },
+            )
+            if resp.status not in (200, 201):
+                logger.error(
+                    "Failed to create repo",
+                    status=resp.status,
+                    error=resp.data,
+                )
+                return None
+
+            repo = resp.data
+            return {
+                "id": repo["id"],
+                "name": repo["name"],
+                "full_name": repo["full_name"],
+                "html_url": repo["html_url"],
+                "clone_url": repo["clone_url"],
+                "private": repo["private"],
+                "description": repo.get("description"),
+            }
         except Exception as e:
             logger.error("Failed to create repo", error=str(e))
             return None
@@ -395,24 +682,20 @@ class GitHubService:
     async def get_repo(self, pat: str, owner: str, repo: str) -> dict[str, Any] | None:
         """Get repository information."""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{GITHUB_API_BASE}/repos/{owner}/{repo}",
-                    headers=self._get_headers(pat),
-                ) as resp:
-                    if resp.status != 200:
-                        return None
-                    data = await resp.json()
-                    return {
-                        "id": data["id"],
-                        "name": data["name"],
-                        "full_name": data["full_name"],
-                        "html_url": data["html_url"],
-                        "clone_url": data["clone_url"],
-                        "private": data["private"],
-                        "description": data.get("description"),
-                        "default_branch": data.get("default_branch", "main"),
-                    }
+            resp = await self._request("GET", pat, f"/repos/{owner}/{repo}")
+            if resp.status != 200:
+                return None
+            data = resp.data
+            return {
+                "id": data["id"],
+                "name": data["name"],
+                "full_name": data["full_name"],
+                "html_url": data["html_url"],
+                "clone_url": data["clone_url"],
+                "private": data["private"],
+                "description": data.get("description"),
+                "default_branch": data.get("default_branch", "main"),
+            }
         except Exception as e:
             logger.error("Failed to get repo", error=str(e))
             return None
@@ -425,34 +708,33 @@ class GitHubService:
         owner: str,
         repo: str,
         state: str = "open",
+        max_pages: int = MAX_LIST_PAGES,
     ) -> list[dict[str, Any]]:
-        """List pull requests for a repository."""
+        """List pull requests for a repository (up to ``max_pages`` pages of 100)."""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{GITHUB_API_BASE}/repos/{owner}/{repo}/pulls",
-                    headers=self._get_headers(pat),
-                    params={"state": state, "per_page": 30},
-                ) as resp:
-                    if resp.status != 200:
-                        return []
-                    prs = await resp.json()
-                    return [
-                        {
-                            "number": pr["number"],
-                            "title": pr["title"],
-                            "body": pr.get("body"),
-                            "state": pr["state"],
-                            "head": pr["head"]["ref"],
-                            "base": pr["base"]["ref"],
-                            "html_url": pr["html_url"],
-                            "created_at": pr["created_at"],
-                            "user": pr["user"]["login"],
-                            "mergeable": pr.get("mergeable"),
-                            "draft": pr.get("draft", False),
-                        }
-                        for pr in prs
-                    ]
+            prs = await self.api.get_paginated(
+                pat,
+                f"/repos/{owner}/{repo}/pulls",
+                params={"state": state, "per_page": 100},
+                headers=self._get_headers(pat),
+                max_pages=max_pages,
+            )
+            return [
+                {
+                    "number": pr["number"],
+                    "title": pr["title"],
+                    "body": pr.get("body"),
+                    "state": pr["state"],
+                    "head": pr["head"]["ref"],
+                    "base": pr["base"]["ref"],
+                    "html_url": pr["html_url"],
+                    "created_at": pr["created_at"],
+                    "user": pr["user"]["login"],
+                    "mergeable": pr.get("mergeable"),
+                    "draft": pr.get("draft", False),
+                }
+                for pr in prs
+            ]
         except Exception as e:
             logger.error("Failed to list PRs", error=str(e))
             return []
@@ -470,36 +752,35 @@ class GitHubService:
     ) -> dict[str, Any] | None:
         """Create a pull request."""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{GITHUB_API_BASE}/repos/{owner}/{repo}/pulls",
-                    headers=self._get_headers(pat),
-                    json={
-                        "title": title,
-                        "head": head,
-                        "base": base,
-                        "body": body,
-                        "draft": draft,
-                    },
-                ) as resp:
-                    if resp.status not in (200, 201):
-                        error = await resp.json()
-                        logger.error("Failed to create PR", error=error)
-                        return None
-                    pr = await resp.json()
-                    return {
-                        "number": pr["number"],
-                        "title": pr["title"],
-                        "body": pr.get("body"),
-                        "state": pr["state"],
-                        "head": pr["head"]["ref"],
-                        "base": pr["base"]["ref"],
-                        "html_url": pr["html_url"],
-                        "created_at": pr["created_at"],
-                        "user": pr["user"]["login"],
-                        "mergeable": pr.get("mergeable"),
-                        "draft": pr.get("draft", False),
-                    }
+            resp = await self._request(
+                "POST",
+                pat,
+                f"/repos/{owner}/{repo}/pulls",
+                json={
+                    "title": title,
+                    "head": head,
+                    "base": base,
+                    "body": body,
+                    "draft": draft,
+                },
+            )
+            if resp.status not in (200, 201):
+                logger.error("Failed to create PR", error=resp.data)
+                return None
+            pr = resp.data
+            return {
+                "number": pr["number"],
+                "title": pr["title"],
+                "body": pr.get("body"),
+                "state": pr["state"],
+                "head": pr["head"]["ref"],
+                "base": pr["base"]["ref"],
+                "html_url": pr["html_url"],
+                "created_at": pr["created_at"],
+                "user": pr["user"]["login"],
+                "mergeable": pr.get("mergeable"),
+                "draft": pr.get("draft", False),
+            }
         except Exception as e:
             logger.error("Failed to create PR", error=str(e))
             return None
@@ -509,35 +790,31 @@ class GitHubService:
     ) -> dict[str, Any] | None:
         """Get pull request details."""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{GITHUB_API_BASE}/repos/{owner}/{repo}/pulls/{number}",
-                    headers=self._get_headers(pat),
-                ) as resp:
-                    if resp.status != 200:
-                        return None
-                    pr = await resp.json()
-                    return {
-                        "number": pr["number"],
-                        "title": pr["title"],
-                        "body": pr.get("body"),
-                        "state": pr["state"],
-                        "head": pr["head"]["ref"],
-                        "base": pr["base"]["ref"],
-                        "html_url": pr["html_url"],
-                        "created_at": pr["created_at"],
-                        "user": pr["user"]["login"],
-                        "mergeable": pr.get("mergeable"),
-                        "draft": pr.get("draft", False),
-                        "merged": pr.get("merged", False),
-                        "merge_commit_sha": pr.get("merge_commit_sha"),
-                        "comments": pr.get("comments", 0),
-                        "review_comments": pr.get("review_comments", 0),
-                        "commits": pr.get("commits", 0),
-                        "additions": pr.get("additions", 0),
-                        "deletions": pr.get("deletions", 0),
-                        "changed_files": pr.get("changed_files", 0),
-                    }
+            resp = await self._request("GET", pat, f"/repos/{owner}/{repo}/pulls/{number}")
+            if resp.status != 200:
+                return None
+            pr = resp.data
+            return {
+                "number": pr["number"],
+                "title": pr["title"],
+                "body": pr.get("body"),
+                "state": pr["state"],
+                "head": pr["head"]["ref"],
+                "base": pr["base"]["ref"],
+                "html_url": pr["html_url"],
+                "created_at": pr["created_at"],
+                "user": pr["user"]["login"],
+                "mergeable": pr.get("mergeable"),
+                "draft": pr.get("draft", False),
+                "merged": pr.get("merged", False),
+                "merge_commit_sha": pr.get("merge_commit_sha"),
+                "comments": pr.get("comments", 0),
+                "review_comments": pr.get("review_comments", 0),
+                "commits": pr.get("commits", 0),
+                "additions": pr.get("additions", 0),
+                "deletions": pr.get("deletions", 0),
+                "changed_files": pr.get("changed_files", 0),
+            }
         except Exception as e:
             logger.error("Failed to get PR", error=str(e))
             return None
@@ -561,29 +838,29 @@ class GitHubService:
             {success: bool, sha: str | None, message: str}
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                body: dict[str, Any] = {"merge_method": merge_method}
-                if commit_message:
-                    body["commit_message"] = commit_message
-
-                async with session.put(
-                    f"{GITHUB_API_BASE}/repos/{owner}/{repo}/pulls/{number}/merge",
-                    headers=self._get_headers(pat),
-                    json=body,
-                ) as resp:
-                    data = await resp.json()
-                    if resp.status == 200:
-                        return {
-                            "success": True,
-                            "sha": data.get("sha"),
-                            "message": data.get("message", "Pull request merged"),
-                        }
-                    else:
-                        return {
-                            "success": False,
-                            "sha": None,
-                            "message": data.get("message", "Merge failed"),
-                        }
+            body: dict[str, Any] = {"merge_method": merge_method}
+            if commit_message:
+                body["commit_message"] = commit_message
+
+            resp = await self._request(
+                "PUT",
+                pat,
+                f"/repos/{owner}/{repo}/pulls/{number}/merge",
+                json=body,
+            )
+            data = resp.data or {}
+            if resp.status == 200:
+                return {
+                    "success": True,
+                    "sha": data.get("sha"),
+                    "message": data.get("message", "Pull request merged"),
+                }
+            else:
+                return {
+                    "success": False,
+                    "sha": None,
+                    "message": data.get("message", "Merge failed"),
+                }
         except Exception as e:
             logger.error("Failed to merge PR", error=str(e))
             return {"success": False, "sha": None, "message": str(e)}
@@ -597,38 +874,37 @@ class GitHubService:
         repo: str,
         state: str = "open",
         labels: list[str] | None = None,
+        max_pages: int = MAX_LIST_PAGES,
     ) -> list[dict[str, Any]]:
-        """List issues for a repository."""
+        """List issues for a repository (up to ``max_pages`` pages of 100)."""
         try:
-            params: dict[str, Any] = {"state": state, "per_page": 30}
+            params: dict[str, Any] = {"state": state, "per_page": 100}
             if labels:
                 params["labels"] = ",".join(labels)
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{GITHUB_API_BASE}/repos/{owner}/{repo}/issues",
-                    headers=self._get_headers(pat),
-                    params=params,
-                ) as resp:
-                    if resp.status != 200:
-                        return []
-                    issues = await resp.json()
-                    # Filter out pull requests (they appear in issues API)
-                    return [
-                        {
-                            "number": issue["number"],
-                            "title": issue["title"],
-                            "body": issue.get("body"),
-                            "state": issue["state"],
-                            "html_url": issue["html_url"],
-                            "created_at": issue["created_at"],
-                            "user": issue["user"]["login"],
-                            "labels": [l["name"] for l in issue.get("labels", [])],
-                            "comments": issue.get("comments", 0),
-                        }
-                        for issue in issues
-                        if "pull_request" not in issue
-                    ]
+            issues = await self.api.get_paginated(
+                pat,
+                f"/repos/{owner}/{repo}/issues",
+                params=params,
+                headers=self._get_headers(pat),
+                max_pages=max_pages,
+            )
+            # Filter out pull requests (they appear in issues API)
+            return [
+                {
+                    "number": issue["number"],
+                    "title": issue["title"],
+                    "body": issue.get("body"),
+                    "state": issue["state"],
+                    "html_url": issue["html_url"],
+                    "created_at": issue["created_at"],
+                    "user": issue["user"]["login"],
+                    "labels": [l["name"] for l in issue.get("labels", [])],
+                    "comments": issue.get("comments", 0),
+                }
+                for issue in issues
+                if "pull_request" not in issue
+            ]
         except Exception as e:
             logger.error("Failed to list issues", error=str(e))
             return []
@@ -650,25 +926,22 @@ class GitHubService:
             if labels:
                 data["labels"] = labels
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{GITHUB_API_BASE}/repos/{owner}/{repo}/issues",
-                    headers=self._get_headers(pat),
-                    json=data,
-                ) as resp:
-                    if resp.status not in (200, 201):
-                        return None
-                    issue = await resp.json()
-                    return {
-                        "number": issue["number"],
-                        "title": issue["title"],
-                        "body": issue.get("body"),
-                        "state": issue["state"],
-                        "html_url": issue["html_url"],
-                        "created_at": issue["created_at"],
-                        "user": issue["user"]["login"],
-                        "labels": [l["name"] for l in issue.get("labels", [])],
-                    }
+            resp = await self._request(
+                "POST", pat, f"/repos/{owner}/{repo}/issues", json=data
+            )
+            if resp.status not in (200, 201):
+                return None
+            issue = resp.data
+            return {
+                "number": issue["number"],
+                "title": issue["title"],
+                "body": issue.get("body"),
+                "state": issue["state"],
+                "html_url": issue["html_url"],
+                "created_at": issue["created_at"],
+                "user": issue["user"]["login"],
+                "labels": [l["name"] for l in issue.get("labels", [])],
+            }
         except Exception as e:
             logger.error("Failed to create issue", error=str(e))
             return None
@@ -3,17 +3,29 @@ Domain health checker service.
 
 Periodically checks domain availability and response times.
 Stores results in the Domain model and can trigger notifications.
+
+Each sweep probes the domains that are due concurrently (bounded by
+MAX_CONCURRENT_CHECKS) through one shared HTTP client, so TLS setup and
+connections are reused, and a DNS cache that also refuses private
+addresses on every connection, redirects included. Domains are scheduled
+individually: healthy ones back off toward MAX_CHECK_INTERVAL_SECONDS,
+failing ones are rechecked every MIN_CHECK_INTERVAL_SECONDS, with jitter
+so checks spread out instead of arriving in bursts. Results of a sweep
+are written with a single UPDATE.
 """
 
 import asyncio
 import ipaddress
+import random
 import socket
+import ssl
 import time
+from dataclasses import dataclass
 from datetime import datetime, timezone
 
+import httpcore
 import httpx
-from sqlalchemy import select, update
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import DateTime, Integer, String, column, select, update, values
 
 from ai_core import get_logger
 from database.models import Domain
@@ -23,10 +35,23 @@ from ..database import db_session_context
 
 logger = get_logger(__name__)
 
-# Check interval: 5 minutes for active domains
+# Check interval: 5 minutes for active domains that just came up
 CHECK_INTERVAL_SECONDS = 300
+# Domains that keep passing back off to this interval
+MAX_CHECK_INTERVAL_SECONDS = 1800
+# Domains that are down or degraded are rechecked this often
+MIN_CHECK_INTERVAL_SECONDS = 60
+# Intervals are randomized by this fraction either way
+CHECK_JITTER = 0.1
+# How often the loop looks for domains that are due
+SWEEP_INTERVAL_SECONDS = 30
+# Probes in flight at once
+MAX_CONCURRENT_CHECKS = 20
 # Timeout for health check requests
 REQUEST_TIMEOUT_SECONDS = 10
+# Resolved addresses are reused this long; failed lookups for less
+DNS_CACHE_TTL_SECONDS = 300
+DNS_NEGATIVE_TTL_SECONDS = 60
 # Private IP ranges (for SSRF prevention)
 PRIVATE_NETWORKS = [
     ipaddress.ip_network("10.0.0.0/8"),
@@ -49,46 +74,243 @@ def is_private_ip(ip_str: str) -> bool:
         return True  # Invalid IPs treated as private (reject)
 
 
-async def resolve_domain(domain_name: str) -> str | None:
-    """Resolve domain to IP, returns None if private/internal."""
-    try:
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            None, socket.gethostbyname, domain_name
-        )
-        if is_private_ip(result):
+class DNSCache:
+    """
+    Resolves hostnames to a public address, caching results.
+
+    Hosts resolving to a private address are treated like failed lookups.
+    Concurrent lookups of the same host share one resolution.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DNS_CACHE_TTL_SECONDS,
+        negative_ttl: float = DNS_NEGATIVE_TTL_SECONDS,
+    ):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries: dict[str, tuple[float, str | None]] = {}
+        self._pending: dict[str, asyncio.Future[str | None]] = {}
+
+    async def resolve(self, host: str) -> str | None:
+        """Public IP address for a host, or None if it has none."""
+        try:
+            ipaddress.ip_address(host)
+            return None if is_private_ip(host) else host
+        except ValueError:
+            pass
+
+        entry = self._entries.get(host)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+
+        pending = self._pending.get(host)
+        if pending:
+            return await asyncio.shield(pending)
+
+        future: asyncio.Future[str | None] = asyncio.get_running_loop().create_future()
+        self._pending[host] = future
+        try:
+            address = await self._lookup(host)
+            ttl = self.ttl if address else self.negative_ttl
+            self._entries[host] = (time.monotonic() + ttl, address)
+            future.set_result(address)
+            return address
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Retrieved here when nobody else is waiting
+            raise
+        finally:
+            del self._pending[host]
+
+    async def _lookup(self, host: str) -> str | None:
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(
+                host, None, type=socket.SOCK_STREAM
+            )
+        except socket.gaierror:
+            return None
+        if not infos:
+            return None
+
+        address = infos[0][4][0]
+        if is_private_ip(address):
             logger.warning(
                 "Domain resolves to private IP, skipping health check",
-                domain=domain_name,
-                ip=result,
+                domain=host,
+                ip=address,
             )
             return None
-        return result
-    except socket.gaierror:
-        return None
+        return address
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class _CachedDNSBackend(httpcore.AsyncNetworkBackend):
+    """Opens connections to addresses from a DNSCache; TLS still uses the hostname."""
+
+    def __init__(self, dns: DNSCache):
+        self._dns = dns
+        self._backend = httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options=None,
+    ) -> httpcore.AsyncNetworkStream:
+        address = await self._dns.resolve(host)
+        if address is None:
+            raise httpcore.ConnectError(f"{host} has no public address")
+        return await self._backend.connect_tcp(
+            address,
+            port,
+            timeout=timeout,
+            local_address=local_address,
+            socket_options=socket_options,
+        )
 
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+# httpcore errors and the httpx errors callers catch, most specific first
+_HTTPCORE_ERRORS: list[tuple[type[Exception], type[httpx.HTTPError]]] = [
+    (httpcore.ConnectTimeout, httpx.ConnectTimeout),
+    (httpcore.ReadTimeout, httpx.ReadTimeout),
+    (httpcore.WriteTimeout, httpx.WriteTimeout),
+    (httpcore.PoolTimeout, httpx.PoolTimeout),
+    (httpcore.TimeoutException, httpx.TimeoutException),
+    (httpcore.ConnectError, httpx.ConnectError),
+    (httpcore.ReadError, httpx.ReadError),
+    (httpcore.WriteError, httpx.WriteError),
+    (httpcore.NetworkError, httpx.NetworkError),
+    (httpcore.UnsupportedProtocol, httpx.UnsupportedProtocol),
+    (httpcore.RemoteProtocolError, httpx.RemoteProtocolError),
+    (httpcore.LocalProtocolError, httpx.LocalProtocolError),
+    (httpcore.ProtocolError, httpx.ProtocolError),
+]
+
+
+def _httpx_error(exc: Exception) -> Exception:
+    for core_error, httpx_error in _HTTPCORE_ERRORS:
+        if isinstance(exc, core_error):
+            return httpx_error(str(exc))
+    return exc
+
+
+class _ResponseStream(httpx.AsyncByteStream):
+    def __init__(self, stream) -> None:
+        self._stream = stream
+
+    async def __aiter__(self):
+        try:
+            async for part in self._stream:
+                yield part
+        except Exception as e:
+            raise _httpx_error(e) from e
+
+    async def aclose(self) -> None:
+        await self._stream.aclose()
 
-async def check_domain_health(domain_name: str) -> tuple[str, int | None]:
+
+class _PoolTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport over an httpcore connection pool.
+
+    httpx has no option for a custom network backend, so the pool that
+    connects through the DNS cache is wrapped in a transport of our own.
+    """
+
+    def __init__(self, pool: httpcore.AsyncConnectionPool):
+        self._pool = pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        try:
+            response = await self._pool.handle_async_request(core_request)
+        except Exception as e:
+            raise _httpx_error(e) from e
+
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=_ResponseStream(response.stream),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._pool.aclose()
+
+
+def create_probe_client(
+    dns: DNSCache,
+    max_connections: int = MAX_CONCURRENT_CHECKS,
+    network_backend: httpcore.AsyncNetworkBackend | None = None,
+) -> httpx.AsyncClient:
+    """HTTP client for health probes that resolves hosts through ``dns``."""
+    # Don't fail on self-signed certs
+    ssl_context = ssl.create_default_context()
+    ssl_context.check_hostname = False
+    ssl_context.verify_mode = ssl.CERT_NONE
+
+    pool = httpcore.AsyncConnectionPool(
+        ssl_context=ssl_context,
+        max_connections=max_connections * 2,  # Room for redirects
+        max_keepalive_connections=max_connections * 2,
+        keepalive_expiry=60,
+        network_backend=network_backend or _CachedDNSBackend(dns),
+    )
+    return httpx.AsyncClient(
+        transport=_PoolTransport(pool),
+        timeout=REQUEST_TIMEOUT_SECONDS,
+        follow_redirects=True,
+    )
+
+
+_dns_cache = DNSCache()
+
+
+async def resolve_domain(domain_name: str) -> str | None:
+    """Resolve domain to IP, returns None if private/internal."""
+    return await _dns_cache.resolve(domain_name)
+
+
+async def check_domain_health(
+    domain_name: str,
+    client: httpx.AsyncClient | None = None,
+) -> tuple[str, int | None]:
     """
     Check health of a single domain.
     Returns (status, response_time_ms).
     Status: 'up', 'down', 'degraded'
+
+    Pass a client from ``create_probe_client`` to reuse its connections and
+    DNS cache; without one, a client is created for this check.
     """
-    # Resolve and check for SSRF
-    ip = await resolve_domain(domain_name)
-    if ip is None:
-        return "down", None
+    if client is None:
+        async with create_probe_client(_dns_cache, max_connections=1) as client:
+            return await check_domain_health(domain_name, client)
 
     url = f"https://{domain_name}"
     start_time = time.monotonic()
 
     try:
-        async with httpx.AsyncClient(
-            timeout=REQUEST_TIMEOUT_SECONDS,
-            follow_redirects=True,
-            verify=False,  # Don't fail on self-signed certs
-        ) as client:
-            response = await client.get(url)
+        response = await client.get(url)
 
         elapsed_ms = int((time.monotonic() - start_time) * 1000)
 
@@ -105,22 +327,46 @@ async def check_domain_health(domain_name: str) -> tuple[str, int | None]:
         elapsed_ms = int((time.monotonic() - start_time) * 1000)
         return "down", elapsed_ms
     except Exception as e:
+        # Includes domains without a public address (SSRF prevention)
         logger.debug("Health check failed", domain=domain_name, error=str(e))
         return "down", None
 
 
+@dataclass
+class _DomainSchedule:
+    """When a domain is next due and how long it waits after a check."""
+    domain_name: str
+    next_check: float
+    interval: float = CHECK_INTERVAL_SECONDS
+
+
+def _jittered(interval: float) -> float:
+    return interval * random.uniform(1 - CHECK_JITTER, 1 + CHECK_JITTER)
+
+
 class HealthCheckerService:
     """Background service that periodically checks domain health."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        client: httpx.AsyncClient | None = None,
+        max_concurrent: int = MAX_CONCURRENT_CHECKS,
+    ):
         self._running = False
         self._task: asyncio.Task | None = None
+        self._client = client
+        self._owns_client = client is None
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._max_concurrent = max_concurrent
+        self._schedule: dict[str, _DomainSchedule] = {}
 
     async def start(self) -> None:
         """Start the health checker background loop."""
         if self._running:
             return
 
+        if self._client is None:
+            self._client = create_probe_client(_dns_cache, self._max_concurrent)
         self._running = True
         self._task = asyncio.create_task(self._run_loop())
         logger.info("Health checker service started")
@@ -134,6 +380,9 @@ class HealthCheckerService:
                 await self._task
             except asyncio.CancelledError:
                 pass
+        if self._client and self._owns_client:
+            await self._client.aclose()
+            self._client = None
         logger.info("Health checker service stopped")
 
     async def _run_loop(self) -> None:
@@ -144,48 +393,116 @@ class HealthCheckerService:
             except Exception as e:
                 logger.error("Health check loop error", error=str(e))
 
-            await asyncio.sleep(CHECK_INTERVAL_SECONDS)
+            await asyncio.sleep(SWEEP_INTERVAL_SECONDS)
 
     async def _check_all_domains(self) -> None:
-        """Check all active domains."""
+        """Check the active domains that are due, then store all results at once."""
         async with db_session_context() as db:
             result = await db.execute(
-                select(Domain).where(
+                select(Domain.id, Domain.domain_name).where(
                     Domain.status == DomainStatus.ACTIVE,
                 )
             )
-            domains = list(result.scalars().all())
+            active = {row.id: row.domain_name for row in result}
 
-        if not domains:
+        self.sync_schedule(active)
+        due = self.due_domains()
+        if not due:
             return
 
-        logger.debug(f"Checking health of {len(domains)} domains")
-
-        for domain in domains:
-            if not self._running:
-                break
+        logger.debug(f"Checking health of {len(due)} of {len(active)} domains")
+        results = await self.check_domains(due)
+        if results:
+            await self._store_results(results)
+
+    def sync_schedule(self, active: dict[str, str]) -> None:
+        """Track newly active domains (due now) and forget inactive ones."""
+        now = time.monotonic()
+        for domain_id in self._schedule.keys() - active.keys():
+            del self._schedule[domain_id]
+        for domain_id, domain_name in active.items():
+            entry = self._schedule.get(domain_id)
+            if entry is None:
+                self._schedule[domain_id] = _DomainSchedule(domain_name, next_check=now)
+            else:
+                entry.domain_name = domain_name
+
+    def due_domains(self) -> dict[str, str]:
+        """Domains whose next check time has passed, by ID."""
+        now = time.monotonic()
+        return {
+            domain_id: entry.domain_name
+            for domain_id, entry in self._schedule.items()
+            if entry.next_check <= now
+        }
+
+    async def check_domains(self, domains: dict[str, str]) -> list[dict]:
+        """
+        Probe domains concurrently and reschedule each by its result.
+
+        Args:
+            domains: Domain names by domain ID
+
+        Returns:
+            One row per checked domain, ready for ``_store_results``
+        """
+        async def probe(domain_id: str, domain_name: str) -> dict | None:
+            async with self._semaphore:
+                if not self._running:
+                    return None
+                health_status, response_time = await check_domain_health(domain_name, self._client)
+            self._reschedule(domain_id, health_status)
+            return {
+                "id": domain_id,
+                "health_status": health_status,
+                "response_time_ms": response_time,
+                "last_health_check_at": datetime.now(timezone.utc),
+            }
+
+        results = await asyncio.gather(
+            *(probe(domain_id, name) for domain_id, name in domains.items())
+        )
+        return [row for row in results if row is not None]
 
-            health_status, response_time = await check_domain_health(domain.domain_name)
+    def _reschedule(self, domain_id: str, health_status: str) -> None:
+        entry = self._schedule.get(domain_id)
+        if entry is None:
+            return
+        if health_status == "up":
+            entry.interval = min(entry.interval * 1.5, MAX_CHECK_INTERVAL_SECONDS)
+        else:
+            entry.interval = MIN_CHECK_INTERVAL_SECONDS
+        entry.next_check = time.monotonic() + _jittered(entry.interval)
+
+    async def _store_results(self, results: list[dict]) -> None:
+        """Write a sweep's results with one UPDATE ... FROM (VALUES ...)."""
+        checked = values(
+            column("id", String),
+            column("health_status", String),
+            column("response_time_ms", Integer),
+            column("last_health_check_at", DateTime(timezone=True)),
+            name="checked",
+        ).data([
+            (r["id"], r["health_status"], r["response_time_ms"], r["last_health_check_at"])
+            for r in results
+        ])
 
-            # Update domain health status
-            async with db_session_context() as db:
-                await db.execute(
-                    update(Domain)
-                    .where(Domain.id == domain.id)
-                    .values(
-                        health_status=health_status,
-                        response_time_ms=response_time,
-                        last_health_check_at=datetime.now(timezone.utc),
-                    )
+        async with db_session_context() as db:
+            await db.execute(
+                update(Domain)
+                .where(Domain.id == checked.c.id)
+                .values(
+                    health_status=checked.c.health_status,
+                    response_time_ms=checked.c.response_time_ms,
+                    last_health_check_at=checked.c.last_health_check_at,
                 )
-                await db.commit()
-
-            # Small delay between checks to avoid hammering
-            await asyncio.sleep(1)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
 
     async def check_single(self, domain_name: str) -> tuple[str, int | None]:
         """Check a single domain on demand."""
-        return await check_domain_health(domain_name)
+        return await check_domain_health(domain_name, self._client)
 
 
 # Global instance
@@ -0,0 +1,190 @@
+"""
+Content-addressed upload storage.
+
+Uploads are stored once per distinct content, as blobs named by their
+SHA-256, and each upload gets a small per-user reference record pointing
+at its blob:
+
+    <upload_directory>/.blobs/<sha[:2]>/<sha>
+    <upload_directory>/.refs/<user_id>/<file_id>.json
+
+Re-sending the same screenshot or log only adds a reference. Deleting an
+upload removes its reference; blobs no longer referenced by anyone are
+removed by ``collect_garbage``. Files stored before this layout
+(``<upload_directory>/<user_id>/<file_id>.<ext>``) are still served,
+listed and deleted by the routes.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, BinaryIO
+from uuid import uuid4
+
+from ai_core import get_logger
+
+logger = get_logger(__name__)
+
+# Bytes read, hashed and written per step while storing an upload
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# Unreferenced blobs (and abandoned temp files) younger than this are kept,
+# so an upload that is just adding its reference isn't collected
+GC_GRACE_SECONDS = 3600
+
+BLOBS_DIR = ".blobs"
+REFS_DIR = ".refs"
+
+
+class UploadStore:
+    """Stores uploads by content hash with per-user references."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self.blobs = self.root / BLOBS_DIR
+        self.refs = self.root / REFS_DIR
+
+    def blob_path(self, sha256: str) -> Path:
+        """Path of the blob with the given content hash."""
+        return self.blobs / sha256[:2] / sha256
+
+    def _ref_path(self, user_id: str, file_id: str) -> Path:
+        return self.refs / user_id / f"{file_id}.json"
+
+    async def save(
+        self,
+        user_id: str,
+        source: BinaryIO,
+        filename: str | None,
+        content_type: str | None,
+    ) -> dict[str, Any]:
+        """
+        Store an upload and add a reference to it for the user.
+
+        The source is hashed while it is copied, in UPLOAD_CHUNK_SIZE
+        chunks, in a worker thread.
+
+        Returns:
+            The reference record: id, filename, content_type, size,
+            sha256, uploaded_at
+        """
+        sha256, size, deduplicated = await asyncio.to_thread(self._store_blob, source)
+        ref = {
+            "id": str(uuid4()),
+            "filename": filename,
+            "content_type": content_type,
+            "size": size,
+            "sha256": sha256,
+            "uploaded_at": datetime.now(timezone.utc).isoformat(),
+        }
+        await asyncio.to_thread(self._write_ref, user_id, ref)
+        logger.debug("Upload stored", sha256=sha256, size=size, deduplicated=deduplicated)
+        return ref
+
+    def _store_blob(self, source: BinaryIO) -> tuple[str, int, bool]:
+        self.blobs.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        fd, temp_name = tempfile.mkstemp(dir=self.blobs, prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as temp:
+                while chunk := source.read(UPLOAD_CHUNK_SIZE):
+                    digest.update(chunk)
+                    temp.write(chunk)
+                    size += len(chunk)
+
+            sha256 = digest.hexdigest()
+            blob = self.blob_path(sha256)
+            if blob.exists():
+                try:
+                    # Refresh the mtime so a concurrent GC pass keeps it
+                    os.utime(blob)
+                    return sha256, size, True
+                except FileNotFoundError:
+                    pass  # Collected in the meantime; store it again
+
+            blob.parent.mkdir(exist_ok=True)
+            os.replace(temp_name, blob)
+            return sha256, size, False
+        finally:
+            if os.path.exists(temp_name):
+                os.unlink(temp_name)
+
+    def _write_ref(self, user_id: str, ref: dict[str, Any]) -> None:
+        path = self._ref_path(user_id, ref["id"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_suffix(".tmp")
+        temp.write_text(json.dumps(ref))
+        os.replace(temp, path)
+
+    def get(self, user_id: str, file_id: str) -> dict[str, Any] | None:
+        """A user's reference record, or None if they have no such upload."""
+        try:
+            return json.loads(self._ref_path(user_id, file_id).read_text())
+        except FileNotFoundError:
+            return None
+
+    def delete(self, user_id: str, file_id: str) -> bool:
+        """Remove a user's reference; returns False if it didn't exist."""
+        try:
+            self._ref_path(user_id, file_id).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    def list_refs(self, user_id: str) -> list[dict[str, Any]]:
+        """All reference records of a user."""
+        user_refs = self.refs / user_id
+        if not user_refs.exists():
+            return []
+        refs = []
+        for path in user_refs.glob("*.json"):
+            try:
+                refs.append(json.loads(path.read_text()))
+            except (FileNotFoundError, ValueError):
+                continue
+        return refs
+
+    def collect_garbage(self, grace_seconds: float = GC_GRACE_SECONDS) -> dict[str, int]:
+        """
+        Delete blobs no reference points to.
+
+        Blobs and temp files modified within ``grace_seconds`` are kept:
+        storing an upload refreshes its blob before writing the reference.
+
+        Returns:
+            Counts of referenced, removed and kept blobs and bytes freed
+        """
+        referenced: set[str] = set()
+        if self.refs.exists():
+            for path in self.refs.glob("*/*.json"):
+                try:
+                    referenced.add(json.loads(path.read_text())["sha256"])
+                except (FileNotFoundError, ValueError, KeyError):
+                    continue
+
+        cutoff = time.time() - grace_seconds
+        stats = {"referenced": len(referenced), "removed": 0, "kept": 0, "bytes_freed": 0}
+        if not self.blobs.exists():
+            return stats
+
+        for path in self.blobs.rglob("*"):
+            if not path.is_file() or path.name in referenced:
+                continue
+            try:
+                stat = path.stat()
+                if stat.st_mtime > cutoff:
+                    stats["kept"] += 1
+                    continue
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            stats["removed"] += 1
+            stats["bytes_freed"] += stat.st_size
+
+        logger.info("Upload garbage collection finished", **stats)
+        return stats
@@ -3,13 +3,19 @@ Usage Sync Service.
 
 Background service that periodically syncs usage data from provider APIs
 (Anthropic, OpenAI) and stores it in the provider_usage table.
+
+Incremental syncs resume from each provider's high-water mark (the newest
+report date already stored) instead of refetching the whole lookback
+period. Date ranges are split into windows fetched concurrently, and
+records are written with batched INSERT ... ON CONFLICT DO UPDATE, so
+repeating a sync is harmless.
 """
 
 import asyncio
 import json
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.dialects.postgresql import insert
 
 from ai_core import (
@@ -29,14 +35,44 @@ logger = get_logger(__name__)
 SYNC_INTERVAL_SECONDS = 3600
 # Default lookback period: 7 days
 DEFAULT_LOOKBACK_DAYS = 7
+# Days of buckets per provider request
+FETCH_WINDOW_DAYS = 7
+# Provider requests in flight at once, per provider (admin APIs are rate limited)
+MAX_CONCURRENT_FETCHES = 2
+# Days before the high-water mark that are fetched again: the newest daily
+# bucket is still filling up and costs can be reported late
+CURSOR_OVERLAP_DAYS = 1
+# Records per INSERT ... ON CONFLICT statement
+UPSERT_CHUNK_SIZE = 500
+
+
+def split_date_range(
+    start_date: datetime,
+    end_date: datetime,
+    window_days: int = FETCH_WINDOW_DAYS,
+) -> list[tuple[datetime, datetime]]:
+    """
+    Split a date range into consecutive windows of whole days.
+
+    Each window ends a second before the next one starts, so day-granular
+    APIs that treat the end date as inclusive don't fetch a day twice.
+    """
+    windows = []
+    window_start = start_date
+    while window_start <= end_date:
+        day_start = window_start.replace(hour=0, minute=0, second=0, microsecond=0)
+        window_end = min(day_start + timedelta(days=window_days, seconds=-1), end_date)
+        windows.append((window_start, window_end))
+        window_start = day_start + timedelta(days=window_days)
+    return windows
 
 
 class UsageSyncService:
     """
     Background service that syncs usage data from provider APIs.
 
-    Runs hourly, fetching the last 7 days of data and upserting
-    to the provider_usage table.
+    Runs hourly, fetching data newer than what is already stored (or the
+    last 7 days on the first run) and upserting to the provider_usage table.
     """
 
     def __init__(self):
@@ -86,6 +122,9 @@ class UsageSyncService:
         """
         Sync usage data from all configured providers.
 
+        Incremental syncs start at each provider's high-water mark when one
+        exists; other sync types always cover the full lookback period.
+
         Args:
             lookback_days: Number of days to look back
             sync_type: Type of sync operation
@@ -93,37 +132,46 @@ class UsageSyncService:
         Returns:
             Dict with sync results for each provider
         """
-        results = {}
-
-        # Calculate date range
         end_date = datetime.now(timezone.utc)
-        start_date = end_date - timedelta(days=lookback_days)
-
-        # Sync Anthropic
-        if await self._anthropic_client.is_configured():
-            results["anthropic"] = await self._sync_provider(
-                provider=APIProvider.ANTHROPIC,
-                client=self._anthropic_client,
+        default_start = end_date - timedelta(days=lookback_days)
+
+        async def sync(
+            provider: APIProvider,
+            client: AnthropicUsageClient | OpenAIUsageClient,
+        ) -> dict:
+            if not await client.is_configured():
+                return {"configured": False}
+
+            start_date = default_start
+            if sync_type == SyncType.INCREMENTAL:
+                high_water_mark = await self.get_high_water_mark(provider)
+                if high_water_mark:
+                    start_date = high_water_mark - timedelta(days=CURSOR_OVERLAP_DAYS)
+
+            return await self._sync_provider(
+                provider=provider,
+                client=client,
                 start_date=start_date,
                 end_date=end_date,
                 sync_type=sync_type,
             )
-        else:
-            results["anthropic"] = {"configured": False}
 
-        # Sync OpenAI
-        if await self._openai_client.is_configured():
-            results["openai"] = await self._sync_provider(
-                provider=APIProvider.OPENAI,
-                client=self._openai_client,
-                start_date=start_date,
-                end_date=end_date,
-                sync_type=sync_type,
-            )
-        else:
-            results["openai"] = {"configured": False}
+        # Providers have separate rate limits, so sync them side by side
+        anthropic, openai = await asyncio.gather(
+            sync(APIProvider.ANTHROPIC, self._anthropic_client),
+            sync(APIProvider.OPENAI, self._openai_client),
+        )
+        return {"anthropic": anthropic, "openai": openai}
 
-        return results
+    async def get_high_water_mark(self, provider: APIProvider) -> datetime | None:
+        """Newest report date stored for a provider, or None before the first sync."""
+        async with db_session_context() as db:
+            result = await db.execute(
+                select(func.max(ProviderUsage.report_date)).where(
+                    ProviderUsage.provider == provider,
+                )
+            )
+            return result.scalar_one_or_none()
 
     async def _sync_provider(
         self,
@@ -166,20 +214,18 @@ class UsageSyncService:
                 await db.commit()
 
             # Fetch usage data with costs
+            windows = split_date_range(start_date, end_date)
             logger.info(
                 f"Fetching {provider.value} usage data",
                 start_date=start_date.isoformat(),
                 end_date=end_date.isoformat(),
+                windows=len(windows),
             )
 
-            records = await client.get_usage_with_costs(start_date, end_date)
+            records = await self._fetch_records(client, windows)
             logger.info(f"Fetched {len(records)} usage records from {provider.value}")
 
-            # Upsert records
-            synced_count = 0
-            for record in records:
-                await self._upsert_usage_record(provider, record)
-                synced_count += 1
+            synced_count = await self._upsert_usage_records(provider, records)
 
             # Update sync log with success
             completed_at = datetime.now(timezone.utc)
@@ -219,66 +265,73 @@ class UsageSyncService:
                 "error": str(e),
             }
 
-    async def _upsert_usage_record(
+    async def _fetch_records(
+        self,
+        client: AnthropicUsageClient | OpenAIUsageClient,
+        windows: list[tuple[datetime, datetime]],
+    ) -> list[UsageRecord]:
+        """Fetch usage with costs for each window, a few windows at a time."""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+
+        async def fetch(window_start: datetime, window_end: datetime) -> list[UsageRecord]:
+            async with semaphore:
+                return await client.get_usage_with_costs(window_start, window_end)
+
+        results = await asyncio.gather(*(fetch(*window) for window in windows))
+        return [record for records in results for record in records]
+
+    async def _upsert_usage_records(
         self,
         provider: APIProvider,
-        record: UsageRecord,
-    ) -> None:
+        records: list[UsageRecord],
+    ) -> int:
         """
-        Upsert a single usage record.
+        Upsert usage records in chunks with INSERT ... ON CONFLICT DO UPDATE.
 
-        Uses a manual check-then-insert/update approach to handle NULL workspace_id
-        properly (PostgreSQL unique indexes treat NULLs as distinct).
+        Records are deduplicated on the unique key (a statement can't update
+        the same row twice) and written oldest first, one transaction per
+        chunk, so a failed sync never leaves a gap below the high-water mark.
+
+        Returns:
+            Number of records written
         """
-        async with db_session_context() as db:
-            # Prepare raw response as JSON string
-            raw_response_str = None
-            if record.raw_response:
-                raw_response_str = json.dumps(record.raw_response)
-
-            # Check if record exists (handling NULL workspace_id)
-            if record.workspace_id:
-                existing_stmt = select(ProviderUsage).where(
-                    ProviderUsage.provider == provider,
-                    ProviderUsage.report_date == record.report_date,
-                    ProviderUsage.model == record.model,
-                    ProviderUsage.workspace_id == record.workspace_id,
-                )
-            else:
-                existing_stmt = select(ProviderUsage).where(
-                    ProviderUsage.provider == provider,
-                    ProviderUsage.report_date == record.report_date,
-                    ProviderUsage.model == record.model,
-                    ProviderUsage.workspace_id.is_(None),
-                )
+        latest: dict[tuple, UsageRecord] = {}
+        for record in records:
+            latest[(record.report_date, record.model, record.workspace_id)] = record
+        rows = [
+            {
+                "id": generate_uuid(),
+                "provider": provider,
+                "report_date": record.report_date,
+                "model": record.model,
+                "input_tokens": record.input_tokens,
+                "output_tokens": record.output_tokens,
+                "cached_tokens": record.cached_tokens,
+                "cost_usd": record.cost_usd,
+                "workspace_id": record.workspace_id,
+                "raw_response": json.dumps(record.raw_response) if record.raw_response else None,
+            }
+            for record in sorted(latest.values(), key=lambda r: r.report_date)
+        ]
 
-            result = await db.execute(existing_stmt)
-            existing = result.scalar_one_or_none()
-
-            if existing:
-                # Update existing record
-                existing.input_tokens = record.input_tokens
-                existing.output_tokens = record.output_tokens
-                existing.cached_tokens = record.cached_tokens
-                existing.cost_usd = record.cost_usd
-                existing.raw_response = raw_response_str
-            else:
-                # Insert new record
-                new_record = ProviderUsage(
-                    id=generate_uuid(),
-                    provider=provider,
-                    report_date=record.report_date,
-                    model=record.model,
-                    input_tokens=record.input_tokens,
-                    output_tokens=record.output_tokens,
-                    cached_tokens=record.cached_tokens,
-                    cost_usd=record.cost_usd,
-                    workspace_id=record.workspace_id,
-                    raw_response=raw_response_str,
+        async with db_session_context() as db:
+            for offset in range(0, len(rows), UPSERT_CHUNK_SIZE):
+                stmt = insert(ProviderUsage).values(rows[offset:offset + UPSERT_CHUNK_SIZE])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["provider", "report_date", "model", "workspace_id"],
+                    set_={
+                        "input_tokens": stmt.excluded.input_tokens,
+                        "output_tokens": stmt.excluded.output_tokens,
+                        "cached_tokens": stmt.excluded.cached_tokens,
+                        "cost_usd": stmt.excluded.cost_usd,
+                        "raw_response": stmt.excluded.raw_response,
+                        "updated_at": func.now(),
+                    },
                 )
-                db.add(new_record)
+                await db.execute(stmt)
+                await db.commit()
 
-            await db.commit()
+        return len(rows)
 
     async def get_sync_status(self) -> dict:
         """
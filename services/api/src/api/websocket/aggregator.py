@@ -0,0 +1,205 @@
+"""
+Aggregation of high-frequency agent events for WebSocket delivery.
+
+Agents publish streamed tokens, status, step/todo progress, actions and
+thinking updates as individual events. Sending each as its own frame
+means thousands of tiny frames per second under parallel plans. The
+aggregator holds these events for a short per-conversation window and
+flushes them as one frame:
+
+- superseding updates (``manager.SUPERSEDING_TYPES``) keep only the latest
+  event per key, at the position of the first one; delta updates
+  (``manager.DELTA_FIELDS``) are kept in order and end that run, so a
+  later full update is appended after them rather than replacing one
+  they apply to
+- consecutive streamed tokens for the same message are concatenated
+- everything else in the window is kept in order
+
+A window with a single event is sent unchanged; otherwise a
+``{"type": "batch", "events": [...]}`` frame is sent. Events outside
+``AGGREGATED_TYPES`` flush the conversation's window first and are sent
+immediately, so ordering with complete messages and errors is kept.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any
+
+from ai_core import get_logger
+
+from .manager import ConnectionManager, coalesce_key, delta_key
+
+logger = get_logger(__name__)
+
+# How long events are held before a conversation's window is flushed
+DEFAULT_WINDOW_SECONDS = 0.05
+
+# Flush early once a window holds this many events
+MAX_WINDOW_EVENTS = 200
+
+# Event types worth holding back for a window
+AGGREGATED_TYPES = {
+    "token",
+    "agent_status",
+    "agent_action",
+    "thinking_stream",
+    "step_update",
+    "todo_progress",
+    "usage_update",
+}
+
+
+@dataclass
+class _Window:
+    """Events buffered for one user's conversation."""
+
+    events: list[dict[str, Any]] = field(default_factory=list)
+    # Coalesce key -> index in ``events`` of the superseding update
+    latest: dict[tuple, int] = field(default_factory=dict)
+    handle: asyncio.TimerHandle | None = None
+    received: int = 0
+
+
+class EventAggregator:
+    """
+    Buffers agent events per user and conversation and flushes them as
+    merged frames through the ConnectionManager.
+    """
+
+    def __init__(
+        self,
+        manager: ConnectionManager,
+        window_seconds: float = DEFAULT_WINDOW_SECONDS,
+    ):
+        self.manager = manager
+        self.window_seconds = window_seconds
+        self._windows: dict[tuple[str, str | None], _Window] = {}
+        # Timer-driven flushes in flight, kept so they aren't garbage collected
+        self._pending_flushes: set[asyncio.Task[None]] = set()
+        self.events_received = 0
+        self.frames_sent = 0
+
+    async def send(self, user_id: str, message: dict[str, Any]) -> int:
+        """
+        Send an event to a user, aggregating it if it is high-frequency.
+
+        Returns the number of connections the event is (or will be) sent to.
+        """
+        self.events_received += 1
+        key = (user_id, message.get("conversation_id"))
+
+        if self.window_seconds <= 0 or message.get("type") not in AGGREGATED_TYPES:
+            await self.flush(key)
+            self.frames_sent += 1
+            return await self.manager.send_personal(user_id, message)
+
+        window = self._windows.get(key)
+        if window is None:
+            window = _Window()
+            self._windows[key] = window
+            window.handle = asyncio.get_running_loop().call_later(
+                self.window_seconds, self._schedule_flush, key
+            )
+
+        self._add(window, message)
+        if len(window.events) >= MAX_WINDOW_EVENTS:
+            await self.flush(key)
+
+        return self.manager.get_connection_count(user_id)
+
+    @staticmethod
+    def _add(window: _Window, message: dict[str, Any]) -> None:
+        window.received += 1
+        events = window.events
+
+        base = delta_key(message)
+        if base is not None:
+            window.latest.pop(base, None)
+
+        key = coalesce_key(message)
+        if key is not None:
+            index = window.latest.get(key)
+            if index is not None:
+                # Latest status wins
+                events[index] = message
+                return
+            window.latest[key] = len(events)
+            events.append(message)
+            return
+
+        if message.get("type") == "token" and events:
+            last = events[-1]
+            if (
+                last.get("type") == "token"
+                and last.get("message_id") == message.get("message_id")
+                and last.get("agent") == message.get("agent")
+            ):
+                # Copy before extending so the caller's dict is untouched
+                events[-1] = {**last, "token": (last.get("token") or "") + (message.get("token") or "")}
+                return
+
+        events.append(message)
+
+    def _schedule_flush(self, key: tuple[str, str | None]) -> None:
+        window = self._windows.get(key)
+        if window is not None:
+            window.handle = None
+            task = asyncio.create_task(self._timed_flush(key))
+            self._pending_flushes.add(task)
+            task.add_done_callback(self._pending_flushes.discard)
+
+    async def _timed_flush(self, key: tuple[str, str | None]) -> None:
+        try:
+            await self.flush(key)
+        except Exception as e:
+            logger.warning(
+                "Failed to flush aggregated agent events",
+                user_id=key[0],
+                conversation_id=key[1],
+                error=str(e),
+            )
+
+    async def flush(self, key: tuple[str, str | None]) -> None:
+        """Send whatever is buffered for a user's conversation."""
+        window = self._windows.pop(key, None)
+        if window is None or not window.events:
+            return
+        if window.handle is not None:
+            window.handle.cancel()
+
+        user_id, conversation_id = key
+        if len(window.events) == 1:
+            frame = window.events[0]
+        else:
+            frame = {
+                "type": "batch",
+                "conversation_id": conversation_id,
+                "events": window.events,
+            }
+
+        self.frames_sent += 1
+        await self.manager.send_personal(user_id, frame)
+
+        if window.received > len(window.events):
+            logger.debug(
+                "Aggregated agent events",
+                user_id=user_id,
+                conversation_id=conversation_id,
+                received=window.received,
+                sent=len(window.events),
+            )
+
+    async def flush_all(self) -> None:
+        """Flush every open window (e.g. on shutdown)."""
+        for key in list(self._windows):
+            await self.flush(key)
+        if self._pending_flushes:
+            await asyncio.gather(*self._pending_flushes, return_exceptions=True)
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "window_seconds": self.window_seconds,
+            "open_windows": len(self._windows),
+            "events_received": self.events_received,
+            "frames_sent": self.frames_sent,
+        }
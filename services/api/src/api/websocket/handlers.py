@@ -14,6 +14,8 @@ from sqlalchemy import select
 
 from ..commands import CommandHandler, extract_hashtags
 from ..database import db_session_context
+from ..services.conversation_history import get_conversation_history
+from .aggregator import DEFAULT_WINDOW_SECONDS, EventAggregator
 from .manager import Connection, ConnectionManager
 
 logger = get_logger(__name__)
@@ -33,6 +35,7 @@ class MessageHandler:
         self.redis = redis
         self.pubsub = PubSubManager(redis)
         self.command_handler = CommandHandler(redis)
+        self.history = get_conversation_history(redis)
 
     async def _get_conversation_history(
         self, conversation_id: str, limit: int = 10
@@ -43,26 +46,16 @@ class MessageHandler:
         Returns list of messages with role, content, timestamp.
         """
         try:
-            conv_msgs_key = f"conversation:{conversation_id}:messages"
-            # Get recent message IDs (stored newest first via lpush)
-            message_ids = await self.redis.lrange(conv_msgs_key, 0, limit - 1)
-
-            if not message_ids:
-                return []
-
-            history = []
-            for msg_id in reversed(message_ids):  # Reverse to get chronological order
-                msg_key = f"message:{msg_id}"
-                msg_data = await self.redis.hgetall(msg_key)
-                if msg_data:
-                    history.append({
-                        "role": msg_data.get("role", "user"),
-                        "content": msg_data.get("content", ""),
-                        "timestamp": msg_data.get("timestamp", ""),
-                        "agent": msg_data.get("agent"),
-                    })
-
-            return history
+            messages = await self.history.recent(conversation_id, limit=limit)
+            return [
+                {
+                    "role": msg.get("role", "user"),
+                    "content": msg.get("content", ""),
+                    "timestamp": msg.get("timestamp", ""),
+                    "agent": msg.get("agent"),
+                }
+                for msg in messages
+            ]
         except Exception as e:
             logger.warning("Failed to fetch conversation history", error=str(e))
             return []
@@ -234,39 +227,17 @@ class MessageHandler:
         message_id = data.get("message_id") or str(uuid4())
         timestamp = datetime.now(timezone.utc).isoformat()
 
-        # Store message in Redis
-        msg_key = f"message:{message_id}"
-        msg_data = {
+        # Store message in Redis (persisted to PostgreSQL in the background)
+        msg_data: dict[str, Any] = {
             "id": message_id,
-            "conversation_id": conversation_id,
             "user_id": connection.user_id,
             "role": "user",
             "content": content,
             "timestamp": timestamp,
         }
         if memory_tags:
-            msg_data["memory_tags"] = json.dumps(memory_tags)
-        await self.redis.hset(msg_key, mapping=msg_data)
-
-        # Add to conversation message list
-        conv_msgs_key = f"conversation:{conversation_id}:messages"
-        await self.redis.lpush(conv_msgs_key, message_id)
-
-        # Update conversation
-        conv_key = f"conversation:{conversation_id}"
-        await self.redis.hset(conv_key, "updated_at", timestamp)
-        await self.redis.hincrby(conv_key, "message_count", 1)
-
-        # Persist to PostgreSQL asynchronously
-        asyncio.create_task(
-            self._persist_message_to_db(
-                message_id=message_id,
-                conversation_id=conversation_id,
-                role="user",
-                content=content,
-                user_id=connection.user_id,
-            )
-        )
+            msg_data["memory_tags"] = memory_tags
+        await self.history.append(conversation_id, msg_data)
 
         # Generate conversation title from first message (async, non-blocking)
         asyncio.create_task(
@@ -516,13 +487,10 @@ class MessageHandler:
             timestamp = result.get("timestamp") or datetime.now(timezone.utc).isoformat()
             message_id = f"cmd-{uuid4()}"
 
-            # Store message in Redis
-            msg_key = f"message:{message_id}"
-            await self.redis.hset(
-                msg_key,
-                mapping={
+            await self.history.append(
+                conversation_id,
+                {
                     "id": message_id,
-                    "conversation_id": conversation_id,
                     "user_id": connection.user_id,
                     "role": "assistant",
                     "content": result.get("content", ""),
@@ -531,15 +499,6 @@ class MessageHandler:
                 },
             )
 
-            # Add to conversation message list
-            conv_msgs_key = f"conversation:{conversation_id}:messages"
-            await self.redis.lpush(conv_msgs_key, message_id)
-
-            # Update conversation
-            conv_key = f"conversation:{conversation_id}"
-            await self.redis.hset(conv_key, "updated_at", timestamp)
-            await self.redis.hincrby(conv_key, "message_count", 1)
-
         # Send command result to user
         await self.manager.send_personal(
             connection.user_id,
@@ -565,7 +524,7 @@ class MessageHandler:
         data: dict[str, Any],
     ) -> None:
         """Handle ping/heartbeat message."""
-        await connection.websocket.send_json({
+        connection.send({
             "type": "pong",
             "timestamp": datetime.now(timezone.utc).isoformat(),
         })
@@ -590,7 +549,7 @@ class MessageHandler:
         channels = data.get("channels", [])
         # Store subscription info for this connection
         # Implementation depends on subscription model
-        await connection.websocket.send_json({
+        connection.send({
             "type": "subscribed",
             "channels": channels,
         })
@@ -602,7 +561,7 @@ class MessageHandler:
     ) -> None:
         """Handle unsubscription from events."""
         channels = data.get("channels", [])
-        await connection.websocket.send_json({
+        connection.send({
             "type": "unsubscribed",
             "channels": channels,
         })
@@ -647,7 +606,7 @@ class MessageHandler:
         )
 
         # Send acknowledgment
-        await connection.websocket.send_json({
+        connection.send({
             "type": "task_control_ack",
             "action": action,
             "conversation_id": conversation_id,
@@ -694,7 +653,7 @@ class MessageHandler:
         )
 
         # Send acknowledgment
-        await connection.websocket.send_json({
+        connection.send({
             "type": "message_queued",
             "content": content[:50] + "..." if len(content) > 50 else content,
             "conversation_id": conversation_id,
@@ -757,7 +716,7 @@ class MessageHandler:
             return
 
         # Send acknowledgment
-        await connection.websocket.send_json({
+        connection.send({
             "type": "rollback_initiated",
             "plan_id": plan_id,
             "step_id": step_id,
@@ -822,7 +781,7 @@ class MessageHandler:
             return
 
         # Send acknowledgment
-        await connection.websocket.send_json({
+        connection.send({
             "type": "redo_initiated",
             "plan_id": plan_id,
             "task_id": task_id,
@@ -831,36 +790,6 @@ class MessageHandler:
             "timestamp": datetime.now(timezone.utc).isoformat(),
         })
 
-    async def _persist_message_to_db(
-        self,
-        message_id: str,
-        conversation_id: str,
-        role: str,
-        content: str,
-        agent: str | None = None,
-        user_id: str | None = None,
-    ) -> None:
-        """Persist a message to PostgreSQL asynchronously."""
-        try:
-            from database.models import Message
-
-            async with db_session_context() as session:
-                msg = Message(
-                    id=message_id,
-                    conversation_id=conversation_id,
-                    role=role,
-                    content=content,
-                    agent=agent,
-                    user_id=user_id,
-                )
-                session.add(msg)
-        except Exception as e:
-            logger.warning(
-                "Failed to persist message to DB",
-                message_id=message_id,
-                error=str(e),
-            )
-
     async def _send_error(
         self,
         connection: Connection,
@@ -868,7 +797,7 @@ class MessageHandler:
     ) -> None:
         """Send error message to connection."""
         try:
-            await connection.websocket.send_json({
+            connection.send({
                 "type": "error",
                 "error": error,
                 "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -1019,15 +948,20 @@ class AgentResponseHandler:
     Handles responses from agents and routes them to WebSocket clients.
 
     Listens to Redis pub/sub for agent responses and streams them to users.
+    High-frequency progress events are merged per conversation by an
+    EventAggregator before they reach the connections.
     """
 
     def __init__(
         self,
         manager: ConnectionManager,
         redis: RedisClient,
+        event_window_seconds: float = DEFAULT_WINDOW_SECONDS,
     ):
         self.manager = manager
         self.redis = redis
+        self.aggregator = EventAggregator(manager, window_seconds=event_window_seconds)
+        self.history = get_conversation_history(redis)
         self._running = False
 
     async def start(self) -> None:
@@ -1056,6 +990,7 @@ class AgentResponseHandler:
                         logger.error("Error handling agent response", error=str(e))
 
         finally:
+            await self.aggregator.flush_all()
             await pubsub.unsubscribe("agent:responses")
             await pubsub.aclose()  # Close connection to prevent memory leak
             logger.info("Agent response handler stopped")
@@ -1064,35 +999,6 @@ class AgentResponseHandler:
         """Stop listening for agent responses."""
         self._running = False
 
-    async def _persist_agent_message_to_db(
-        self,
-        message_id: str,
-        conversation_id: str,
-        content: str,
-        agent: str,
-        user_id: str | None = None,
-    ) -> None:
-        """Persist an agent message to PostgreSQL asynchronously."""
-        try:
-            from database.models import Message
-
-            async with db_session_context() as session:
-                msg = Message(
-                    id=message_id,
-                    conversation_id=conversation_id,
-                    role="assistant",
-                    content=content,
-                    agent=agent,
-                    user_id=user_id,
-                )
-                session.add(msg)
-        except Exception as e:
-            logger.warning(
-                "Failed to persist agent message to DB",
-                message_id=message_id,
-                error=str(e),
-            )
-
     async def _maybe_generate_title(
         self,
         conversation_id: str,
@@ -1378,7 +1284,7 @@ RESPONSE TO ANALYZE:
 
         if response_type == "token":
             # Streaming token
-            await self.manager.send_personal(
+            await self.aggregator.send(
                 user_id,
                 {
                     "type": "token",
@@ -1401,13 +1307,11 @@ RESPONSE TO ANALYZE:
                 # Generate message ID for agent response
                 agent_message_id = f"agent-{message_id or uuid4()}"
 
-                # Store message in Redis
-                msg_key = f"message:{agent_message_id}"
-                await self.redis.hset(
-                    msg_key,
-                    mapping={
+                # Store message in Redis (persisted to PostgreSQL in the background)
+                await self.history.append(
+                    conversation_id,
+                    {
                         "id": agent_message_id,
-                        "conversation_id": conversation_id,
                         "user_id": user_id,
                         "role": "assistant",
                         "content": content,
@@ -1416,26 +1320,6 @@ RESPONSE TO ANALYZE:
                     },
                 )
 
-                # Add to conversation message list
-                conv_msgs_key = f"conversation:{conversation_id}:messages"
-                await self.redis.lpush(conv_msgs_key, agent_message_id)
-
-                # Update conversation
-                conv_key = f"conversation:{conversation_id}"
-                await self.redis.hset(conv_key, "updated_at", timestamp or datetime.now(timezone.utc).isoformat())
-                await self.redis.hincrby(conv_key, "message_count", 1)
-
-                # Persist to PostgreSQL asynchronously
-                asyncio.create_task(
-                    self._persist_agent_message_to_db(
-                        message_id=agent_message_id,
-                        conversation_id=conversation_id,
-                        content=content,
-                        agent=agent or "supervisor",
-                        user_id=user_id,
-                    )
-                )
-
                 # Extract learnings from the response as a background task
                 # Get project_id from conversation (agent response may not include it)
                 project_id = data.get("project_id")
@@ -1468,11 +1352,11 @@ RESPONSE TO ANALYZE:
             if usage:
                 ws_message["usage"] = usage
 
-            await self.manager.send_personal(user_id, ws_message)
+            await self.aggregator.send(user_id, ws_message)
 
         elif response_type == "status":
             # Agent status update
-            await self.manager.send_personal(
+            await self.aggregator.send(
                 user_id,
                 {
                     "type": "agent_status",
@@ -1484,7 +1368,7 @@ RESPONSE TO ANALYZE:
 
         elif response_type == "action":
             # Real-time action update (Claude Code-style)
-            sent_count = await self.manager.send_personal(
+            sent_count = await self.aggregator.send(
                 user_id,
                 {
                     "type": "agent_action",
@@ -1505,7 +1389,7 @@ RESPONSE TO ANALYZE:
 
         elif response_type == "thinking_stream":
             # Narrative thinking/reasoning stream (Thinking panel)
-            sent_count = await self.manager.send_personal(
+            sent_count = await self.aggregator.send(
                 user_id,
                 {
                     "type": "thinking_stream",
@@ -1528,7 +1412,7 @@ RESPONSE TO ANALYZE:
 
         elif response_type == "quality_check_result":
             # Quality check result after task completion
-            await self.manager.send_personal(
+            await self.aggregator.send(
                 user_id,
                 {
                     "type": "quality_check_result",
@@ -1551,7 +1435,7 @@ RESPONSE TO ANALYZE:
 
         elif response_type == "rollback_complete":
             # Rollback operation completed
-            await self.manager.send_personal(
+            await self.aggregator.send(
                 user_id,
                 {
                     "type": "rollback_complete",
@@ -1574,7 +1458,7 @@ RESPONSE TO ANALYZE:
 
         elif response_type == "redo_complete":
             # Redo operation completed
-            await self.manager.send_personal(
+            await self.aggregator.send(
                 user_id,
                 {
                     "type": "redo_complete",
@@ -1597,7 +1481,7 @@ RESPONSE TO ANALYZE:
 
         elif response_type == "error":
             # Error from agent
-            await self.manager.send_personal(
+            await self.aggregator.send(
                 user_id,
                 {
                     "type": "error",
@@ -1653,7 +1537,7 @@ RESPONSE TO ANALYZE:
                         error=str(e),
                     )
 
-            await self.manager.send_personal(
+            await self.aggregator.send(
                 user_id,
                 {
                     "type": "plan_update",
@@ -1675,7 +1559,7 @@ RESPONSE TO ANALYZE:
 
         elif response_type == "plan_status":
             # Plan status change notification
-            await self.manager.send_personal(
+            await self.aggregator.send(
                 user_id,
                 {
                     "type": "plan_status",
@@ -1687,18 +1571,21 @@ RESPONSE TO ANALYZE:
 
         elif response_type == "step_update":
             # Plan step progress update (todo-style checkboxes)
-            await self.manager.send_personal(
-                user_id,
-                {
-                    "type": "step_update",
-                    "conversation_id": data.get("conversation_id"),
-                    "plan_id": data.get("plan_id"),
-                    "steps": data.get("steps", []),
-                    "current_step": data.get("current_step", 0),
-                    "agent": data.get("agent"),
-                    "timestamp": data.get("timestamp"),
-                },
-            )
+            step_update = {
+                "type": "step_update",
+                "conversation_id": data.get("conversation_id"),
+                "plan_id": data.get("plan_id"),
+                "current_step": data.get("current_step", 0),
+                "agent": data.get("agent"),
+                "timestamp": data.get("timestamp"),
+            }
+            # Progress ticks carry only the changed steps; new or
+            # restructured plans carry the full step list
+            if "step_changes" in data:
+                step_update["step_changes"] = data["step_changes"]
+            else:
+                step_update["steps"] = data.get("steps", [])
+            await self.aggregator.send(user_id, step_update)
             logger.debug(
                 "Step update sent to user",
                 user_id=user_id,
@@ -1708,7 +1595,7 @@ RESPONSE TO ANALYZE:
 
         elif response_type == "todo_progress":
             # Individual todo item progress within a step
-            await self.manager.send_personal(
+            await self.aggregator.send(
                 user_id,
                 {
                     "type": "todo_progress",
@@ -1731,7 +1618,7 @@ RESPONSE TO ANALYZE:
 
         elif response_type == "conversation_renamed":
             # Conversation title was auto-generated
-            await self.manager.send_personal(
+            await self.aggregator.send(
                 user_id,
                 {
                     "type": "conversation_renamed",
@@ -1748,7 +1635,7 @@ RESPONSE TO ANALYZE:
 
         elif response_type == "usage_update":
             # Real-time API usage update for frontend meter
-            await self.manager.send_personal(
+            await self.aggregator.send(
                 user_id,
                 {
                     "type": "usage_update",
@@ -1770,7 +1657,7 @@ RESPONSE TO ANALYZE:
 
         elif response_type == "branch_mismatch_warning":
             # Warning when plan branch differs from current branch
-            await self.manager.send_personal(
+            await self.aggregator.send(
                 user_id,
                 {
                     "type": "branch_mismatch_warning",
@@ -1,20 +1,111 @@
 """
 WebSocket connection manager.
+
+Every connection owns a bounded outbound queue drained by a dedicated
+writer task, so a slow client only delays its own frames. Fan-out just
+serializes a message once and enqueues it. When a client lags, the queue
+applies backpressure:
+
+- superseding updates (agent status, step/todo progress, usage) replace
+  their still-queued predecessor instead of queueing behind it
+- best-effort frames (actions, thinking stream, typing) are dropped
+- clients whose queue stays full, or whose sends stall, are disconnected
 """
 
 import asyncio
 import json
-from collections import defaultdict
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any
 
 from fastapi import WebSocket
 
-from ai_core import get_logger
+from ai_core import (
+    get_logger,
+    websocket_connections_active,
+    websocket_frames_dropped_total,
+    websocket_send_queue_depth,
+    websocket_slow_disconnects_total,
+)
 
 logger = get_logger(__name__)
 
+# Frames that may be queued per connection before the client is cut off
+MAX_QUEUE_SIZE = 256
+
+# Above this depth the client is lagging and best-effort frames are dropped
+LAG_THRESHOLD = 64
+
+# A single frame taking longer than this to send means the client is stuck
+SEND_TIMEOUT = 10.0
+
+# Close code for clients that cannot keep up (1013: try again later)
+SLOW_CLIENT_CLOSE_CODE = 1013
+
+# Longest wait for a close handshake; stuck clients never complete one
+CLOSE_TIMEOUT = 2.0
+
+# Message type -> fields identifying the state a newer frame supersedes
+SUPERSEDING_TYPES: dict[str, tuple[str, ...]] = {
+    "agent_status": ("agent",),
+    "step_update": ("conversation_id", "plan_id"),
+    "todo_progress": ("plan_id", "step_id", "todo_index"),
+    "usage_update": ("conversation_id",),
+    "plan_status": ("conversation_id",),
+    "typing": ("conversation_id", "agent"),
+}
+
+# Message type -> field marking a delta frame, which carries only part of the
+# state (e.g. the changed steps of a plan) and so never supersedes or is
+# superseded; a full-state frame may only replace one queued after the last delta
+DELTA_FIELDS: dict[str, str] = {
+    "step_update": "step_changes",
+}
+
+# Message types that can be dropped for lagging clients
+BEST_EFFORT_TYPES = {"agent_action", "thinking_stream", "typing"}
+
+
+def encode_message(message: dict[str, Any]) -> str:
+    """Serialize a message the way ``WebSocket.send_json`` does."""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+def _state_key(message: dict[str, Any]) -> tuple | None:
+    fields = SUPERSEDING_TYPES.get(message.get("type", ""))
+    if fields is None:
+        return None
+    return (message["type"], *(message.get(f) for f in fields))
+
+
+def _is_delta(message: dict[str, Any]) -> bool:
+    field_name = DELTA_FIELDS.get(message.get("type", ""))
+    return field_name is not None and field_name in message
+
+
+def coalesce_key(message: dict[str, Any]) -> tuple | None:
+    """Key under which a newer full-state frame replaces this one, if any."""
+    if _is_delta(message):
+        return None
+    return _state_key(message)
+
+
+def delta_key(message: dict[str, Any]) -> tuple | None:
+    """Key of the full state a delta frame applies on top of, if it is one."""
+    if not _is_delta(message):
+        return None
+    return _state_key(message)
+
+
+@dataclass
+class _Frame:
+    """A queued outbound frame."""
+
+    text: str
+    key: tuple | None = None
+    best_effort: bool = False
+
 
 @dataclass
 class Connection:
@@ -25,6 +116,104 @@ class Connection:
     username: str
     connected_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     last_activity: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    max_queue_size: int = MAX_QUEUE_SIZE
+    lag_threshold: int = LAG_THRESHOLD
+
+    # Outbound queue state, owned by the connection's writer task
+    _queue: deque[_Frame] = field(default_factory=deque, repr=False)
+    _pending: dict[tuple, _Frame] = field(default_factory=dict, repr=False)
+    _ready: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    _writer: asyncio.Task | None = field(default=None, repr=False)
+    # Loop time the in-flight send started, checked by the stall watchdog
+    _send_started: float | None = field(default=None, repr=False)
+    closed: bool = False
+    overflowed: bool = False
+
+    # Delivery counters for stats
+    frames_sent: int = 0
+    frames_dropped: int = 0
+    frames_coalesced: int = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def send(self, message: dict[str, Any]) -> bool:
+        """Queue a message for this connection; returns False if it was not queued."""
+        return self.enqueue(encode_message(message), message)
+
+    def enqueue(self, text: str, message: dict[str, Any]) -> bool:
+        """
+        Queue an already serialized message.
+
+        Returns False when the frame was dropped or the connection is closed
+        or over capacity; the writer task closes over-capacity connections.
+        """
+        if self.closed or self.overflowed:
+            return False
+
+        depth = len(self._queue)
+        websocket_send_queue_depth.observe(depth)
+
+        base = delta_key(message)
+        if base is not None:
+            # Later full state must not jump ahead of this delta
+            self._pending.pop(base, None)
+
+        key = coalesce_key(message)
+        if key is not None:
+            queued = self._pending.get(key)
+            if queued is not None:
+                # Latest state wins, keeping the original queue position
+                queued.text = text
+                self.frames_coalesced += 1
+                websocket_frames_dropped_total.labels(reason="coalesced").inc()
+                return True
+
+        best_effort = message.get("type") in BEST_EFFORT_TYPES
+        if best_effort and depth >= self.lag_threshold:
+            self.frames_dropped += 1
+            websocket_frames_dropped_total.labels(reason="lagging").inc()
+            return False
+
+        if depth >= self.max_queue_size:
+            self._evict_best_effort()
+            if len(self._queue) >= self.max_queue_size:
+                self.overflowed = True
+                self._ready.set()
+                return False
+
+        frame = _Frame(text, key, best_effort)
+        self._queue.append(frame)
+        if key is not None:
+            self._pending[key] = frame
+        self._ready.set()
+        return True
+
+    def _evict_best_effort(self) -> None:
+        kept = deque(f for f in self._queue if not f.best_effort)
+        evicted = len(self._queue) - len(kept)
+        if evicted:
+            # Evicted frames must not absorb later updates to the same state
+            for frame in self._queue:
+                if frame.best_effort and frame.key is not None and self._pending.get(frame.key) is frame:
+                    del self._pending[frame.key]
+            self._queue = kept
+            self.frames_dropped += evicted
+            websocket_frames_dropped_total.labels(reason="overflow").inc(evicted)
+
+    async def _next_frame(self) -> _Frame | None:
+        while not self._queue:
+            if self.overflowed or self.closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+        if self.overflowed:
+            return None
+        frame = self._queue.popleft()
+        if frame.key is not None and self._pending.get(frame.key) is frame:
+            del self._pending[frame.key]
+        return frame
 
 
 class ConnectionManager:
@@ -32,15 +221,27 @@ class ConnectionManager:
     Manages WebSocket connections for real-time chat.
 
     Tracks connections per user and provides broadcast capabilities.
+    Sends never block on a client: messages are queued per connection
+    and written by that connection's writer task.
     """
 
-    def __init__(self, max_connections_per_user: int = 5):
+    def __init__(
+        self,
+        max_connections_per_user: int = 5,
+        max_queue_size: int = MAX_QUEUE_SIZE,
+        lag_threshold: int = LAG_THRESHOLD,
+        send_timeout: float = SEND_TIMEOUT,
+    ):
         self.max_connections_per_user = max_connections_per_user
+        self.max_queue_size = max_queue_size
+        self.lag_threshold = lag_threshold
+        self.send_timeout = send_timeout
         # user_id -> list of Connection
         self._connections: dict[str, list[Connection]] = defaultdict(list)
         # websocket -> Connection for reverse lookup
         self._websocket_to_connection: dict[WebSocket, Connection] = {}
         self._lock = asyncio.Lock()
+        self._watchdog: asyncio.Task | None = None
 
     async def connect(
         self,
@@ -62,13 +263,15 @@ class ConnectionManager:
         Raises:
             ValueError: If user has too many connections
         """
+        evicted = None
         async with self._lock:
             # Check connection limit
             user_connections = self._connections[user_id]
             if len(user_connections) >= self.max_connections_per_user:
                 # Close oldest connection
                 oldest = user_connections[0]
-                await self._remove_connection(oldest)
+                if self._remove_connection(oldest):
+                    evicted = oldest
                 logger.info(
                     "Closed oldest connection for user",
                     user_id=user_id,
@@ -83,10 +286,16 @@ class ConnectionManager:
                 websocket=websocket,
                 user_id=user_id,
                 username=username,
+                max_queue_size=self.max_queue_size,
+                lag_threshold=self.lag_threshold,
             )
+            connection._writer = asyncio.create_task(self._write_loop(connection))
+            if self._watchdog is None or self._watchdog.done():
+                self._watchdog = asyncio.create_task(self._watch_stalled_sends())
 
             self._connections[user_id].append(connection)
             self._websocket_to_connection[websocket] = connection
+            websocket_connections_active.inc()
 
             logger.info(
                 "WebSocket connected",
@@ -94,7 +303,9 @@ class ConnectionManager:
                 connections=len(self._connections[user_id]),
             )
 
-            return connection
+        if evicted is not None:
+            await self._close_socket(evicted)
+        return connection
 
     async def disconnect(self, websocket: WebSocket) -> None:
         """
@@ -105,14 +316,107 @@ class ConnectionManager:
         """
         async with self._lock:
             connection = self._websocket_to_connection.get(websocket)
-            if connection:
-                await self._remove_connection(connection)
+            if connection is None or not self._remove_connection(connection):
+                return
+        await self._close_socket(connection)
+
+    async def _write_loop(self, connection: Connection) -> None:
+        """Drain a connection's queue onto its socket."""
+        loop = asyncio.get_running_loop()
+        reason = None
+        try:
+            while True:
+                frame = await connection._next_frame()
+                if frame is None:
+                    if connection.overflowed:
+                        reason = "queue_full"
+                    break
+                connection._send_started = loop.time()
+                await connection.websocket.send_text(frame.text)
+                connection._send_started = None
+                connection.frames_sent += 1
+                connection.last_activity = datetime.now(timezone.utc)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(
+                "Failed to send to connection",
+                user_id=connection.user_id,
+                error=str(e),
+            )
+
+        if connection.closed:
+            return
+
+        if reason:
+            websocket_slow_disconnects_total.labels(reason=reason).inc()
+            logger.warning(
+                "Disconnecting slow WebSocket client",
+                user_id=connection.user_id,
+                reason=reason,
+                queue_depth=connection.queue_depth,
+            )
+        async with self._lock:
+            removed = self._remove_connection(connection)
+        if removed:
+            await self._close_socket(connection, code=SLOW_CLIENT_CLOSE_CODE if reason else 1000)
+
+    async def _watch_stalled_sends(self) -> None:
+        """
+        Disconnect clients whose current send has stalled.
 
-    async def _remove_connection(self, connection: Connection) -> None:
-        """Remove a connection from tracking (must hold lock)."""
+        One periodic sweep replaces a timeout per send, which would cost a
+        timer (and on older Pythons a task) for every frame written.
+        """
+        loop = asyncio.get_running_loop()
+        while self._websocket_to_connection:
+            await asyncio.sleep(min(1.0, self.send_timeout / 2))
+            now = loop.time()
+            stalled = [
+                c for c in list(self._websocket_to_connection.values())
+                if c._send_started is not None and now - c._send_started > self.send_timeout
+            ]
+            if not stalled:
+                continue
+            removed = []
+            async with self._lock:
+                for connection in stalled:
+                    if not self._remove_connection(connection):
+                        continue
+                    removed.append(connection)
+                    websocket_slow_disconnects_total.labels(reason="send_timeout").inc()
+                    logger.warning(
+                        "Disconnecting slow WebSocket client",
+                        user_id=connection.user_id,
+                        reason="send_timeout",
+                        queue_depth=connection.queue_depth,
+                    )
+            # Close handshakes to stuck peers run outside the lock, together
+            await asyncio.gather(
+                *(self._close_socket(c, code=SLOW_CLIENT_CLOSE_CODE) for c in removed)
+            )
+
+    def _remove_connection(self, connection: Connection) -> bool:
+        """
+        Remove a connection from tracking (must hold lock).
+
+        Returns whether it was removed; the caller then closes the socket
+        with ``_close_socket`` after releasing the lock.
+        """
         user_id = connection.user_id
         websocket = connection.websocket
 
+        if connection.closed:
+            return False
+        connection.closed = True
+        connection._ready.set()
+        websocket_connections_active.dec()
+
+        # Stop the writer unless it is the one removing the connection
+        writer = connection._writer
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
+
         # Remove from user's connections
         if user_id in self._connections:
             self._connections[user_id] = [
@@ -125,10 +429,12 @@ class ConnectionManager:
         self._websocket_to_connection.pop(websocket, None)
 
         logger.info("WebSocket disconnected", user_id=user_id)
+        return True
 
-        # Try to close the websocket
+    async def _close_socket(self, connection: Connection, code: int = 1000) -> None:
+        """Close a removed connection's socket, giving up on unresponsive peers."""
         try:
-            await websocket.close()
+            await asyncio.wait_for(connection.websocket.close(code=code), CLOSE_TIMEOUT)
         except Exception:
             pass
 
@@ -145,10 +451,9 @@ class ConnectionManager:
             message: Message to send
 
         Returns:
-            Number of connections message was sent to
+            Number of connections message was queued for
         """
         connections = self._connections.get(user_id, [])
-        sent_count = 0
 
         if not connections:
             logger.debug(
@@ -157,23 +462,10 @@ class ConnectionManager:
                 message_type=message.get("type"),
                 all_connected_users=list(self._connections.keys()),
             )
+            return 0
 
-        for connection in connections[:]:  # Copy list to avoid modification during iteration
-            try:
-                await connection.websocket.send_json(message)
-                connection.last_activity = datetime.now(timezone.utc)
-                sent_count += 1
-            except Exception as e:
-                logger.warning(
-                    "Failed to send to user",
-                    user_id=user_id,
-                    error=str(e),
-                )
-                # Remove dead connection
-                async with self._lock:
-                    await self._remove_connection(connection)
-
-        return sent_count
+        text = encode_message(message)
+        return sum(1 for connection in connections[:] if connection.enqueue(text, message))
 
     async def broadcast(
         self,
@@ -188,27 +480,17 @@ class ConnectionManager:
             exclude_user: Optional user ID to exclude
 
         Returns:
-            Number of connections message was sent to
+            Number of connections message was queued for
         """
+        text = encode_message(message)
         sent_count = 0
 
         for user_id, connections in list(self._connections.items()):
             if user_id == exclude_user:
                 continue
-
             for connection in connections[:]:
-                try:
-                    await connection.websocket.send_json(message)
-                    connection.last_activity = datetime.now(timezone.utc)
+                if connection.enqueue(text, message):
                     sent_count += 1
-                except Exception as e:
-                    logger.warning(
-                        "Broadcast failed for connection",
-                        user_id=user_id,
-                        error=str(e),
-                    )
-                    async with self._lock:
-                        await self._remove_connection(connection)
 
         return sent_count
 
@@ -250,6 +532,19 @@ class ConnectionManager:
             return len(self._connections.get(user_id, []))
         return sum(len(conns) for conns in self._connections.values())
 
+    def get_queue_stats(self) -> dict[str, Any]:
+        """Outbound queue depth and delivery counters across connections."""
+        connections = list(self._websocket_to_connection.values())
+        depths = [c.queue_depth for c in connections]
+        return {
+            "max_queue_depth": max(depths, default=0),
+            "total_queued": sum(depths),
+            "lagging_connections": sum(1 for d in depths if d >= self.lag_threshold),
+            "frames_sent": sum(c.frames_sent for c in connections),
+            "frames_dropped": sum(c.frames_dropped for c in connections),
+            "frames_coalesced": sum(c.frames_coalesced for c in connections),
+        }
+
     def get_connected_users(self) -> list[str]:
         """Get list of connected user IDs."""
         return list(self._connections.keys())
@@ -0,0 +1,197 @@
+"""
+Event-driven streaming of PTY output to a WebSocket.
+
+The PTY master is registered with the event loop (``loop.add_reader``) so
+an idle terminal costs no wakeups. Each readiness callback drains the
+master with a read size that grows while reads come back full and
+shrinks again for interactive traffic. Output is buffered and a writer
+task sends it as binary frames:
+
+- the first output after an idle period is sent immediately, so echo
+  stays snappy
+- output arriving within ``frame_interval`` of the last frame is
+  coalesced into the next one, up to ``max_frame_size``
+- when more than ``high_water`` bytes are waiting on the client, the
+  reader is removed so the PTY (and the process writing to it) blocks
+  until the backlog drains below ``low_water``
+"""
+
+import asyncio
+import errno
+import os
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from ai_core import get_logger
+
+logger = get_logger(__name__)
+
+# Read size bounds; the size adapts between these per read
+MIN_READ_SIZE = 4 * 1024
+MAX_READ_SIZE = 256 * 1024
+
+# Cap on reads per readiness callback so one busy PTY can't starve the loop
+MAX_READS_PER_WAKEUP = 16
+
+# Output arriving within this window of the previous frame is coalesced
+FRAME_INTERVAL = 0.008
+MAX_FRAME_SIZE = 128 * 1024
+
+# Flow control thresholds for bytes buffered but not yet sent
+HIGH_WATER = 1024 * 1024
+LOW_WATER = 256 * 1024
+
+
+class PtyStreamer:
+    """Pumps output from a non-blocking PTY master fd into ``send``."""
+
+    def __init__(
+        self,
+        fd: int,
+        send: Callable[[bytes], Awaitable[Any]],
+        frame_interval: float = FRAME_INTERVAL,
+        max_frame_size: int = MAX_FRAME_SIZE,
+        high_water: int = HIGH_WATER,
+        low_water: int = LOW_WATER,
+    ):
+        self.fd = fd
+        self.send = send
+        self.frame_interval = frame_interval
+        self.max_frame_size = max_frame_size
+        self.high_water = high_water
+        self.low_water = low_water
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._buffer = bytearray()
+        self._ready = asyncio.Event()
+        self._read_size = MIN_READ_SIZE
+        self._reading = False
+        self._eof = False
+        self._last_send = 0.0
+        self._writer: asyncio.Task | None = None
+
+        self.bytes_read = 0
+        self.reads = 0
+        self.frames_sent = 0
+        self.pauses = 0
+
+    def start(self) -> None:
+        """Register the fd with the running loop and start the writer."""
+        self._loop = asyncio.get_running_loop()
+        self._resume_reading()
+        self._writer = asyncio.create_task(self._write_loop())
+
+    async def stop(self) -> None:
+        """Stop reading and cancel the writer; unsent output is discarded."""
+        self._pause_reading()
+        if self._writer is not None:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    async def wait_closed(self) -> None:
+        """Wait until the PTY hits EOF and all output has been sent."""
+        if self._writer is not None:
+            await asyncio.shield(self._writer)
+
+    @property
+    def paused(self) -> bool:
+        return not self._reading and not self._eof
+
+    @property
+    def buffered(self) -> int:
+        return len(self._buffer)
+
+    def _resume_reading(self) -> None:
+        if not self._reading and not self._eof and self._loop is not None:
+            self._loop.add_reader(self.fd, self._on_readable)
+            self._reading = True
+
+    def _pause_reading(self) -> None:
+        if self._reading and self._loop is not None:
+            self._loop.remove_reader(self.fd)
+            self._reading = False
+
+    def _on_readable(self) -> None:
+        for _ in range(MAX_READS_PER_WAKEUP):
+            try:
+                data = os.read(self.fd, self._read_size)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                # EIO is how Linux reports the slave side closing
+                if e.errno not in (errno.EIO, errno.EBADF):
+                    logger.warning("PTY read failed", error=str(e))
+                data = b""
+
+            if not data:
+                self._pause_reading()
+                self._eof = True
+                break
+
+            self.reads += 1
+            self.bytes_read += len(data)
+            self._buffer += data
+
+            # Grow for bulk output, shrink back for interactive echo
+            if len(data) == self._read_size:
+                self._read_size = min(self._read_size * 2, MAX_READ_SIZE)
+            elif len(data) < self._read_size // 4:
+                self._read_size = max(self._read_size // 2, MIN_READ_SIZE)
+                break
+            else:
+                break
+
+            if len(self._buffer) >= self.high_water:
+                break
+
+        if len(self._buffer) >= self.high_water and self._reading:
+            self._pause_reading()
+            self.pauses += 1
+            logger.debug("PTY reads paused for slow client", fd=self.fd, buffered=len(self._buffer))
+
+        self._ready.set()
+
+    async def _write_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                await self._ready.wait()
+
+                if not self._buffer:
+                    if self._eof:
+                        return
+                    self._ready.clear()
+                    continue
+
+                # Hold output briefly if a frame just went out
+                wait = self._last_send + self.frame_interval - loop.time()
+                if wait > 0 and len(self._buffer) < self.max_frame_size and not self._eof:
+                    await asyncio.sleep(wait)
+
+                frame = bytes(self._buffer[: self.max_frame_size])
+                del self._buffer[: self.max_frame_size]
+                if not self._buffer and not self._eof:
+                    self._ready.clear()
+
+                await self.send(frame)
+                self._last_send = loop.time()
+                self.frames_sent += 1
+
+                if not self._reading and len(self._buffer) <= self.low_water:
+                    self._resume_reading()
+        finally:
+            # Nothing left to deliver output to
+            self._pause_reading()
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "bytes_read": self.bytes_read,
+            "reads": self.reads,
+            "frames_sent": self.frames_sent,
+            "pauses": self.pauses,
+            "buffered": len(self._buffer),
+            "read_size": self._read_size,
+        }
@@ -5,7 +5,6 @@ For legacy projects: Uses tmux for persistent shell sessions
 For Docker projects: Uses docker exec for container isolation
 """
 
-import asyncio
 import os
 import pty
 import struct
@@ -21,6 +20,7 @@ from ai_messaging import RedisClient
 from ..config import get_api_config
 from ..dependencies import get_redis
 from ..services.auth_service import AuthService, TokenPayload
+from .pty_stream import PtyStreamer
 
 logger = get_logger(__name__)
 
@@ -592,28 +592,9 @@ async def run_terminal_loop(
 ) -> None:
     """Main terminal I/O loop for both Docker and tmux modes."""
 
-    async def read_from_pty():
-        """Read output from PTY and send to WebSocket."""
-        import errno
-        try:
-            while True:
-                await asyncio.sleep(0.01)
-                try:
-                    data = os.read(master_fd, 4096)
-                    if data:
-                        await websocket.send_bytes(data)
-                except OSError as e:
-                    # EAGAIN/EWOULDBLOCK means no data available yet (non-blocking)
-                    if e.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
-                        continue
-                    # Other OSError means PTY closed
-                    break
-                except Exception:
-                    break
-        except asyncio.CancelledError:
-            pass
-
-    read_task = asyncio.create_task(read_from_pty())
+    # Output is pushed as binary frames when the PTY becomes readable
+    streamer = PtyStreamer(master_fd, websocket.send_bytes)
+    streamer.start()
 
     try:
         while True:
@@ -649,11 +630,7 @@ async def run_terminal_loop(
     except Exception as e:
         logger.error("Terminal error", error=str(e), user_id=user_id)
     finally:
-        read_task.cancel()
-        try:
-            await read_task
-        except asyncio.CancelledError:
-            pass
+        await streamer.stop()
 
         os.close(master_fd)
         try:
@@ -662,4 +639,9 @@ async def run_terminal_loop(
         except (OSError, ChildProcessError):
             pass
 
-        logger.info("Terminal detached", user_id=user_id, session=session_id)
+        logger.info(
+            "Terminal detached",
+            user_id=user_id,
+            session=session_id,
+            **streamer.get_stats(),
+        )
@@ -22,12 +22,14 @@ from ai_core import (
     ModelTier,
     PermissionLevel,
     get_elevation_manager,
+    get_git_service,
     get_logger,
     get_task_classifier,
 )
 from ai_memory import PAIMemory
 from ai_messaging import (
     MessageType,
+    PlanIndex,
     PubSubManager,
     RedisClient,
     TaskRequest,
@@ -1857,16 +1859,7 @@ class SupervisorAgent(BaseAgent):
         if not current_branch:
             # Fallback to git detection (may not work inside container)
             try:
-                import subprocess
-                result = subprocess.run(
-                    ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-                    cwd=root_path,
-                    capture_output=True,
-                    text=True,
-                    timeout=5,
-                )
-                if result.returncode == 0:
-                    current_branch = result.stdout.strip()
+                current_branch = await get_git_service().get(root_path).current_branch()
             except Exception as e:
                 logger.debug("Could not get git branch", error=str(e))
 
@@ -1968,7 +1961,13 @@ class SupervisorAgent(BaseAgent):
                 plan["project_name"] = project_name
                 plan["branch"] = current_branch  # Track which branch the plan was created on
 
-                await self._redis.set(plan_key, json.dumps(plan))
+                await PlanIndex(self._redis).update(
+                    plan_id,
+                    fields={
+                        name: plan[name]
+                        for name in ("steps", "status", "root_path", "agent_context", "project_name", "branch")
+                    },
+                )
 
                 # Send plan update to user via WebSocket
                 if self._pubsub and user_id:
@@ -2146,16 +2145,7 @@ class SupervisorAgent(BaseAgent):
             current_branch = request.payload.get("branch")
             if not current_branch:
                 try:
-                    import subprocess
-                    result = subprocess.run(
-                        ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-                        cwd=root_path,
-                        capture_output=True,
-                        text=True,
-                        timeout=5,
-                    )
-                    if result.returncode == 0:
-                        current_branch = result.stdout.strip()
+                    current_branch = await get_git_service().get(root_path).current_branch()
                 except Exception as e:
                     logger.debug("Could not check git branch for plan execution", error=str(e))
 
@@ -2192,7 +2182,16 @@ class SupervisorAgent(BaseAgent):
 
             # Update plan status to executing
             plan["status"] = "executing"
-            await self._redis.set(plan_key, json.dumps(plan))
+            fields = {"status": "executing", "root_path": root_path}
+            if any(not s.get("id") for s in steps):
+                # Steps of older plans may lack IDs; give them one now so the
+                # step_update deltas below always name the step they change
+                from uuid import uuid4
+                for s in steps:
+                    if not s.get("id"):
+                        s["id"] = str(uuid4())
+                fields["steps"] = steps
+            await PlanIndex(self._redis).update(plan_id, fields=fields)
 
             # Initialize rollback tracking for this plan
             await self._rollback_manager.start_plan(plan_id, conversation_id)
@@ -2274,7 +2273,9 @@ class SupervisorAgent(BaseAgent):
                 step["status"] = "in_progress"
                 step["started_at"] = datetime.now(timezone.utc).isoformat()
                 plan["current_step"] = i
-                await self._redis.set(plan_key, json.dumps(plan))
+                step_change = await self._save_plan_step(
+                    plan, step, ("status", "started_at"), current_step=i
+                )
 
                 # Send thinking update for step start
                 await self.publish_thinking(
@@ -2293,7 +2294,7 @@ class SupervisorAgent(BaseAgent):
                             "user_id": user_id,
                             "conversation_id": conversation_id,
                             "plan_id": plan_id,
-                            "steps": steps,
+                            "step_changes": [step_change],
                             "current_step": i,
                             "agent": "wyld",
                             "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -2324,7 +2325,7 @@ class SupervisorAgent(BaseAgent):
                     if self.is_task_cancelled():
                         cancelled = True
                         step["status"] = "pending"  # Reset to pending
-                        step.pop("started_at", None)
+                        step["started_at"] = None
                         break
 
                     step_result = await self._execute_plan_step(step, plan)
@@ -2475,6 +2476,7 @@ class SupervisorAgent(BaseAgent):
 
                 # Check for course correction on remaining steps
                 remaining_steps = steps[i + 1:]
+                did_replan = False
                 if remaining_steps and step_score < 0.5:
                     # Publish thinking about low score and potential correction
                     await self.publish_thinking(
@@ -2498,8 +2500,16 @@ class SupervisorAgent(BaseAgent):
                         plan["steps"] = steps
                         logger.info(f"Course corrected: replaced {len(remaining_steps)} steps with {len(replanned_steps)}")
 
-                # Update plan in Redis
-                await self._redis.set(plan_key, json.dumps(plan))
+                # Update plan in Redis: the finished step's fields, or every
+                # step if the remaining ones were replanned
+                if did_replan:
+                    await PlanIndex(self._redis).update(plan_id, fields={"steps": steps})
+                    step_update = {"steps": steps}
+                else:
+                    step_change = await self._save_plan_step(
+                        plan, step, ("status", "completed_at", "output", "error", "score")
+                    )
+                    step_update = {"step_changes": [step_change]}
 
                 # Send step completion update
                 if self._pubsub and user_id:
@@ -2510,7 +2520,7 @@ class SupervisorAgent(BaseAgent):
                             "user_id": user_id,
                             "conversation_id": conversation_id,
                             "plan_id": plan_id,
-                            "steps": steps,
+                            **step_update,
                             "current_step": i,
                             "agent": "wyld",
                             "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -2523,9 +2533,13 @@ class SupervisorAgent(BaseAgent):
             # Mark plan as completed or cancelled
             completed_steps = sum(1 for s in steps if s.get("status") == "completed")
 
+            # The last step may have stopped mid-way (cancelled or needing
+            # continuation) without its fields being saved yet
+            final_step_fields = ("status", "started_at", "completed_at", "output", "error", "continuation_data")
+
             if cancelled:
                 plan["status"] = "paused"  # Mark as paused so it can be resumed
-                await self._redis.set(plan_key, json.dumps(plan))
+                await self._save_plan_step(plan, step, final_step_fields, status="paused")
 
                 # Send cancelled status update
                 if self._pubsub and user_id:
@@ -2558,7 +2572,9 @@ class SupervisorAgent(BaseAgent):
 
             plan["status"] = "completed"
             plan["completed_at"] = datetime.now(timezone.utc).isoformat()
-            await self._redis.set(plan_key, json.dumps(plan))
+            await self._save_plan_step(
+                plan, step, final_step_fields, status="completed", completed_at=plan["completed_at"]
+            )
 
             # Publish thinking summary about plan completion
             success_rate = completed_steps / max(len(steps), 1)
@@ -2881,6 +2897,35 @@ Only flag real problems, not stylistic preferences."""
         # Default to verified if parsing fails
         return {"verified": True, "issues": []}
 
+    async def _save_plan_step(
+        self,
+        plan: dict,
+        step: dict,
+        names: tuple[str, ...],
+        **plan_fields: Any,
+    ) -> dict:
+        """
+        Save the named fields the step has, plus any top-level plan fields,
+        as a field-level update instead of rewriting the whole plan.
+
+        Returns:
+            The step's ID and saved fields, for step_update notifications
+        """
+        change = {name: step[name] for name in names if name in step}
+        if step.get("id"):
+            await PlanIndex(self._redis).update(
+                plan["id"], fields=plan_fields, steps={step["id"]: change}
+            )
+        else:
+            # Execution gives every step an ID up front; should one still be
+            # missing, assign it and save all steps so the ID is stored
+            from uuid import uuid4
+            step["id"] = str(uuid4())
+            await PlanIndex(self._redis).update(
+                plan["id"], fields={**plan_fields, "steps": plan["steps"]}
+            )
+        return {"id": step["id"], **change}
+
     async def _initialize_plan_context(self, plan: dict, root_path: str) -> dict:
         """
         Create shared context for all steps to use (Initializer Phase).
@@ -4163,7 +4208,9 @@ Execute this step now. Make real file changes, not just descriptions."""
             else:
                 plan["steps"] = steps
                 plan["modified_at"] = datetime.now(timezone.utc).isoformat()
-                await self._redis.set(plan_key, json.dumps(plan))
+                await PlanIndex(self._redis).update(
+                    plan_id, fields={"steps": steps, "modified_at": plan["modified_at"]}
+                )
 
             # Send update to frontend
             if self._pubsub and user_id:
@@ -7,7 +7,7 @@ Determines which agent(s) should handle a given task.
 from dataclasses import dataclass, field
 from enum import Enum
 
-from ai_core import AgentType, get_logger
+from ai_core import AgentType, PatternClassifier, get_logger, get_pattern_classifier
 
 logger = get_logger(__name__)
 
@@ -70,6 +70,12 @@ TASK_PATTERNS: dict[str, AgentType] = {
     "audit_": AgentType.QA,
 }
 
+# Payload keywords hinting at an agent when the task type matches nothing
+_payload_patterns = get_pattern_classifier()
+_payload_patterns.register("payload.code", ["code", "function", "class", "bug", "test"])
+_payload_patterns.register("payload.data", ["sql", "query", "database", "table"])
+_payload_patterns.register("payload.infra", ["docker", "nginx", "server", "deploy"])
+
 
 class TaskRouter:
     """
@@ -81,10 +87,20 @@ class TaskRouter:
 
     def __init__(self) -> None:
         self._patterns = TASK_PATTERNS.copy()
+        self._matcher = PatternClassifier()
+        self._compile_patterns()
+
+    def _compile_patterns(self) -> None:
+        # Prefix patterns ("git_") are looked up without the underscore
+        self._matcher.register(
+            "task_type",
+            [p[:-1] if p.endswith("_") else p for p in self._patterns],
+        )
 
     def add_pattern(self, pattern: str, agent: AgentType) -> None:
         """Add a routing pattern."""
         self._patterns[pattern] = agent
+        self._compile_patterns()
 
     def route_by_pattern(self, task_type: str) -> AgentType | None:
         """
@@ -99,12 +115,15 @@ class TaskRouter:
         if task_lower in self._patterns:
             return self._patterns[task_lower]
 
-        # Check prefix patterns
+        # One scan finds every pattern; the first in table order that applies wins
+        matches = self._matcher.scan(task_lower)
+        if not matches.has("task_type"):
+            return None
         for pattern, agent in self._patterns.items():
             if pattern.endswith("_"):
-                if task_lower.startswith(pattern) or task_lower.startswith(pattern[:-1]):
+                if matches.position(pattern[:-1]) == 0:
                     return agent
-            elif task_lower.startswith(pattern) or pattern in task_lower:
+            elif matches.position(pattern) is not None:
                 return agent
 
         return None
@@ -139,10 +158,10 @@ class TaskRouter:
 
         # Analyze payload for clues
         if payload:
-            payload_str = str(payload).lower()
+            matches = _payload_patterns.scan(str(payload))
 
             # Check for code indicators
-            if any(kw in payload_str for kw in ["code", "function", "class", "bug", "test"]):
+            if matches.has("payload.code"):
                 return RoutingDecision(
                     strategy=RoutingStrategy.SINGLE,
                     primary_agent=AgentType.CODE,
@@ -151,7 +170,7 @@ class TaskRouter:
                 )
 
             # Check for data indicators
-            if any(kw in payload_str for kw in ["sql", "query", "database", "table"]):
+            if matches.has("payload.data"):
                 return RoutingDecision(
                     strategy=RoutingStrategy.SINGLE,
                     primary_agent=AgentType.DATA,
@@ -160,7 +179,7 @@ class TaskRouter:
                 )
 
             # Check for infrastructure indicators
-            if any(kw in payload_str for kw in ["docker", "nginx", "server", "deploy"]):
+            if matches.has("payload.infra"):
                 return RoutingDecision(
                     strategy=RoutingStrategy.SINGLE,
                     primary_agent=AgentType.INFRA,
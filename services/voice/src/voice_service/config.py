@@ -23,18 +23,38 @@ class VoiceConfig(BaseSettings):
 
     # OpenAI settings
     openai_api_key: str = Field(default="")
+    openai_base_url: str | None = Field(default=None)  # e.g. a local OpenAI-compatible server
 
     # Whisper settings (Speech-to-Text)
     whisper_model: str = Field(default="whisper-1")
     whisper_language: str | None = Field(default=None)  # Auto-detect if None
     max_audio_size_mb: int = Field(default=25)
 
+    # Streaming transcription (16-bit mono PCM, split at pauses)
+    stt_stream_sample_rate: int = Field(default=16000, ge=8000, le=48000)
+    stt_stream_concurrency: int = Field(default=4, ge=1)  # Utterances transcribed at once
+    stt_vad_threshold_db: float = Field(default=-45.0)  # Quietest level counted as speech
+    stt_vad_min_speech_ms: int = Field(default=250)
+    stt_vad_min_silence_ms: int = Field(default=500)  # Pause that ends an utterance
+    stt_vad_max_segment_seconds: float = Field(default=20.0)
+
     # TTS settings (Text-to-Speech)
     tts_model: str = Field(default="tts-1")
     tts_voice: str = Field(default="alloy")  # alloy, echo, fable, onyx, nova, shimmer
     tts_speed: float = Field(default=1.0, ge=0.25, le=4.0)
     tts_response_format: str = Field(default="mp3")  # mp3, opus, aac, flac, wav, pcm
 
+    # Streaming synthesis
+    tts_stream_chunk_size: int = Field(default=4096)
+    tts_stream_lookahead: int = Field(default=2, ge=0)  # Sentences synthesized ahead of playback
+    tts_segment_min_chars: int = Field(default=24)
+    tts_segment_max_chars: int = Field(default=400, le=4096)
+
+    # Phrase cache for short, repeated utterances
+    tts_cache_max_bytes: int = Field(default=32 * 1024 * 1024)  # 0 disables
+    tts_cache_max_phrase_chars: int = Field(default=200)
+    tts_cache_prewarm: list[str] = Field(default=[])  # Phrases synthesized at startup
+
     # Audio processing
     temp_audio_dir: str = Field(default="/tmp/voice_service")
     cleanup_interval_seconds: int = Field(default=300)  # 5 minutes
@@ -15,6 +15,7 @@ from ai_core import configure_logging, get_logger, get_settings
 
 from .config import VoiceConfig, get_voice_config
 from .routes import health_router, synthesize_router, transcribe_router
+from .synthesis import get_synthesis_service
 
 logger = get_logger(__name__)
 
@@ -31,10 +32,21 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         log_format=settings.logging.format,
     )
 
+    # Fill the phrase cache in the background; requests don't wait on it
+    config = get_voice_config()
+    prewarm_task = None
+    if config.tts_cache_prewarm and config.openai_api_key:
+        prewarm_task = asyncio.create_task(
+            get_synthesis_service().prewarm(config.tts_cache_prewarm)
+        )
+
     logger.info("Voice Service started")
 
     yield
 
+    if prewarm_task is not None:
+        prewarm_task.cancel()
+
     logger.info("Shutting down Voice Service...")
     logger.info("Voice Service stopped")
 
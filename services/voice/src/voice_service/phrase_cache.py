@@ -0,0 +1,87 @@
+"""
+Content-addressed cache of synthesized audio for short, repeated phrases.
+
+Acknowledgements, status lines and error messages recur constantly; their
+audio is keyed by a hash of the normalized text and every parameter that
+affects the output, so a repeat is served without calling the TTS API.
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Any
+
+from .config import get_voice_config
+
+
+class PhraseCache:
+    """LRU of audio bytes bounded by total size."""
+
+    def __init__(self, max_bytes: int, max_phrase_chars: int):
+        self.max_bytes = max_bytes
+        self.max_phrase_chars = max_phrase_chars
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(text: str, voice: str, speed: float, response_format: str, model: str) -> str:
+        normalized = " ".join(text.split())
+        material = f"{model}\0{voice}\0{speed:.2f}\0{response_format}\0{normalized}"
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def cacheable(self, text: str) -> bool:
+        return self.max_bytes > 0 and len(text) <= self.max_phrase_chars
+
+    def get(self, key: str) -> bytes | None:
+        audio = self._entries.get(key)
+        if audio is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return audio
+
+    def put(self, key: str, audio: bytes) -> None:
+        # One phrase may not take more than a quarter of the budget
+        if not audio or len(audio) > self.max_bytes // 4:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous)
+        self._entries[key] = audio
+        self._size += len(audio)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+    def get_stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+# Singleton instance
+_phrase_cache: PhraseCache | None = None
+
+
+def get_phrase_cache() -> PhraseCache:
+    """Get the phrase cache singleton."""
+    global _phrase_cache
+    if _phrase_cache is None:
+        config = get_voice_config()
+        _phrase_cache = PhraseCache(
+            max_bytes=config.tts_cache_max_bytes,
+            max_phrase_chars=config.tts_cache_max_phrase_chars,
+        )
+    return _phrase_cache
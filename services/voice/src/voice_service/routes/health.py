@@ -10,6 +10,7 @@ from fastapi import APIRouter
 from ai_core import get_logger
 
 from ..config import get_voice_config
+from ..phrase_cache import get_phrase_cache
 
 logger = get_logger(__name__)
 
@@ -62,4 +63,5 @@ async def health() -> dict[str, Any]:
             "tts_voice": config.tts_voice,
             "max_audio_size_mb": config.max_audio_size_mb,
         },
+        "tts_phrase_cache": get_phrase_cache().get_stats(),
     }
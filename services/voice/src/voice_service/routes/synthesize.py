@@ -2,9 +2,12 @@
 Text-to-Speech synthesis routes.
 """
 
+import asyncio
+import json
+from collections.abc import AsyncIterator
 from typing import Annotated, Literal
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, HTTPException, Query, WebSocket, status
 from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field
 
@@ -16,6 +19,18 @@ logger = get_logger(__name__)
 
 router = APIRouter(prefix="/synthesize", tags=["Synthesis"])
 
+CONTENT_TYPES = {
+    "mp3": "audio/mpeg",
+    "opus": "audio/opus",
+    "aac": "audio/aac",
+    "flac": "audio/flac",
+    "wav": "audio/wav",
+    "pcm": "audio/pcm",
+}
+
+# Upper bound on text accepted over one synthesis WebSocket session
+MAX_SESSION_TEXT = 100_000
+
 
 class SynthesizeRequest(BaseModel):
     """Text-to-speech synthesis request."""
@@ -72,15 +87,7 @@ async def synthesize_speech(
         )
 
         # Determine content type
-        content_types = {
-            "mp3": "audio/mpeg",
-            "opus": "audio/opus",
-            "aac": "audio/aac",
-            "flac": "audio/flac",
-            "wav": "audio/wav",
-            "pcm": "audio/pcm",
-        }
-        content_type = content_types.get(request.response_format, "audio/mpeg")
+        content_type = CONTENT_TYPES.get(request.response_format, "audio/mpeg")
 
         return Response(
             content=audio_data,
@@ -114,7 +121,9 @@ async def synthesize_stream(
     """
     Convert text to speech with streaming response.
 
-    Returns audio as a streaming response, useful for longer texts.
+    Returns audio as a chunked streaming response. Text is synthesized
+    sentence by sentence, so audio starts after the first sentence rather
+    than after the whole text.
 
     Args:
         text: Text to synthesize
@@ -134,17 +143,12 @@ async def synthesize_stream(
         voice=voice,
     )
 
-    content_types = {
-        "mp3": "audio/mpeg",
-        "opus": "audio/opus",
-        "aac": "audio/aac",
-        "flac": "audio/flac",
-        "wav": "audio/wav",
-        "pcm": "audio/pcm",
-    }
-    content_type = content_types.get(response_format, "audio/mpeg")
+    content_type = CONTENT_TYPES.get(response_format, "audio/mpeg")
 
     try:
+        # Validate before the response starts; errors after that can't change the status
+        service.resolve_options(voice, speed, response_format, model)
+
         return StreamingResponse(
             service.synthesize_stream(
                 text=text,
@@ -156,6 +160,9 @@ async def synthesize_stream(
             media_type=content_type,
             headers={
                 "Content-Disposition": f'attachment; filename="speech.{response_format}"',
+                "Cache-Control": "no-store",
+                # Don't let a reverse proxy buffer the audio
+                "X-Accel-Buffering": "no",
             },
         )
 
@@ -166,6 +173,116 @@ async def synthesize_stream(
         )
 
 
+@router.websocket("/ws")
+async def synthesize_websocket(websocket: WebSocket) -> None:
+    """
+    WebSocket endpoint for speaking text while it is being generated.
+
+    Protocol:
+    1. Client connects
+    2. Client optionally sends JSON config:
+       {"action": "config", "voice": "alloy", "speed": 1.0, "response_format": "mp3", "model": "tts-1"}
+    3. Client sends text as it arrives: {"action": "text", "text": "..."}
+    4. Client sends {"action": "end"} when the text is complete
+    5. Server sends binary audio chunks as each sentence is synthesized,
+       then {"type": "done"}
+
+    Audio for the first sentence starts as soon as it is complete, while
+    the client is still sending the rest.
+    """
+    await websocket.accept()
+    service = get_synthesis_service()
+
+    logger.info("WebSocket synthesis session started")
+
+    text_queue: asyncio.Queue[str | None] = asyncio.Queue()
+    configured = asyncio.get_running_loop().create_future()
+    received_chars = 0
+    sent_bytes = 0
+
+    async def receive_text() -> None:
+        nonlocal received_chars
+        try:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                if "text" not in message:
+                    continue
+                try:
+                    data = json.loads(message["text"])
+                except json.JSONDecodeError:
+                    await websocket.send_json({"type": "error", "message": "Invalid JSON"})
+                    continue
+
+                action = data.get("action")
+                if action == "config" and not configured.done():
+                    configured.set_result(data)
+                elif action == "text":
+                    if not configured.done():
+                        configured.set_result({})
+                    received_chars += len(data.get("text", ""))
+                    if received_chars > MAX_SESSION_TEXT:
+                        await websocket.send_json({"type": "error", "message": "Text limit exceeded"})
+                        break
+                    text_queue.put_nowait(data.get("text", ""))
+                elif action == "end":
+                    break
+        finally:
+            if not configured.done():
+                configured.set_result({})
+            text_queue.put_nowait(None)
+
+    async def text_stream() -> AsyncIterator[str]:
+        while (piece := await text_queue.get()) is not None:
+            yield piece
+
+    receiver = asyncio.create_task(receive_text())
+    try:
+        session = await configured
+        options = service.resolve_options(
+            voice=session.get("voice"),
+            speed=session.get("speed"),
+            response_format=session.get("response_format") or "mp3",
+            model=session.get("model"),
+        )
+        if session:
+            await websocket.send_json({
+                "type": "config_ack",
+                "mime_type": CONTENT_TYPES.get(options.response_format, "audio/mpeg"),
+            })
+
+        async for chunk in service.synthesize_stream(
+            text_stream(),
+            voice=options.voice,
+            speed=options.speed,
+            response_format=options.response_format,
+            model=options.model,
+        ):
+            await websocket.send_bytes(chunk)
+            sent_bytes += len(chunk)
+
+        await websocket.send_json({"type": "done", "audio_bytes": sent_bytes})
+
+    except Exception as e:
+        logger.error("WebSocket synthesis error", error=str(e))
+        try:
+            await websocket.send_json({
+                "type": "error",
+                "message": str(e),
+            })
+        except Exception:
+            pass  # Connection already closed
+
+    finally:
+        receiver.cancel()
+        logger.info(
+            "WebSocket synthesis session ended",
+            text_chars=received_chars,
+            audio_bytes=sent_bytes,
+        )
+
+
 @router.get("/voices", response_model=list[VoiceInfo])
 async def list_voices() -> list[VoiceInfo]:
     """
@@ -2,9 +2,8 @@
 Speech-to-Text transcription routes.
 """
 
+import asyncio
 import json
-import os
-import tempfile
 from typing import Annotated, Any
 
 from fastapi import APIRouter, File, Form, HTTPException, UploadFile, WebSocket, status
@@ -13,7 +12,7 @@ from pydantic import BaseModel
 from ai_core import get_logger
 
 from ..config import get_voice_config
-from ..transcription import get_transcription_service
+from ..transcription import StreamingTranscription, get_transcription_service
 
 logger = get_logger(__name__)
 
@@ -131,12 +130,19 @@ async def transcribe_stream(websocket: WebSocket) -> None:
 
     Protocol:
     1. Client connects
-    2. Client sends JSON config: {"language": "en", "prompt": "..."}
+    2. Client sends JSON config:
+       {"action": "config", "language": "en", "prompt": "...",
+        "encoding": "pcm16", "sample_rate": 16000}
     3. Client sends binary audio chunks
     4. Client sends JSON: {"action": "end"} to finish
     5. Server responds with transcription result
 
-    Audio should be sent in chunks of ~1-5 seconds.
+    With ``"encoding": "pcm16"`` (16-bit little-endian mono), audio is split
+    at pauses and each utterance is transcribed while the client is still
+    speaking; the server sends {"type": "partial", ...} messages in order as
+    they complete, so only the last utterance is pending after "end".
+    Otherwise chunks are treated as one compressed recording (e.g. webm
+    from MediaRecorder) and transcribed when the client ends.
     """
     await websocket.accept()
     config = get_voice_config()
@@ -145,7 +151,20 @@ async def transcribe_stream(websocket: WebSocket) -> None:
     logger.info("WebSocket transcription session started")
 
     audio_chunks: list[bytes] = []
+    chunks_received = 0
+    total_size = 0
     session_config: dict[str, Any] = {}
+    stream: StreamingTranscription | None = None
+    partials: asyncio.Task | None = None
+    send_lock = asyncio.Lock()
+
+    async def send(message: dict[str, Any]) -> None:
+        async with send_lock:
+            await websocket.send_json(message)
+
+    async def send_partials(stream: StreamingTranscription) -> None:
+        async for partial in stream.results():
+            await send({"type": "partial", **partial})
 
     try:
         while True:
@@ -160,40 +179,65 @@ async def transcribe_stream(websocket: WebSocket) -> None:
                     data = json.loads(message["text"])
 
                     if data.get("action") == "end":
-                        # Process accumulated audio
-                        if audio_chunks:
-                            audio_data = b"".join(audio_chunks)
+                        if stream is not None:
+                            stream.end()
+                            await partials
+                            if stream.segments:
+                                await send({
+                                    "type": "transcription",
+                                    "text": stream.text,
+                                    "language": session_config.get("language"),
+                                    "segments": stream.segments,
+                                    "final": True,
+                                })
+                            else:
+                                await send({"type": "error", "message": "No speech detected"})
+                        elif audio_chunks:
                             result = await service.transcribe_bytes(
-                                audio_data=audio_data,
+                                audio_data=b"".join(audio_chunks),
                                 filename="stream.webm",
                                 language=session_config.get("language"),
                                 prompt=session_config.get("prompt"),
                             )
-                            await websocket.send_json({
+                            await send({
                                 "type": "transcription",
                                 "text": result["text"],
                                 "language": result.get("language"),
                                 "final": True,
                             })
                         else:
-                            await websocket.send_json({
+                            await send({
                                 "type": "error",
                                 "message": "No audio received",
                             })
                         break
 
                     elif data.get("action") == "config":
+                        if audio_chunks or stream is not None:
+                            await send({
+                                "type": "error",
+                                "message": "Config must be sent before audio",
+                            })
+                            continue
                         session_config = {
                             "language": data.get("language"),
                             "prompt": data.get("prompt"),
                         }
-                        await websocket.send_json({
+                        if data.get("encoding") == "pcm16":
+                            stream = service.start_stream(
+                                sample_rate=data.get("sample_rate"),
+                                language=session_config["language"],
+                                prompt=session_config["prompt"],
+                            )
+                            partials = asyncio.create_task(send_partials(stream))
+                        await send({
                             "type": "config_ack",
                             "message": "Configuration received",
+                            "streaming": stream is not None,
                         })
 
                 except json.JSONDecodeError:
-                    await websocket.send_json({
+                    await send({
                         "type": "error",
                         "message": "Invalid JSON",
                     })
@@ -201,28 +245,39 @@ async def transcribe_stream(websocket: WebSocket) -> None:
             # Handle binary messages (audio data)
             elif "bytes" in message:
                 chunk = message["bytes"]
-                audio_chunks.append(chunk)
+                chunks_received += 1
+                total_size += len(chunk)
 
                 # Check total size
-                total_size = sum(len(c) for c in audio_chunks)
                 if total_size > config.max_audio_size_mb * 1024 * 1024:
-                    await websocket.send_json({
+                    await send({
                         "type": "error",
                         "message": "Audio size limit exceeded",
                     })
                     break
 
+                if stream is not None:
+                    stream.feed(chunk)
+                    if partials.done():
+                        # A segment failed; surface its error
+                        await partials
+                else:
+                    audio_chunks.append(chunk)
+
                 # Send acknowledgment
-                await websocket.send_json({
+                ack: dict[str, Any] = {
                     "type": "chunk_ack",
-                    "chunks": len(audio_chunks),
+                    "chunks": chunks_received,
                     "total_bytes": total_size,
-                })
+                }
+                if stream is not None:
+                    ack["segments"] = stream.segments
+                await send(ack)
 
     except Exception as e:
         logger.error("WebSocket transcription error", error=str(e))
         try:
-            await websocket.send_json({
+            await send({
                 "type": "error",
                 "message": str(e),
             })
@@ -230,7 +285,11 @@ async def transcribe_stream(websocket: WebSocket) -> None:
             pass  # Connection already closed
 
     finally:
+        if stream is not None:
+            stream.cancel()
+            partials.cancel()
         logger.info(
             "WebSocket transcription session ended",
-            chunks_received=len(audio_chunks),
+            chunks_received=chunks_received,
+            segments=stream.segments if stream is not None else None,
         )
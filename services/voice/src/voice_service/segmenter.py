@@ -0,0 +1,120 @@
+"""
+Sentence segmentation for streaming speech synthesis.
+
+Text arriving from an LLM is split into sentence-sized pieces as soon as a
+sentence is complete, so the first sentence can be synthesized while the
+rest is still being generated.
+"""
+
+import re
+
+# Sentence-final punctuation (plus closing quotes/brackets) followed by
+# whitespace, or a line break. The lookahead means a trailing "3." is held
+# until we know whether "14" follows.
+_BOUNDARY = re.compile(r"[.!?…]+[\"'”’)\]]*(?=\s)|\n")
+
+_LAST_WORD = re.compile(r"\S*$")
+
+# Words that end in a period without ending the sentence
+_ABBREVIATIONS = frozenset({
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "e.g", "i.e",
+    "approx", "no", "fig", "inc", "ltd", "co", "dept", "est", "min", "max",
+})
+
+# Preferred places to break an over-long sentence, strongest first
+_SOFT_BREAKS = (";", ":", " —", " –", ",")
+
+# The TTS API rejects inputs longer than this
+MAX_SEGMENT_CHARS = 4096
+
+
+class SentenceSegmenter:
+    """
+    Incremental sentence splitter.
+
+    ``feed`` returns the sentences completed by the new text; ``flush``
+    returns whatever remains once the input ends. The first sentence is
+    released as soon as it completes (for time-to-first-audio); later short
+    sentences are merged until ``min_chars`` so acknowledgements like "Ok."
+    don't each cost a synthesis request. Sentences longer than ``max_chars``
+    are broken at the last clause boundary or space.
+    """
+
+    def __init__(self, min_chars: int = 24, max_chars: int = 400):
+        self._min_chars = min_chars
+        self._max_chars = min(max_chars, MAX_SEGMENT_CHARS)
+        self._buffer = ""
+        self._held = ""
+        self._emitted = False
+
+    def feed(self, text: str) -> list[str]:
+        self._buffer += text
+        out: list[str] = []
+
+        start = 0
+        for match in _BOUNDARY.finditer(self._buffer):
+            if match.group().startswith(".") and match.group().rstrip("\"'”’)]") == ".":
+                if self._is_abbreviation(match.start()):
+                    continue
+            self._add(self._buffer[start:match.end()], out)
+            start = match.end()
+        self._buffer = self._buffer[start:]
+
+        while len(self._buffer) > self._max_chars:
+            cut = self._soft_break(self._buffer)
+            self._add(self._buffer[:cut], out)
+            self._buffer = self._buffer[cut:]
+
+        return out
+
+    def flush(self) -> list[str]:
+        out: list[str] = []
+        rest, self._buffer = self._buffer, ""
+        self._add(rest, out)
+        if self._held:
+            out.append(self._held)
+            self._held = ""
+        return out
+
+    def _add(self, piece: str, out: list[str]) -> None:
+        piece = " ".join(piece.split())
+        while len(piece) > self._max_chars:
+            cut = self._soft_break(piece)
+            self._emit(piece[:cut].strip(), out)
+            piece = piece[cut:].strip()
+        if piece:
+            self._emit(piece, out)
+
+    def _emit(self, text: str, out: list[str]) -> None:
+        if self._held:
+            merged = f"{self._held} {text}"
+            if len(merged) <= self._max_chars:
+                text = merged
+            else:
+                out.append(self._held)
+            self._held = ""
+        if self._emitted and len(text) < self._min_chars:
+            self._held = text
+            return
+        self._emitted = True
+        out.append(text)
+
+    def _is_abbreviation(self, dot: int) -> bool:
+        before = self._buffer[:dot]
+        word = _LAST_WORD.search(before).group().lstrip("(\"'“‘").lower()
+        return word in _ABBREVIATIONS or (len(word) == 1 and word.isalpha())
+
+    def _soft_break(self, text: str) -> int:
+        window = text[: self._max_chars]
+        for mark in _SOFT_BREAKS:
+            index = window.rfind(mark)
+            if index > self._max_chars // 3:
+                return index + len(mark)
+        index = window.rfind(" ")
+        return index if index > 0 else self._max_chars
+
+
+def split_sentences(text: str, min_chars: int = 24, max_chars: int = 400) -> list[str]:
+    """Split complete text into synthesis segments."""
+    segmenter = SentenceSegmenter(min_chars=min_chars, max_chars=max_chars)
+    return segmenter.feed(text) + segmenter.flush()
@@ -1,16 +1,26 @@
 """
 Text-to-Speech synthesis service using OpenAI TTS.
+
+Streaming synthesis splits text into sentences (as it arrives, when fed
+from an LLM), synthesizes upcoming sentences while the current one is
+being sent, and forwards audio chunks as the API produces them. Short
+repeated phrases are served from a content-addressed cache.
 """
 
 import asyncio
-import io
-from typing import AsyncIterator, Literal
+import struct
+import time
+from collections.abc import AsyncIterable, AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any, Literal
 
 from openai import AsyncOpenAI
 
 from ai_core import get_logger
 
 from .config import get_voice_config
+from .phrase_cache import get_phrase_cache
+from .segmenter import SentenceSegmenter
 
 logger = get_logger(__name__)
 
@@ -18,6 +28,53 @@ logger = get_logger(__name__)
 VoiceType = Literal["alloy", "echo", "fable", "onyx", "nova", "shimmer"]
 AudioFormat = Literal["mp3", "opus", "aac", "flac", "wav", "pcm"]
 
+# OpenAI TTS PCM output: 24 kHz, 16-bit signed little-endian, mono
+PCM_SAMPLE_RATE = 24000
+
+# Formats whose per-sentence outputs can be concatenated into one stream.
+# WAV is requested as PCM and sent behind a single streaming header; FLAC
+# is synthesized as one segment.
+_SEGMENTABLE_FORMATS = {"mp3", "opus", "aac", "pcm", "wav"}
+
+
+@dataclass
+class SynthesisOptions:
+    """Validated synthesis parameters."""
+
+    voice: str
+    speed: float
+    response_format: str
+    model: str
+
+
+@dataclass
+class _Segment:
+    """One sentence being synthesized; chunks are consumed in order."""
+
+    index: int
+    text: str
+    chunks: asyncio.Queue = field(default_factory=asyncio.Queue)
+    task: asyncio.Task | None = None
+
+
+def _wav_stream_header(sample_rate: int = PCM_SAMPLE_RATE, channels: int = 1, bits: int = 16) -> bytes:
+    """RIFF header for a WAV stream of unknown length."""
+    block_align = channels * bits // 8
+    unknown = 0xFFFFFFFF
+    return (
+        b"RIFF" + struct.pack("<I", unknown) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, channels, sample_rate, sample_rate * block_align, block_align, bits)
+        + b"data" + struct.pack("<I", unknown)
+    )
+
+
+async def _iter_text(text: str | AsyncIterable[str]) -> AsyncIterator[str]:
+    if isinstance(text, str):
+        yield text
+        return
+    async for piece in text:
+        yield piece
+
 
 class SynthesisService:
     """Service for synthesizing text to speech using OpenAI TTS."""
@@ -27,7 +84,40 @@ class SynthesisService:
 
     def __init__(self) -> None:
         self.config = get_voice_config()
-        self.client = AsyncOpenAI(api_key=self.config.openai_api_key)
+        self.client = AsyncOpenAI(
+            api_key=self.config.openai_api_key,
+            base_url=self.config.openai_base_url,
+        )
+        self.cache = get_phrase_cache()
+        self.api_requests = 0
+
+    def resolve_options(
+        self,
+        voice: VoiceType | None = None,
+        speed: float | None = None,
+        response_format: AudioFormat | None = None,
+        model: str | None = None,
+    ) -> SynthesisOptions:
+        """Apply config defaults and validate synthesis parameters."""
+        options = SynthesisOptions(
+            voice=voice or self.config.tts_voice,
+            speed=speed if speed is not None else self.config.tts_speed,
+            response_format=response_format or self.config.tts_response_format,
+            model=model or self.config.tts_model,
+        )
+
+        if options.voice not in self.AVAILABLE_VOICES:
+            raise ValueError(f"Invalid voice: {options.voice}. Available: {self.AVAILABLE_VOICES}")
+
+        if options.response_format not in self.AVAILABLE_FORMATS:
+            raise ValueError(
+                f"Invalid format: {options.response_format}. Available: {self.AVAILABLE_FORMATS}"
+            )
+
+        if not 0.25 <= options.speed <= 4.0:
+            raise ValueError("Speed must be between 0.25 and 4.0")
+
+        return options
 
     async def synthesize(
         self,
@@ -57,40 +147,35 @@ class SynthesisService:
         if not text.strip():
             raise ValueError("Text cannot be empty")
 
-        # Use defaults from config if not specified
-        voice = voice or self.config.tts_voice  # type: ignore
-        speed = speed if speed is not None else self.config.tts_speed
-        response_format = response_format or self.config.tts_response_format  # type: ignore
-        model = model or self.config.tts_model
+        options = self.resolve_options(voice, speed, response_format, model)
 
-        # Validate parameters
-        if voice not in self.AVAILABLE_VOICES:
-            raise ValueError(f"Invalid voice: {voice}. Available: {self.AVAILABLE_VOICES}")
-
-        if response_format not in self.AVAILABLE_FORMATS:
-            raise ValueError(
-                f"Invalid format: {response_format}. Available: {self.AVAILABLE_FORMATS}"
+        cache_key = None
+        if self.cache.cacheable(text):
+            cache_key = self.cache.key(
+                text, options.voice, options.speed, options.response_format, options.model
             )
-
-        if not 0.25 <= speed <= 4.0:
-            raise ValueError("Speed must be between 0.25 and 4.0")
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.debug("Phrase cache hit", text_length=len(text))
+                return cached
 
         logger.info(
             "Synthesizing speech",
             text_length=len(text),
-            voice=voice,
-            speed=speed,
-            format=response_format,
-            model=model,
+            voice=options.voice,
+            speed=options.speed,
+            format=options.response_format,
+            model=options.model,
         )
 
         try:
+            self.api_requests += 1
             response = await self.client.audio.speech.create(
-                model=model,
-                voice=voice,
+                model=options.model,
+                voice=options.voice,
                 input=text,
-                speed=speed,
-                response_format=response_format,
+                speed=options.speed,
+                response_format=options.response_format,
             )
 
             # Get audio content
@@ -99,29 +184,132 @@ class SynthesisService:
             logger.info(
                 "Speech synthesis completed",
                 audio_size=len(audio_data),
-                format=response_format,
+                format=options.response_format,
             )
 
+            if cache_key is not None:
+                self.cache.put(cache_key, audio_data)
+
             return audio_data
 
         except Exception as e:
             logger.error("Speech synthesis failed", error=str(e))
             raise
 
-    async def synthesize_stream(
+    async def _stream_segment(
         self,
         text: str,
+        options: SynthesisOptions,
+        response_format: str,
+        chunk_size: int,
+    ) -> AsyncIterator[bytes]:
+        """Audio for one segment, from the cache or streamed from the API."""
+        cache_key = None
+        if self.cache.cacheable(text):
+            cache_key = self.cache.key(
+                text, options.voice, options.speed, response_format, options.model
+            )
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        parts: list[bytes] = []
+        self.api_requests += 1
+        async with self.client.audio.speech.with_streaming_response.create(
+            model=options.model,
+            voice=options.voice,
+            input=text,
+            speed=options.speed,
+            response_format=response_format,
+        ) as response:
+            async for chunk in response.iter_bytes(chunk_size):
+                if cache_key is not None:
+                    parts.append(chunk)
+                yield chunk
+
+        if cache_key is not None:
+            self.cache.put(cache_key, b"".join(parts))
+
+    async def _fill_segment(
+        self,
+        segment: _Segment,
+        options: SynthesisOptions,
+        response_format: str,
+        chunk_size: int,
+    ) -> None:
+        try:
+            async for chunk in self._stream_segment(segment.text, options, response_format, chunk_size):
+                segment.chunks.put_nowait(chunk)
+            segment.chunks.put_nowait(None)
+        except Exception as e:
+            segment.chunks.put_nowait(e)
+
+    async def _produce_segments(
+        self,
+        text: str | AsyncIterable[str],
+        options: SynthesisOptions,
+        response_format: str,
+        chunk_size: int,
+        segments: asyncio.Queue,
+    ) -> None:
+        """Split text into sentences and start synthesizing each one."""
+        index = 0
+
+        async def start(sentence: str) -> None:
+            nonlocal index
+            segment = _Segment(index=index, text=sentence)
+            index += 1
+            # Blocks while `lookahead` segments are already queued, which
+            # bounds how far synthesis runs ahead of the client
+            await segments.put(segment)
+            segment.task = asyncio.create_task(
+                self._fill_segment(segment, options, response_format, chunk_size)
+            )
+
+        try:
+            if options.response_format in _SEGMENTABLE_FORMATS:
+                segmenter = SentenceSegmenter(
+                    min_chars=self.config.tts_segment_min_chars,
+                    max_chars=self.config.tts_segment_max_chars,
+                )
+                async for piece in _iter_text(text):
+                    for sentence in segmenter.feed(piece):
+                        await start(sentence)
+                for sentence in segmenter.flush():
+                    await start(sentence)
+            else:
+                # Outputs that can't be concatenated are synthesized in one request
+                whole = " ".join("".join([piece async for piece in _iter_text(text)]).split())
+                if len(whole) > 4096:
+                    raise ValueError("Text exceeds maximum length of 4096 characters")
+                if whole:
+                    await start(whole)
+
+            await segments.put(None)
+        except Exception as e:
+            await segments.put(e)
+
+    async def synthesize_stream(
+        self,
+        text: str | AsyncIterable[str],
         voice: VoiceType | None = None,
         speed: float | None = None,
         response_format: AudioFormat = "mp3",
         model: str | None = None,
-        chunk_size: int = 4096,
+        chunk_size: int | None = None,
     ) -> AsyncIterator[bytes]:
         """
         Synthesize text to speech with streaming output.
 
+        Text is synthesized sentence by sentence: the first audio is sent as
+        soon as the API starts returning the first sentence, and the next
+        ``tts_stream_lookahead`` sentences are synthesized while earlier ones
+        are still streaming.
+
         Args:
-            text: Text to convert to speech
+            text: Text to convert to speech, or an async iterable of text
+                fragments (e.g. LLM output deltas)
             voice: Voice to use
             speed: Speaking speed
             response_format: Audio format
@@ -131,41 +319,98 @@ class SynthesisService:
         Yields:
             Audio data chunks
         """
-        # Use defaults from config if not specified
-        voice = voice or self.config.tts_voice  # type: ignore
-        speed = speed if speed is not None else self.config.tts_speed
-        model = model or self.config.tts_model
+        options = self.resolve_options(voice, speed, response_format, model)
+        chunk_size = chunk_size or self.config.tts_stream_chunk_size
+        # WAV is sent as one header followed by raw PCM for every sentence
+        segment_format = "pcm" if options.response_format == "wav" else options.response_format
 
         logger.info(
             "Starting streaming speech synthesis",
-            text_length=len(text),
-            voice=voice,
+            text_length=len(text) if isinstance(text, str) else None,
+            voice=options.voice,
+            format=options.response_format,
         )
 
-        try:
-            # Note: OpenAI TTS doesn't support true streaming yet,
-            # so we simulate it by chunking the response
-            response = await self.client.audio.speech.create(
-                model=model,
-                voice=voice,
-                input=text,
-                speed=speed,
-                response_format=response_format,
-            )
+        segments: asyncio.Queue = asyncio.Queue(maxsize=max(1, self.config.tts_stream_lookahead))
+        producer = asyncio.create_task(
+            self._produce_segments(text, options, segment_format, chunk_size, segments)
+        )
 
-            # Stream the content in chunks
-            audio_data = response.content
-            for i in range(0, len(audio_data), chunk_size):
-                yield audio_data[i : i + chunk_size]
-                # Small delay to simulate streaming
-                await asyncio.sleep(0.01)
+        started = time.monotonic()
+        first_audio: float | None = None
+        sent_bytes = 0
+        count = 0
+        current: _Segment | None = None
 
-            logger.info("Streaming synthesis completed")
+        try:
+            if options.response_format == "wav":
+                yield _wav_stream_header()
+
+            while True:
+                current = await segments.get()
+                if current is None:
+                    break
+                if isinstance(current, Exception):
+                    raise current
+
+                count += 1
+                while True:
+                    chunk = await current.chunks.get()
+                    if chunk is None:
+                        break
+                    if isinstance(chunk, Exception):
+                        raise chunk
+                    if first_audio is None:
+                        first_audio = time.monotonic() - started
+                    sent_bytes += len(chunk)
+                    yield chunk
+
+            logger.info(
+                "Streaming synthesis completed",
+                segments=count,
+                audio_bytes=sent_bytes,
+                first_audio_ms=round(first_audio * 1000) if first_audio is not None else None,
+                total_ms=round((time.monotonic() - started) * 1000),
+            )
 
         except Exception as e:
             logger.error("Streaming synthesis failed", error=str(e))
             raise
 
+        finally:
+            # Client gone or failure: stop synthesizing what will never be sent
+            producer.cancel()
+            pending = [current] if isinstance(current, _Segment) else []
+            while not segments.empty():
+                item = segments.get_nowait()
+                if isinstance(item, _Segment):
+                    pending.append(item)
+            for segment in pending:
+                if segment.task is not None:
+                    segment.task.cancel()
+
+    async def prewarm(self, phrases: list[str]) -> None:
+        """Synthesize common phrases into the cache ahead of use."""
+        options = self.resolve_options()
+        for phrase in phrases:
+            if not self.cache.cacheable(phrase):
+                continue
+            try:
+                async for _ in self._stream_segment(
+                    phrase, options, options.response_format, self.config.tts_stream_chunk_size
+                ):
+                    pass
+            except Exception as e:
+                logger.warning("Phrase prewarm failed", phrase=phrase, error=str(e))
+                return
+        logger.info("Phrase cache prewarmed", phrases=len(phrases))
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "api_requests": self.api_requests,
+            "phrase_cache": self.cache.get_stats(),
+        }
+
     def get_voice_info(self) -> list[dict]:
         """
         Get information about available voices.
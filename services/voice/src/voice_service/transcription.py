@@ -4,30 +4,106 @@ Speech-to-Text transcription service using OpenAI Whisper.
 
 import asyncio
 import io
-import os
-import tempfile
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from pathlib import Path
-from typing import AsyncIterator
+from typing import Any
 
 import aiofiles
 from openai import AsyncOpenAI
-from pydub import AudioSegment
 
 from ai_core import get_logger
 
-from .config import get_voice_config
+from .config import VoiceConfig, get_voice_config
+from .vad import EnergyVAD, SpeechSegment, pcm_to_wav
 
 logger = get_logger(__name__)
 
 
+class TranscriptionBackend(ABC):
+    """Speech recognizer the transcription service sends audio to."""
+
+    @abstractmethod
+    async def transcribe(
+        self,
+        audio_data: bytes,
+        filename: str,
+        language: str | None = None,
+        prompt: str | None = None,
+        response_format: str = "json",
+        temperature: float = 0.0,
+    ) -> dict[str, Any]:
+        """
+        Transcribe one audio clip.
+
+        Args:
+            audio_data: Encoded audio bytes
+            filename: Filename whose extension identifies the format
+            language: ISO-639-1 language code (optional, auto-detect if None)
+            prompt: Optional prompt to guide transcription
+            response_format: Output format (json, text, srt, verbose_json, vtt)
+            temperature: Sampling temperature (0-1)
+
+        Returns:
+            Dict with at least "text"; optionally language, duration, segments
+        """
+        ...
+
+
+class WhisperBackend(TranscriptionBackend):
+    """OpenAI Whisper API (or any OpenAI-compatible transcription server)."""
+
+    def __init__(self, config: VoiceConfig):
+        self.model = config.whisper_model
+        self.client = AsyncOpenAI(
+            api_key=config.openai_api_key,
+            base_url=config.openai_base_url,
+        )
+
+    async def transcribe(
+        self,
+        audio_data: bytes,
+        filename: str,
+        language: str | None = None,
+        prompt: str | None = None,
+        response_format: str = "json",
+        temperature: float = 0.0,
+    ) -> dict[str, Any]:
+        params: dict = {
+            "model": self.model,
+            # The client reads the format from the file name; no temp file needed
+            "file": (filename, audio_data),
+            "response_format": response_format,
+            "temperature": temperature,
+        }
+        if language:
+            params["language"] = language
+        if prompt:
+            params["prompt"] = prompt
+
+        response = await self.client.audio.transcriptions.create(**params)
+
+        # Handle different response formats
+        if response_format in ("json", "verbose_json"):
+            result = {
+                "text": response.text,
+                "language": getattr(response, "language", language),
+                "duration": getattr(response, "duration", None),
+            }
+            if hasattr(response, "segments"):
+                result["segments"] = response.segments
+            return result
+        return {"text": response if isinstance(response, str) else response.text}
+
+
 class TranscriptionService:
     """Service for transcribing audio to text using Whisper."""
 
     SUPPORTED_FORMATS = {"mp3", "mp4", "mpeg", "mpga", "m4a", "wav", "webm", "ogg", "flac"}
 
-    def __init__(self) -> None:
+    def __init__(self, backend: TranscriptionBackend | None = None) -> None:
         self.config = get_voice_config()
-        self.client = AsyncOpenAI(api_key=self.config.openai_api_key)
+        self.backend = backend or WhisperBackend(self.config)
 
     async def transcribe_file(
         self,
@@ -55,102 +131,90 @@ class TranscriptionService:
         if not file_path.exists():
             raise FileNotFoundError(f"Audio file not found: {file_path}")
 
-        # Check file size
-        file_size_mb = file_path.stat().st_size / (1024 * 1024)
-        if file_size_mb > self.config.max_audio_size_mb:
-            raise ValueError(
-                f"File size ({file_size_mb:.1f}MB) exceeds maximum "
-                f"({self.config.max_audio_size_mb}MB)"
-            )
+        async with aiofiles.open(file_path, "rb") as f:
+            audio_data = await f.read()
 
-        logger.info(
-            "Transcribing audio file",
-            file=str(file_path),
-            size_mb=f"{file_size_mb:.1f}",
-            language=language or "auto",
+        return await self.transcribe_bytes(
+            audio_data,
+            filename=file_path.name,
+            language=language,
+            prompt=prompt,
+            response_format=response_format,
+            temperature=temperature,
         )
 
-        try:
-            async with aiofiles.open(file_path, "rb") as f:
-                audio_data = await f.read()
-
-            # Create a file-like object for the API
-            audio_file = io.BytesIO(audio_data)
-            audio_file.name = file_path.name
-
-            # Build API parameters
-            params: dict = {
-                "model": self.config.whisper_model,
-                "file": audio_file,
-                "response_format": response_format,
-                "temperature": temperature,
-            }
-
-            if language:
-                params["language"] = language
-            elif self.config.whisper_language:
-                params["language"] = self.config.whisper_language
-
-            if prompt:
-                params["prompt"] = prompt
-
-            # Call Whisper API
-            response = await self.client.audio.transcriptions.create(**params)
-
-            # Handle different response formats
-            if response_format in ("json", "verbose_json"):
-                result = {
-                    "text": response.text,
-                    "language": getattr(response, "language", language),
-                    "duration": getattr(response, "duration", None),
-                }
-                if hasattr(response, "segments"):
-                    result["segments"] = response.segments
-            else:
-                result = {"text": response if isinstance(response, str) else response.text}
-
-            logger.info("Transcription completed", text_length=len(result["text"]))
-            return result
-
-        except Exception as e:
-            logger.error("Transcription failed", error=str(e))
-            raise
-
     async def transcribe_bytes(
         self,
         audio_data: bytes,
         filename: str = "audio.webm",
         language: str | None = None,
         prompt: str | None = None,
+        response_format: str = "json",
+        temperature: float = 0.0,
     ) -> dict:
         """
-        Transcribe audio from bytes.
+        Transcribe audio from bytes, without touching the filesystem.
 
         Args:
             audio_data: Raw audio bytes
             filename: Original filename (for format detection)
             language: ISO-639-1 language code (optional)
             prompt: Optional prompt to guide transcription
+            response_format: Output format (json, text, srt, verbose_json, vtt)
+            temperature: Sampling temperature (0-1)
 
         Returns:
             Transcription result
         """
-        # Save to temporary file
-        suffix = Path(filename).suffix or ".webm"
-        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tmp:
-            tmp.write(audio_data)
-            tmp_path = tmp.name
+        size_mb = len(audio_data) / (1024 * 1024)
+        if size_mb > self.config.max_audio_size_mb:
+            raise ValueError(
+                f"File size ({size_mb:.1f}MB) exceeds maximum "
+                f"({self.config.max_audio_size_mb}MB)"
+            )
+
+        if not Path(filename).suffix:
+            filename = f"{filename}.webm"
+
+        logger.info(
+            "Transcribing audio",
+            filename=filename,
+            size_mb=f"{size_mb:.1f}",
+            language=language or "auto",
+        )
 
         try:
-            result = await self.transcribe_file(
-                tmp_path,
-                language=language,
+            result = await self.backend.transcribe(
+                audio_data,
+                filename,
+                language=language or self.config.whisper_language,
                 prompt=prompt,
+                response_format=response_format,
+                temperature=temperature,
             )
+            logger.info("Transcription completed", text_length=len(result["text"]))
             return result
-        finally:
-            # Cleanup
-            os.unlink(tmp_path)
+
+        except Exception as e:
+            logger.error("Transcription failed", error=str(e))
+            raise
+
+    def start_stream(
+        self,
+        sample_rate: int | None = None,
+        language: str | None = None,
+        prompt: str | None = None,
+    ) -> "StreamingTranscription":
+        """Begin a live transcription of 16-bit mono PCM audio."""
+        sample_rate = sample_rate or self.config.stt_stream_sample_rate
+        if not isinstance(sample_rate, int) or not 8000 <= sample_rate <= 48000:
+            raise ValueError("Sample rate must be an integer between 8000 and 48000")
+        return StreamingTranscription(
+            self,
+            sample_rate=sample_rate,
+            language=language,
+            prompt=prompt,
+        )
 
     async def convert_audio_format(
         self,
@@ -169,10 +233,12 @@ class TranscriptionService:
         Returns:
             Converted audio bytes
         """
-        # Run conversion in thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
+        if source_format == target_format:
+            return audio_data
 
         def _convert():
+            from pydub import AudioSegment
+
             audio = AudioSegment.from_file(
                 io.BytesIO(audio_data),
                 format=source_format,
@@ -181,7 +247,105 @@ class TranscriptionService:
             audio.export(output, format=target_format)
             return output.getvalue()
 
-        return await loop.run_in_executor(None, _convert)
+        # Run conversion in thread pool to avoid blocking
+        return await asyncio.to_thread(_convert)
+
+
+class StreamingTranscription:
+    """
+    One live dictation.
+
+    PCM passed to ``feed`` is split into utterances at pauses, and each
+    utterance is transcribed as soon as it ends, up to
+    ``stt_stream_concurrency`` at a time, while recording continues.
+    ``results`` yields the partial transcripts in speaking order; ``text``
+    is the stitched transcript so far. Only the audio after the last pause
+    is left to transcribe when the speaker stops.
+    """
+
+    def __init__(
+        self,
+        service: TranscriptionService,
+        sample_rate: int,
+        language: str | None = None,
+        prompt: str | None = None,
+    ):
+        config = service.config
+        self._service = service
+        self.sample_rate = sample_rate
+        self.language = language
+        self.prompt = prompt
+        self._vad = EnergyVAD(
+            sample_rate=sample_rate,
+            threshold_db=config.stt_vad_threshold_db,
+            min_speech_ms=config.stt_vad_min_speech_ms,
+            min_silence_ms=config.stt_vad_min_silence_ms,
+            max_segment_seconds=config.stt_vad_max_segment_seconds,
+        )
+        self._semaphore = asyncio.Semaphore(config.stt_stream_concurrency)
+        self._pending: asyncio.Queue[asyncio.Task | None] = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+        self._texts: list[str] = []
+        self._ended = False
+        self.audio_bytes = 0
+
+    @property
+    def segments(self) -> int:
+        return len(self._tasks)
+
+    @property
+    def text(self) -> str:
+        return " ".join(text for text in self._texts if text)
+
+    def feed(self, pcm: bytes) -> int:
+        """Add audio; returns how many utterances it completed."""
+        if self._ended:
+            raise RuntimeError("Stream already ended")
+        self.audio_bytes += len(pcm)
+        segments = self._vad.feed(pcm)
+        for segment in segments:
+            self._start(segment)
+        return len(segments)
+
+    def end(self) -> None:
+        """Mark the end of audio; the last utterance is transcribed."""
+        if self._ended:
+            return
+        self._ended = True
+        for segment in self._vad.flush():
+            self._start(segment)
+        self._pending.put_nowait(None)
+
+    async def results(self) -> AsyncIterator[dict[str, Any]]:
+        """Partial transcripts, in order, as each utterance finishes."""
+        while (task := await self._pending.get()) is not None:
+            partial = await task
+            self._texts.append(partial["text"])
+            yield partial
+
+    def cancel(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+
+    def _start(self, segment: SpeechSegment) -> None:
+        task = asyncio.create_task(self._transcribe(segment))
+        self._tasks.append(task)
+        self._pending.put_nowait(task)
+
+    async def _transcribe(self, segment: SpeechSegment) -> dict[str, Any]:
+        async with self._semaphore:
+            result = await self._service.transcribe_bytes(
+                pcm_to_wav(segment.pcm, self.sample_rate),
+                filename=f"segment-{segment.index}.wav",
+                language=self.language,
+                prompt=self.prompt,
+            )
+        return {
+            "index": segment.index,
+            "start": round(segment.start, 2),
+            "end": round(segment.end, 2),
+            "text": result["text"].strip(),
+        }
 
 
 # Singleton instance
@@ -0,0 +1,178 @@
+"""
+Energy-based voice activity detection for streaming transcription.
+
+Incoming 16-bit mono PCM is cut into utterances at pauses, so each one can
+be transcribed while the speaker carries on. Speech is any frame louder
+than a fixed floor and a margin above the adaptive background level.
+"""
+
+import io
+import wave
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+
+SAMPLE_WIDTH = 2  # 16-bit PCM
+
+
+def pcm_to_wav(pcm: bytes, sample_rate: int, channels: int = 1) -> bytes:
+    """Wrap raw 16-bit PCM in a WAV container, in memory."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(SAMPLE_WIDTH)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+
+@dataclass
+class SpeechSegment:
+    """One utterance of PCM audio and its position in the stream."""
+
+    index: int
+    start: float  # Seconds from the start of the stream
+    end: float
+    pcm: bytes
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class EnergyVAD:
+    """
+    Incremental utterance segmenter.
+
+    ``feed`` returns the utterances completed by the new audio; ``flush``
+    returns the one in progress when the stream ends. An utterance closes
+    after ``min_silence_ms`` of quiet and keeps ``padding_ms`` of audio on
+    either side so word edges aren't clipped. Bursts shorter than
+    ``min_speech_ms`` are dropped as noise, and utterances longer than
+    ``max_segment_seconds`` are cut at the quietest recent frame.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_ms: int = 30,
+        threshold_db: float = -45.0,
+        margin_db: float = 10.0,
+        min_speech_ms: int = 250,
+        min_silence_ms: int = 500,
+        max_segment_seconds: float = 20.0,
+        padding_ms: int = 200,
+    ):
+        self.sample_rate = sample_rate
+        self.threshold_db = threshold_db
+        self.margin_db = margin_db
+        self._frame_samples = sample_rate * frame_ms // 1000
+        self._frame_bytes = self._frame_samples * SAMPLE_WIDTH
+        self._frame_seconds = self._frame_samples / sample_rate
+        self._min_speech = max(1, min_speech_ms // frame_ms)
+        self._min_silence = max(1, min_silence_ms // frame_ms)
+        self._max_frames = max(self._min_silence * 2, int(max_segment_seconds * 1000) // frame_ms)
+        self._padding = padding_ms // frame_ms
+
+        self._remainder = b""
+        self._preroll: deque[bytes] = deque(maxlen=self._padding)
+        self._frames: list[bytes] = []
+        self._levels: list[float] = []
+        self._speech_frames = 0
+        self._silence_run = 0
+        self._segment_start = 0
+        self._position = 0  # Frames seen so far
+        self._index = 0
+        self._noise_floor = threshold_db - margin_db
+
+    @property
+    def in_speech(self) -> bool:
+        return bool(self._frames)
+
+    def feed(self, pcm: bytes) -> list[SpeechSegment]:
+        data = self._remainder + pcm
+        usable = len(data) - len(data) % self._frame_bytes
+        self._remainder = data[usable:]
+        if not usable:
+            return []
+
+        samples = np.frombuffer(data[:usable], dtype="<i2").astype(np.float32)
+        frames = samples.reshape(-1, self._frame_samples)
+        rms = np.sqrt(np.mean(frames * frames, axis=1)) / 32768.0
+        levels = 20.0 * np.log10(rms + 1e-10)
+
+        out: list[SpeechSegment] = []
+        for i, level in enumerate(levels.tolist()):
+            frame = data[i * self._frame_bytes : (i + 1) * self._frame_bytes]
+            self._process(frame, level, out)
+            self._position += 1
+        return out
+
+    def flush(self) -> list[SpeechSegment]:
+        out: list[SpeechSegment] = []
+        self._remainder = b""  # Less than one frame
+        if self._frames:
+            self._close(len(self._frames), out)
+        return out
+
+    def _process(self, frame: bytes, level: float, out: list[SpeechSegment]) -> None:
+        speech = level > max(self.threshold_db, self._noise_floor + self.margin_db)
+
+        if not self._frames:
+            if speech:
+                self._frames = list(self._preroll)
+                self._levels = [self._noise_floor] * len(self._frames)
+                self._segment_start = self._position - len(self._frames)
+                self._preroll.clear()
+                self._speech_frames = 0
+                self._silence_run = 0
+            else:
+                self._preroll.append(frame)
+                # Track the background level only while nobody is speaking
+                self._noise_floor = 0.95 * self._noise_floor + 0.05 * level
+                return
+
+        self._frames.append(frame)
+        self._levels.append(level)
+        if speech:
+            self._speech_frames += 1
+            self._silence_run = 0
+        else:
+            self._silence_run += 1
+
+        if self._silence_run >= self._min_silence:
+            # Keep `padding` frames of the trailing silence
+            self._close(len(self._frames) - self._silence_run + self._padding, out)
+        elif len(self._frames) >= self._max_frames:
+            # Cut a long run of speech at the quietest point of its last quarter
+            tail = self._max_frames // 4
+            cut = len(self._frames) - tail + int(np.argmin(self._levels[-tail:])) + 1
+            self._close(cut, out)
+
+    def _close(self, keep: int, out: list[SpeechSegment]) -> None:
+        frames, self._frames = self._frames[:keep], self._frames[keep:]
+        levels, self._levels = self._levels[:keep], self._levels[keep:]
+        start = self._segment_start
+        self._segment_start += keep
+
+        speech_frames = self._speech_frames
+        threshold = max(self.threshold_db, self._noise_floor + self.margin_db)
+        self._speech_frames = sum(1 for level in self._levels if level > threshold)
+        self._silence_run = 0
+        if not self._speech_frames:
+            # Nothing but silence left over; it becomes pre-roll for the next utterance
+            self._preroll.extend(self._frames)
+            self._frames, self._levels = [], []
+
+        if speech_frames - self._speech_frames < self._min_speech:
+            return
+        out.append(
+            SpeechSegment(
+                index=self._index,
+                start=start * self._frame_seconds,
+                end=(start + len(levels)) * self._frame_seconds,
+                pcm=b"".join(frames),
+            )
+        )
+        self._index += 1
@@ -0,0 +1,16 @@
+"""Shared test fixtures."""
+
+import fakeredis
+import pytest
+
+from ai_messaging import RedisClient
+
+
+@pytest.fixture
+async def redis():
+    """A RedisClient backed by an in-memory fake Redis (with Lua scripting)."""
+    client = RedisClient()
+    client._client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    yield client
+    await client._client.aclose()
+    client._client = None
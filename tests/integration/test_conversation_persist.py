@@ -0,0 +1,87 @@
+"""Tests for persisting conversation history to Postgres, against a live server."""
+
+from uuid import uuid4
+
+import pytest
+from api.database import db_session_context
+from api.services.conversation_history import load_messages, persist_message
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from ai_messaging import ConversationHistory
+
+
+@pytest.fixture
+async def conversation_id(database_url, monkeypatch):
+    """A conversation row in a throwaway schema the API's sessions are pointed at."""
+    from database.models import Base, Conversation, User
+
+    schema = f"test_{uuid4().hex[:12]}"
+    url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    admin = create_async_engine(url)
+    async with admin.begin() as conn:
+        await conn.execute(text(f'CREATE SCHEMA "{schema}"'))
+
+    engine = create_async_engine(url, connect_args={"server_settings": {"search_path": schema}})
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    monkeypatch.setattr("api.database._engine", engine)
+    monkeypatch.setattr("api.database._session_factory", async_sessionmaker(engine, expire_on_commit=False))
+
+    user = User(email="dev@example.com", username="dev", password_hash="x")
+    conversation = Conversation(title="backfill", user=user)
+    async with db_session_context() as session:
+        session.add_all([user, conversation])
+
+    yield conversation.id
+
+    await engine.dispose()
+    async with admin.begin() as conn:
+        await conn.execute(text(f'DROP SCHEMA "{schema}" CASCADE'))
+    await admin.dispose()
+
+
+@pytest.mark.asyncio
+class TestPersistMessage:
+    """Tests for the messages table writer."""
+
+    async def test_persist_twice(self, conversation_id):
+        """Test that persisting a stored message again leaves the stored row alone."""
+        message = {
+            "id": f"agent-{uuid4()}",
+            "conversation_id": conversation_id,
+            "role": "assistant",
+            "content": "done",
+            "agent": "code",
+            "timestamp": "2026-10-18T00:00:01+00:00",
+        }
+
+        await persist_message(message)
+        await persist_message({**message, "content": "changed"})
+
+        stored = await load_messages(conversation_id, 10)
+        assert [(m["id"], m["content"]) for m in stored] == [(message["id"], "done")]
+
+    async def test_backfill_persists_legacy_messages(self, conversation_id, redis):
+        """Test that a backfill stores every legacy message, including ones stored before."""
+        messages = [
+            {
+                "id": f"agent-{uuid4()}" if n % 2 else str(uuid4()),
+                "role": "assistant" if n % 2 else "user",
+                "content": f"message {n}",
+                "timestamp": f"2026-10-18T00:00:{n:02d}+00:00",
+            }
+            for n in range(8)
+        ]
+        for msg in messages:
+            await redis.hset(f"message:{msg['id']}", mapping=msg)
+            await redis.lpush(f"conversation:{conversation_id}:messages", msg["id"])
+        # The old code stored user messages; only agent replies were lost
+        await persist_message({**messages[0], "conversation_id": conversation_id})
+
+        history = ConversationHistory(redis, loader=load_messages, writer=persist_message, max_messages=3)
+        await history.backfill()
+
+        stored = await load_messages(conversation_id, 100)
+        assert [m["id"] for m in stored] == [m["id"] for m in messages]
+        assert not await redis.exists(f"conversation:{conversation_id}:messages")
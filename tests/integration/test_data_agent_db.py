@@ -0,0 +1,117 @@
+"""Tests for the data agent's pooled SQL tools against a live Postgres."""
+
+import time
+
+import asyncpg
+import pytest
+from data_agent.tools import db as db_module
+from data_agent.tools import sql_tools
+from data_agent.tools.db import DatabaseManager
+
+ROWS = 2500
+PAGE = 1000
+
+
+@pytest.fixture
+async def manager(database_url, monkeypatch):
+    """The global database manager pointed at the test server."""
+    manager = DatabaseManager(database_url)
+    monkeypatch.setattr(db_module, "_database_manager", manager)
+    yield manager
+    await sql_tools.close_cursors()
+    await manager.close_all()
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("manager")
+class TestSqlTools:
+    """Tests for query execution through the connection pool."""
+
+    async def test_queries_share_pool(self, manager):
+        """Test that repeated small queries reuse pooled connections."""
+        for _ in range(5):
+            result = await sql_tools.execute_query("SELECT 1 AS one")
+            assert result.success
+
+        db = await manager.get()
+        stats = db.get_stats()
+        assert db.acquired == 5
+        assert stats["size"] == 1
+
+    async def test_cursor_paging(self):
+        """Test that fetch_more_rows walks a large result without gaps or duplicates."""
+        query = f"SELECT g AS n FROM generate_series(1, {ROWS}) g ORDER BY g"
+
+        result = await sql_tools.execute_query(query, limit=PAGE)
+        seen = [row["n"] for row in result.output]
+        cursor_id = result.metadata["cursor_id"]
+        assert result.metadata["has_more"]
+        while cursor_id:
+            result = await sql_tools.fetch_more_rows(cursor_id, limit=PAGE)
+            assert result.success, result.error
+            seen.extend(row["n"] for row in result.output)
+            cursor_id = result.metadata.get("cursor_id")
+
+        assert seen == list(range(1, ROWS + 1))
+        assert not sql_tools._open_cursors
+
+    async def test_close_cursor(self):
+        """Test that an abandoned cursor is released explicitly."""
+        result = await sql_tools.execute_query("SELECT generate_series(1, 100) AS n", limit=10)
+
+        closed = await sql_tools.close_query_cursor(result.metadata["cursor_id"])
+
+        assert closed.success
+        assert not sql_tools._open_cursors
+
+    async def test_small_result_holds_no_cursor(self):
+        """Test that a result that fits in one page returns its connection."""
+        result = await sql_tools.execute_query("SELECT 1 AS one", limit=10)
+
+        assert result.success
+        assert result.metadata["cursor_id"] is None
+        assert not sql_tools._open_cursors
+
+    async def test_statement_timeout(self, manager):
+        """Test that a slow query is cancelled by the server and its connection returned."""
+        start = time.perf_counter()
+        result = await sql_tools.execute_query("SELECT pg_sleep(5)", timeout_seconds=0.5)
+        elapsed = time.perf_counter() - start
+
+        assert not result.success
+        assert "timeout" in result.error
+        assert elapsed < 3
+        db = await manager.get()
+        stats = db.get_stats()
+        assert stats["statement_timeouts"] == 1
+        assert stats["idle"] == stats["size"]
+
+    async def test_query_error(self):
+        result = await sql_tools.execute_query("SELECT * FROM data_agent_missing_table")
+
+        assert not result.success
+
+    async def test_read_only_transaction(self, database_url):
+        """Test that a write passing the keyword filter is refused by the transaction."""
+        conn = await asyncpg.connect(database_url)
+        try:
+            await conn.execute("CREATE SEQUENCE IF NOT EXISTS data_agent_test_seq")
+            result = await sql_tools.execute_query("SELECT nextval('data_agent_test_seq')")
+        finally:
+            await conn.execute("DROP SEQUENCE IF EXISTS data_agent_test_seq")
+            await conn.close()
+
+        assert not result.success
+        assert "read-only" in result.error
+
+    async def test_health(self):
+        result = await sql_tools.database_health()
+
+        assert result.success
+        assert result.output["healthy"]
+
+    async def test_database_name_validated(self):
+        """Test that database names are checked before building a DSN."""
+        result = await sql_tools.list_tables(database="bench; drop")
+
+        assert not result.success
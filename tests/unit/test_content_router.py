@@ -0,0 +1,182 @@
+"""Tests for content routing: micro-batching, the decision cache and fallbacks."""
+
+import asyncio
+import sys
+import threading
+import time
+
+import pytest
+
+from ai_core.content_router import CACHE_MAX_ENTRIES, ContentRouter
+from ai_core.model_selector import ModelTier
+from ai_core.router_inference import RoutingBatcher
+
+
+class StubRouter:
+    """Routes every text to one model, recording the batches it was given."""
+
+    def __init__(self, model_name: str = "powerful") -> None:
+        self.model_name = model_name
+        self.delay = 0.0
+        self.batches: list[list[str]] = []
+
+    def route_batch(self, texts: list[str]) -> list[tuple[str, int]]:
+        time.sleep(self.delay)
+        self.batches.append(texts)
+        return [(self.model_name, len(text.split())) for text in texts]
+
+
+def user(text: str) -> list[dict]:
+    return [{"role": "user", "content": text}]
+
+
+@pytest.fixture
+def stub():
+    return StubRouter()
+
+
+@pytest.fixture
+async def content_router(stub):
+    """A ContentRouter serving ``stub`` without loading a bundle."""
+    router = ContentRouter(export_dir="", config_path="")
+    router._router = stub
+    router._cost_tracking_enabled = False
+    yield router
+    await router._batcher.close()
+
+
+@pytest.mark.asyncio
+class TestRoutingBatcher:
+    """Tests for collecting concurrent requests into batches."""
+
+    async def test_concurrent_requests_batched(self, stub):
+        """Test that concurrent requests are routed in one batch and answered in order."""
+        batcher = RoutingBatcher(stub.route_batch, window_ms=5)
+
+        results = await asyncio.gather(*(batcher.submit("word " * n) for n in range(1, 17)))
+        await batcher.close()
+
+        assert results == [("powerful", n) for n in range(1, 17)]
+        assert len(stub.batches) == batcher.batches == 1
+
+    async def test_cancelled_request_dropped(self, stub):
+        """Test that a request cancelled while waiting isn't routed."""
+        batcher = RoutingBatcher(stub.route_batch, window_ms=5)
+        cancelled = asyncio.create_task(batcher.submit("cancelled"))
+        kept = asyncio.create_task(batcher.submit("kept"))
+        await asyncio.sleep(0)
+
+        cancelled.cancel()
+        result = await kept
+        await batcher.close()
+
+        assert result == ("powerful", 1)
+        assert stub.batches == [["kept"]]
+
+    async def test_close_cancels_batch_in_flight(self):
+        """Test that closing cancels requests whose batch is being routed."""
+        started, release = threading.Event(), threading.Event()
+
+        def blocking(texts: list[str]) -> list[tuple[str, int]]:
+            started.set()
+            release.wait(5)
+            return [("fast", 1) for _ in texts]
+
+        batcher = RoutingBatcher(blocking, window_ms=0)
+        request = asyncio.create_task(batcher.submit("in flight"))
+        assert await asyncio.to_thread(started.wait, 5)
+
+        await batcher.close()
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(request, 1)
+        release.set()
+
+
+@pytest.mark.asyncio
+class TestContentRouter:
+    """Tests for the decision cache, the latency budget and loading the router."""
+
+    async def test_routes_with_router(self, content_router):
+        """Test that a BALANCED request takes the tier of the routed model name."""
+        assert await content_router.route(user("Refactor the auth module")) == ModelTier.POWERFUL
+
+    async def test_cache_key_normalized(self, content_router):
+        """Test that prompts differing in case and whitespace share a cache key."""
+        first = content_router._compute_cache_key(user("Refactor   the AUTH module"), "")
+        second = content_router._compute_cache_key(user("refactor the auth module"), "")
+
+        assert first == second
+
+    async def test_cache_hit_skips_model(self, content_router, stub):
+        """Test that a cached decision is served without routing again."""
+        await content_router.route(user("Refactor   the AUTH module"))
+
+        tier = await content_router.route(user("refactor the auth module"))
+
+        assert tier == ModelTier.POWERFUL
+        assert len(stub.batches) == 1
+
+    async def test_cache_bounded_lru(self, content_router):
+        """Test that the cache keeps recently used decisions and evicts the oldest past its limit."""
+        for n in range(CACHE_MAX_ENTRIES + 200):
+            content_router._cache_result(f"key-{n}", ModelTier.FAST)
+            if n % 100 == 0:
+                content_router._get_cached("key-0")
+
+        assert len(content_router._cache) == CACHE_MAX_ENTRIES
+        assert content_router._get_cached("key-0") is not None
+        assert content_router._get_cached("key-1") is None
+
+    async def test_latency_budget_falls_back(self, content_router, stub):
+        """Test that a request over the latency budget keeps BALANCED without waiting for the model."""
+        stub.delay = 0.2
+        content_router._latency_budget_ms = 50
+
+        start = time.monotonic()
+        tier = await content_router.route(user("something slow"))
+
+        assert tier == ModelTier.BALANCED
+        assert time.monotonic() - start < 0.15
+
+    async def test_mfrouter_without_bundle(self, tmp_path, stub, monkeypatch):
+        """Test that MFRouter is served through llmrouter when no bundle was exported."""
+        config = tmp_path / "router_config.yaml"
+        config.write_text("hparam: {}\n")
+        loaded = []
+        monkeypatch.setattr(
+            "ai_core.content_router._MFRouterFallback",
+            lambda path: loaded.append(path) or stub,
+        )
+        router = ContentRouter(export_dir=str(tmp_path / "export"), config_path=str(config))
+        router._cost_tracking_enabled = False
+
+        tier = await router.route(user("Refactor the auth module"))
+        await router._batcher.close()
+
+        assert tier == ModelTier.POWERFUL
+        assert loaded == [str(config)]
+
+    async def test_disabled_without_router(self, tmp_path):
+        """Test that routing is disabled when there is neither a bundle nor an MFRouter config."""
+        router = ContentRouter(
+            export_dir=str(tmp_path / "export"),
+            config_path=str(tmp_path / "router_config.yaml"),
+        )
+
+        tier = await router.route(user("Refactor the auth module"))
+
+        assert tier == ModelTier.BALANCED
+        assert not router._enabled
+
+    async def test_disabled_without_llmrouter(self, tmp_path, monkeypatch):
+        """Test that routing is disabled when llmrouter can't be imported for the fallback."""
+        config = tmp_path / "router_config.yaml"
+        config.write_text("hparam: {}\n")
+        monkeypatch.setitem(sys.modules, "llmrouter.models.mfrouter.router", None)
+        router = ContentRouter(export_dir=str(tmp_path / "export"), config_path=str(config))
+
+        tier = await router.route(user("Refactor the auth module"))
+
+        assert tier == ModelTier.BALANCED
+        assert not router._enabled
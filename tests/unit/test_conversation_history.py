@@ -0,0 +1,212 @@
+"""Tests for packed conversation history and the legacy backfill."""
+
+import uuid
+from typing import Any
+
+import pytest
+
+from ai_messaging import ConversationHistory
+from ai_messaging.conversation_history import (
+    HISTORY_VERSION,
+    HISTORY_VERSION_KEY,
+    estimate_tokens,
+    history_key,
+)
+
+
+def make_message(conversation_id: str, n: int) -> dict[str, str]:
+    return {
+        "id": str(uuid.uuid4()),
+        "conversation_id": conversation_id,
+        "user_id": "user-1",
+        "role": "user" if n % 2 == 0 else "assistant",
+        "content": f"message {n} " + "x" * 40,
+        "timestamp": f"2026-10-18T00:{n // 60 % 60:02d}:{n % 60:02d}+00:00",
+    }
+
+
+async def seed_legacy(redis, conversation_id: str, count: int) -> list[dict[str, str]]:
+    """Store a conversation the way it was stored before packed history."""
+    messages = [make_message(conversation_id, n) for n in range(count)]
+    for msg in messages:
+        await redis.hset(f"message:{msg['id']}", mapping=msg)
+        await redis.lpush(f"conversation:{conversation_id}:messages", msg["id"])
+    return messages
+
+
+class FakeStore:
+    """An in-memory stand-in for the Postgres loader and writer."""
+
+    def __init__(self) -> None:
+        self.messages: dict[str, list[dict[str, Any]]] = {}
+        self.loads: list[str] = []
+        self.fail_ids: set[str] = set()
+
+    async def load(self, conversation_id: str, limit: int) -> list[dict[str, Any]]:
+        self.loads.append(conversation_id)
+        return self.messages.get(conversation_id, [])[-limit:]
+
+    async def write(self, message: dict[str, Any]) -> None:
+        if message["id"] in self.fail_ids:
+            raise ConnectionError("database unavailable")
+        stored = self.messages.setdefault(message["conversation_id"], [])
+        if all(m["id"] != message["id"] for m in stored):
+            stored.append(message)
+
+    def ids(self, conversation_id: str) -> list[str]:
+        return [m["id"] for m in self.messages.get(conversation_id, [])]
+
+
+@pytest.fixture
+def store():
+    return FakeStore()
+
+
+@pytest.fixture
+def history(redis, store):
+    return ConversationHistory(redis, loader=store.load, writer=store.write, max_messages=10)
+
+
+@pytest.mark.asyncio
+class TestBackfill:
+    """Tests for converting ``message:{id}`` hashes into packed history."""
+
+    async def test_converts_newest_in_order(self, redis, history):
+        """Test that the newest messages are converted oldest first with their token count."""
+        messages = await seed_legacy(redis, "c1", 25)
+
+        converted = await history.backfill()
+
+        recent = await history.recent("c1", limit=10)
+        assert converted == 10
+        assert [m["id"] for m in recent] == [m["id"] for m in messages[-10:]]
+        assert await history.token_count("c1") == sum(estimate_tokens(m["content"]) for m in messages[-10:])
+
+    async def test_every_message_persisted_before_delete(self, redis, history, store):
+        """Test that messages older than the history cap reach the writer before their hashes go."""
+        messages = await seed_legacy(redis, "c1", 25)
+
+        await history.backfill()
+
+        assert store.ids("c1") == [m["id"] for m in messages]
+        assert not await redis.exists("conversation:c1:messages", *(f"message:{m['id']}" for m in messages))
+        assert await redis.get(HISTORY_VERSION_KEY) == HISTORY_VERSION
+
+    async def test_writer_failure_keeps_legacy(self, redis, history, store):
+        """Test that messages the writer fails on stay in the legacy layout until a rerun stores them."""
+        messages = await seed_legacy(redis, "c1", 25)
+        failing = {messages[2]["id"], messages[20]["id"]}
+        store.fail_ids = set(failing)
+
+        await history.backfill()
+
+        assert await redis.lrange("conversation:c1:messages", 0, -1) == [messages[20]["id"], messages[2]["id"]]
+        assert await redis.exists(*(f"message:{i}" for i in failing)) == 2
+        assert await redis.get(HISTORY_VERSION_KEY) is None
+
+        store.fail_ids.clear()
+        assert await history.ensure_backfilled() == 0
+
+        assert sorted(store.ids("c1")) == sorted(m["id"] for m in messages)
+        assert not await redis.exists("conversation:c1:messages", *(f"message:{i}" for i in failing))
+        assert await redis.get(HISTORY_VERSION_KEY) == HISTORY_VERSION
+
+    async def test_without_writer_keeps_overflow(self, redis):
+        """Test that without a writer only the messages converted into Redis are deleted."""
+        messages = await seed_legacy(redis, "c1", 15)
+        history = ConversationHistory(redis, max_messages=10)
+
+        await history.backfill()
+
+        assert await redis.lrange("conversation:c1:messages", 0, -1) == [m["id"] for m in reversed(messages[:5])]
+        assert await redis.exists(*(f"message:{m['id']}" for m in messages)) == 5
+        assert len(await history.recent("c1", limit=20)) == 10
+
+    async def test_existing_history_kept(self, redis, history, store):
+        """Test that a conversation that already has a history list keeps it."""
+        legacy = await seed_legacy(redis, "c1", 3)
+        current = await history.append("c1", {"id": "new", "role": "user", "content": "hi"}, persist=False)
+
+        converted = await history.backfill()
+
+        assert converted == 0
+        assert await history.recent("c1") == [current]
+        assert store.ids("c1") == [m["id"] for m in legacy]
+        assert not await redis.exists("conversation:c1:messages")
+
+    async def test_missing_hashes_dropped(self, redis, history):
+        """Test that IDs listed without a message hash are dropped from the legacy list."""
+        await seed_legacy(redis, "c1", 3)
+        await redis.lpush("conversation:c1:messages", "gone")
+
+        await history.backfill()
+
+        assert not await redis.exists("conversation:c1:messages")
+        assert len(await history.recent("c1")) == 3
+
+
+@pytest.mark.asyncio
+class TestConversationHistory:
+    """Tests for appends, range reads and the loader fallback."""
+
+    async def test_append_updates_counters_and_cap(self, redis, history, store):
+        """Test that appends update the counters, cap the list and reach the writer."""
+        messages = [make_message("c1", n) for n in range(12)]
+
+        for msg in messages:
+            await history.append("c1", msg)
+        await history.flush()
+
+        assert int(await redis.hget("conversation:c1", "message_count")) == 12
+        assert await history.token_count("c1") == sum(estimate_tokens(m["content"]) for m in messages)
+        assert await redis.llen(history_key("c1")) == 10
+        assert (await history.recent("c1", limit=1))[0]["id"] == messages[-1]["id"]
+        assert store.ids("c1") == [m["id"] for m in messages]
+
+    async def test_recent_single_command(self, redis, history):
+        """Test that the last messages are read with one command."""
+        for n in range(5):
+            await history.append("c1", make_message("c1", n), persist=False)
+        calls = 0
+        execute = redis.client.execute_command
+
+        async def counted(*args: Any, **kwargs: Any) -> Any:
+            nonlocal calls
+            calls += 1
+            return await execute(*args, **kwargs)
+
+        redis.client.execute_command = counted
+
+        assert len(await history.recent("c1", limit=3)) == 3
+        assert calls == 1
+
+    async def test_loaded_once(self, history, store):
+        """Test that an empty history is reloaded from the loader once, then served by Redis."""
+        store.messages["c2"] = [make_message("c2", n) for n in range(5)]
+
+        first = await history.recent("c2", limit=3)
+        second = await history.recent("c2", limit=3)
+
+        assert store.loads == ["c2"]
+        assert first == second
+        assert [m["id"] for m in second] == store.ids("c2")[-3:]
+
+    async def test_clear(self, redis, history):
+        """Test that clearing drops the history and resets the token count."""
+        await history.append("c1", make_message("c1", 0), persist=False)
+
+        await history.clear("c1")
+
+        assert not await redis.exists(history_key("c1"))
+        assert await history.token_count("c1") == 0
+
+    async def test_token_budget(self, history):
+        """Test that a token budget drops the oldest messages."""
+        messages = [make_message("c1", n) for n in range(5)]
+        for msg in messages:
+            await history.append("c1", msg, persist=False)
+        budget = estimate_tokens(messages[-1]["content"]) * 3
+
+        trimmed = await history.recent("c1", limit=5, max_tokens=budget)
+
+        assert [m["id"] for m in trimmed] == [m["id"] for m in messages[-3:]]
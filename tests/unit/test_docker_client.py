@@ -0,0 +1,278 @@
+"""Tests for the Docker Engine API client against a unix-socket stub daemon."""
+
+import asyncio
+import struct
+
+import pytest
+from aiohttp import web
+
+from ai_core.docker_client import DockerAPIError, DockerClient
+
+
+def frame(stream_type: int, payload: bytes) -> bytes:
+    """Encode one multiplexed stdout/stderr frame."""
+    return struct.pack(">BxxxL", stream_type, len(payload)) + payload
+
+
+class FakeEngine:
+    """A stub Docker daemon speaking the subset of the Engine API the client uses."""
+
+    def __init__(self) -> None:
+        self.containers: dict[str, dict] = {}
+        self.images = {"wyld-project:abc"}
+        self.pulls: list[dict[str, str]] = []
+        self.connections: set[int] = set()
+        self.execs: list[dict] = []
+        self.exec_delay = 0.0
+
+        self.app = web.Application()
+        self.app.router.add_get("/_ping", self.ping)
+        self.app.router.add_get("/containers/json", self.list_containers)
+        self.app.router.add_post("/containers/create", self.create_container)
+        self.app.router.add_get("/containers/{name}/json", self.inspect_container)
+        self.app.router.add_delete("/containers/{name}", self.remove_container)
+        self.app.router.add_get("/containers/{name}/logs", self.logs)
+        self.app.router.add_post("/containers/{name}/exec", self.create_exec)
+        self.app.router.add_post("/exec/{id}/start", self.start_exec)
+        self.app.router.add_get("/exec/{id}/json", self.inspect_exec)
+        self.app.router.add_get("/images/{name}/json", self.inspect_image)
+        self.app.router.add_post("/images/create", self.pull)
+        self.app.router.add_get("/networks/{name}", self.inspect_network)
+
+    def _track(self, request: web.Request) -> None:
+        self.connections.add(id(request.transport))
+
+    async def ping(self, request: web.Request) -> web.Response:
+        self._track(request)
+        return web.Response(text="OK")
+
+    async def list_containers(self, request: web.Request) -> web.Response:
+        self._track(request)
+        return web.json_response([{"Names": [f"/{name}"]} for name in self.containers])
+
+    async def create_container(self, request: web.Request) -> web.Response:
+        self._track(request)
+        name = request.query["name"]
+        if name in self.containers:
+            return web.json_response({"message": f"Conflict. The name {name} is in use"}, status=409)
+        self.containers[name] = await request.json()
+        return web.json_response({"Id": name, "Warnings": []}, status=201)
+
+    async def inspect_container(self, request: web.Request) -> web.Response:
+        self._track(request)
+        name = request.match_info["name"]
+        if name not in self.containers:
+            return web.json_response({"message": f"No such container: {name}"}, status=404)
+        return web.json_response({"Name": f"/{name}", "State": {"Status": "running"}})
+
+    async def remove_container(self, request: web.Request) -> web.Response:
+        self._track(request)
+        if self.containers.pop(request.match_info["name"], None) is None:
+            return web.json_response({"message": "No such container"}, status=404)
+        return web.Response(status=204)
+
+    async def logs(self, request: web.Request) -> web.StreamResponse:
+        self._track(request)
+        response = web.StreamResponse()
+        await response.prepare(request)
+        # A frame split across chunks must still be reassembled
+        data = frame(1, b"hello\n") + frame(2, b"oops\n") + frame(1, b"bye\n")
+        await response.write(data[:10])
+        await response.write(data[10:])
+        await response.write_eof()
+        return response
+
+    async def create_exec(self, request: web.Request) -> web.Response:
+        self._track(request)
+        self.execs.append(await request.json())
+        return web.json_response({"Id": f"exec{len(self.execs)}"}, status=201)
+
+    async def start_exec(self, request: web.Request) -> web.StreamResponse:
+        self._track(request)
+        response = web.StreamResponse(headers={"Content-Type": "application/vnd.docker.raw-stream"})
+        await response.prepare(request)
+        await response.write(frame(1, b"out\n"))
+        await asyncio.sleep(self.exec_delay)
+        await response.write(frame(2, b"err\n"))
+        await response.write_eof()
+        return response
+
+    async def inspect_exec(self, request: web.Request) -> web.Response:
+        self._track(request)
+        return web.json_response({"ExitCode": 3, "Running": False})
+
+    async def inspect_image(self, request: web.Request) -> web.Response:
+        self._track(request)
+        if request.match_info["name"] not in self.images:
+            return web.json_response({"message": "No such image"}, status=404)
+        return web.json_response({"Id": "sha256:1"})
+
+    async def pull(self, request: web.Request) -> web.StreamResponse:
+        self._track(request)
+        self.pulls.append(dict(request.query))
+        response = web.StreamResponse()
+        await response.prepare(request)
+        await response.write(b'{"status":"Pulling fs layer"}\n{"status":"Downloa')
+        await response.write(b'd complete"}\n')
+        await response.write_eof()
+        return response
+
+    async def inspect_network(self, request: web.Request) -> web.Response:
+        self._track(request)
+        return web.json_response({"Name": request.match_info["name"]})
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    """A fake daemon listening on a unix socket."""
+    fake = FakeEngine()
+    runner = web.AppRunner(fake.app)
+    await runner.setup()
+    fake.socket_path = str(tmp_path / "docker.sock")
+    await web.UnixSite(runner, fake.socket_path).start()
+    yield fake
+    await runner.cleanup()
+
+
+@pytest.fixture
+async def client(engine):
+    docker = DockerClient(f"unix://{engine.socket_path}", max_connections=2)
+    yield docker
+    await docker.close()
+
+
+@pytest.mark.asyncio
+class TestDockerClient:
+    """Tests for DockerClient."""
+
+    async def test_reuses_connections(self, client, engine):
+        """Test that sequential requests share one keep-alive connection."""
+        assert await client.ping()
+        for _ in range(5):
+            await client.list_containers(all=True)
+
+        assert len(engine.connections) == 1
+
+    async def test_concurrent_requests_bounded_by_pool(self, client, engine):
+        """Test that concurrent lookups use at most max_connections sockets."""
+        engine.containers = {f"c{i}": {} for i in range(8)}
+
+        results = await client.inspect_containers([*engine.containers, "missing"])
+
+        assert results["missing"] is None
+        assert all(results[f"c{i}"] for i in range(8))
+        assert len(engine.connections) <= 2
+
+    async def test_error_status(self, client):
+        """Test that API errors carry the daemon's message and status."""
+        await client.create_container("web", {"Image": "nginx"})
+
+        with pytest.raises(DockerAPIError) as excinfo:
+            await client.create_container("web", {"Image": "nginx"})
+
+        assert excinfo.value.docker_status == 409
+        assert "in use" in str(excinfo.value)
+
+    async def test_logs_demultiplexed(self, client):
+        """Test that stdout and stderr frames are separated."""
+        stdout, stderr = await client.logs("web")
+
+        assert stdout == "hello\nbye\n"
+        assert stderr == "oops\n"
+
+    async def test_exec(self, client, engine):
+        """Test that exec returns the exit code and both streams."""
+        code, stdout, stderr = await client.exec("web", ["ls"], user="wyld", workdir="/app")
+
+        assert (code, stdout, stderr) == (3, "out\n", "err\n")
+        assert engine.execs[0]["Cmd"] == ["ls"]
+        assert engine.execs[0]["User"] == "wyld"
+
+    async def test_exec_timeout_releases_connection(self, client, engine):
+        """Test that a timed out exec gives its pooled connection back."""
+        engine.exec_delay = 1.0
+
+        for _ in range(3):
+            with pytest.raises(asyncio.TimeoutError):
+                await client.exec("web", ["sleep", "1"], timeout=0.1)
+
+        # With a pool of two, leaked slots would block here
+        assert await asyncio.wait_for(client.ping(), 1.0)
+
+    @pytest.mark.parametrize("image,expected", [
+        ("nginx", {"fromImage": "nginx", "tag": "latest"}),
+        ("nginx:1.27", {"fromImage": "nginx", "tag": "1.27"}),
+        ("localhost:5000/app", {"fromImage": "localhost:5000/app", "tag": "latest"}),
+        ("localhost:5000/app:v2", {"fromImage": "localhost:5000/app", "tag": "v2"}),
+        (
+            "ghcr.io/org/app@sha256:" + "a" * 64,
+            {"fromImage": "ghcr.io/org/app", "tag": "sha256:" + "a" * 64},
+        ),
+        (
+            "localhost:5000/app@sha256:" + "b" * 64,
+            {"fromImage": "localhost:5000/app", "tag": "sha256:" + "b" * 64},
+        ),
+    ])
+    async def test_pull_image_reference(self, client, engine, image, expected):
+        """Test that tags and digests are split from the repository correctly."""
+        events = [event async for event in client.pull_image(image)]
+
+        assert engine.pulls == [expected]
+        assert [e["status"] for e in events] == ["Pulling fs layer", "Download complete"]
+
+
+@pytest.mark.asyncio
+class TestContainerService:
+    """Tests for ContainerService error handling over the Docker client."""
+
+    @pytest.fixture
+    def service(self, monkeypatch):
+        from api.services import container_service
+
+        def use(docker: DockerClient) -> container_service.ContainerService:
+            monkeypatch.setattr(container_service, "get_docker_client", lambda: docker)
+            return container_service.ContainerService()
+
+        return use
+
+    async def test_create_container_daemon_unreachable(self, service, tmp_path):
+        """Test that an unreachable daemon returns an error result instead of raising."""
+        from api.services.container_service import ContainerConfig, ProjectType
+
+        svc = service(DockerClient(f"unix://{tmp_path / 'missing.sock'}"))
+        config = ContainerConfig("abc", "demo", ProjectType.PYTHON, str(tmp_path))
+
+        result = await svc.create_container(config)
+
+        assert result["success"] is False
+        assert result["error"]
+
+    async def test_create_container(self, service, client, engine, tmp_path):
+        """Test creating a container for a project whose image exists."""
+        from api.services.container_service import ContainerConfig, ProjectType
+
+        svc = service(client)
+        config = ContainerConfig("abc", "demo", ProjectType.PYTHON, str(tmp_path), expose_ports=[8080])
+
+        result = await svc.create_container(config)
+
+        assert result == {"success": True, "container": "wyld-project-abc"}
+        created = engine.containers["wyld-project-abc"]
+        assert created["HostConfig"]["PortBindings"] == {"8080/tcp": [{"HostPort": "8080"}]}
+
+    async def test_exec_command_timeout(self, service, client, engine):
+        """Test that a command outliving its timeout returns an error result."""
+        engine.exec_delay = 1.0
+        svc = service(client)
+
+        result = await svc.exec_command("abc", ["sleep", "1"], timeout=0.1)
+
+        assert result["returncode"] == -1
+        assert "timed out" in result["stderr"]
+
+    async def test_exec_command(self, service, client):
+        svc = service(client)
+
+        result = await svc.exec_command("abc", ["ls"])
+
+        assert result == {"returncode": 3, "stdout": "out\n", "stderr": "err\n"}
@@ -0,0 +1,130 @@
+"""Tests for the cached git metadata service."""
+
+import subprocess
+
+import pytest
+
+from ai_core import git_service
+from ai_core.git_service import GitRepository, parse_status_v2
+
+
+def git(cwd, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout
+
+
+@pytest.fixture
+def repo_path(tmp_path):
+    """A repository with one commit on main."""
+    git(tmp_path, "init", "-q", "-b", "main")
+    git(tmp_path, "config", "user.email", "dev@example.com")
+    git(tmp_path, "config", "user.name", "Dev")
+    (tmp_path / "README.md").write_text("hello\n")
+    git(tmp_path, "add", "README.md")
+    git(tmp_path, "commit", "-q", "-m", "init")
+    return tmp_path
+
+
+@pytest.fixture
+async def repo(repo_path):
+    repository = GitRepository(str(repo_path))
+    yield repository
+    await repository.close()
+
+
+async def branches(repo: GitRepository) -> list[str]:
+    result = await repo.query("for-each-ref", "--format=%(refname)", "refs/")
+    return result.stdout.split()
+
+
+class TestParseStatus:
+    """Tests for porcelain v2 parsing."""
+
+    def test_branch_and_entries(self):
+        """Test branch headers, changed, renamed and untracked records."""
+        output = "\0".join([
+            "# branch.oid abc",
+            "# branch.head main",
+            "# branch.upstream origin/main",
+            "# branch.ab +2 -1",
+            "1 .M N... 100644 100644 100644 a a src/app.py",
+            "2 R. N... 100644 100644 100644 a a R100 new.py",
+            "old.py",
+            "? notes.txt",
+            "",
+        ])
+
+        status = parse_status_v2(output)
+
+        assert (status.branch, status.upstream, status.ahead, status.behind) == ("main", "origin/main", 2, 1)
+        assert [(e.path, e.index_status, e.worktree_status) for e in status.entries] == [
+            ("src/app.py", " ", "M"),
+            ("new.py", "R", " "),
+        ]
+        assert status.entries[1].orig_path == "old.py"
+        assert status.untracked == ["notes.txt"]
+
+
+@pytest.mark.asyncio
+class TestGitRepository:
+    """Tests for GitRepository caching."""
+
+    async def test_repeated_queries_cached(self, repo):
+        """Test that an unchanged repository answers from the cache."""
+        await branches(repo)
+        await branches(repo)
+
+        assert repo.invocations == 1
+        assert repo.cache_hits == 1
+
+    async def test_branch_via_run_refreshes(self, repo):
+        """Test that creating a nested branch through run() is visible immediately."""
+        assert await branches(repo) == ["refs/heads/main"]
+
+        await repo.run("branch", "feature/b")
+
+        assert await branches(repo) == ["refs/heads/feature/b", "refs/heads/main"]
+
+    async def test_external_nested_branch_refreshes(self, repo, repo_path):
+        """Test that a branch created outside the service changes the stamp."""
+        git(repo_path, "branch", "feature/a")
+        assert "refs/heads/feature/a" in await branches(repo)
+
+        git(repo_path, "branch", "feature/b")
+
+        assert "refs/heads/feature/b" in await branches(repo)
+
+    @pytest.mark.parametrize("ref", ["refs/tags/v1", "refs/remotes/origin/main"])
+    async def test_external_tags_and_remotes_refresh(self, repo, repo_path, ref):
+        """Test that new tags and remote-tracking refs change the stamp."""
+        await branches(repo)
+
+        git(repo_path, "update-ref", ref, "HEAD")
+
+        assert ref in await branches(repo)
+
+    async def test_status_follows_invalidate(self, repo, repo_path):
+        """Test that working-tree results are recomputed after invalidate()."""
+        assert (await repo.status()).is_clean
+
+        (repo_path / "new.txt").write_text("x\n")
+        repo.invalidate()
+
+        assert (await repo.status()).untracked == ["new.txt"]
+
+    async def test_cache_bounded(self, repo, monkeypatch):
+        """Test that distinct queries don't grow the cache without limit."""
+        monkeypatch.setattr(git_service, "MAX_CACHED_RESULTS", 3)
+
+        for n in range(1, 6):
+            await repo.query("log", f"-{n}", "--format=%H")
+        await repo.query("log", "-5", "--format=%H")
+
+        assert len(repo._cache) == 3
+        assert repo.cache_hits == 1
+
+    async def test_read_object(self, repo):
+        """Test reading blobs at a ref through the cat-file worker."""
+        assert await repo.read_object("HEAD:README.md") == b"hello\n"
+        assert await repo.read_object("HEAD:missing.txt") is None
@@ -0,0 +1,235 @@
+"""Tests for the shared GitHub API client's ETag cache, rate limiting and paging."""
+
+import asyncio
+import hashlib
+import json
+import time
+
+import pytest
+from aiohttp import web
+from api.services.github_service import (
+    MAX_CONCURRENT_PAGES,
+    GitHubAPIClient,
+    GitHubRateLimitError,
+    GitHubService,
+)
+
+PULLS_PATH = "/repos/o/r/pulls"
+AUTH = {"Authorization": "token pat"}
+
+
+def pull(number: int) -> dict:
+    return {
+        "number": number,
+        "title": f"PR {number}",
+        "body": "",
+        "state": "open",
+        "head": {"ref": f"feature-{number}"},
+        "base": {"ref": "main"},
+        "html_url": f"https://github.com/o/r/pull/{number}",
+        "created_at": "2026-01-01T00:00:00Z",
+        "user": {"login": "dev"},
+        "draft": False,
+    }
+
+
+class FakeGitHub:
+    """The pull request listing endpoint with ETags, Link paging and rate limits.
+
+    Like GitHub, 304 answers to conditional requests don't use the rate limit.
+    """
+
+    def __init__(self, pulls: int = 5, limit: int = 5000) -> None:
+        self.pulls = [pull(n) for n in range(1, pulls + 1)]
+        self.limit = limit
+        self.remaining: dict[str, int] = {}
+        self.reset = int(time.time()) + 3600
+        self.latency = 0.0
+        self.retry_after: str | None = None
+        self.requests = 0
+        self.not_modified = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+        self.app = web.Application()
+        self.app.router.add_get(PULLS_PATH, self.list_pulls)
+
+    async def list_pulls(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+
+        if self.retry_after is not None:
+            retry_after, self.retry_after = self.retry_after, None
+            return web.json_response(
+                {"message": "You have exceeded a secondary rate limit"},
+                status=403,
+                headers={"Retry-After": retry_after},
+            )
+
+        token = request.headers.get("Authorization", "")
+        remaining = self.remaining.setdefault(token, self.limit)
+        per_page = int(request.query.get("per_page", 30))
+        page = int(request.query.get("page", 1))
+        body = json.dumps(self.pulls[(page - 1) * per_page:page * per_page])
+        etag = f'"{hashlib.sha1(body.encode()).hexdigest()}"'
+
+        headers = {"ETag": etag, "X-RateLimit-Reset": str(self.reset)}
+        last = max(1, -(-len(self.pulls) // per_page))
+        if last > 1:
+            base = f"{request.url.with_query(None)}?state=open&per_page={per_page}"
+            links = [f'<{base}&page={last}>; rel="last"']
+            if page < last:
+                links.insert(0, f'<{base}&page={page + 1}>; rel="next"')
+            headers["Link"] = ", ".join(links)
+
+        if request.headers.get("If-None-Match") == etag:
+            self.not_modified += 1
+            headers["X-RateLimit-Remaining"] = str(remaining)
+            return web.Response(status=304, headers=headers)
+
+        if remaining <= 0:
+            headers["X-RateLimit-Remaining"] = "0"
+            return web.json_response({"message": "API rate limit exceeded"}, status=403, headers=headers)
+        self.remaining[token] = remaining - 1
+        headers["X-RateLimit-Remaining"] = str(remaining - 1)
+        return web.Response(text=body, content_type="application/json", headers=headers)
+
+    def used(self, pat: str) -> int:
+        return self.limit - self.remaining.get(f"token {pat}", self.limit)
+
+
+@pytest.fixture
+async def github():
+    """A fake GitHub API on a local port."""
+    fake = FakeGitHub()
+    runner = web.AppRunner(fake.app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    fake.base_url = f"http://127.0.0.1:{runner.addresses[0][1]}"
+    yield fake
+    await runner.cleanup()
+
+
+@pytest.fixture
+async def api(github):
+    client = GitHubAPIClient(base_url=github.base_url)
+    yield client
+    await client.close()
+
+
+@pytest.fixture
+def service(api):
+    return GitHubService(redis=None, api=api)
+
+
+@pytest.mark.asyncio
+class TestETagCache:
+    """Tests for conditional requests and 304 replay."""
+
+    async def test_not_modified_replayed(self, service, github):
+        """Test that a repeated listing is revalidated with a 304 that doesn't use the rate limit."""
+        first = await service.list_pull_requests("pat", "o", "r", max_pages=1)
+        second = await service.list_pull_requests("pat", "o", "r", max_pages=1)
+
+        assert [p["number"] for p in second] == [p["number"] for p in first] == [1, 2, 3, 4, 5]
+        assert github.requests == 2
+        assert github.not_modified == 1
+        assert github.used("pat") == 1
+
+    async def test_changes_picked_up(self, service, github):
+        """Test that a changed listing is fetched in full on the next call."""
+        await service.list_pull_requests("pat", "o", "r", max_pages=1)
+        github.pulls.append(pull(6))
+
+        prs = await service.list_pull_requests("pat", "o", "r", max_pages=1)
+
+        assert len(prs) == 6
+        assert github.not_modified == 0
+
+    async def test_cache_per_pat(self, service, github):
+        """Test that another PAT doesn't revalidate against the first PAT's cache."""
+        await service.list_pull_requests("pat", "o", "r", max_pages=1)
+
+        await service.list_pull_requests("other-pat", "o", "r", max_pages=1)
+
+        assert github.not_modified == 0
+        assert github.used("other-pat") == 1
+
+
+@pytest.mark.asyncio
+class TestRateLimit:
+    """Tests for serving from the cache and backing off when GitHub limits requests."""
+
+    async def test_exhausted_serves_cache(self, api, github):
+        """Test that once the limit is exhausted cached responses are served without calling GitHub."""
+        await api.request("GET", "pat", PULLS_PATH, headers=AUTH)
+        github.remaining["token pat"] = 0
+        await api.request("GET", "pat", PULLS_PATH, params={"page": 2}, headers=AUTH)
+        assert api.rate_limit("pat")["remaining"] == 0
+        requests = github.requests
+
+        response = await api.request("GET", "pat", PULLS_PATH, headers=AUTH)
+
+        assert response.from_cache
+        assert [p["number"] for p in response.data] == [1, 2, 3, 4, 5]
+        assert github.requests == requests
+
+    async def test_exhausted_uncached_raises(self, api, github):
+        """Test that an uncached request raises instead of calling GitHub once the limit is exhausted."""
+        github.remaining["token pat"] = 0
+        await api.request("GET", "pat", PULLS_PATH, headers=AUTH)
+        requests = github.requests
+
+        with pytest.raises(GitHubRateLimitError):
+            await api.request("GET", "pat", PULLS_PATH, params={"page": 9}, headers=AUTH)
+        assert github.requests == requests
+
+    async def test_secondary_limit_retry_after(self, api, github):
+        """Test that a secondary limit's Retry-After holds requests back until it passes."""
+        await api.request("GET", "pat", PULLS_PATH, headers=AUTH)
+        github.retry_after = "1"
+        limited = await api.request("GET", "pat", PULLS_PATH, params={"page": 2}, headers=AUTH)
+        assert limited.status == 403
+        requests = github.requests
+
+        cached = await api.request("GET", "pat", PULLS_PATH, headers=AUTH)
+        with pytest.raises(GitHubRateLimitError):
+            await api.request("GET", "pat", PULLS_PATH, params={"page": 2}, headers=AUTH)
+        assert cached.from_cache
+        assert github.requests == requests
+
+        await asyncio.sleep(1.05)
+        response = await api.request("GET", "pat", PULLS_PATH, params={"page": 2}, headers=AUTH)
+
+        assert response.status == 200
+        assert github.requests == requests + 1
+
+
+@pytest.mark.asyncio
+class TestGetPaginated:
+    """Tests for paginated listings."""
+
+    async def test_pages_fetched_concurrently(self, api, github):
+        """Test that the remaining pages are fetched at once, bounded, and joined in order."""
+        github.pulls = [pull(n) for n in range(1, 251)]
+        github.latency = 0.05
+
+        items = await api.get_paginated("pat", PULLS_PATH, params={"per_page": 10}, max_pages=25)
+
+        assert [p["number"] for p in items] == list(range(1, 251))
+        assert github.requests == 25
+        assert 1 < github.max_in_flight <= MAX_CONCURRENT_PAGES
+
+    async def test_max_pages(self, api, github):
+        """Test that no more than ``max_pages`` pages are fetched."""
+        github.pulls = [pull(n) for n in range(1, 51)]
+
+        items = await api.get_paginated("pat", PULLS_PATH, params={"per_page": 10}, max_pages=2)
+
+        assert [p["number"] for p in items] == list(range(1, 21))
+        assert github.requests == 2
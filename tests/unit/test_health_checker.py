@@ -0,0 +1,219 @@
+"""Tests for the domain health checker against a local TLS server."""
+
+import asyncio
+import shutil
+import ssl
+import subprocess
+
+import httpx
+import pytest
+from api.services import health_checker
+from api.services.health_checker import (
+    MAX_CHECK_INTERVAL_SECONDS,
+    MIN_CHECK_INTERVAL_SECONDS,
+    DNSCache,
+    HealthCheckerService,
+    _CachedDNSBackend,
+    check_domain_health,
+    create_probe_client,
+)
+
+
+class FakeDomains:
+    """TLS server answering for every host; hosts starting with ``down-`` return 503."""
+
+    def __init__(self) -> None:
+        self.connections = 0
+        self.delay = 0.0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                host = next(
+                    (line.split(b":", 1)[1].strip() for line in head.split(b"\r\n")
+                     if line.lower().startswith(b"host:")),
+                    b"",
+                )
+                await asyncio.sleep(self.delay)
+                if host.startswith(b"moved-"):
+                    writer.write(
+                        b"HTTP/1.1 301 Moved Permanently\r\nLocation: https://"
+                        + host[len(b"moved-"):] + b"/\r\nContent-Length: 0\r\n\r\n"
+                    )
+                else:
+                    status = b"503 Service Unavailable" if host.startswith(b"down-") else b"200 OK"
+                    writer.write(b"HTTP/1.1 " + status + b"\r\nContent-Length: 2\r\n\r\nok")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, OSError):
+            pass
+        finally:
+            writer.close()
+
+
+class LocalDNS(DNSCache):
+    """Every name resolves to a public-looking address the backend maps to localhost."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.lookups: list[str] = []
+
+    async def _lookup(self, host: str) -> str | None:
+        self.lookups.append(host)
+        return "203.0.113.1"
+
+
+class LocalBackend(_CachedDNSBackend):
+    def __init__(self, dns: DNSCache, port: int):
+        super().__init__(dns)
+        self.port = port
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):  # noqa: ARG002
+        await self._dns.resolve(host)
+        return await self._backend.connect_tcp("127.0.0.1", self.port, timeout=timeout)
+
+
+@pytest.fixture(scope="session")
+def server_ssl_context(tmp_path_factory) -> ssl.SSLContext:
+    """Self-signed certificate made with the openssl CLI."""
+    if shutil.which("openssl") is None:
+        pytest.skip("openssl CLI not available")
+    directory = tmp_path_factory.mktemp("tls")
+    cert, key = directory / "cert.pem", directory / "key.pem"
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=health.test", "-keyout", str(key), "-out", str(cert)],
+        check=True,
+        capture_output=True,
+    )
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    return context
+
+
+@pytest.fixture
+async def domains(server_ssl_context):
+    fake = FakeDomains()
+    server = await asyncio.start_server(fake.handle, "127.0.0.1", 0, ssl=server_ssl_context)
+    fake.port = server.sockets[0].getsockname()[1]
+    yield fake
+    server.close()
+    await server.wait_closed()
+
+
+@pytest.fixture
+def dns() -> LocalDNS:
+    return LocalDNS()
+
+
+@pytest.fixture
+async def client(domains, dns):
+    probe_client = create_probe_client(dns, 4, LocalBackend(dns, domains.port))
+    yield probe_client
+    await probe_client.aclose()
+
+
+@pytest.fixture
+def service(client) -> HealthCheckerService:
+    checker = HealthCheckerService(client=client, max_concurrent=4)
+    checker._running = True
+    return checker
+
+
+SITES = {f"domain-{n}": f"{'down-' if n % 4 == 0 else ''}site-{n}.test" for n in range(12)}
+
+
+@pytest.mark.asyncio
+class TestCheckDomainHealth:
+    """Tests for single probes through the probe client."""
+
+    async def test_up_and_down(self, client):
+        up, up_ms = await check_domain_health("site.test", client)
+        down, _ = await check_domain_health("down-site.test", client)
+
+        assert (up, down) == ("up", "down")
+        assert up_ms is not None
+
+    async def test_redirect_resolved_through_cache(self, client, dns):
+        """Test that redirect targets also go through the DNS cache."""
+        status, _ = await check_domain_health("moved-target.test", client)
+
+        assert status == "up"
+        assert dns.lookups == ["moved-target.test", "target.test"]
+
+    async def test_timeout_is_down(self, domains, dns, monkeypatch):
+        """Test that a slow server maps to an httpx timeout and a down status."""
+        monkeypatch.setattr(health_checker, "REQUEST_TIMEOUT_SECONDS", 0.1)
+        domains.delay = 0.5
+
+        async with create_probe_client(dns, 1, LocalBackend(dns, domains.port)) as probe_client:
+            with pytest.raises(httpx.TimeoutException):
+                await probe_client.get("https://slow.test")
+            status, elapsed_ms = await check_domain_health("slow.test", probe_client)
+
+        assert status == "down"
+        assert elapsed_ms is not None
+
+    async def test_connect_error_mapped(self, dns):
+        """Test that connection failures surface as httpx errors."""
+        async with create_probe_client(dns, 1, LocalBackend(dns, 1)) as probe_client:
+            with pytest.raises(httpx.ConnectError):
+                await probe_client.get("https://closed.test")
+
+    async def test_private_addresses_refused(self):
+        """Test that the real DNS cache refuses private and loopback addresses."""
+        real_dns = DNSCache()
+
+        for host in ("127.0.0.1", "localhost", "10.1.2.3"):
+            assert await real_dns.resolve(host) is None
+        status, _ = await check_domain_health("localhost")
+        assert status == "down"
+
+
+@pytest.mark.asyncio
+class TestHealthCheckerService:
+    """Tests for concurrent sweeps and scheduling."""
+
+    async def test_sweep_statuses(self, service):
+        service.sync_schedule(SITES)
+
+        results = await service.check_domains(service.due_domains())
+
+        statuses = {row["id"]: row["health_status"] for row in results}
+        assert len(results) == len(SITES)
+        assert statuses == {
+            domain_id: "down" if name.startswith("down-") else "up" for domain_id, name in SITES.items()
+        }
+
+    async def test_adaptive_intervals(self, service):
+        """Test that failing domains are rechecked sooner than healthy ones, with jitter."""
+        service.sync_schedule(SITES)
+        await service.check_domains(service.due_domains())
+
+        assert not service.due_domains()
+        assert MIN_CHECK_INTERVAL_SECONDS < service._schedule["domain-1"].interval <= MAX_CHECK_INTERVAL_SECONDS
+        assert service._schedule["domain-0"].interval == MIN_CHECK_INTERVAL_SECONDS
+        assert len({entry.next_check for entry in service._schedule.values()}) > 1
+
+    async def test_removed_domains_dropped(self, service):
+        service.sync_schedule(SITES)
+
+        service.sync_schedule(dict(list(SITES.items())[:-1]))
+
+        assert len(service._schedule) == len(SITES) - 1
+
+    async def test_connections_reused(self, service, domains):
+        """Test that rechecking domains reuses pooled connections."""
+        recheck = dict(list(SITES.items())[:4])
+        await service.check_domains(recheck)
+        opened = domains.connections
+
+        await service.check_domains(recheck)
+
+        assert domains.connections == opened
+
+    async def test_stopped_service_skips_probes(self, service):
+        service._running = False
+
+        assert await service.check_domains(SITES) == []
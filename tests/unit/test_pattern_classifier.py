@@ -0,0 +1,223 @@
+"""Tests for the shared single-pass pattern classifier and its consumers."""
+
+import random
+import re
+
+import pytest
+from supervisor.router import TaskRouter
+
+from ai_core import AgentType
+from ai_core.model_selector import PromptTier
+from ai_core.pattern_classifier import PatternClassifier, _Automaton
+from ai_core.prompt_tier import PromptTierClassifier, TaskCategory
+from ai_core.task_complexity_classifier import ExecutionMode, TaskComplexityClassifier
+
+
+def brute_force_counts(text: str, keywords: list[str]) -> dict[str, int]:
+    """Occurrences of each keyword, overlapping included."""
+    counts = {}
+    for keyword in keywords:
+        count, start = 0, text.find(keyword)
+        while start != -1:
+            count += 1
+            start = text.find(keyword, start + 1)
+        counts[keyword] = count
+    return counts
+
+
+@pytest.fixture(params=["python", "pyahocorasick"])
+def automaton(request, monkeypatch):
+    """Run the test with the pure-Python automaton and, when installed, pyahocorasick."""
+    if request.param == "python":
+        monkeypatch.setattr("ai_core.pattern_classifier._new_automaton", _Automaton)
+    else:
+        pytest.importorskip("ahocorasick")
+    return request.param
+
+
+@pytest.mark.usefixtures("automaton")
+class TestPatternClassifier:
+    """Tests for keyword and regex matching."""
+
+    def test_overlapping_keywords_counted(self):
+        """Test that overlapping and nested keyword occurrences all count."""
+        keywords = ["he", "she", "hers", "his", "s"]
+        classifier = PatternClassifier()
+        classifier.register("words", keywords)
+        text = "ushers say she is his"
+
+        matches = classifier.scan(text)
+
+        assert matches.counts["words"] == sum(brute_force_counts(text, keywords).values())
+        assert matches.matched("words") == keywords
+        assert matches.position("she") == text.find("she")
+
+    def test_matches_brute_force(self):
+        """Test that counts and first positions agree with a brute-force search on random text."""
+        rng = random.Random(7)
+        keywords = ["a", "ab", "aba", "bab", "b a", "aaa", "ba b"]
+        classifier = PatternClassifier(memo_size=0)
+        classifier.register("odd", keywords[::2])
+        classifier.register("even", keywords[1::2])
+
+        for _ in range(200):
+            text = "".join(rng.choice("ab ") for _ in range(rng.randrange(40)))
+            expected = brute_force_counts(text, keywords)
+
+            matches = classifier.scan(text)
+
+            assert matches.counts == {
+                "odd": sum(expected[k] for k in keywords[::2]),
+                "even": sum(expected[k] for k in keywords[1::2]),
+            }
+            assert matches.positions == {k: text.find(k) for k in keywords if expected[k]}
+
+    def test_keyword_in_several_categories(self):
+        """Test that a keyword registered in two categories counts in both."""
+        classifier = PatternClassifier()
+        classifier.register("code", ["test", "bug"])
+        classifier.register("qa", ["test"])
+
+        matches = classifier.scan("Test the fix, then test again")
+
+        assert matches.counts == {"code": 2, "qa": 2}
+
+    def test_first_in_declaration_order(self):
+        """Test that ``first`` follows declaration order, not position in the text."""
+        classifier = PatternClassifier()
+        classifier.register("task", ["git push", "npm run"])
+
+        matches = classifier.scan("NPM RUN build, then git push")
+
+        assert matches.first("task") == "git push"
+        assert matches.matched("task") == ["git push", "npm run"]
+        assert not matches.has("other")
+
+    def test_regexes_counted_separately(self):
+        """Test that regexes matching at the same position each count their own hits."""
+        regexes = [r"\bfix\w*", r"\b(?:fix|patch)(?:es|ed)?\b", r"\b\d+\s*(?:files|services)\b"]
+        classifier = PatternClassifier()
+        classifier.register("edits", ["upgrade"], regexes[:2])
+        classifier.register("changes", regexes=regexes[1:])
+        text = "Fixed 3 files and patches 12 services; upgrade then fix it"
+        lowered = text.lower()
+
+        matches = classifier.scan(text)
+
+        assert matches.counts["edits"] == 1 + sum(len(re.findall(r, lowered)) for r in regexes[:2])
+        assert matches.counts["changes"] == sum(len(re.findall(r, lowered)) for r in regexes[1:])
+        assert matches.position(regexes[0]) == matches.position(regexes[1]) == 0
+        assert matches.first("edits") == "upgrade"
+
+
+class TestMemo:
+    """Tests for memoized scans."""
+
+    def test_hit(self):
+        """Test that scanning the same text again returns the memoized result."""
+        classifier = PatternClassifier()
+        classifier.register("code", ["function"])
+
+        assert classifier.scan("a function") is classifier.scan("a function")
+
+    def test_bounded(self):
+        """Test that the memo keeps at most ``memo_size`` scans, the most recent."""
+        classifier = PatternClassifier(memo_size=10)
+        classifier.register("code", ["function"])
+        first = classifier.scan("text 0")
+
+        for n in range(1, 20):
+            classifier.scan(f"text {n}")
+
+        assert len(classifier._memo) == 10
+        assert classifier.scan("text 0") is not first
+
+    def test_register_invalidates(self):
+        """Test that registering a category clears the memo and changes later results."""
+        classifier = PatternClassifier()
+        classifier.register("code", ["function"])
+        first = classifier.scan("a method")
+
+        classifier.register("code", ["function", "method"])
+        second = classifier.scan("a method")
+
+        assert not first.has("code")
+        assert second.has("code")
+
+    def test_long_text_not_memoized(self):
+        """Test that texts over the memo length limit are scanned but not kept."""
+        classifier = PatternClassifier()
+        classifier.register("code", ["function"])
+
+        matches = classifier.scan("function " * 2000)
+
+        assert matches.counts["code"] == 2000
+        assert not classifier._memo
+
+
+class TestConsumers:
+    """Tests for the decisions the classifiers make from one shared scan."""
+
+    def test_direct_pattern_in_declaration_order(self):
+        """Test that the reported direct pattern is the first declared one that occurs."""
+        result = TaskComplexityClassifier()._classify_by_patterns("git push after npm run build")
+
+        assert result.execution_mode == ExecutionMode.DIRECT
+        assert result.reason == "Matched direct pattern: npm run"
+
+    def test_plan_worthy_patterns(self):
+        """Test that plan-worthy patterns win over direct ones and are listed in declaration order."""
+        result = TaskComplexityClassifier()._classify_by_patterns(
+            "Rewrite the billing flow from scratch, then npm run build"
+        )
+
+        assert result.execution_mode == ExecutionMode.PLAN
+        assert result.reason == "Task matches plan-worthy patterns: rewrite, from scratch, billing"
+
+    def test_planning_question(self):
+        """Test that an approach question suggests plan mode."""
+        result = TaskComplexityClassifier()._classify_by_patterns("How should I cache this?")
+
+        assert result.execution_mode == ExecutionMode.PLAN
+        assert result.reason == "Task is asking for approach guidance: 'how should'"
+
+    def test_short_question_not_direct(self):
+        """Test that a short command phrased as a question isn't treated as direct."""
+        classifier = TaskComplexityClassifier()
+
+        assert classifier._classify_by_patterns("build it now").execution_mode == ExecutionMode.DIRECT
+        assert classifier._classify_by_patterns("build what exactly").execution_mode == ExecutionMode.COMPLEX
+
+    def test_prompt_tier_complex_before_code(self):
+        """Test that complex keywords take precedence over code keywords."""
+        classifier = PromptTierClassifier()
+        message = "Please refactor this function so the whole module is easier to maintain"
+
+        assert classifier._do_classify(message, 0, False) == (PromptTier.FULL, TaskCategory.COMPLEX)
+
+    def test_payload_keywords(self):
+        """Test that payload keywords pick an agent when the task type matches no pattern."""
+        router = TaskRouter()
+
+        code = router.analyze_task("user_request", {"message": "The SQL function has a bug"})
+        data = router.analyze_task("user_request", {"message": "Slow query on the orders table"})
+        none = router.analyze_task("user_request", {"message": "Hello"})
+
+        assert code.primary_agent == AgentType.CODE
+        assert data.primary_agent == AgentType.DATA
+        assert none.primary_agent == AgentType.RESEARCH
+
+    def test_task_type_prefixes(self):
+        """Test that prefix patterns only match at the start of a task type."""
+        router = TaskRouter()
+
+        assert router.route_by_pattern("docker_restart") == AgentType.INFRA
+        assert router.route_by_pattern("GIT_push") == AgentType.CODE
+        assert router.route_by_pattern("restart_docker") is None
+
+    def test_added_pattern(self):
+        """Test that an added pattern is matched on the next lookup."""
+        router = TaskRouter()
+        router.add_pattern("chat_", AgentType.QA)
+
+        assert router.route_by_pattern("chat_about_it") == AgentType.QA
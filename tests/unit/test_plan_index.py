@@ -0,0 +1,211 @@
+"""Tests for the Redis plan indexes behind PlanManager."""
+
+import asyncio
+import json
+import uuid
+
+import pytest
+from api.plan_mode import PlanManager, PlanStatus, StepStatus
+
+STATUSES = ["pending", "approved", "executing", "paused", "completed", "failed", "cancelled"]
+
+
+@pytest.fixture
+def manager(redis) -> PlanManager:
+    return PlanManager(redis)
+
+
+async def seed(manager: PlanManager, user_id: str, count: int) -> list[str]:
+    """Plans for one user across statuses and three projects."""
+    plan_ids = []
+    for n in range(count):
+        plan = await manager.create_plan(
+            conversation_id=f"{user_id}-conv",
+            user_id=user_id,
+            title=f"Plan {n}",
+            description="",
+            project_id=f"project-{n % 3}",
+        )
+        plan.status = PlanStatus(STATUSES[n % len(STATUSES)])
+        await manager._save_plan(plan)
+        plan_ids.append(plan.id)
+    manager._active_plans.clear()
+    return plan_ids
+
+
+async def executing_plan(manager: PlanManager, user_id: str) -> str:
+    plan = await manager.create_plan("conv-x", user_id, "Two steps", "", "project-x")
+    await manager.set_steps(plan.id, [{"title": "one"}, {"title": "two"}])
+    await manager.approve_plan(plan.id)
+    await manager.start_execution(plan.id)
+    return plan.id
+
+
+@pytest.mark.asyncio
+class TestListPlans:
+    """Tests for listing plans through the indexes."""
+
+    async def test_only_callers_plans_newest_first(self, manager):
+        """Test that a user sees exactly their plans, most recently updated first."""
+        mine = await seed(manager, "alice", 10)
+        await seed(manager, "bob", 5)
+
+        plans, total = await manager.list_plans("alice", limit=100)
+
+        assert total == 10
+        assert {p["id"] for p in plans} == set(mine)
+        updated = [p["updated_at"] for p in plans]
+        assert updated == sorted(updated, reverse=True)
+
+    async def test_pagination(self, manager):
+        await seed(manager, "alice", 10)
+
+        page1, total = await manager.list_plans("alice", offset=0, limit=3)
+        page2, _ = await manager.list_plans("alice", offset=3, limit=3)
+
+        assert total == 10
+        assert len(page1) == len(page2) == 3
+        assert not {p["id"] for p in page1} & {p["id"] for p in page2}
+
+    async def test_status_filter(self, manager):
+        await seed(manager, "alice", 14)
+
+        paused, total = await manager.list_plans("alice", status_filter="paused")
+        active, active_total = await manager.list_plans("alice", status_filter="active")
+
+        assert total == 2
+        assert all(p["status"] == "paused" for p in paused)
+        assert active_total == 4
+        assert {p["status"] for p in active} == {"approved", "executing"}
+
+    async def test_project_filter(self, manager):
+        await seed(manager, "alice", 9)
+
+        plans, total = await manager.list_plans("alice", project_id="project-1")
+
+        assert total == 3
+        assert all(p["project_id"] == "project-1" for p in plans)
+
+    async def test_shared_conversation(self, manager):
+        """Test that a shared conversation lists only the caller's plans, paged after filtering."""
+        for n in range(6):
+            await manager.create_plan("shared", "alice" if n % 2 else "bob", f"Shared {n}", "", None)
+
+        page1, total = await manager.list_plans("alice", conversation_id="shared", offset=0, limit=2)
+        page2, _ = await manager.list_plans("alice", conversation_id="shared", offset=2, limit=2)
+
+        assert total == 3
+        assert (len(page1), len(page2)) == (2, 1)
+        assert all(p["user_id"] == "alice" for p in page1 + page2)
+
+    async def test_stuck_filter(self, manager):
+        """Test that paused plans with completed steps are listed as stuck."""
+        plan_id = await executing_plan(manager, "alice")
+        plan = await manager.get_plan(plan_id)
+        await manager.update_step_status(plan_id, plan.steps[0].id, StepStatus.COMPLETED)
+        await manager.pause_execution(plan_id)
+        await seed(manager, "alice", 7)
+
+        stuck, total = await manager.list_plans("alice", status_filter="stuck")
+
+        assert total == 1
+        assert [p["id"] for p in stuck] == [plan_id]
+
+
+@pytest.mark.asyncio
+class TestPlanIndex:
+    """Tests for index consistency."""
+
+    async def test_status_sets_follow_transitions(self, manager, redis):
+        """Test that a plan is only in the set for its current status."""
+        plan_id = await executing_plan(manager, "alice")
+        await manager.pause_execution(plan_id)
+
+        members = {
+            status
+            for status in ("exploring", "pending", "approved", "executing", "paused")
+            if await redis.sismember(f"plans:status:{status}", plan_id)
+        }
+
+        assert members == {"paused"}
+
+    async def test_short_id(self, manager):
+        """Test that an ID prefix resolves without the in-memory cache."""
+        plan = await manager.create_plan("conv", "alice", "Prefix", "", None)
+        manager._active_plans.clear()
+
+        found = await manager.get_plan(plan.id[:8])
+
+        assert found is not None and found.id == plan.id
+
+    async def test_empty_prefix_rejected(self, manager):
+        await manager.create_plan("conv", "alice", "Prefix", "", None)
+
+        assert await manager.index.resolve_id("") is None
+
+    async def test_delete_removes_every_entry(self, manager, redis):
+        """Test that a delete removes the document, its history and its index entries."""
+        plan_id = await executing_plan(manager, "alice")
+        await manager.pause_execution(plan_id)
+        await redis.lpush(f"plan:{plan_id}:history", "{}")
+
+        assert await manager.delete_plan(plan_id)
+
+        for key in ("plans:user:alice", "plans:conversation:conv-x", "plans:project:project-x"):
+            assert not await redis.zcard(key)
+        assert not await redis.exists(f"plan:{plan_id}", f"plan:{plan_id}:history")
+        assert not await redis.sismember("plans:status:paused", plan_id)
+        assert await manager.index.resolve_id(plan_id) is None
+
+    async def test_backfill(self, manager, redis):
+        """Test that plans written without the index are picked up by backfill."""
+        raw_id = str(uuid.uuid4())
+        await redis.set(f"plan:{raw_id}", json.dumps({
+            "id": raw_id, "user_id": "alice", "conversation_id": "conv-x",
+            "status": "failed", "created_at": "2024-01-01T00:00:00+00:00", "steps": [],
+        }))
+        before, _ = await manager.list_plans("alice")
+
+        indexed = await manager.index.backfill()
+        after, _ = await manager.list_plans("alice", status_filter="failed")
+
+        assert before == []
+        assert indexed == 1
+        assert [p["id"] for p in after] == [raw_id]
+
+
+@pytest.mark.asyncio
+class TestStepUpdates:
+    """Tests for field-level step updates."""
+
+    async def test_plan_settles_when_steps_complete(self, manager):
+        plan_id = await executing_plan(manager, "alice")
+        plan = await manager.get_plan(plan_id)
+
+        for step in plan.steps:
+            assert await manager.update_step_status(plan_id, step.id, StepStatus.COMPLETED)
+
+        done = await manager.get_plan(plan_id)
+        assert done.status == PlanStatus.COMPLETED
+        assert done.progress == 100
+
+    async def test_concurrent_updates_kept(self, manager):
+        """Test that concurrent updates to different steps don't overwrite each other."""
+        plan = await manager.create_plan("conv", "alice", "Many steps", "", None)
+        await manager.set_steps(plan.id, [{"title": f"Step {n}"} for n in range(20)])
+        step_ids = [step.id for step in (await manager.get_plan(plan.id)).steps]
+
+        results = await asyncio.gather(*(
+            manager.update_step_status(plan.id, step_id, StepStatus.IN_PROGRESS, output=f"out {n}")
+            for n, step_id in enumerate(step_ids)
+        ))
+
+        steps = (await manager.get_plan(plan.id)).steps
+        assert all(results)
+        assert all(s.status == StepStatus.IN_PROGRESS for s in steps)
+        assert [s.output for s in steps] == [f"out {n}" for n in range(20)]
+
+    async def test_unknown_step_not_written(self, manager):
+        plan_id = await executing_plan(manager, "alice")
+
+        assert not await manager.update_step_status(plan_id, "missing", StepStatus.COMPLETED)
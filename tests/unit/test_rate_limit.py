@@ -0,0 +1,114 @@
+"""Tests for the GCRA rate limiter."""
+
+import asyncio
+import time
+
+import pytest
+from api.middleware.rate_limit import GCRARateLimiter
+
+# One token every 100 ms: short enough to watch refills, long enough that a
+# burst of checks completes within one interval
+RATE = 600
+INTERVAL = 60 / RATE
+
+
+def make_limiter(redis, capacity: int = 5, **kwargs) -> GCRARateLimiter:
+    return GCRARateLimiter(redis, requests_per_minute=RATE, capacity=capacity, **kwargs)
+
+
+@pytest.mark.asyncio
+class TestGCRARateLimiter:
+    """Tests for GCRARateLimiter burst and fairness behaviour."""
+
+    async def test_burst_then_denied(self, redis):
+        """Test that a cold identifier gets exactly ``capacity`` requests at once."""
+        limiter = make_limiter(redis, capacity=5)
+
+        decisions = [await limiter.acquire("user:burst") for _ in range(10)]
+
+        assert [d.allowed for d in decisions] == [True] * 5 + [False] * 5
+        assert [d.remaining for d in decisions[:5]] == [4, 3, 2, 1, 0]
+        assert all(d.retry_after >= 1 for d in decisions[5:])
+
+    async def test_refill_at_steady_rate(self, redis):
+        """Test that tokens come back one per emission interval."""
+        limiter = make_limiter(redis, capacity=5)
+        for _ in range(5):
+            await limiter.acquire("user:refill")
+
+        await asyncio.sleep(3 * INTERVAL + 0.01)
+        regained = sum([(await limiter.acquire("user:refill")).allowed for _ in range(10)])
+
+        assert 3 <= regained <= 4
+
+    async def test_identifiers_isolated(self, redis):
+        """Test that one identifier's flood doesn't consume another's tokens."""
+        limiter = make_limiter(redis, capacity=3)
+        for _ in range(20):
+            await limiter.acquire("user:noisy")
+
+        decisions = [await limiter.acquire("user:quiet") for _ in range(3)]
+
+        assert all(d.allowed for d in decisions)
+
+    @pytest.mark.parametrize("lease_size", [0, 4])
+    async def test_workers_share_one_limit(self, redis, lease_size):
+        """Test that workers flooding one identifier never admit more than the global rate."""
+        workers = [make_limiter(redis, capacity=10, lease_size=lease_size, lease_ttl=0.1) for _ in range(4)]
+        admitted = [0] * len(workers)
+        polite_sent = polite_admitted = 0
+        duration = 0.5
+        stop_at = time.monotonic() + duration
+
+        async def flood(index: int) -> None:
+            while time.monotonic() < stop_at:
+                admitted[index] += (await workers[index].acquire("user:shared")).allowed
+                await asyncio.sleep(0)
+
+        async def well_behaved() -> None:
+            # Half the steady rate, round-robin across workers
+            nonlocal polite_sent, polite_admitted
+            while time.monotonic() < stop_at:
+                polite_admitted += (await workers[polite_sent % len(workers)].acquire("user:polite")).allowed
+                polite_sent += 1
+                await asyncio.sleep(2 * INTERVAL)
+
+        start = time.monotonic()
+        await asyncio.gather(*(flood(i) for i in range(len(workers))), well_behaved())
+        elapsed = time.monotonic() - start
+
+        ceiling = 10 + int(elapsed / INTERVAL) + 1
+        assert 10 <= sum(admitted) <= ceiling
+        assert polite_admitted == polite_sent
+
+    async def test_leases_save_round_trips(self, redis):
+        """Test that a lease answers following requests without Redis."""
+        limiter = make_limiter(redis, capacity=8, lease_size=4)
+
+        decisions = [await limiter.acquire("user:lease") for _ in range(8)]
+
+        assert all(d.allowed for d in decisions)
+        assert limiter.redis_calls == 2
+        assert limiter.local_hits == 6
+
+    async def test_cached_denial(self, redis):
+        """Test that a denial is answered locally until a token could be free."""
+        limiter = make_limiter(redis, capacity=2, lease_size=2)
+        await limiter.acquire("user:denied")
+        await limiter.acquire("user:denied")
+
+        first = await limiter.acquire("user:denied")
+        calls = limiter.redis_calls
+        second = await limiter.acquire("user:denied")
+
+        assert not first.allowed and not second.allowed
+        assert limiter.redis_calls == calls
+
+    async def test_legacy_sliding_window_key(self, redis):
+        """Test that a sorted set left by the sliding-window limiter doesn't break checks."""
+        await redis.client.zadd("ratelimit:user:legacy", {"1": 1.0})
+        limiter = make_limiter(redis)
+
+        decision = await limiter.acquire("user:legacy")
+
+        assert decision.allowed
@@ -0,0 +1,149 @@
+"""Tests for exporting the content router and serving the bundle without torch."""
+
+import json
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from ai_core.router_inference import ENCODER_FILE, ExportedRouter
+from ai_core.router_training import RouterTrainer, TrainingConfig
+
+# Short enough for a tiny model; still spans several encoder lengths
+MAX_TOKENS = 32
+MODEL_NAMES = ["fast", "balanced", "powerful"]
+QUERIES = [
+    "fix typo",
+    "explain how this works",
+    "refactor the auth module and add tests",
+    "migrate the database schema to the new service with zero downtime and add tests",
+    "refactor the auth module and migrate the database schema to the new service "
+    "with zero downtime then explain how this works and fix the typo in the readme",
+]
+
+
+@pytest.fixture(scope="module")
+def encoder_dir(tmp_path_factory):
+    """A tiny randomly initialised Longformer and its tokenizer, saved like a Hub model."""
+    torch = pytest.importorskip("torch")
+    transformers = pytest.importorskip("transformers")
+    from tokenizers import Tokenizer, models, normalizers, pre_tokenizers, processors
+
+    vocab = {"<s>": 0, "<pad>": 1, "</s>": 2, "<unk>": 3}
+    for word in " ".join(QUERIES).split():
+        vocab.setdefault(word, len(vocab))
+    tokenizer = Tokenizer(models.WordLevel(vocab, unk_token="<unk>"))
+    tokenizer.normalizer = normalizers.Lowercase()
+    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    tokenizer.post_processor = processors.TemplateProcessing(
+        single="<s> $A </s>", special_tokens=[("<s>", 0), ("</s>", 2)]
+    )
+
+    path = tmp_path_factory.mktemp("encoder")
+    transformers.PreTrainedTokenizerFast(
+        tokenizer_object=tokenizer,
+        bos_token="<s>",
+        eos_token="</s>",
+        pad_token="<pad>",
+        unk_token="<unk>",
+    ).save_pretrained(path)
+
+    torch.manual_seed(0)
+    config = transformers.LongformerConfig(
+        vocab_size=len(vocab),
+        hidden_size=16,
+        num_hidden_layers=2,
+        num_attention_heads=2,
+        intermediate_size=32,
+        attention_window=4,
+        max_position_embeddings=MAX_TOKENS + 8,
+        pad_token_id=1,
+        bos_token_id=0,
+        eos_token_id=2,
+    )
+    transformers.LongformerModel(config).save_pretrained(path)
+    return path
+
+
+@pytest.fixture(scope="module")
+def mf(encoder_dir, tmp_path_factory):
+    """An untrained MFRouter head over the tiny encoder, exported as a bundle."""
+    torch = pytest.importorskip("torch")
+    pytest.importorskip("onnx")
+    router = pytest.importorskip("llmrouter.models.mfrouter.router")
+
+    config = TrainingConfig(
+        config_dir=str(tmp_path_factory.mktemp("router")),
+        latent_dim=8,
+        text_dim=16,
+        embedding_model=str(encoder_dir),
+    )
+    trainer = RouterTrainer(config)
+    trainer.write_config()
+    with open(config.training_data_path, "w") as f:
+        for n, query in enumerate(QUERIES):
+            f.write(json.dumps({"query": query, "model_name": MODEL_NAMES[n % 3]}) + "\n")
+
+    torch.manual_seed(1)
+    model = router.BilinearMF(dim=8, num_models=len(MODEL_NAMES), text_dim=16)
+    config.model_path.parent.mkdir(parents=True, exist_ok=True)
+    torch.save(model.state_dict(), config.model_path)
+
+    trainer.export(max_tokens=MAX_TOKENS)
+    return model.eval(), config.export_dir
+
+
+class TestExport:
+    """Tests for the exported bundle against MFRouter."""
+
+    def test_one_encoder_per_length(self, mf):
+        """Test that an encoder is exported per doubling length from the attention window."""
+        _, export_dir = mf
+
+        assert sorted(p.name for p in export_dir.glob("encoder-*.onnx")) == sorted(
+            ENCODER_FILE.format(length=length) for length in (4, 8, 16, 32)
+        )
+
+    def test_scores_match_mfrouter(self, mf, encoder_dir, monkeypatch):
+        """Test that the bundle scores queries as MFRouter does on llmrouter's embeddings."""
+        import torch
+        from llmrouter.utils import embeddings
+        from transformers import AutoModel, AutoTokenizer
+
+        model, export_dir = mf
+        monkeypatch.setattr(embeddings, "_tokenizer", AutoTokenizer.from_pretrained(encoder_dir))
+        monkeypatch.setattr(embeddings, "_model", AutoModel.from_pretrained(encoder_dir).eval())
+        monkeypatch.setattr(embeddings, "_device", torch.device("cpu"))
+
+        with torch.no_grad():
+            expected = np.stack([
+                model.score_all(model.project_text(embeddings.get_longformer_embedding(query))).numpy()
+                for query in QUERIES
+            ])
+        scores, token_counts = ExportedRouter.load(export_dir).score_batch(QUERIES)
+
+        np.testing.assert_allclose(scores, expected, rtol=1e-4, atol=1e-5)
+        assert list(scores.argmax(axis=1)) == list(expected.argmax(axis=1))
+        assert token_counts == [len(q.split()) + 2 for q in QUERIES]
+
+    def test_batch_same_as_alone(self, mf):
+        """Test that routing texts together gives each the same result as routing it alone."""
+        router = ExportedRouter.load(mf[1])
+
+        together = router.route_batch(QUERIES)
+
+        assert together == [router.route_batch([q])[0] for q in QUERIES]
+
+    def test_routes_without_torch(self, mf):
+        """Test that a bundle is served in an interpreter where torch can't be imported."""
+        code = (
+            "import sys; sys.modules['torch'] = None\n"
+            "from ai_core.router_inference import ExportedRouter\n"
+            f"print(ExportedRouter.load({str(mf[1])!r}).route_batch(['fix typo'])[0][0])\n"
+        )
+
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.splitlines()[-1] in MODEL_NAMES
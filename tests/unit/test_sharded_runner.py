@@ -0,0 +1,80 @@
+"""Tests for the QA agent's sharded pytest runner."""
+
+from qa_agent.sharded_runner import parse_junit_xml, split_shards
+
+JUNIT_XML = """<?xml version="1.0" encoding="utf-8"?>
+<testsuites>
+  <testsuite name="pytest" tests="3" time="4.5">
+    <testcase classname="tests.unit.test_api" file="tests/unit/test_api.py" name="test_get" time="1.5"/>
+    <testcase classname="tests.unit.test_api.TestAuth" file="tests/unit/test_api.py" name="test_login" time="2.0">
+      <failure message="assert 401 == 200">details</failure>
+    </testcase>
+    <testcase classname="test_api" file="test_api.py" name="test_root" time="1.0">
+      <skipped message="slow"/>
+    </testcase>
+  </testsuite>
+</testsuites>
+"""
+
+
+class TestParseJunitXml:
+    """Tests for JUnit report parsing."""
+
+    def test_durations_keyed_by_node_id(self, tmp_path):
+        """Test that durations are recorded per pytest node ID."""
+        report = tmp_path / "junit.xml"
+        report.write_text(JUNIT_XML)
+
+        results = parse_junit_xml(report)
+
+        assert results.test_durations == {
+            "tests/unit/test_api.py::test_get": 1.5,
+            "tests/unit/test_api.py::TestAuth::test_login": 2.0,
+            "test_api.py::test_root": 1.0,
+        }
+        assert (results.passed, results.failed, results.skipped) == (1, 1, 1)
+        assert results.failures[0]["test"] == "tests.unit.test_api.TestAuth::test_login"
+
+
+class TestSplitShards:
+    """Tests for shard balancing."""
+
+    def test_exact_lookup(self):
+        """Test that a file doesn't take the duration of another sharing its suffix."""
+        durations = {
+            "test_api.py::test_root": 9.0,
+            "tests/unit/test_api.py::test_get": 1.0,
+            "tests/unit/test_api.py::test_put": 1.0,
+            "tests/unit/test_db.py::test_query": 3.0,
+        }
+
+        shards = split_shards(["tests/unit/test_api.py", "tests/unit/test_db.py"], 2, durations)
+
+        # test_api.py costs 2.0 (its own tests), not 9.0 from the root-level file
+        assert shards == [["tests/unit/test_db.py"], ["tests/unit/test_api.py"]]
+
+    def test_balances_node_ids(self):
+        """Test longest-first assignment over individual tests."""
+        durations = {f"tests/test_a.py::test_{i}": float(i) for i in range(1, 7)}
+        tests = list(durations)
+
+        shards = split_shards(tests, 3, durations)
+
+        loads = [sum(durations[t] for t in shard) for shard in shards]
+        assert sorted(loads) == [7.0, 7.0, 7.0]
+        assert sorted(t for shard in shards for t in shard) == sorted(tests)
+
+    def test_normalizes_paths(self):
+        """Test that ./-prefixed node IDs still find their durations."""
+        durations = {"tests/test_a.py::test_slow": 5.0, "tests/test_b.py::test_fast": 0.1}
+
+        shards = split_shards(["./tests/test_b.py::test_fast", "./tests/test_a.py::test_slow"], 2, durations)
+
+        assert shards[0] == ["./tests/test_a.py::test_slow"]
+
+    def test_unknown_tests_fall_back(self):
+        """Test that tests without durations still get a shard."""
+        shards = split_shards(["missing/test_x.py", "missing/test_y.py"], 4)
+
+        assert sorted(t for shard in shards for t in shard) == ["missing/test_x.py", "missing/test_y.py"]
+        assert len(shards) == 2
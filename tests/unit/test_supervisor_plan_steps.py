@@ -0,0 +1,54 @@
+"""Tests for how the supervisor saves plan step progress."""
+
+import pytest
+from supervisor.agent import SupervisorAgent
+
+from ai_messaging import PlanIndex
+
+
+@pytest.fixture
+def agent(redis) -> SupervisorAgent:
+    """A supervisor with only the Redis client it needs to save plans."""
+    supervisor = SupervisorAgent.__new__(SupervisorAgent)
+    supervisor._redis = redis
+    return supervisor
+
+
+async def stored_plan(redis, steps: list[dict]) -> dict:
+    plan = {"id": "plan-1", "user_id": "alice", "conversation_id": "conv", "status": "executing", "steps": steps}
+    await PlanIndex(redis).save(plan)
+    return plan
+
+
+@pytest.mark.asyncio
+class TestSavePlanStep:
+    """Tests for SupervisorAgent._save_plan_step."""
+
+    async def test_field_level_change(self, agent, redis):
+        """Test that only the named fields of the step are saved and reported."""
+        plan = await stored_plan(redis, [{"id": "s1", "title": "One", "status": "pending"}])
+        step = plan["steps"][0]
+        step["status"] = "in_progress"
+        step["title"] = "Renamed locally"
+
+        change = await agent._save_plan_step(plan, step, ("status", "started_at"), current_step=0)
+
+        assert change == {"id": "s1", "status": "in_progress"}
+        [saved] = await PlanIndex(redis).get_many(["plan-1"])
+        assert saved["steps"][0]["status"] == "in_progress"
+        assert saved["steps"][0]["title"] == "One"
+        assert saved["current_step"] == 0
+
+    async def test_step_without_id_gets_one(self, agent, redis):
+        """Test that a step_update delta never carries an empty step ID."""
+        plan = await stored_plan(redis, [{"title": "Legacy", "status": "pending"}])
+        step = plan["steps"][0]
+        step["status"] = "completed"
+
+        change = await agent._save_plan_step(plan, step, ("status",))
+
+        assert change["id"]
+        assert change == {"id": step["id"], "status": "completed"}
+        [saved] = await PlanIndex(redis).get_many(["plan-1"])
+        assert saved["steps"][0]["id"] == step["id"]
+        assert saved["steps"][0]["status"] == "completed"
@@ -0,0 +1,194 @@
+"""Tests for streaming speech synthesis against a fake OpenAI speech endpoint."""
+
+import asyncio
+import hashlib
+
+import pytest
+from aiohttp import web
+from voice_service import phrase_cache
+from voice_service.config import get_voice_config
+from voice_service.segmenter import split_sentences
+from voice_service.synthesis import SynthesisService, _wav_stream_header
+
+BYTES_PER_CHAR = 40
+CHUNK_SIZE = 1024
+LOOKAHEAD = 2
+
+TEXT = (
+    "Sure, I can help with that. I looked through the deployment logs for the last hour. "
+    "The API containers restarted twice, both times after the health check timed out. "
+    "I recommend moving the export to a read replica and raising the pool size to twenty. "
+    "Would you like me to prepare that change?"
+)
+
+
+def fake_audio(text: str) -> bytes:
+    """Deterministic stand-in for the audio of ``text``."""
+    seed = hashlib.sha256(text.encode()).digest()
+    size = len(text) * BYTES_PER_CHAR
+    return (seed * (size // len(seed) + 1))[:size]
+
+
+class FakeTTSServer:
+    """POST /v1/audio/speech streaming chunked audio after a delay."""
+
+    def __init__(self) -> None:
+        self.inputs: list[str] = []
+        self.formats: list[str] = []
+        self.active = 0
+        self.max_active = 0
+        self.delay = 0.02
+        self.status = 200
+
+        self.app = web.Application()
+        self.app.router.add_post("/v1/audio/speech", self.speech)
+
+    async def speech(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        self.inputs.append(body["input"])
+        self.formats.append(body["response_format"])
+        if self.status != 200:
+            return web.json_response({"error": {"message": "invalid input"}}, status=self.status)
+
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            response = web.StreamResponse(headers={"Content-Type": "audio/mpeg"})
+            await response.prepare(request)
+            audio = fake_audio(body["input"])
+            for i in range(0, len(audio), CHUNK_SIZE):
+                await asyncio.sleep(self.delay)
+                await response.write(audio[i : i + CHUNK_SIZE])
+            await response.write_eof()
+            return response
+        finally:
+            self.active -= 1
+
+
+@pytest.fixture
+async def tts_server():
+    """A fake speech endpoint on a local port."""
+    server = FakeTTSServer()
+    runner = web.AppRunner(server.app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    server.port = runner.addresses[0][1]
+    yield server
+    await runner.cleanup()
+
+
+@pytest.fixture
+def service(tts_server, monkeypatch):
+    """A SynthesisService talking to the fake server with a fresh phrase cache."""
+    monkeypatch.setenv("VOICE_OPENAI_BASE_URL", f"http://127.0.0.1:{tts_server.port}/v1")
+    monkeypatch.setenv("VOICE_OPENAI_API_KEY", "fake")
+    monkeypatch.setenv("VOICE_TTS_STREAM_LOOKAHEAD", str(LOOKAHEAD))
+    monkeypatch.setenv("VOICE_TTS_STREAM_CHUNK_SIZE", str(CHUNK_SIZE))
+    monkeypatch.setattr(phrase_cache, "_phrase_cache", None)
+    get_voice_config.cache_clear()
+    yield SynthesisService()
+    get_voice_config.cache_clear()
+
+
+def sentences(service: SynthesisService, text: str) -> list[str]:
+    config = service.config
+    return split_sentences(text, config.tts_segment_min_chars, config.tts_segment_max_chars)
+
+
+async def collect(stream) -> bytes:
+    return b"".join([chunk async for chunk in stream])
+
+
+async def llm_tokens(text: str, done: asyncio.Event):
+    """Yield ``text`` in ~4 character tokens like an LLM stream."""
+    for i in range(0, len(text), 4):
+        await asyncio.sleep(0.002)
+        yield text[i : i + 4]
+    done.set()
+
+
+@pytest.mark.asyncio
+class TestSynthesizeStream:
+    """Tests for sentence-pipelined streaming synthesis."""
+
+    async def test_sentences_in_order(self, service, tts_server):
+        """Test that every sentence's audio arrives complete and in order."""
+        expected = b"".join(fake_audio(s) for s in sentences(service, TEXT))
+
+        audio = await collect(service.synthesize_stream(TEXT))
+
+        assert audio == expected
+        # Lookahead requests run concurrently and may reach the server in any order
+        assert sorted(tts_server.inputs) == sorted(sentences(service, TEXT))
+
+    async def test_lookahead_pipelines_requests(self, service, tts_server):
+        """Test that upcoming sentences are synthesized while earlier ones stream."""
+        await collect(service.synthesize_stream(TEXT))
+
+        assert 2 <= tts_server.max_active <= LOOKAHEAD + 1
+
+    async def test_speaks_while_llm_generates(self, service):
+        """Test that audio starts before the text iterator is exhausted."""
+        done = asyncio.Event()
+        expected = b"".join(fake_audio(s) for s in sentences(service, TEXT))
+        audio = bytearray()
+        started_early = False
+
+        async for chunk in service.synthesize_stream(llm_tokens(TEXT, done)):
+            if not audio:
+                started_early = not done.is_set()
+            audio.extend(chunk)
+
+        assert started_early
+        assert bytes(audio) == expected
+
+    async def test_repeated_phrases_cached(self, service, tts_server):
+        """Test that short repeated phrases are synthesized once."""
+        phrases = ["Okay.", "Working on it.", "Done!"]
+
+        first = [await collect(service.synthesize_stream(p)) for p in phrases]
+        second = [await collect(service.synthesize_stream(p)) for p in phrases]
+
+        assert first == second == [fake_audio(p) for p in phrases]
+        assert len(tts_server.inputs) == len(phrases)
+
+    async def test_stops_on_disconnect(self, service, tts_server):
+        """Test that closing the stream stops synthesis of later sentences."""
+        long_text = " ".join([TEXT] * 4)
+        stream = service.synthesize_stream(long_text)
+        async for _ in stream:
+            break
+        await stream.aclose()
+        await asyncio.sleep(0.2)
+
+        assert len(tts_server.inputs) <= LOOKAHEAD + 1
+        assert len(sentences(service, long_text)) > LOOKAHEAD + 1
+
+    async def test_wav_streams_pcm_behind_one_header(self, service, tts_server):
+        """Test that WAV output is one streaming header followed by PCM per sentence."""
+        audio = await collect(service.synthesize_stream(TEXT, response_format="wav"))
+
+        header = _wav_stream_header()
+        assert audio.startswith(header)
+        assert audio[len(header):] == b"".join(fake_audio(s) for s in sentences(service, TEXT))
+        assert set(tts_server.formats) == {"pcm"}
+
+    async def test_api_error_raised(self, service, tts_server):
+        tts_server.status = 400
+
+        with pytest.raises(Exception, match="invalid input"):
+            await collect(service.synthesize_stream(TEXT))
+
+
+@pytest.mark.asyncio
+class TestSynthesize:
+    """Tests for whole-text synthesis."""
+
+    async def test_whole_text(self, service, tts_server):
+        assert await service.synthesize(TEXT) == fake_audio(TEXT)
+        assert tts_server.inputs == [TEXT]
+
+    async def test_empty_text_rejected(self, service):
+        with pytest.raises(ValueError):
+            await service.synthesize("   ")
@@ -0,0 +1,197 @@
+"""Tests for streaming transcription with a local stub recognizer."""
+
+import asyncio
+import io
+import wave
+
+import numpy as np
+import pytest
+from voice_service.transcription import TranscriptionBackend, TranscriptionService
+from voice_service.vad import pcm_to_wav
+
+SAMPLE_RATE = 16000
+WORDS = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india", "juliet"]
+
+
+def word_frequency(index: int) -> float:
+    return 300.0 + 80.0 * index
+
+
+def noise(rng: np.random.Generator, seconds: float, level: float = 30) -> np.ndarray:
+    return rng.normal(0, level, int(seconds * SAMPLE_RATE))
+
+
+def to_pcm(samples: np.ndarray) -> bytes:
+    return np.clip(samples, -32768, 32767).astype("<i2").tobytes()
+
+
+def dictation(utterances: int, seed: int = 7) -> tuple[bytes, list[str]]:
+    """Tone bursts (one word each) separated by pauses, with a click halfway."""
+    rng = np.random.default_rng(seed)
+    parts = [noise(rng, 0.6)]
+    spoken = []
+    for i in range(utterances):
+        word = i % len(WORDS)
+        spoken.append(WORDS[word])
+        t = np.arange(int(rng.uniform(1.5, 3.0) * SAMPLE_RATE)) / SAMPLE_RATE
+        # Syllable-like envelope whose dips must not split the utterance
+        envelope = 0.55 + 0.45 * np.sin(2 * np.pi * 3 * t) ** 2
+        parts.append(6000 * envelope * np.sin(2 * np.pi * word_frequency(word) * t) + noise(rng, t.size / SAMPLE_RATE))
+        parts.append(noise(rng, rng.uniform(0.7, 1.2)))
+        if i == utterances // 2:
+            # A 60 ms click is noise, not speech
+            parts.append(noise(rng, 0.06, level=8000))
+            parts.append(noise(rng, 0.8))
+    return to_pcm(np.concatenate(parts)), spoken
+
+
+class StubBackend(TranscriptionBackend):
+    """Reads the synthetic tone words back, after a short fixed latency."""
+
+    def __init__(self, latency: float = 0.02):
+        self.latency = latency
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+
+    async def transcribe(self, audio_data, filename, language=None, prompt=None,  # noqa: ARG002
+                         response_format="json", temperature=0.0):  # noqa: ARG002
+        with wave.open(io.BytesIO(audio_data)) as wav:
+            rate = wav.getframerate()
+            samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype="<i2").astype(np.float32)
+
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.active -= 1
+
+        text = []
+        window = rate // 2
+        for start in range(0, samples.size - window + 1, window):
+            chunk = samples[start : start + window]
+            if np.sqrt(np.mean(chunk * chunk)) < 500:
+                continue
+            spectrum = np.abs(np.fft.rfft(chunk))
+            if spectrum.max() < 20 * spectrum.mean():
+                continue  # Broadband noise, not a tone
+            peak = np.fft.rfftfreq(chunk.size, 1 / rate)[int(np.argmax(spectrum))]
+            word = WORDS[min(range(len(WORDS)), key=lambda i: abs(word_frequency(i) - peak))]
+            if not text or text[-1] != word:
+                text.append(word)
+        return {"text": " ".join(text), "duration": samples.size / rate}
+
+
+async def transcribe_live(service: TranscriptionService, pcm: bytes, chunk_ms: int = 100):
+    """Feed PCM in WebSocket-sized chunks and collect the partial transcripts."""
+    stream = service.start_stream(sample_rate=SAMPLE_RATE)
+    partials = []
+
+    async def collect() -> None:
+        async for partial in stream.results():
+            partials.append(partial)
+
+    collector = asyncio.create_task(collect())
+    chunk_bytes = SAMPLE_RATE * 2 * chunk_ms // 1000
+    for i in range(0, len(pcm), chunk_bytes):
+        stream.feed(pcm[i : i + chunk_bytes])
+        await asyncio.sleep(0)
+    stream.end()
+    await collector
+    return stream, partials
+
+
+@pytest.fixture
+def backend() -> StubBackend:
+    return StubBackend()
+
+
+@pytest.fixture
+def service(backend) -> TranscriptionService:
+    return TranscriptionService(backend)
+
+
+@pytest.mark.asyncio
+class TestStreamingTranscription:
+    """Tests for utterance-segmented live transcription."""
+
+    async def test_stitched_text(self, service):
+        """Test that partials stitch to the spoken text."""
+        pcm, spoken = dictation(6)
+
+        stream, _ = await transcribe_live(service, pcm)
+
+        assert stream.text == " ".join(spoken)
+
+    async def test_partials_in_order(self, service):
+        """Test that partials arrive in speaking order without overlapping."""
+        pcm, _ = dictation(6)
+
+        _, partials = await transcribe_live(service, pcm)
+
+        assert [p["index"] for p in partials] == list(range(len(partials)))
+        assert all(a["end"] <= b["start"] for a, b in zip(partials, partials[1:], strict=False))
+
+    async def test_segments_at_pauses(self, service):
+        """Test one segment per utterance, ignoring the click and background noise."""
+        pcm, spoken = dictation(6)
+
+        _, partials = await transcribe_live(service, pcm)
+
+        assert [p["text"] for p in partials] == spoken
+
+    async def test_noise_not_transcribed(self, service, backend):
+        """Test that background noise alone sends nothing to the recognizer."""
+        pcm = to_pcm(noise(np.random.default_rng(1), 3.0))
+
+        stream, partials = await transcribe_live(service, pcm)
+
+        assert partials == []
+        assert stream.text == ""
+        assert backend.calls == 0
+
+    async def test_concurrency_bounded(self, service, backend):
+        """Test that utterances finished together are transcribed at most N at once."""
+        backend.latency = 0.1
+        pcm, spoken = dictation(8)
+
+        stream = service.start_stream(sample_rate=SAMPLE_RATE)
+        stream.feed(pcm)
+        stream.end()
+        texts = [p["text"] async for p in stream.results()]
+
+        assert texts == spoken
+        assert 1 < backend.max_active <= service.config.stt_stream_concurrency
+
+    async def test_feed_after_end(self, service):
+        stream = service.start_stream(sample_rate=SAMPLE_RATE)
+        stream.end()
+
+        with pytest.raises(RuntimeError):
+            stream.feed(b"\0\0")
+
+    async def test_invalid_sample_rate(self, service):
+        with pytest.raises(ValueError):
+            service.start_stream(sample_rate=4000)
+
+
+@pytest.mark.asyncio
+class TestTranscribeBytes:
+    """Tests for whole-clip transcription."""
+
+    async def test_whole_recording(self, service, backend):
+        pcm, spoken = dictation(4)
+
+        result = await service.transcribe_bytes(pcm_to_wav(pcm, SAMPLE_RATE), filename="dictation.wav")
+
+        assert result["text"] == " ".join(spoken)
+        assert backend.calls == 1
+
+    async def test_size_limit(self, service):
+        """Test that clips over max_audio_size_mb are refused before sending."""
+        limit = service.config.max_audio_size_mb * 1024 * 1024
+
+        with pytest.raises(ValueError):
+            await service.transcribe_bytes(b"\0" * (limit + 1), filename="big.wav")
@@ -0,0 +1,151 @@
+"""Tests for content-addressed upload storage and the files routes."""
+
+import hashlib
+import io
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from uuid import uuid4
+
+import httpx
+import pytest
+from api.config import APIConfig
+from api.dependencies import get_config, get_current_user
+from api.routes.files import router as files_router
+from api.services.upload_store import UploadStore
+from fastapi import FastAPI
+
+PAYLOAD = os.urandom(100_000)
+
+
+def blob_count(store: UploadStore) -> int:
+    return sum(1 for p in store.blobs.rglob("*") if p.is_file())
+
+
+@pytest.fixture
+def user():
+    return SimpleNamespace(sub=str(uuid4()))
+
+
+@pytest.fixture
+async def client(tmp_path, user):
+    """An HTTP client for the files router, uploading to a temp directory as ``user``."""
+    config = APIConfig(upload_directory=str(tmp_path))
+    app = FastAPI()
+    app.include_router(files_router, prefix="/api")
+    app.dependency_overrides[get_config] = lambda: config
+    app.dependency_overrides[get_current_user] = lambda: user
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+        yield http
+
+
+async def upload(client: httpx.AsyncClient, payload: bytes = PAYLOAD) -> str:
+    resp = await client.post("/api/files/upload", files={"file": ("shot.png", payload, "image/png")})
+    assert resp.status_code == 200
+    return resp.json()["id"]
+
+
+@pytest.mark.asyncio
+class TestUploadStore:
+    """Tests for UploadStore deduplication and garbage collection."""
+
+    async def test_same_content_stored_once(self, tmp_path):
+        """Test that the same content uploaded by several users is stored once."""
+        store = UploadStore(tmp_path)
+        payloads = [os.urandom(10_000) for _ in range(3)]
+
+        for n in range(12):
+            await store.save(f"user-{n % 3}", io.BytesIO(payloads[n % 3]), "a.png", "image/png")
+
+        assert blob_count(store) == 3
+        assert sum(len(store.list_refs(f"user-{n}")) for n in range(3)) == 12
+
+    async def test_gc_keeps_referenced_blobs(self, tmp_path):
+        """Test that a blob is only collected once no reference points at it."""
+        store = UploadStore(tmp_path)
+        first = await store.save("alice", io.BytesIO(PAYLOAD), "a.png", "image/png")
+        second = await store.save("bob", io.BytesIO(PAYLOAD), "b.png", "image/png")
+
+        store.delete("alice", first["id"])
+        kept = store.collect_garbage(grace_seconds=0)
+        store.delete("bob", second["id"])
+        collected = store.collect_garbage(grace_seconds=0)
+
+        assert kept["removed"] == 0
+        assert collected["removed"] == 1
+        assert collected["bytes_freed"] == len(PAYLOAD)
+        assert blob_count(store) == 0
+
+
+@pytest.mark.asyncio
+class TestFilesRoutes:
+    """Tests for uploading, downloading and deleting through the files routes."""
+
+    async def test_uploads_get_distinct_ids(self, client):
+        """Test that uploading the same content twice returns two IDs."""
+        assert await upload(client) != await upload(client)
+
+    async def test_download_etag_is_content_hash(self, client):
+        """Test that downloads carry the content hash as ETag."""
+        file_id = await upload(client)
+
+        resp = await client.get(f"/api/files/{file_id}")
+
+        assert resp.content == PAYLOAD
+        assert resp.headers["etag"] == f'"{hashlib.sha256(PAYLOAD).hexdigest()}"'
+
+    async def test_if_none_match(self, client):
+        """Test that a matching If-None-Match is answered with an empty 304."""
+        file_id = await upload(client)
+        etag = (await client.get(f"/api/files/{file_id}")).headers["etag"]
+
+        resp = await client.get(f"/api/files/{file_id}", headers={"If-None-Match": etag})
+
+        assert resp.status_code == 304
+        assert not resp.content
+
+    async def test_range(self, client):
+        """Test that Range requests are served with 206."""
+        file_id = await upload(client)
+
+        resp = await client.get(f"/api/files/{file_id}", headers={"Range": "bytes=10-19"})
+
+        assert resp.status_code == 206
+        assert resp.content == PAYLOAD[10:20]
+
+    async def test_glob_id_rejected(self, client):
+        """Test that a glob pattern isn't accepted as a file ID."""
+        resp = await client.get("/api/files/*")
+
+        assert resp.status_code == 404
+
+    async def test_legacy_layout(self, client, tmp_path, user):
+        """Test that files stored in the old per-user layout are listed and served."""
+        await upload(client)
+        legacy_id = str(uuid4())
+        legacy_dir = Path(tmp_path) / user.sub
+        legacy_dir.mkdir(parents=True)
+        (legacy_dir / f"{legacy_id}.txt").write_text("old upload")
+
+        listing = (await client.get("/api/files")).json()
+        resp = await client.get(f"/api/files/{legacy_id}")
+
+        assert listing["count"] == 2
+        assert resp.text == "old upload"
+
+    async def test_delete(self, client, tmp_path):
+        """Test that deleting removes the reference and garbage collection then frees the blob."""
+        ids = [await upload(client), await upload(client)]
+        store = UploadStore(tmp_path)
+
+        await client.delete(f"/api/files/{ids[0]}")
+        kept = store.collect_garbage(grace_seconds=0)
+        await client.delete(f"/api/files/{ids[1]}")
+        collected = store.collect_garbage(grace_seconds=0)
+
+        assert kept["removed"] == 0
+        assert collected["removed"] == 1
+        assert (await client.get(f"/api/files/{ids[1]}")).status_code == 404
+        assert (await client.get("/api/files")).json()["count"] == 0
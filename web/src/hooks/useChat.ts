@@ -1,7 +1,7 @@
 "use client";
 
 import { useEffect, useRef, useCallback, useState } from "react";
-import { useChatStore, PlanChange } from "@/stores/chat-store";
+import { useChatStore, PlanChange, StepChange } from "@/stores/chat-store";
 import { useAgentStore } from "@/stores/agent-store";
 import { useAuthStore } from "@/stores/auth-store";
 import { useUsageStore } from "@/stores/usage-store";
@@ -55,6 +55,7 @@ interface ChatMessage {
   // Step update fields
   plan_id?: string;
   steps?: PlanStep[];
+  step_changes?: StepChange[];
   current_step?: number;
   modification?: string;
   // Deploy progress fields
@@ -198,402 +199,409 @@ export function useChat() {
 
   const handleMessage = useCallback((event: MessageEvent) => {
     try {
-      const data: ChatMessage = JSON.parse(event.data);
-
-      // Clear sending state for any response-type message (not pong/connected/subscribed)
-      const responseTypes = [
-        "message", "token", "error", "command_result", "command_error",
-        "plan_update", "plan_status", "step_update", "agent_status", "agent_action",
-        "thinking_stream", "rollback_complete", "redo_complete", "continuation_required", "quality_check_result"
-      ];
-      if (responseTypes.includes(data.type)) {
-        clearSendingTimeout();
-      }
-
-      switch (data.type) {
-        case "connected":
-          console.log("WebSocket connected:", data.username);
-          break;
-
-        case "message":
-          if (data.content) {
-            addMessage({
-              id: data.message_id || crypto.randomUUID(),
-              role: "assistant",
-              content: data.content,
-              agent: data.agent,
-              created_at: data.timestamp || new Date().toISOString(),
-            });
-            setIsSending(false);
-          }
-          break;
-
-        case "token":
-          // Streaming token
-          if (data.token) {
-            updateStreamingMessage(data.token);
-          }
-          break;
+      const parsed = JSON.parse(event.data);
+      // The server merges high-frequency agent events into batch frames
+      const events: ChatMessage[] = parsed.type === "batch" ? parsed.events : [parsed];
+
+      for (const data of events) {
+        // Clear sending state for any response-type message (not pong/connected/subscribed)
+        const responseTypes = [
+          "message", "token", "error", "command_result", "command_error",
+          "plan_update", "plan_status", "step_update", "agent_status", "agent_action",
+          "thinking_stream", "rollback_complete", "redo_complete", "continuation_required", "quality_check_result"
+        ];
+        if (responseTypes.includes(data.type)) {
+          clearSendingTimeout();
+        }
 
-        case "agent_status":
-          if (data.agent && data.status) {
-            updateAgentStatus(data.agent, data.status, data.task);
-            // Clear sending state when agent starts working (status=busy)
-            if (data.status === "busy") {
+        switch (data.type) {
+          case "connected":
+            console.log("WebSocket connected:", data.username);
+            break;
+
+          case "message":
+            if (data.content) {
+              addMessage({
+                id: data.message_id || crypto.randomUUID(),
+                role: "assistant",
+                content: data.content,
+                agent: data.agent,
+                created_at: data.timestamp || new Date().toISOString(),
+              });
               setIsSending(false);
             }
-          }
-          break;
+            break;
 
-        case "agent_action":
-          if (data.agent && data.action && data.description) {
-            addAgentAction(data.agent, data.action, data.description, data.timestamp);
-          }
-          break;
+          case "token":
+            // Streaming token
+            if (data.token) {
+              updateStreamingMessage(data.token);
+            }
+            break;
+
+          case "agent_status":
+            if (data.agent && data.status) {
+              updateAgentStatus(data.agent, data.status, data.task);
+              // Clear sending state when agent starts working (status=busy)
+              if (data.status === "busy") {
+                setIsSending(false);
+              }
+            }
+            break;
 
-        case "message_ack":
-          // Message acknowledgment - mark as sent and clear previous actions
-          if (data.message_id) {
-            setMessageStatus(data.message_id, "sent");
-          }
-          clearAgentActions();
-          break;
-
-        case "pong":
-          // Heartbeat response, ignore
-          break;
-
-        case "subscribed":
-        case "unsubscribed":
-          // Subscription confirmation, ignore
-          break;
-
-        case "error":
-          console.error("Server error:", data.error);
-          // If there's a message_id, mark it as failed
-          if (data.message_id) {
-            markMessageFailed(data.message_id);
-          }
-          clearStreamingMessage();
-          setIsSending(false);
-          break;
-
-        case "command_result":
-          if (data.content && data.action !== "plan_creating") {
-            addMessage({
-              id: crypto.randomUUID(),
-              role: "assistant",
-              content: data.content,
-              agent: "system",
-              created_at: data.timestamp || new Date().toISOString(),
-            });
+          case "agent_action":
+            if (data.agent && data.action && data.description) {
+              addAgentAction(data.agent, data.action, data.description, data.timestamp);
+            }
+            break;
+
+          case "message_ack":
+            // Message acknowledgment - mark as sent and clear previous actions
+            if (data.message_id) {
+              setMessageStatus(data.message_id, "sent");
+            }
+            clearAgentActions();
+            break;
+
+          case "pong":
+            // Heartbeat response, ignore
+            break;
+
+          case "subscribed":
+          case "unsubscribed":
+            // Subscription confirmation, ignore
+            break;
+
+          case "error":
+            console.error("Server error:", data.error);
+            // If there's a message_id, mark it as failed
+            if (data.message_id) {
+              markMessageFailed(data.message_id);
+            }
+            clearStreamingMessage();
             setIsSending(false);
-          }
-          if (data.plan_content !== undefined) {
-            if (data.plan_content === "" || data.plan_content === null) {
-              useChatStore.getState().clearPlan();
-            } else {
-              updatePlan(
-                data.plan_content,
-                normalizePlanStatus(data.plan_status),
-                data.plan_id
-              );
+            break;
+
+          case "command_result":
+            if (data.content && data.action !== "plan_creating") {
+              addMessage({
+                id: crypto.randomUUID(),
+                role: "assistant",
+                content: data.content,
+                agent: "system",
+                created_at: data.timestamp || new Date().toISOString(),
+              });
+              setIsSending(false);
             }
-          }
-          // Handle steps from plan view command
-          if (data.steps && Array.isArray(data.steps)) {
-            console.log("[Plan] Loading steps from command_result:", data.steps.length);
-            updateSteps(data.steps, 0, data.plan_id);
-          }
-          break;
-
-        case "command_error":
-          if (data.error) {
-            addMessage({
-              id: crypto.randomUUID(),
-              role: "assistant",
-              content: `Command error: ${data.error}`,
-              agent: "system",
-              created_at: data.timestamp || new Date().toISOString(),
+            if (data.plan_content !== undefined) {
+              if (data.plan_content === "" || data.plan_content === null) {
+                useChatStore.getState().clearPlan();
+              } else {
+                updatePlan(
+                  data.plan_content,
+                  normalizePlanStatus(data.plan_status),
+                  data.plan_id
+                );
+              }
+            }
+            // Handle steps from plan view command
+            if (data.steps && Array.isArray(data.steps)) {
+              console.log("[Plan] Loading steps from command_result:", data.steps.length);
+              updateSteps(data.steps, 0, data.plan_id);
+            }
+            break;
+
+          case "command_error":
+            if (data.error) {
+              addMessage({
+                id: crypto.randomUUID(),
+                role: "assistant",
+                content: `Command error: ${data.error}`,
+                agent: "system",
+                created_at: data.timestamp || new Date().toISOString(),
+              });
+            }
+            break;
+
+          case "memory_saved":
+            console.log("Memory saved with tags:", data.tags);
+            break;
+
+          case "plan_update":
+            console.log("[Plan] plan_update received:", {
+              plan_content: data.plan_content?.substring(0, 100),
+              plan_status: data.plan_status,
+              plan_id: data.plan_id,
+              branch: data.branch,
+              conversation_id: data.conversation_id
             });
-          }
-          break;
-
-        case "memory_saved":
-          console.log("Memory saved with tags:", data.tags);
-          break;
-
-        case "plan_update":
-          console.log("[Plan] plan_update received:", {
-            plan_content: data.plan_content?.substring(0, 100),
-            plan_status: data.plan_status,
-            plan_id: data.plan_id,
-            branch: data.branch,
-            conversation_id: data.conversation_id
-          });
-          if (data.plan_content !== undefined) {
-            const planStatus = normalizePlanStatus(data.plan_status);
-            const planBranch = data.branch || null;
-            console.log("[Plan] Calling updatePlan with status:", planStatus, "planId:", data.plan_id, "branch:", planBranch);
-            updatePlan(data.plan_content, planStatus, data.plan_id, planBranch);
-            setIsSending(false);
-          }
-          break;
+            if (data.plan_content !== undefined) {
+              const planStatus = normalizePlanStatus(data.plan_status);
+              const planBranch = data.branch || null;
+              console.log("[Plan] Calling updatePlan with status:", planStatus, "planId:", data.plan_id, "branch:", planBranch);
+              updatePlan(data.plan_content, planStatus, data.plan_id, planBranch);
+              setIsSending(false);
+            }
+            break;
 
-        case "branch_mismatch_warning":
-          console.log("[Plan] Branch mismatch warning:", {
-            plan_branch: data.plan_branch,
-            current_branch: data.current_branch,
-            plan_id: data.plan_id
-          });
-          if (data.plan_branch && data.current_branch) {
-            useChatStore.getState().setBranchMismatchWarning({
-              planBranch: data.plan_branch,
-              currentBranch: data.current_branch,
+          case "branch_mismatch_warning":
+            console.log("[Plan] Branch mismatch warning:", {
+              plan_branch: data.plan_branch,
+              current_branch: data.current_branch,
+              plan_id: data.plan_id
             });
-          }
-          break;
-
-        case "plan_status":
-          if (data.plan_status) {
-            const normalized = normalizePlanStatus(data.plan_status);
-            if (normalized === "COMPLETED") {
-              useChatStore.getState().clearPlan();
-            } else {
-              const currentPlan = useChatStore.getState().currentPlan;
-              if (currentPlan) {
-                updatePlan(currentPlan, normalized);
+            if (data.plan_branch && data.current_branch) {
+              useChatStore.getState().setBranchMismatchWarning({
+                planBranch: data.plan_branch,
+                currentBranch: data.current_branch,
+              });
+            }
+            break;
+
+          case "plan_status":
+            if (data.plan_status) {
+              const normalized = normalizePlanStatus(data.plan_status);
+              if (normalized === "COMPLETED") {
+                useChatStore.getState().clearPlan();
+              } else {
+                const currentPlan = useChatStore.getState().currentPlan;
+                if (currentPlan) {
+                  updatePlan(currentPlan, normalized);
+                }
               }
             }
-          }
-          setIsSending(false); // Clear sending state on plan status update
-          break;
-
-        case "step_update":
-          console.log("[Plan] step_update received:", {
-            steps_count: data.steps?.length,
-            current_step: data.current_step,
-            plan_id: data.plan_id,
-            conversation_id: data.conversation_id
-          });
-          if (data.steps) {
-            updateSteps(data.steps, data.current_step || 0, data.plan_id);
-            if (data.modification) {
-              console.log(`[Plan] Modified: ${data.modification}`);
+            setIsSending(false); // Clear sending state on plan status update
+            break;
+
+          case "step_update":
+            console.log("[Plan] step_update received:", {
+              steps_count: data.steps?.length,
+              changed_steps: data.step_changes?.length,
+              current_step: data.current_step,
+              plan_id: data.plan_id,
+              conversation_id: data.conversation_id
+            });
+            if (data.steps) {
+              updateSteps(data.steps, data.current_step || 0, data.plan_id);
+              if (data.modification) {
+                console.log(`[Plan] Modified: ${data.modification}`);
+              }
+            } else if (data.step_changes) {
+              useChatStore.getState().applyStepChanges(data.step_changes, data.current_step || 0, data.plan_id);
             }
-          }
-          setIsSending(false); // Clear sending state when plan steps arrive
-          break;
+            setIsSending(false); // Clear sending state when plan steps arrive
+            break;
 
-        case "task_control_ack":
-          console.log(`Task ${data.action} acknowledged`);
-          break;
+          case "task_control_ack":
+            console.log(`Task ${data.action} acknowledged`);
+            break;
 
-        case "message_queued":
-          console.log("Message queued:", data.content);
-          break;
+          case "message_queued":
+            console.log("Message queued:", data.content);
+            break;
 
-        case "conversation_renamed":
-          if (data.conversation_id && data.title) {
-            useChatStore.getState().renameConversationLocal(data.conversation_id, data.title);
-          }
-          break;
+          case "conversation_renamed":
+            if (data.conversation_id && data.title) {
+              useChatStore.getState().renameConversationLocal(data.conversation_id, data.title);
+            }
+            break;
 
-        case "deploy_progress":
-          // Emit a custom event for deploy progress tracking
-          if (typeof window !== "undefined") {
-            window.dispatchEvent(new CustomEvent("deploy_progress", { detail: data }));
-          }
-          break;
-
-        case "usage_update":
-          if (data.input_tokens !== undefined || data.output_tokens !== undefined) {
-            useUsageStore.getState().updateUsage(
-              data.input_tokens || 0,
-              data.output_tokens || 0,
-              data.cost || 0
-            );
-          }
-          break;
+          case "deploy_progress":
+            // Emit a custom event for deploy progress tracking
+            if (typeof window !== "undefined") {
+              window.dispatchEvent(new CustomEvent("deploy_progress", { detail: data }));
+            }
+            break;
+
+          case "usage_update":
+            if (data.input_tokens !== undefined || data.output_tokens !== undefined) {
+              useUsageStore.getState().updateUsage(
+                data.input_tokens || 0,
+                data.output_tokens || 0,
+                data.cost || 0
+              );
+            }
+            break;
+
+          case "supervisor_thinking":
+            if (data.content && data.phase) {
+              useChatStore.getState().addSupervisorThought({
+                content: data.content,
+                phase: data.phase,
+                timestamp: data.timestamp || new Date().toISOString(),
+                stepId: data.step_id,
+                confidence: data.confidence,
+              });
+            }
+            break;
+
+          case "step_confidence_update":
+            if (data.step_id && data.old_confidence !== undefined && data.new_confidence !== undefined) {
+              useChatStore.getState().addConfidenceUpdate({
+                stepId: data.step_id,
+                oldConfidence: data.old_confidence,
+                newConfidence: data.new_confidence,
+                reason: data.reason || "",
+                timestamp: data.timestamp || new Date().toISOString(),
+              });
+            }
+            break;
+
+          case "plan_change":
+            if (data.change_type && data.step_id) {
+              useChatStore.getState().addPlanChange({
+                changeType: data.change_type,
+                stepId: data.step_id,
+                stepTitle: data.title,
+                reason: data.reason || "",
+                timestamp: data.timestamp || new Date().toISOString(),
+                before: data.before as PlanChange["before"],
+                after: data.after as PlanChange["after"],
+              });
+            }
+            break;
+
+          case "todo_progress":
+            if (data.step_id && data.todo_index !== undefined) {
+              // Update plan step todos
+              useChatStore.getState().updateTodoProgress({
+                stepId: data.step_id,
+                todoIndex: data.todo_index,
+                progress: data.progress || 0,
+                statusMessage: data.status_message || "",
+                timestamp: data.timestamp || new Date().toISOString(),
+              });
+
+              // Also update active task todos (task_id and step_id are both used as key)
+              if (data.task_id || data.step_id) {
+                const taskId = data.task_id || data.step_id;
+                const progress = data.progress ?? 0;
+                useChatStore.getState().updateActiveTaskTodo(
+                  taskId,
+                  data.todo_index,
+                  data.status || (progress >= 100 ? "completed" : "in_progress"),
+                  progress,
+                  data.status_message
+                );
+              }
+            }
+            break;
+
+          case "file_change_preview":
+            if (data.path && data.after_content !== undefined) {
+              useChatStore.getState().addFileChangePreview({
+                id: data.message_id || crypto.randomUUID(),
+                path: data.path,
+                before: data.before_content || "",
+                after: data.after_content,
+                language: data.language,
+                summary: data.summary,
+                stepId: data.step_id,
+              });
+            }
+            break;
 
-        case "supervisor_thinking":
-          if (data.content && data.phase) {
-            useChatStore.getState().addSupervisorThought({
-              content: data.content,
-              phase: data.phase,
-              timestamp: data.timestamp || new Date().toISOString(),
-              stepId: data.step_id,
-              confidence: data.confidence,
-            });
-          }
-          break;
+          case "available_agents":
+            if (data.agents) {
+              useChatStore.getState().setAvailableAgents(data.agents);
+            }
+            break;
+
+          case "continuation_required":
+            // Agent hit max iterations and needs user decision to continue
+            if (data.step_id) {
+              useChatStore.getState().setContinuationRequest({
+                stepId: data.step_id,
+                stepTitle: data.step_title || "Current step",
+                iterationsUsed: data.iterations_used || 0,
+                progressEstimate: data.progress_estimate || 0,
+                estimatedRemaining: data.estimated_remaining || 10,
+                filesModified: data.files_modified || [],
+                message: data.message || "Step reached maximum iterations.",
+                timestamp: data.timestamp || new Date().toISOString(),
+                planId: data.plan_id,
+                conversationId: data.conversation_id,
+              });
+              setIsSending(false);
+            }
+            break;
+
+          case "thinking_stream":
+            // Narrative thinking/reasoning for Thinking panel
+            if (data.content && data.thought_type) {
+              useChatStore.getState().addThinkingEntry({
+                type: data.thought_type,
+                content: data.content,
+                context: data.context,
+                agent: data.agent || "supervisor",
+                timestamp: data.timestamp || new Date().toISOString(),
+              });
+            }
+            break;
 
-        case "step_confidence_update":
-          if (data.step_id && data.old_confidence !== undefined && data.new_confidence !== undefined) {
-            useChatStore.getState().addConfidenceUpdate({
+          case "rollback_complete":
+            // Rollback operation completed
+            useChatStore.getState().setRollbackResult({
+              success: true,
+              planId: data.plan_id || "",
               stepId: data.step_id,
-              oldConfidence: data.old_confidence,
-              newConfidence: data.new_confidence,
-              reason: data.reason || "",
+              filesRestored: data.files_restored || [],
+              filesDeleted: data.files_deleted || [],
               timestamp: data.timestamp || new Date().toISOString(),
             });
-          }
-          break;
+            break;
 
-        case "plan_change":
-          if (data.change_type && data.step_id) {
-            useChatStore.getState().addPlanChange({
-              changeType: data.change_type,
+          case "redo_complete":
+            // Redo operation completed
+            useChatStore.getState().setRollbackResult({
+              success: true,
+              planId: data.plan_id || "",
               stepId: data.step_id,
-              stepTitle: data.title,
-              reason: data.reason || "",
+              filesRestored: data.files_reapplied || [],
+              filesDeleted: data.files_created || [],
               timestamp: data.timestamp || new Date().toISOString(),
-              before: data.before as PlanChange["before"],
-              after: data.after as PlanChange["after"],
             });
-          }
-          break;
+            break;
 
-        case "todo_progress":
-          if (data.step_id && data.todo_index !== undefined) {
-            // Update plan step todos
-            useChatStore.getState().updateTodoProgress({
-              stepId: data.step_id,
-              todoIndex: data.todo_index,
-              progress: data.progress || 0,
-              statusMessage: data.status_message || "",
+          case "quality_check_result":
+            // Quality check result after task completion
+            useChatStore.getState().setQualityCheckResult({
+              taskId: data.task_id || "",
+              conversationId: data.conversation_id,
+              passed: data.passed ?? true,
+              errors: data.errors || [],
+              checksRun: data.checks_run || [],
+              agent: data.agent,
               timestamp: data.timestamp || new Date().toISOString(),
             });
-
-            // Also update active task todos (task_id and step_id are both used as key)
-            if (data.task_id || data.step_id) {
-              const taskId = data.task_id || data.step_id;
-              const progress = data.progress ?? 0;
-              useChatStore.getState().updateActiveTaskTodo(
-                taskId,
-                data.todo_index,
-                data.status || (progress >= 100 ? "completed" : "in_progress"),
-                progress,
-                data.status_message
+            break;
+
+          case "task_todos":
+            // Non-plan mode task tracking - agent created a tracked task with TODOs
+            if (data.task_id && data.task_description && data.todos) {
+              useChatStore.getState().addActiveTask(
+                data.task_id,
+                data.task_description,
+                data.todos,
+                data.agent || "agent"
               );
             }
-          }
-          break;
-
-        case "file_change_preview":
-          if (data.path && data.after_content !== undefined) {
-            useChatStore.getState().addFileChangePreview({
-              id: data.message_id || crypto.randomUUID(),
-              path: data.path,
-              before: data.before_content || "",
-              after: data.after_content,
-              language: data.language,
-              summary: data.summary,
-              stepId: data.step_id,
-            });
-          }
-          break;
-
-        case "available_agents":
-          if (data.agents) {
-            useChatStore.getState().setAvailableAgents(data.agents);
-          }
-          break;
-
-        case "continuation_required":
-          // Agent hit max iterations and needs user decision to continue
-          if (data.step_id) {
-            useChatStore.getState().setContinuationRequest({
-              stepId: data.step_id,
-              stepTitle: data.step_title || "Current step",
-              iterationsUsed: data.iterations_used || 0,
-              progressEstimate: data.progress_estimate || 0,
-              estimatedRemaining: data.estimated_remaining || 10,
-              filesModified: data.files_modified || [],
-              message: data.message || "Step reached maximum iterations.",
-              timestamp: data.timestamp || new Date().toISOString(),
-              planId: data.plan_id,
-              conversationId: data.conversation_id,
-            });
-            setIsSending(false);
-          }
-          break;
-
-        case "thinking_stream":
-          // Narrative thinking/reasoning for Thinking panel
-          if (data.content && data.thought_type) {
-            useChatStore.getState().addThinkingEntry({
-              type: data.thought_type,
-              content: data.content,
-              context: data.context,
-              agent: data.agent || "supervisor",
-              timestamp: data.timestamp || new Date().toISOString(),
-            });
-          }
-          break;
-
-        case "rollback_complete":
-          // Rollback operation completed
-          useChatStore.getState().setRollbackResult({
-            success: true,
-            planId: data.plan_id || "",
-            stepId: data.step_id,
-            filesRestored: data.files_restored || [],
-            filesDeleted: data.files_deleted || [],
-            timestamp: data.timestamp || new Date().toISOString(),
-          });
-          break;
-
-        case "redo_complete":
-          // Redo operation completed
-          useChatStore.getState().setRollbackResult({
-            success: true,
-            planId: data.plan_id || "",
-            stepId: data.step_id,
-            filesRestored: data.files_reapplied || [],
-            filesDeleted: data.files_created || [],
-            timestamp: data.timestamp || new Date().toISOString(),
-          });
-          break;
-
-        case "quality_check_result":
-          // Quality check result after task completion
-          useChatStore.getState().setQualityCheckResult({
-            taskId: data.task_id || "",
-            conversationId: data.conversation_id,
-            passed: data.passed ?? true,
-            errors: data.errors || [],
-            checksRun: data.checks_run || [],
-            agent: data.agent,
-            timestamp: data.timestamp || new Date().toISOString(),
-          });
-          break;
-
-        case "task_todos":
-          // Non-plan mode task tracking - agent created a tracked task with TODOs
-          if (data.task_id && data.task_description && data.todos) {
-            useChatStore.getState().addActiveTask(
-              data.task_id,
-              data.task_description,
-              data.todos,
-              data.agent || "agent"
-            );
-          }
-          break;
-
-        case "plan_suggestion":
-          // Supervisor suggests entering plan mode for a complex task
-          if (data.message) {
-            useChatStore.getState().setPlanSuggestion({
-              message: data.message,
-              reason: data.reason || "",
-              timestamp: data.timestamp || new Date().toISOString(),
-            });
-          }
-          break;
+            break;
+
+          case "plan_suggestion":
+            // Supervisor suggests entering plan mode for a complex task
+            if (data.message) {
+              useChatStore.getState().setPlanSuggestion({
+                message: data.message,
+                reason: data.reason || "",
+                timestamp: data.timestamp || new Date().toISOString(),
+              });
+            }
+            break;
 
-        default:
-          console.log("Unknown message type:", data.type);
+          default:
+            console.log("Unknown message type:", data.type);
+        }
       }
     } catch (e) {
       console.error("Failed to parse WebSocket message:", e);
@@ -213,6 +213,9 @@ export interface PlanStep {
   completed_at?: string;
 }
 
+// Changed fields of one step, sent instead of the full step list on progress ticks
+export type StepChange = Partial<PlanStep> & { id: string };
+
 interface ChatState {
   conversations: Conversation[];
   currentConversation: Conversation | null;
@@ -323,6 +326,7 @@ interface ChatState {
   // Plan actions
   updatePlan: (content: string, status?: PlanStatus, planId?: string, branch?: string | null) => void;
   updateSteps: (steps: PlanStep[], currentStep: number, planId?: string) => void;
+  applyStepChanges: (changes: StepChange[], currentStep: number, planId?: string) => void;
   setCurrentPlanId: (planId: string | null) => void;
   setPlanBranch: (branch: string | null) => void;
   setBranchMismatchWarning: (warning: { planBranch: string; currentBranch: string } | null) => void;
@@ -805,6 +809,20 @@ export const useChatStore = create<ChatState>((set, get) => ({
     });
   },
 
+  applyStepChanges: (changes: StepChange[], currentStep: number, planId?: string) => {
+    const state = get();
+    // Changes only apply on top of the same plan's steps
+    if (planId && state.currentPlanId && planId !== state.currentPlanId) {
+      return;
+    }
+    const changesById = new Map(changes.map((change) => [change.id, change]));
+    const steps = state.planSteps.map((step) => {
+      const change = changesById.get(step.id);
+      return change ? { ...step, ...change } : step;
+    });
+    get().updateSteps(steps, currentStep, planId);
+  },
+
   setCurrentPlanId: (planId: string | null) => {
     set({ currentPlanId: planId });
   },